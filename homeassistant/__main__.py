@@ -106,6 +106,26 @@ def get_arguments() -> argparse.Namespace:
     parser.add_argument(
         "--open-ui", action="store_true", help="Open the webinterface in a browser"
     )
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="Log a report of the time spent starting Home Assistant",
+    )
+    parser.add_argument(
+        "--lazy-platforms",
+        action="store_true",
+        help="Import the config flows and other unprocessed platforms on first use",
+    )
+    parser.add_argument(
+        "--warm-up-platforms",
+        action="store_true",
+        help="With --lazy-platforms, import the unused platforms after start",
+    )
+    parser.add_argument(
+        "--storage-write-behind",
+        action="store_true",
+        help="Batch the writes of storage files and limit the rate of fsyncs",
+    )
 
     skip_pip_group = parser.add_mutually_exclusive_group()
     skip_pip_group.add_argument(
@@ -204,6 +224,10 @@ def main() -> int:
         recovery_mode=args.recovery_mode,
         debug=args.debug,
         open_ui=args.open_ui,
+        profile_startup=args.profile_startup,
+        lazy_platforms=args.lazy_platforms,
+        warm_up_platforms=args.warm_up_platforms,
+        storage_write_behind=args.storage_write_behind,
         safe_mode=safe_mode,
     )
 
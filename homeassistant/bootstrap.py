@@ -4,15 +4,18 @@ from __future__ import annotations
 
 import asyncio
 from collections import defaultdict
+from collections.abc import Iterable, Mapping
 import contextlib
 from functools import partial
 from itertools import chain
 import logging
 from logging.handlers import RotatingFileHandler, TimedRotatingFileHandler
+import math
 import mimetypes
 from operator import contains, itemgetter
 import os
 import platform
+import re
 import sys
 import threading
 from time import monotonic
@@ -88,7 +91,11 @@ from .helpers import (
     translation,
 )
 from .helpers.dispatcher import async_dispatcher_send_internal
-from .helpers.storage import get_internal_store_manager
+from .helpers.storage import (
+    Store,
+    async_enable_write_behind,
+    get_internal_store_manager,
+)
 from .helpers.system_info import async_get_system_info, is_official_image
 from .helpers.typing import ConfigType
 from .setup import (
@@ -119,14 +126,25 @@ _LOGGER = logging.getLogger(__name__)
 
 SETUP_ORDER_SORT_KEY = partial(contains, BASE_PLATFORMS)
 
+_REQUIREMENT_NAME_END = re.compile(r"[\[<>=!~;@ ]")
+
 
 ERROR_LOG_FILENAME = "home-assistant.log"
 
 # hass.data key for logging information.
 DATA_REGISTRIES_LOADED: HassKey[None] = HassKey("bootstrap_registries_loaded")
+DATA_PROFILE_STARTUP: HassKey[None] = HassKey("bootstrap_profile_startup")
 
 LOG_SLOW_STARTUP_INTERVAL = 60
 SLOW_STARTUP_CHECK_INTERVAL = 1
+# The number of integration setups in the --profile-startup report
+STARTUP_PROFILE_SLOWEST_SETUPS = 10
+# The imports of an integration which take longer are in the report
+STARTUP_PROFILE_IMPORT_BUDGET = 0.5
+
+SETUP_TIMINGS_STORAGE_KEY = "core.setup_timings"
+SETUP_TIMINGS_STORAGE_VERSION = 1
+SETUP_TIMINGS_SAVE_DELAY = 60
 
 STAGE_1_TIMEOUT = 120
 STAGE_2_TIMEOUT = 300
@@ -239,6 +257,7 @@ SETUP_ORDER = (
 # If they do not exist they will not be loaded
 #
 PRELOAD_STORAGE = [
+    SETUP_TIMINGS_STORAGE_KEY,
     "core.logger",
     "core.network",
     "http.auth",
@@ -280,6 +299,13 @@ async def async_setup_hass(
         hass.config.skip_pip = runtime_config.skip_pip
         hass.config.skip_pip_packages = runtime_config.skip_pip_packages
 
+        if runtime_config.profile_startup:
+            hass.data[DATA_PROFILE_STARTUP] = None
+        if runtime_config.lazy_platforms:
+            loader.async_enable_lazy_platforms(hass, runtime_config.warm_up_platforms)
+        if runtime_config.storage_write_behind:
+            async_enable_write_behind(hass)
+
         return hass
 
     async def stop_hass(hass: core.HomeAssistant) -> None:
@@ -379,6 +405,52 @@ async def async_setup_hass(
     return hass
 
 
+@core.callback
+def _async_log_startup_profile(hass: core.HomeAssistant, startup_time: float) -> None:
+    """Log where the time starting Home Assistant was spent."""
+    if manifest_cache := hass.data.get(loader.DATA_MANIFEST_CACHE):
+        _LOGGER.info(
+            (
+                "Startup profile: %s integration manifests loaded from cache, %s"
+                " loaded in %.3fs; the cache saved %.3fs"
+            ),
+            manifest_cache.hits,
+            manifest_cache.misses,
+            manifest_cache.load_time,
+            manifest_cache.saved_time,
+        )
+    setup_time = async_get_setup_timings(hass)
+    _LOGGER.info(
+        "Startup profile: initialized in %.2fs, slowest integration setups: %s",
+        startup_time,
+        ", ".join(
+            f"{domain} {seconds:.2f}s"
+            for domain, seconds in sorted(
+                setup_time.items(), key=itemgetter(1), reverse=True
+            )[:STARTUP_PROFILE_SLOWEST_SETUPS]
+        )
+        or "none",
+    )
+    import_timings = loader.async_get_import_timings(hass)
+    _LOGGER.info(
+        (
+            "Startup profile: %s integrations imported in %.2fs, imports over"
+            " the budget of %.2fs: %s"
+        ),
+        len(import_timings),
+        sum(import_timings.values()),
+        STARTUP_PROFILE_IMPORT_BUDGET,
+        ", ".join(
+            f"{domain} {seconds:.2f}s"
+            for domain, seconds in sorted(
+                import_timings.items(), key=itemgetter(1), reverse=True
+            )
+            if seconds > STARTUP_PROFILE_IMPORT_BUDGET
+        )
+        or "none",
+    )
+
+
 def open_hass_ui(hass: core.HomeAssistant) -> None:
     """Open the UI."""
     import webbrowser  # pylint: disable=import-outside-toplevel
@@ -435,6 +507,7 @@ async def async_load_base_functionality(hass: core.HomeAssistant) -> None:
         create_eager_task(label_registry.async_load(hass)),
         hass.async_add_executor_job(_init_blocking_io_modules_in_executor),
         create_eager_task(template.async_load_custom_templates(hass)),
+        create_eager_task(template.async_load_bytecode_cache(hass)),
         create_eager_task(restore_state.async_load(hass)),
         create_eager_task(hass.config_entries.async_initialize()),
         create_eager_task(async_get_system_info(hass)),
@@ -452,6 +525,7 @@ async def async_from_config_dict(
     start = monotonic()
 
     hass.config_entries = config_entries.ConfigEntries(hass, config)
+    await loader.async_load_manifest_cache(hass)
     # Prime custom component cache early so we know if registry entries are tied
     # to a custom integration
     await loader.async_get_custom_components(hass)
@@ -495,6 +569,8 @@ async def async_from_config_dict(
 
     stop = monotonic()
     _LOGGER.info("Home Assistant initialized in %.2fs", stop - start)
+    if DATA_PROFILE_STARTUP in hass.data:
+        _async_log_startup_profile(hass, stop - start)
 
     if (
         REQUIRED_NEXT_PYTHON_HA_RELEASE
@@ -774,10 +850,17 @@ async def async_setup_multi_components(
     hass: core.HomeAssistant,
     domains: set[str],
     config: dict[str, Any],
+    priorities: Mapping[str, float] | None = None,
 ) -> None:
-    """Set up multiple domains. Log on failure."""
+    """Set up multiple domains. Log on failure.
+
+    The priorities are the estimated setup times of the longest chains of
+    integrations which wait for each domain, the setups of the domains with
+    the longest chains are started first.
+    """
     # Avoid creating tasks for domains that were setup in a previous stage
     domains_not_yet_setup = domains - hass.config.components
+    priorities = priorities or {}
     # Create setup tasks for base platforms first since everything will have
     # to wait to be imported, and the sooner we can get the base platforms
     # loaded the sooner we can start loading the rest of the integrations.
@@ -788,7 +871,12 @@ async def async_setup_multi_components(
             eager_start=True,
         )
         for domain in sorted(
-            domains_not_yet_setup, key=SETUP_ORDER_SORT_KEY, reverse=True
+            domains_not_yet_setup,
+            key=lambda domain: (
+                SETUP_ORDER_SORT_KEY(domain),
+                priorities.get(domain, 0),
+            ),
+            reverse=True,
         )
     }
     results = await asyncio.gather(*futures.values(), return_exceptions=True)
@@ -802,6 +890,126 @@ async def async_setup_multi_components(
             )
 
 
+def _requirement_name(requirement: str) -> str:
+    """Return the name of the package of a requirement."""
+    return _REQUIREMENT_NAME_END.split(requirement, maxsplit=1)[0].lower()
+
+
+def _setup_dependencies(integration: loader.Integration) -> set[str]:
+    """Return the domains the setup of an integration waits for."""
+    return {*integration.dependencies, *integration.after_dependencies}
+
+
+def _setup_priorities(
+    timings: Mapping[str, float],
+    domains: Iterable[str],
+    integration_cache: Mapping[str, loader.Integration],
+) -> dict[str, float]:
+    """Estimate the critical paths of the integrations to set up.
+
+    The priority of a domain is its setup time of the previous start plus
+    the longest priority of the domains which wait for it.
+
+    After dependencies may be circular. The domains of a cycle wait for
+    each other, so they share the sum of their setup times plus the
+    longest priority of the domains which wait for any of them, which
+    does not depend on the order the domains are visited in.
+    """
+    dependents: dict[str, set[str]] = {}
+    for domain in domains:
+        if (integration := integration_cache.get(domain)) is None:
+            continue
+        for dependency in _setup_dependencies(integration):
+            dependents.setdefault(dependency, set()).add(domain)
+
+    priorities: dict[str, float] = {}
+    # Tarjan's algorithm, the cycles are found as strongly connected
+    # components after the components of all their dependents
+    index: dict[str, int] = {}
+    lowlink: dict[str, int] = {}
+    stack: list[str] = []
+    on_stack: set[str] = set()
+
+    def _visit(domain: str) -> None:
+        index[domain] = lowlink[domain] = len(index)
+        stack.append(domain)
+        on_stack.add(domain)
+        for dependent in dependents.get(domain, ()):
+            if dependent not in index:
+                _visit(dependent)
+                lowlink[domain] = min(lowlink[domain], lowlink[dependent])
+            elif dependent in on_stack:
+                lowlink[domain] = min(lowlink[domain], index[dependent])
+        if lowlink[domain] != index[domain]:
+            return
+        component: set[str] = set()
+        while True:
+            member = stack.pop()
+            on_stack.discard(member)
+            component.add(member)
+            if member == domain:
+                break
+        priority = math.fsum(timings.get(member, 0) for member in component) + max(
+            (
+                priorities[dependent]
+                for member in component
+                for dependent in dependents.get(member, ())
+                if dependent not in component
+            ),
+            default=0,
+        )
+        for member in component:
+            priorities[member] = priority
+
+    for domain in domains:
+        if domain not in index:
+            _visit(domain)
+    return priorities
+
+
+def _independent_stage_2_domains(
+    stage_1_domains: set[str],
+    stage_2_domains: set[str],
+    integration_cache: Mapping[str, loader.Integration],
+) -> set[str]:
+    """Return the stage 2 domains which can be set up with stage 1.
+
+    These neither wait for a stage 1 domain or a stage 2 domain which is
+    not independent, nor are waited for by a stage 1 domain, nor share a
+    requirement with a stage 1 domain which may be updated by stage 1.
+    """
+    stage_1_requirements: set[str] = set()
+    stage_1_waits_for: set[str] = set()
+    for domain in stage_1_domains:
+        if (integration := integration_cache.get(domain)) is not None:
+            stage_1_requirements.update(
+                _requirement_name(requirement)
+                for requirement in integration.requirements
+            )
+            stage_1_waits_for.update(_setup_dependencies(integration))
+
+    independent: set[str] = set()
+    for domain in stage_2_domains - stage_1_waits_for:
+        if (integration := integration_cache.get(domain)) is None:
+            continue
+        if not any(
+            _requirement_name(requirement) in stage_1_requirements
+            for requirement in integration.requirements
+        ):
+            independent.add(domain)
+
+    # Remove the domains which wait for a domain which is not independent
+    while late := [
+        domain
+        for domain in independent
+        if not _setup_dependencies(integration_cache[domain]).isdisjoint(
+            stage_1_domains | (stage_2_domains - independent)
+        )
+    ]:
+        independent.difference_update(late)
+    return independent
+
+
 async def _async_resolve_domains_to_setup(
     hass: core.HomeAssistant, config: dict[str, Any]
 ) -> tuple[set[str], dict[str, loader.Integration]]:
@@ -1023,17 +1231,50 @@ async def _async_set_up_integrations(
             async_set_domains_to_be_loaded(hass, to_be_loaded)
             await async_setup_multi_components(hass, domain_group, config)
 
+    setup_timings_store = Store[dict[str, float]](
+        hass, SETUP_TIMINGS_STORAGE_VERSION, SETUP_TIMINGS_STORAGE_KEY, private=True
+    )
+    previous_timings = await setup_timings_store.async_load() or {}
+    priorities = _setup_priorities(
+        previous_timings, stage_1_domains | stage_2_domains, integration_cache
+    )
+
+    # Stage 2 domains which do not wait for stage 1 are set up with stage 1
+    early_stage_2_domains = _independent_stage_2_domains(
+        stage_1_domains, stage_2_domains, integration_cache
+    )
+    stage_2_domains -= early_stage_2_domains
+
     # Enables after dependencies when setting up stage 1 domains
-    async_set_domains_to_be_loaded(hass, stage_1_domains)
+    async_set_domains_to_be_loaded(hass, stage_1_domains | early_stage_2_domains)
 
-    # Start setup
+    # Start setup, the setups of stage 1 are started first
+    stage_1_task: asyncio.Task[None] | None = None
     if stage_1_domains:
         _LOGGER.info("Setting up stage 1: %s", stage_1_domains)
+        stage_1_task = create_eager_task(
+            async_setup_multi_components(hass, stage_1_domains, config, priorities),
+            loop=hass.loop,
+        )
+
+    early_stage_2_task: asyncio.Task[None] | None = None
+    if early_stage_2_domains:
+        _LOGGER.info(
+            "Setting up stage 2 independent of stage 1: %s", early_stage_2_domains
+        )
+        early_stage_2_task = create_eager_task(
+            async_setup_multi_components(
+                hass, early_stage_2_domains, config, priorities
+            ),
+            loop=hass.loop,
+        )
+
+    if stage_1_task:
         try:
             async with hass.timeout.async_timeout(
                 STAGE_1_TIMEOUT, cool_down=COOLDOWN_TIME
             ):
-                await async_setup_multi_components(hass, stage_1_domains, config)
+                await stage_1_task
         except TimeoutError:
             _LOGGER.warning(
                 "Setup timed out for stage 1 waiting on %s - moving forward",
@@ -1043,13 +1284,17 @@ async def _async_set_up_integrations(
     # Add after dependencies when setting up stage 2 domains
     async_set_domains_to_be_loaded(hass, stage_2_domains)
 
-    if stage_2_domains:
+    if stage_2_domains or early_stage_2_task:
         _LOGGER.info("Setting up stage 2: %s", stage_2_domains)
         try:
             async with hass.timeout.async_timeout(
                 STAGE_2_TIMEOUT, cool_down=COOLDOWN_TIME
             ):
-                await async_setup_multi_components(hass, stage_2_domains, config)
+                await async_setup_multi_components(
+                    hass, stage_2_domains, config, priorities
+                )
+                if early_stage_2_task:
+                    await early_stage_2_task
         except TimeoutError:
             _LOGGER.warning(
                 "Setup timed out for stage 2 waiting on %s - moving forward",
@@ -1069,6 +1314,11 @@ async def _async_set_up_integrations(
 
     watcher.async_stop()
 
+    # The setup times prioritize the longest chains of setups on the next start
+    setup_timings_store.async_delay_save(
+        partial(async_get_setup_timings, hass), SETUP_TIMINGS_SAVE_DELAY
+    )
+
     if _LOGGER.isEnabledFor(logging.DEBUG):
         setup_time = async_get_setup_timings(hass)
         _LOGGER.debug(
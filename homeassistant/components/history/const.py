@@ -5,3 +5,10 @@ DOMAIN = "history"
 EVENT_COALESCE_TIME = 0.35
 
 MAX_PENDING_HISTORY_STATES = 2048
+
+DOWNSAMPLE_LTTB = "lttb"
+DOWNSAMPLE_MIN_MAX = "min_max"
+DOWNSAMPLE_METHODS = (DOWNSAMPLE_LTTB, DOWNSAMPLE_MIN_MAX)
+# The first and last state are always kept and LTTB needs
+# at least one bucket in between
+MIN_DOWNSAMPLE_POINTS = 3
@@ -0,0 +1,193 @@
+"""Downsample history for the history integration."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+import math
+from typing import Any
+
+from homeassistant.const import COMPRESSED_STATE_LAST_UPDATED, COMPRESSED_STATE_STATE
+
+from .const import DOWNSAMPLE_LTTB, DOWNSAMPLE_MIN_MAX, MIN_DOWNSAMPLE_POINTS
+
+
+def _float_or_none(state: Any) -> float | None:
+    """Return the state as a finite float or None if it is not numeric."""
+    try:
+        value = float(state)
+    except (TypeError, ValueError):
+        return None
+    return value if math.isfinite(value) else None
+
+
+def _lttb(xs: list[float], ys: list[float], max_points: int) -> list[int]:
+    """Return the indices picked by Largest-Triangle-Three-Buckets.
+
+    The first and last point are always picked, the points in between are
+    split into max_points - 2 buckets and the point of each bucket forming
+    the largest triangle with the previously picked point and the average
+    of the next bucket is picked.
+    """
+    count = len(xs)
+    if count <= max_points:
+        return list(range(count))
+    bucket_size = (count - 2) / (max_points - 2)
+    picked = [0]
+    prev = 0
+    for bucket in range(max_points - 2):
+        next_start = int((bucket + 1) * bucket_size) + 1
+        next_end = min(int((bucket + 2) * bucket_size) + 1, count)
+        next_count = next_end - next_start
+        avg_x = sum(xs[next_start:next_end]) / next_count
+        avg_y = sum(ys[next_start:next_end]) / next_count
+        prev_x = xs[prev]
+        prev_y = ys[prev]
+        max_area = -1.0
+        for idx in range(int(bucket * bucket_size) + 1, next_start):
+            # Twice the area of the triangle, the factor does not matter
+            area = abs(
+                (prev_x - avg_x) * (ys[idx] - prev_y)
+                - (prev_x - xs[idx]) * (avg_y - prev_y)
+            )
+            if area > max_area:
+                max_area = area
+                prev = idx
+        picked.append(prev)
+    picked.append(count - 1)
+    return picked
+
+
+def _min_max(xs: list[float], ys: list[float], max_points: int) -> list[int]:
+    """Return the indices of the min and max point of each time bucket.
+
+    The first and last point are always picked and the time between them is
+    split into (max_points - 2) // 2 buckets of the same length.
+    """
+    count = len(xs)
+    if count <= max_points:
+        return list(range(count))
+    if not (buckets := (max_points - 2) // 2):
+        return [0, count - 1]
+    first_x = xs[0]
+    bucket_width = (xs[-1] - first_x) / buckets or 1.0
+    min_idx: dict[int, int] = {}
+    max_idx: dict[int, int] = {}
+    for idx in range(1, count - 1):
+        bucket = min(int((xs[idx] - first_x) / bucket_width), buckets - 1)
+        y = ys[idx]
+        if (min_bucket_idx := min_idx.get(bucket)) is None:
+            min_idx[bucket] = max_idx[bucket] = idx
+            continue
+        if y < ys[min_bucket_idx]:
+            min_idx[bucket] = idx
+        elif y > ys[max_idx[bucket]]:
+            max_idx[bucket] = idx
+    return sorted({0, count - 1, *min_idx.values(), *max_idx.values()})
+
+
+_DOWNSAMPLERS: dict[str, Callable[[list[float], list[float], int], list[int]]] = {
+    DOWNSAMPLE_LTTB: _lttb,
+    DOWNSAMPLE_MIN_MAX: _min_max,
+}
+
+
+def _change_points(states: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Return only the states where the state changed."""
+    result: list[dict[str, Any]] = []
+    prev_state: Any = None
+    for state in states:
+        if not result or state[COMPRESSED_STATE_STATE] != prev_state:
+            result.append(state)
+            prev_state = state[COMPRESSED_STATE_STATE]
+    return result
+
+
+def _share_budget(run_lengths: list[int], budget: int) -> list[int]:
+    """Share a budget of points between runs of numeric states.
+
+    Each run gets its share of the budget by its number of states. What is
+    left is used to give each run, in order, one point and then up to
+    MIN_DOWNSAMPLE_POINTS points, so the total never exceeds the budget.
+    """
+    if budget <= 0:
+        return [0] * len(run_lengths)
+    total = sum(run_lengths)
+    points = [budget * length // total for length in run_lengths]
+    left = budget - sum(points)
+    for min_points in (1, MIN_DOWNSAMPLE_POINTS):
+        for idx, length in enumerate(run_lengths):
+            missing = min(min_points, length) - points[idx]
+            if 0 < missing <= left:
+                points[idx] += missing
+                left -= missing
+    return points
+
+
+def _downsample_entity_states(
+    states: list[dict[str, Any]], max_points: int, method: str
+) -> list[dict[str, Any]]:
+    """Downsample the compressed states of an entity to at most max_points."""
+    values = [_float_or_none(state[COMPRESSED_STATE_STATE]) for state in states]
+    if len(values) == values.count(None):
+        return _change_points(states)
+    # States which are not numeric, such as unavailable, are gaps in the
+    # graph so the states where a gap starts or changes are kept and the
+    # numeric runs between them share what is left of max_points.
+    gaps: list[int] = []
+    runs: list[list[int]] = []
+    run: list[int] = []
+    prev_state: Any = None
+    for idx, value in enumerate(values):
+        state = states[idx][COMPRESSED_STATE_STATE]
+        if value is None:
+            if run:
+                runs.append(run)
+                run = []
+            if not idx or state != prev_state:
+                gaps.append(idx)
+        else:
+            run.append(idx)
+        prev_state = state
+    if run:
+        runs.append(run)
+    downsampler = _DOWNSAMPLERS[method]
+    # The first state is picked by the first run unless it is a gap
+    keep: set[int] = {0, *gaps}
+    for run, run_points in zip(
+        runs,
+        _share_budget([len(run) for run in runs], max_points - len(gaps)),
+        strict=True,
+    ):
+        if not run_points:
+            continue
+        if run_points <= 2:
+            keep.update((run[0], run[-1])[:run_points])
+            continue
+        xs = [states[idx][COMPRESSED_STATE_LAST_UPDATED] for idx in run]
+        ys = [value for idx in run if (value := values[idx]) is not None]
+        keep.update(run[idx] for idx in downsampler(xs, ys, run_points))
+    result = [state for idx, state in enumerate(states) if idx in keep]
+    if len(result) > max_points:
+        # There are more gaps than max_points, they are thinned out
+        # evenly, keeping the first and the last state
+        step = (len(result) - 1) / (max_points - 1)
+        result = [result[round(point * step)] for point in range(max_points)]
+    return result
+
+
+def downsample_states(
+    states: dict[str, list[dict[str, Any]]], max_points: int, method: str
+) -> None:
+    """Downsample compressed history states in place.
+
+    Entities with numeric states and more than max_points states are
+    reduced to at most max_points states with the given method. Entities with
+    non-numeric states are reduced to the states where the state changed.
+    The first state of each entity is always kept since it is the only one
+    which carries the attributes when a minimal response is requested.
+    """
+    for entity_id, entity_states in states.items():
+        if len(entity_states) > max_points:
+            states[entity_id] = _downsample_entity_states(
+                entity_states, max_points, method
+            )
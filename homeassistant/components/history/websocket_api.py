@@ -38,7 +38,14 @@ from homeassistant.helpers.json import json_bytes
 from homeassistant.util.async_ import create_eager_task
 import homeassistant.util.dt as dt_util
 
-from .const import EVENT_COALESCE_TIME, MAX_PENDING_HISTORY_STATES
+from .const import (
+    DOWNSAMPLE_LTTB,
+    DOWNSAMPLE_METHODS,
+    EVENT_COALESCE_TIME,
+    MAX_PENDING_HISTORY_STATES,
+    MIN_DOWNSAMPLE_POINTS,
+)
+from .downsample import downsample_states
 from .helpers import entities_may_have_state_changes_after, has_recorder_run_after
 
 _LOGGER = logging.getLogger(__name__)
@@ -72,25 +79,27 @@ def _ws_get_significant_states(
     significant_changes_only: bool,
     minimal_response: bool,
     no_attributes: bool,
+    max_points: int | None,
+    downsample: str,
 ) -> bytes:
     """Fetch history significant_states and convert them to json in the executor."""
-    return json_bytes(
-        messages.result_message(
-            msg_id,
-            history.get_significant_states(
-                hass,
-                start_time,
-                end_time,
-                entity_ids,
-                None,
-                include_start_time_state,
-                significant_changes_only,
-                minimal_response,
-                no_attributes,
-                True,
-            ),
-        )
+    states = history.get_significant_states(
+        hass,
+        start_time,
+        end_time,
+        entity_ids,
+        None,
+        include_start_time_state,
+        significant_changes_only,
+        minimal_response,
+        no_attributes,
+        True,
     )
+    if max_points:
+        downsample_states(
+            cast(dict[str, list[dict[str, Any]]], states), max_points, downsample
+        )
+    return json_bytes(messages.result_message(msg_id, states))
 
 
 @websocket_api.websocket_command(
@@ -103,6 +112,8 @@ def _ws_get_significant_states(
         vol.Optional("significant_changes_only", default=True): bool,
         vol.Optional("minimal_response", default=False): bool,
         vol.Optional("no_attributes", default=False): bool,
+        vol.Optional("max_points"): vol.All(int, vol.Range(min=MIN_DOWNSAMPLE_POINTS)),
+        vol.Optional("downsample", default=DOWNSAMPLE_LTTB): vol.In(DOWNSAMPLE_METHODS),
     }
 )
 @websocket_api.async_response
@@ -167,6 +178,8 @@ async def ws_get_history_during_period(
             significant_changes_only,
             minimal_response,
             no_attributes,
+            msg.get("max_points"),
+            msg["downsample"],
         )
     )
 
@@ -221,6 +234,8 @@ def _generate_historical_response(
     minimal_response: bool,
     no_attributes: bool,
     send_empty: bool,
+    max_points: int | None,
+    downsample: str,
 ) -> tuple[float, dt | None, bytes | None]:
     """Generate a historical response."""
     states = cast(
@@ -238,6 +253,8 @@ def _generate_historical_response(
             True,
         ),
     )
+    if max_points:
+        downsample_states(states, max_points, downsample)
     last_time_ts = 0.0
     for state_list in states.values():
         if (
@@ -276,6 +293,8 @@ async def _async_send_historical_states(
     minimal_response: bool,
     no_attributes: bool,
     send_empty: bool,
+    max_points: int | None = None,
+    downsample: str = DOWNSAMPLE_LTTB,
 ) -> dt | None:
     """Fetch history significant_states and send them to the client."""
     instance = get_instance(hass)
@@ -291,6 +310,8 @@ async def _async_send_historical_states(
         minimal_response,
         no_attributes,
         send_empty,
+        max_points,
+        downsample,
     )
     if payload:
         connection.send_message(payload)
@@ -404,6 +425,8 @@ def _async_subscribe_events(
         vol.Optional("significant_changes_only", default=True): bool,
         vol.Optional("minimal_response", default=False): bool,
         vol.Optional("no_attributes", default=False): bool,
+        vol.Optional("max_points"): vol.All(int, vol.Range(min=MIN_DOWNSAMPLE_POINTS)),
+        vol.Optional("downsample", default=DOWNSAMPLE_LTTB): vol.In(DOWNSAMPLE_METHODS),
     }
 )
 @websocket_api.async_response
@@ -443,6 +466,8 @@ async def ws_stream(
     significant_changes_only = msg["significant_changes_only"]
     no_attributes = msg["no_attributes"]
     minimal_response = msg["minimal_response"]
+    max_points: int | None = msg.get("max_points")
+    downsample: str = msg["downsample"]
 
     if end_time and end_time <= utc_now:
         if (
@@ -469,6 +494,8 @@ async def ws_stream(
             minimal_response,
             no_attributes,
             True,
+            max_points,
+            downsample,
         )
         return
 
@@ -533,6 +560,8 @@ async def ws_stream(
         minimal_response,
         no_attributes,
         True,
+        max_points,
+        downsample,
     )
 
     if msg_id not in connection.subscriptions:
@@ -577,4 +606,6 @@ async def ws_stream(
         minimal_response,
         no_attributes,
         send_empty=not last_event_time,
+        max_points=max_points,
+        downsample=downsample,
     )
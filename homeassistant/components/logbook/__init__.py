@@ -36,6 +36,7 @@ from homeassistant.util.event_type import EventType
 from . import rest_api, websocket_api
 from .const import (  # noqa: F401
     ATTR_MESSAGE,
+    CONF_INDEX,
     DOMAIN,
     LOGBOOK_ENTRY_CONTEXT_ID,
     LOGBOOK_ENTRY_DOMAIN,
@@ -45,10 +46,16 @@ from .const import (  # noqa: F401
     LOGBOOK_ENTRY_NAME,
     LOGBOOK_ENTRY_SOURCE,
 )
+from .index import LogbookIndexer, async_remove_index
 from .models import LazyEventPartialState, LogbookConfig
 
 CONFIG_SCHEMA = vol.Schema(
-    {DOMAIN: INCLUDE_EXCLUDE_BASE_FILTER_SCHEMA}, extra=vol.ALLOW_EXTRA
+    {
+        DOMAIN: INCLUDE_EXCLUDE_BASE_FILTER_SCHEMA.extend(
+            {vol.Optional(CONF_INDEX, default=False): cv.boolean}
+        )
+    },
+    extra=vol.ALLOW_EXTRA,
 )
 
 
@@ -136,7 +143,15 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
         EventType[Any] | str,
         tuple[str, Callable[[LazyEventPartialState], dict[str, Any]]],
     ] = {}
-    hass.data[DOMAIN] = LogbookConfig(external_events, filters, entities_filter)
+    indexer: LogbookIndexer | None = None
+    if logbook_conf.get(CONF_INDEX):
+        indexer = LogbookIndexer(hass, external_events)
+        await indexer.async_setup()
+    else:
+        await async_remove_index(hass)
+    hass.data[DOMAIN] = LogbookConfig(
+        external_events, filters, entities_filter, indexer
+    )
     websocket_api.async_setup(hass)
     rest_api.async_setup(hass, config, filters, entities_filter)
     hass.services.async_register(DOMAIN, "log", log_message, schema=LOG_MESSAGE_SCHEMA)
@@ -48,3 +48,10 @@ AUTOMATION_EVENTS = {EVENT_AUTOMATION_TRIGGERED, EVENT_SCRIPT_STARTED}
 
 # Events that are built-in to the logbook or core
 BUILT_IN_EVENTS = {EVENT_LOGBOOK_ENTRY, EVENT_CALL_SERVICE}
+
+CONF_INDEX = "index"
+
+INDEX_STORAGE_KEY = f"{DOMAIN}.index"
+INDEX_STORAGE_VERSION = 1
+# Number of contexts to remember to tell if a row started its context
+INDEX_CONTEXT_ORIGIN_CACHE_SIZE = 4096
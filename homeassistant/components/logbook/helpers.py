@@ -104,6 +104,17 @@ def extract_attr(source: Mapping[str, Any], attr: str) -> list[str]:
     return str(value).split(",")
 
 
+def is_event_data_filtered(
+    entities_filter: Callable[[str], bool], event_data: Mapping[str, Any]
+) -> bool:
+    """Check if the entities filter excludes an event by its data."""
+    entity_ids = extract_attr(event_data, ATTR_ENTITY_ID)
+    if entity_ids and not any(entities_filter(entity_id) for entity_id in entity_ids):
+        return True
+    domain = event_data.get(ATTR_DOMAIN)
+    return bool(domain and not entities_filter(f"{domain}._"))
+
+
 @callback
 def event_forwarder_filtered(
     target: Callable[[Event], None],
@@ -125,16 +136,8 @@ def event_forwarder_filtered(
         @callback
         def _forward_events_filtered_by_entities_filter(event: Event) -> None:
             assert entities_filter is not None
-            event_data = event.data
-            entity_ids = extract_attr(event_data, ATTR_ENTITY_ID)
-            if entity_ids and not any(
-                entities_filter(entity_id) for entity_id in entity_ids
-            ):
-                return
-            domain = event_data.get(ATTR_DOMAIN)
-            if domain and not entities_filter(f"{domain}._"):
-                return
-            target(event)
+            if not is_event_data_filtered(entities_filter, event.data):
+                target(event)
 
         return _forward_events_filtered_by_entities_filter
 
@@ -175,8 +178,18 @@ def async_subscribe_events(
     event_forwarder = event_forwarder_filtered(
         target, entities_filter, entity_ids, device_ids
     )
+
+    @callback
+    def _forward_events(events: list[Event[Any]]) -> None:
+        for event in events:
+            event_forwarder(event)
+
+    # The events are received in batches so an event storm does not
+    # run the forwarders once per event, the batches of the event
+    # types are not ordered relative to each other
     subscriptions.extend(
-        hass.bus.async_listen(event_type, event_forwarder) for event_type in event_types
+        hass.bus.async_listen_batch(event_type, _forward_events)
+        for event_type in event_types
     )
 
     if device_ids and not entity_ids:
@@ -205,12 +218,16 @@ def async_subscribe_events(
         )
         return
 
+    @callback
+    def _forward_state_events_batch(
+        events: list[Event[EventStateChangedData]],
+    ) -> None:
+        for event in events:
+            _forward_state_events_filtered(event)
+
     # We want the firehose
     subscriptions.append(
-        hass.bus.async_listen(
-            EVENT_STATE_CHANGED,
-            _forward_state_events_filtered,
-        )
+        hass.bus.async_listen_batch(EVENT_STATE_CHANGED, _forward_state_events_batch)
     )
 
 
@@ -0,0 +1,361 @@
+"""Maintain the logbook index in the recorder database."""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Mapping
+from datetime import datetime as dt
+import logging
+from typing import Any
+
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.models import (
+    extract_event_type_ids,
+    ulid_to_bytes_or_none,
+    uuid_hex_to_bytes_or_none,
+)
+from homeassistant.components.recorder.tasks import LogbookEntriesTask
+from homeassistant.components.recorder.util import (
+    execute_stmt_lambda_element,
+    session_scope,
+)
+from homeassistant.const import (
+    ATTR_DEVICE_ID,
+    ATTR_ENTITY_ID,
+    ATTR_ICON,
+    EVENT_HOMEASSISTANT_STARTED,
+    EVENT_STATE_CHANGED,
+    MATCH_ALL,
+)
+from homeassistant.core import (
+    Context,
+    CoreState,
+    Event,
+    EventStateChangedData,
+    HomeAssistant,
+    callback,
+)
+from homeassistant.helpers.json import json_dumps
+from homeassistant.helpers.storage import Store
+import homeassistant.util.dt as dt_util
+from homeassistant.util.event_type import EventType
+from homeassistant.util.json import json_loads_object
+
+from .const import (
+    BUILT_IN_EVENTS,
+    INDEX_CONTEXT_ORIGIN_CACHE_SIZE,
+    INDEX_STORAGE_KEY,
+    INDEX_STORAGE_VERSION,
+)
+from .helpers import _is_state_filtered
+from .models import (
+    CONTEXT_ID_BIN_POS,
+    CONTEXT_PARENT_ID_BIN_POS,
+    CONTEXT_USER_ID_BIN_POS,
+    ENTITY_ID_POS,
+    EVENT_DATA_POS,
+    EVENT_TYPE_POS,
+    ICON_POS,
+    STATE_POS,
+    TIME_FIRED_TS_POS,
+    LazyEventPartialState,
+)
+from .queries import statement_for_request
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _scalar_str(value: Any) -> str | None:
+    """Return the value if it is a string, the index does not store lists."""
+    return value if type(value) is str else None
+
+
+def _has_multiple_ids(event_data: Mapping[str, Any]) -> bool:
+    """Return if the event data has a list of entity_ids or device_ids."""
+    return (
+        type(event_data.get(ATTR_ENTITY_ID)) is list
+        or type(event_data.get(ATTR_DEVICE_ID)) is list
+    )
+
+
+def _is_recorded(
+    entity_filter: Callable[[str], bool] | None, event_data: Mapping[str, Any]
+) -> bool:
+    """Return if the recorder records an event with the event data.
+
+    This is the entity filter of the recorder's event listener, the logbook
+    queries never return what the recorder does not record.
+    """
+    if entity_filter is None or not (entity_id := event_data.get(ATTR_ENTITY_ID)):
+        return True
+    if isinstance(entity_id, str):
+        return entity_filter(entity_id)
+    if isinstance(entity_id, list):
+        return any(entity_filter(eid) for eid in entity_id)
+    return True
+
+
+def _resolve_context(
+    context_origins: dict[bytes | None, None],
+    context_id_bin: bytes | None,
+    context_parent_id_bin: bytes | None,
+) -> tuple[bool, bytes | None]:
+    """Return if a row started its context and the context it is described by.
+
+    A row is described by the row which started its context unless
+    it started the context itself, then it is described by the row
+    which started the parent context.
+
+    The contexts are kept in least recently used order, so contexts
+    which keep having rows are not forgotten.
+    """
+    if context_id_bin in context_origins:
+        del context_origins[context_id_bin]
+        context_origins[context_id_bin] = None
+        return False, context_id_bin
+    context_origins[context_id_bin] = None
+    if len(context_origins) > INDEX_CONTEXT_ORIGIN_CACHE_SIZE:
+        del context_origins[next(iter(context_origins))]
+    return True, context_parent_id_bin
+
+
+async def async_remove_index(hass: HomeAssistant) -> None:
+    """Forget what the logbook index covers once it has been disabled.
+
+    The rows left in the index are purged by the recorder.
+    """
+    await Store[dict[str, Any]](
+        hass, INDEX_STORAGE_VERSION, INDEX_STORAGE_KEY
+    ).async_remove()
+
+
+class LogbookIndexer:
+    """Add the rows the logbook shows to the logbook index.
+
+    Once Home Assistant has started, the state changes and events the
+    logbook shows are turned into rows for the logbook_entries table
+    and handed to the recorder which writes them with its next commit.
+    What happened since the recorder started is added from the states
+    and events tables, so the index has no gap at startup.
+
+    Every row the recorder records is added, the filters configured
+    for the logbook are applied when the index is queried since the
+    logbook does not apply them to requests for entities or devices.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        external_events: dict[
+            EventType[Any] | str,
+            tuple[str, Callable[[LazyEventPartialState], dict[str, Any]]],
+        ],
+    ) -> None:
+        """Initialize the logbook indexer."""
+        self.hass = hass
+        self.external_events = external_events
+        self._store = Store[dict[str, Any]](
+            hass, INDEX_STORAGE_VERSION, INDEX_STORAGE_KEY
+        )
+        self._context_origins: dict[bytes | None, None] = {}
+        self._pending: list[dict[str, Any]] = []
+        self._flush_scheduled = False
+        # The index can be used for requests starting at or
+        # after start once the backfill has been written
+        self.start: float | None = None
+        self.ready = False
+
+    async def async_setup(self) -> None:
+        """Set up the logbook indexer."""
+        if (data := await self._store.async_load()) is not None:
+            self.start = data["start"]
+        if self.hass.state is CoreState.running:
+            self._async_start()
+            return
+
+        @callback
+        def _async_started(_: Event) -> None:
+            self._async_start()
+
+        self.hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STARTED, _async_started)
+
+    def covers(self, start_day: dt) -> bool:
+        """Return if the index can answer a request starting at start_day."""
+        return (
+            self.ready
+            and self.start is not None
+            and start_day.timestamp() >= self.start
+        )
+
+    @callback
+    def _async_start(self) -> None:
+        """Start adding rows to the index."""
+        end = dt_util.utcnow()
+        self.hass.bus.async_listen(MATCH_ALL, self._async_add_event)
+        self.hass.async_create_background_task(
+            self._async_backfill(end), "logbook index backfill"
+        )
+
+    async def _async_backfill(self, end: dt) -> None:
+        """Add what happened between the start of the recorder and end."""
+        instance = get_instance(self.hass)
+        start = instance.recorder_runs_manager.recording_start
+        # Wait for the recorder to commit everything up to end
+        await instance.async_block_till_done()
+        event_types = (*BUILT_IN_EVENTS, *self.external_events)
+        if rows := await instance.async_add_executor_job(
+            self._backfill_rows, start, end, event_types
+        ):
+            instance.queue_task(LogbookEntriesTask(rows))
+            await instance.async_block_till_done()
+        _LOGGER.debug("Added %s rows to the logbook index since %s", len(rows), start)
+        if self.start is None:
+            self.start = start.timestamp()
+            await self._store.async_save({"start": self.start})
+        self.ready = True
+
+    def _backfill_rows(
+        self, start: dt, end: dt, event_types: tuple[EventType[Any] | str, ...]
+    ) -> list[dict[str, Any]]:
+        """Build the index rows from the states and events tables."""
+        context_origins: dict[bytes | None, None] = {}
+        rows: list[dict[str, Any]] = []
+        with session_scope(hass=self.hass, read_only=True) as session:
+            instance = get_instance(self.hass)
+            event_type_ids = tuple(
+                extract_event_type_ids(
+                    instance.event_type_manager.get_many(event_types, session)
+                )
+            )
+            stmt = statement_for_request(start, end, event_type_ids)
+            for row in execute_stmt_lambda_element(session, stmt, orm_rows=False):
+                entity_id: str | None = row[ENTITY_ID_POS]
+                device_id: str | None = None
+                multiple_ids = False
+                if (event_data := row[EVENT_DATA_POS]) and (
+                    data := json_loads_object(event_data)
+                ):
+                    entity_id = _scalar_str(data.get(ATTR_ENTITY_ID))
+                    device_id = _scalar_str(data.get(ATTR_DEVICE_ID))
+                    multiple_ids = _has_multiple_ids(data)
+                context_id_bin = row[CONTEXT_ID_BIN_POS]
+                context_origin, resolved_context_id_bin = _resolve_context(
+                    context_origins, context_id_bin, row[CONTEXT_PARENT_ID_BIN_POS]
+                )
+                rows.append(
+                    {
+                        "time_fired_ts": row[TIME_FIRED_TS_POS],
+                        "event_type": row[EVENT_TYPE_POS],
+                        "event_data": event_data,
+                        "entity_id": entity_id,
+                        "device_id": device_id,
+                        "multiple_ids": multiple_ids,
+                        "state": row[STATE_POS],
+                        "icon": row[ICON_POS],
+                        "context_id_bin": context_id_bin,
+                        "context_user_id_bin": row[CONTEXT_USER_ID_BIN_POS],
+                        "context_parent_id_bin": row[CONTEXT_PARENT_ID_BIN_POS],
+                        "resolved_context_id_bin": resolved_context_id_bin,
+                        "context_origin": context_origin,
+                    }
+                )
+        return rows
+
+    @callback
+    def _async_add_event(self, event: Event[Any]) -> None:
+        """Add a state change or event to the index."""
+        event_type = event.event_type
+        instance = get_instance(self.hass)
+        if event_type in instance.exclude_event_types or not _is_recorded(
+            instance.entity_filter, event.data
+        ):
+            return
+        if event_type == EVENT_STATE_CHANGED:
+            self._async_add_state_changed(event)
+            return
+        if event_type not in BUILT_IN_EVENTS and event_type not in self.external_events:
+            return
+        event_data = event.data
+        try:
+            shared_data = json_dumps(event_data)
+        except (TypeError, ValueError):
+            _LOGGER.warning("Event data for %s is not JSON serializable", event_type)
+            return
+        self._async_add_row(
+            event.time_fired_timestamp,
+            event_type,
+            shared_data,
+            _scalar_str(event_data.get(ATTR_ENTITY_ID)),
+            _scalar_str(event_data.get(ATTR_DEVICE_ID)),
+            _has_multiple_ids(event_data),
+            None,
+            None,
+            event.context,
+        )
+
+    @callback
+    def _async_add_state_changed(self, event: Event[EventStateChangedData]) -> None:
+        """Add a state change to the index."""
+        if (old_state := event.data["old_state"]) is None or (
+            new_state := event.data["new_state"]
+        ) is None:
+            return
+        if _is_state_filtered(new_state, old_state):
+            return
+        self._async_add_row(
+            new_state.last_updated_timestamp,
+            None,
+            None,
+            new_state.entity_id,
+            None,
+            False,
+            new_state.state,
+            new_state.attributes.get(ATTR_ICON),
+            new_state.context,
+        )
+
+    @callback
+    def _async_add_row(
+        self,
+        time_fired_ts: float,
+        event_type: EventType[Any] | str | None,
+        event_data: str | None,
+        entity_id: str | None,
+        device_id: str | None,
+        multiple_ids: bool,
+        state: str | None,
+        icon: str | None,
+        context: Context,
+    ) -> None:
+        """Add a row to be handed to the recorder."""
+        context_id_bin = ulid_to_bytes_or_none(context.id)
+        context_parent_id_bin = ulid_to_bytes_or_none(context.parent_id)
+        context_origin, resolved_context_id_bin = _resolve_context(
+            self._context_origins, context_id_bin, context_parent_id_bin
+        )
+        self._pending.append(
+            {
+                "time_fired_ts": time_fired_ts,
+                "event_type": event_type,
+                "event_data": event_data,
+                "entity_id": entity_id,
+                "device_id": device_id,
+                "multiple_ids": multiple_ids,
+                "state": state,
+                "icon": icon,
+                "context_id_bin": context_id_bin,
+                "context_user_id_bin": uuid_hex_to_bytes_or_none(context.user_id),
+                "context_parent_id_bin": context_parent_id_bin,
+                "resolved_context_id_bin": resolved_context_id_bin,
+                "context_origin": context_origin,
+            }
+        )
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            self.hass.loop.call_soon(self._async_flush)
+
+    @callback
+    def _async_flush(self) -> None:
+        """Hand the pending rows to the recorder."""
+        self._flush_scheduled = False
+        get_instance(self.hass).queue_task(LogbookEntriesTask(self._pending))
+        self._pending = []
@@ -2,9 +2,10 @@
 
 from __future__ import annotations
 
-from collections.abc import Callable, Generator, Sequence
+from collections.abc import Callable, Generator, Iterable
 from dataclasses import dataclass
 from datetime import datetime as dt
+from itertools import chain
 import logging
 import time
 from typing import TYPE_CHECKING, Any
@@ -19,6 +20,7 @@ from homeassistant.components.recorder.models import (
     extract_event_type_ids,
     extract_metadata_ids,
     process_timestamp_to_utc_isoformat,
+    ulid_to_bytes_or_none,
 )
 from homeassistant.components.recorder.util import (
     execute_stmt_lambda_element,
@@ -36,8 +38,10 @@ from homeassistant.const import (
 )
 from homeassistant.core import HomeAssistant, split_entity_id
 from homeassistant.helpers import entity_registry as er
+from homeassistant.util.collection import chunked_or_all
 import homeassistant.util.dt as dt_util
 from homeassistant.util.event_type import EventType
+from homeassistant.util.json import json_loads_object
 
 from .const import (
     ATTR_MESSAGE,
@@ -61,7 +65,7 @@ from .const import (
     LOGBOOK_ENTRY_STATE,
     LOGBOOK_ENTRY_WHEN,
 )
-from .helpers import is_sensor_continuous
+from .helpers import is_event_data_filtered, is_sensor_continuous
 from .models import (
     CONTEXT_ID_BIN_POS,
     CONTEXT_ONLY_POS,
@@ -69,6 +73,7 @@ from .models import (
     CONTEXT_POS,
     CONTEXT_USER_ID_BIN_POS,
     ENTITY_ID_POS,
+    EVENT_DATA_POS,
     EVENT_TYPE_POS,
     ICON_POS,
     ROW_ID_POS,
@@ -81,6 +86,7 @@ from .models import (
 )
 from .queries import statement_for_request
 from .queries.common import PSEUDO_EVENT_STATE_CHANGED
+from .queries.index import index_context_stmt, index_multiple_ids_stmt, index_stmt
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -126,6 +132,8 @@ class EventProcessor:
         self.context_id = context_id
         logbook_config: LogbookConfig = hass.data[DOMAIN]
         self.filters: Filters | None = logbook_config.sqlalchemy_filter
+        self.entities_filter = logbook_config.entity_filter
+        self.indexer = logbook_config.indexer
         self.logbook_run = LogbookRun(
             context_lookup={None: None},
             external_events=logbook_config.external_events,
@@ -156,6 +164,12 @@ class EventProcessor:
         end_day: dt,
     ) -> list[dict[str, Any]]:
         """Get events for a period of time."""
+        if (
+            self.indexer
+            and self.indexer.covers(start_day)
+            and (events := self._get_events_from_index(start_day, end_day)) is not None
+        ):
+            return events
         with session_scope(hass=self.hass, read_only=True) as session:
             metadata_ids: list[int] | None = None
             instance = get_instance(self.hass)
@@ -184,8 +198,69 @@ class EventProcessor:
                 execute_stmt_lambda_element(session, stmt, orm_rows=False)
             )
 
+    def _get_events_from_index(
+        self,
+        start_day: dt,
+        end_day: dt,
+    ) -> list[dict[str, Any]] | None:
+        """Get events for a period of time from the logbook index.
+
+        The rows which started the contexts the rows are described by
+        are looked up by their context id and are passed to humanify
+        first, so they are in the context lookup when they are needed.
+
+        Like the logbook queries, the configured filters are only
+        applied when all entities are requested.
+
+        None is returned if entities or devices are requested and there
+        is an event with a list of entity_ids or device_ids in the time
+        range, the index can't match those.
+        """
+        with session_scope(hass=self.hass, read_only=True) as session:
+            if (self.entity_ids or self.device_ids) and session.execute(
+                index_multiple_ids_stmt(
+                    start_day.timestamp(), end_day.timestamp(), self.event_types
+                )
+            ).first():
+                return None
+            rows = list(
+                execute_stmt_lambda_element(
+                    session,
+                    index_stmt(
+                        start_day.timestamp(),
+                        end_day.timestamp(),
+                        self.event_types,
+                        self.entity_ids,
+                        self.device_ids,
+                        ulid_to_bytes_or_none(self.context_id),
+                    ),
+                    orm_rows=False,
+                )
+            )
+            context_rows: dict[bytes, Row] = {}
+            if context_ids_bin := {
+                row.resolved_context_id_bin
+                for row in rows
+                if row.resolved_context_id_bin is not None
+            }:
+                max_bind_vars = get_instance(self.hass).max_bind_vars
+                for context_ids_chunk in chunked_or_all(
+                    list(context_ids_bin), max_bind_vars
+                ):
+                    for row in execute_stmt_lambda_element(
+                        session, index_context_stmt(context_ids_chunk), orm_rows=False
+                    ):
+                        context_rows.setdefault(row[CONTEXT_ID_BIN_POS], row)
+            if (entities_filter := self.entities_filter) and not self.limited_select:
+                return self.humanify(
+                    row
+                    for row in chain(context_rows.values(), rows)
+                    if not _is_row_filtered(entities_filter, row)
+                )
+            return self.humanify(chain(context_rows.values(), rows))
+
     def humanify(
-        self, rows: Generator[EventAsRow] | Sequence[Row] | Result
+        self, rows: Generator[EventAsRow] | Iterable[Row] | Result
     ) -> list[dict[str, str]]:
         """Humanify rows."""
         return list(
@@ -199,9 +274,19 @@ class EventProcessor:
         )
 
 
+def _is_row_filtered(entities_filter: Callable[[str], bool], row: Row) -> bool:
+    """Check if the entities filter excludes a logbook index row."""
+    if row[EVENT_TYPE_POS] is PSEUDO_EVENT_STATE_CHANGED:
+        return not entities_filter(row[ENTITY_ID_POS])
+    return bool(
+        (event_data := row[EVENT_DATA_POS])
+        and is_event_data_filtered(entities_filter, json_loads_object(event_data))
+    )
+
+
 def _humanify(
     hass: HomeAssistant,
-    rows: Generator[EventAsRow] | Sequence[Row] | Result,
+    rows: Generator[EventAsRow] | Iterable[Row] | Result,
     ent_reg: er.EntityRegistry,
     logbook_run: LogbookRun,
     context_augmenter: ContextAugmenter,
@@ -0,0 +1,126 @@
+"""Logbook index queries for logbook."""
+
+from __future__ import annotations
+
+from collections.abc import Collection
+from typing import Any
+
+import sqlalchemy
+from sqlalchemy import lambda_stmt, select
+from sqlalchemy.sql.lambdas import StatementLambdaElement
+from sqlalchemy.sql.selectable import Select
+
+from homeassistant.components.recorder.db_schema import LogbookEntries
+from homeassistant.util.event_type import EventType
+
+from .common import CONTEXT_ONLY, NOT_CONTEXT_ONLY
+
+# The columns must be in the same order as the
+# other logbook queries, see models.py
+LOGBOOK_ENTRIES_COLUMNS = (
+    LogbookEntries.entry_id.label("row_id"),
+    LogbookEntries.event_type.label("event_type"),
+    LogbookEntries.event_data.label("event_data"),
+    LogbookEntries.time_fired_ts.label("time_fired_ts"),
+    LogbookEntries.context_id_bin.label("context_id_bin"),
+    LogbookEntries.context_user_id_bin.label("context_user_id_bin"),
+    LogbookEntries.context_parent_id_bin.label("context_parent_id_bin"),
+    LogbookEntries.state.label("state"),
+    # The entity_id of events is only stored to match
+    # them, the logbook expects it to be NULL for events
+    sqlalchemy.case(
+        (LogbookEntries.event_type.is_(None), LogbookEntries.entity_id)
+    ).label("entity_id"),
+    LogbookEntries.icon.label("icon"),
+)
+
+
+def _select_logbook_entries(
+    start_day: float, end_day: float, event_types: tuple[EventType[Any] | str, ...]
+) -> Select:
+    """Generate a select for the logbook index rows in a time range."""
+    return (
+        select(
+            *LOGBOOK_ENTRIES_COLUMNS,
+            NOT_CONTEXT_ONLY,
+            LogbookEntries.resolved_context_id_bin.label("resolved_context_id_bin"),
+        )
+        .where(
+            (LogbookEntries.time_fired_ts > start_day)
+            & (LogbookEntries.time_fired_ts < end_day)
+        )
+        .where(
+            LogbookEntries.event_type.is_(None)
+            | LogbookEntries.event_type.in_(event_types)
+        )
+    )
+
+
+def index_stmt(
+    start_day: float,
+    end_day: float,
+    event_types: tuple[EventType[Any] | str, ...],
+    entity_ids: Collection[str] | None = None,
+    device_ids: Collection[str] | None = None,
+    context_id_bin: bytes | None = None,
+) -> StatementLambdaElement:
+    """Generate a logbook query for the logbook index.
+
+    The entity_id of an event row was taken from its shared or legacy
+    event data when the row was added, so it matches the entity_id
+    and the legacy entity_id the logbook queries match. The filters
+    configured for the logbook are applied to the rows by the caller.
+    """
+    stmt = lambda_stmt(lambda: _select_logbook_entries(start_day, end_day, event_types))
+    if entity_ids and device_ids:
+        stmt += lambda s: s.where(
+            LogbookEntries.entity_id.in_(entity_ids)
+            | LogbookEntries.device_id.in_(device_ids)
+        )
+    elif entity_ids:
+        stmt += lambda s: s.where(LogbookEntries.entity_id.in_(entity_ids))
+    elif device_ids:
+        stmt += lambda s: s.where(LogbookEntries.device_id.in_(device_ids))
+    elif context_id_bin is not None:
+        stmt += lambda s: s.where(LogbookEntries.context_id_bin == context_id_bin)
+    stmt += lambda s: s.order_by(LogbookEntries.time_fired_ts)
+    return stmt
+
+
+def index_multiple_ids_stmt(
+    start_day: float, end_day: float, event_types: tuple[EventType[Any] | str, ...]
+) -> StatementLambdaElement:
+    """Generate a query for an event with a list of entity_ids or device_ids.
+
+    The index only matches a single entity_id or device_id, so requests
+    for entities or devices can't be answered by the index if there is
+    such an event in the time range.
+    """
+    return lambda_stmt(
+        lambda: select(LogbookEntries.entry_id)
+        .where(LogbookEntries.multiple_ids.is_(True))
+        .where(
+            (LogbookEntries.time_fired_ts > start_day)
+            & (LogbookEntries.time_fired_ts < end_day)
+        )
+        .where(LogbookEntries.event_type.in_(event_types))
+        .limit(1)
+    )
+
+
+def index_context_stmt(context_ids_bin: Collection[bytes]) -> StatementLambdaElement:
+    """Generate a query for the rows which started the contexts.
+
+    The rows are marked as context_only since they are
+    only used to describe the context of other rows.
+    """
+    return lambda_stmt(
+        lambda: select(
+            *LOGBOOK_ENTRIES_COLUMNS,
+            CONTEXT_ONLY,
+            LogbookEntries.resolved_context_id_bin.label("resolved_context_id_bin"),
+        )
+        .where(LogbookEntries.context_id_bin.in_(context_ids_bin))
+        .where(LogbookEntries.context_origin.is_(True))
+        .order_by(LogbookEntries.time_fired_ts)
+    )
@@ -7,6 +7,7 @@ from collections.abc import Callable
 from dataclasses import dataclass
 from datetime import datetime as dt, timedelta
 import logging
+from operator import attrgetter
 from typing import Any
 
 import voluptuous as vol
@@ -230,6 +231,9 @@ async def _async_events_consumer(
         await asyncio.sleep(EVENT_COALESCE_TIME)
         while not stream_queue.empty():
             events.append(stream_queue.get_nowait())
+        # The events are queued in batches per event type
+        # so they have to be put back in the order they were fired
+        events.sort(key=attrgetter("time_fired_timestamp"))
 
         if logbook_events := event_processor.humanify(
             async_event_to_row(e) for e in events
@@ -23,8 +23,12 @@ from homeassistant.const import CONF_SCAN_INTERVAL, CONF_TYPE
 from homeassistant.core import HomeAssistant, ServiceCall, callback
 from homeassistant.exceptions import HomeAssistantError
 import homeassistant.helpers.config_validation as cv
-from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.event import (
+    async_get_template_render_scheduler,
+    async_track_time_interval,
+)
 from homeassistant.helpers.service import async_register_admin_service
+from homeassistant.helpers.storage import async_get_write_stats
 
 from .const import DOMAIN
 
@@ -40,6 +44,8 @@ SERVICE_LOG_THREAD_FRAMES = "log_thread_frames"
 SERVICE_LOG_EVENT_LOOP_SCHEDULED = "log_event_loop_scheduled"
 SERVICE_SET_ASYNCIO_DEBUG = "set_asyncio_debug"
 SERVICE_LOG_CURRENT_TASKS = "log_current_tasks"
+SERVICE_LOG_TEMPLATE_RENDERS = "log_template_renders"
+SERVICE_LOG_STORAGE_WRITES = "log_storage_writes"
 
 _LRU_CACHE_WRAPPER_OBJECT = _lru_cache_wrapper.__name__
 _SQLALCHEMY_LRU_OBJECT = "LRUCache"
@@ -63,15 +69,19 @@ SERVICES = (
     SERVICE_LOG_EVENT_LOOP_SCHEDULED,
     SERVICE_SET_ASYNCIO_DEBUG,
     SERVICE_LOG_CURRENT_TASKS,
+    SERVICE_LOG_TEMPLATE_RENDERS,
+    SERVICE_LOG_STORAGE_WRITES,
 )
 
 DEFAULT_SCAN_INTERVAL = timedelta(seconds=30)
 
 DEFAULT_MAX_OBJECTS = 5
+DEFAULT_MAX_TEMPLATES = 10
 
 CONF_ENABLED = "enabled"
 CONF_SECONDS = "seconds"
 CONF_MAX_OBJECTS = "max_objects"
+CONF_MAX_TEMPLATES = "max_templates"
 
 LOG_INTERVAL_SUB = "log_interval_subscription"
 
@@ -231,6 +241,39 @@ async def async_setup_entry(  # noqa: C901
             notification_id="profile_lru_stats",
         )
 
+    async def _async_dump_template_renders(call: ServiceCall) -> None:
+        """Log the templates which took the most time to render."""
+        stats = async_get_template_render_scheduler(hass).stats.items()
+        for template, template_stats in sorted(
+            stats, key=lambda item: item[1].render_time, reverse=True
+        )[: call.data[CONF_MAX_TEMPLATES]]:
+            _LOGGER.critical(
+                "Template rendered %s times in %.6f seconds: %s",
+                template_stats.renders,
+                template_stats.render_time,
+                template,
+            )
+
+    async def _async_dump_storage_writes(call: ServiceCall) -> None:
+        """Log the statistics of the batched writes of storage files."""
+        if (stats := async_get_write_stats(hass)) is None:
+            raise HomeAssistantError("Storage writes are not batched")
+        _LOGGER.critical(
+            "Storage writes: %s save requests, %s files written (%s bytes, %s"
+            " fsyncs, %s deferred), %s unchanged, write amplification %.2f, %s"
+            " flushes taking %.6f seconds on average and %.6f seconds at most",
+            stats.save_requests,
+            stats.writes,
+            stats.bytes_written,
+            stats.fsyncs,
+            stats.deferred_fsyncs,
+            stats.unchanged,
+            stats.write_amplification,
+            stats.flushes,
+            stats.average_flush_time,
+            stats.max_flush_time,
+        )
+
     async def _async_dump_thread_frames(call: ServiceCall) -> None:
         """Log all thread frames."""
         frames = sys._current_frames()  # noqa: SLF001
@@ -382,6 +425,27 @@ async def async_setup_entry(  # noqa: C901
         _async_dump_current_tasks,
     )
 
+    async_register_admin_service(
+        hass,
+        DOMAIN,
+        SERVICE_LOG_TEMPLATE_RENDERS,
+        _async_dump_template_renders,
+        schema=vol.Schema(
+            {
+                vol.Optional(
+                    CONF_MAX_TEMPLATES, default=DEFAULT_MAX_TEMPLATES
+                ): vol.Range(min=1, max=1024)
+            }
+        ),
+    )
+
+    async_register_admin_service(
+        hass,
+        DOMAIN,
+        SERVICE_LOG_STORAGE_WRITES,
+        _async_dump_storage_writes,
+    )
+
     return True
 
 
@@ -37,7 +37,7 @@ from .const import (  # noqa: F401
     SQLITE_URL_PREFIX,
     SupportedDialect,
 )
-from .core import Recorder
+from .core import MAX_DB_EXECUTOR_WORKERS, MAX_DB_MAX_READERS, Recorder
 from .services import async_register_services
 from .tasks import AddRecorderPlatformTask
 from .util import get_instance
@@ -51,16 +51,24 @@ DEFAULT_DB_INTEGRITY_CHECK = True
 DEFAULT_DB_MAX_RETRIES = 10
 DEFAULT_DB_RETRY_WAIT = 3
 DEFAULT_COMMIT_INTERVAL = 5
+DEFAULT_HOT_TIER_MAX_ROWS = 0
+DEFAULT_PURGE_TIME_BUDGET = 0
+DEFAULT_DB_MAX_READERS = MAX_DB_EXECUTOR_WORKERS
 
 CONF_AUTO_PURGE = "auto_purge"
 CONF_AUTO_REPACK = "auto_repack"
+CONF_BULK_INSERT = "bulk_insert"
+CONF_COMPRESS_ATTRIBUTES = "compress_attributes"
 CONF_DB_URL = "db_url"
 CONF_DB_MAX_RETRIES = "db_max_retries"
 CONF_DB_RETRY_WAIT = "db_retry_wait"
+CONF_DB_MAX_READERS = "db_max_readers"
 CONF_PURGE_KEEP_DAYS = "purge_keep_days"
 CONF_PURGE_INTERVAL = "purge_interval"
+CONF_PURGE_TIME_BUDGET = "purge_time_budget"
 CONF_EVENT_TYPES = "event_types"
 CONF_COMMIT_INTERVAL = "commit_interval"
+CONF_HOT_TIER_MAX_ROWS = "hot_tier_max_rows"
 
 
 EXCLUDE_SCHEMA = INCLUDE_EXCLUDE_FILTER_SCHEMA_INNER.extend(
@@ -96,10 +104,15 @@ CONFIG_SCHEMA = vol.Schema(
                 {
                     vol.Optional(CONF_AUTO_PURGE, default=True): cv.boolean,
                     vol.Optional(CONF_AUTO_REPACK, default=True): cv.boolean,
+                    vol.Optional(CONF_BULK_INSERT, default=False): cv.boolean,
+                    vol.Optional(CONF_COMPRESS_ATTRIBUTES, default=False): cv.boolean,
                     vol.Optional(CONF_PURGE_KEEP_DAYS, default=10): vol.All(
                         vol.Coerce(int), vol.Range(min=1)
                     ),
                     vol.Optional(CONF_PURGE_INTERVAL, default=1): cv.positive_int,
+                    vol.Optional(
+                        CONF_PURGE_TIME_BUDGET, default=DEFAULT_PURGE_TIME_BUDGET
+                    ): cv.positive_int,
                     vol.Optional(CONF_DB_URL): vol.All(cv.string, validate_db_url),
                     vol.Optional(
                         CONF_COMMIT_INTERVAL, default=DEFAULT_COMMIT_INTERVAL
@@ -110,9 +123,17 @@ CONFIG_SCHEMA = vol.Schema(
                     vol.Optional(
                         CONF_DB_RETRY_WAIT, default=DEFAULT_DB_RETRY_WAIT
                     ): cv.positive_int,
+                    vol.Optional(
+                        CONF_DB_MAX_READERS, default=DEFAULT_DB_MAX_READERS
+                    ): vol.All(
+                        vol.Coerce(int), vol.Range(min=1, max=MAX_DB_MAX_READERS)
+                    ),
                     vol.Optional(
                         CONF_DB_INTEGRITY_CHECK, default=DEFAULT_DB_INTEGRITY_CHECK
                     ): cv.boolean,
+                    vol.Optional(
+                        CONF_HOT_TIER_MAX_ROWS, default=DEFAULT_HOT_TIER_MAX_ROWS
+                    ): cv.positive_int,
                 }
             ),
         )
@@ -142,6 +163,11 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     commit_interval = conf[CONF_COMMIT_INTERVAL]
     db_max_retries = conf[CONF_DB_MAX_RETRIES]
     db_retry_wait = conf[CONF_DB_RETRY_WAIT]
+    hot_tier_max_rows = conf[CONF_HOT_TIER_MAX_ROWS]
+    bulk_insert = conf[CONF_BULK_INSERT]
+    purge_time_budget = conf[CONF_PURGE_TIME_BUDGET]
+    db_max_readers = conf[CONF_DB_MAX_READERS]
+    compress_attributes = conf[CONF_COMPRESS_ATTRIBUTES]
     db_url = conf.get(CONF_DB_URL) or DEFAULT_URL.format(
         hass_config_path=hass.config.path(DEFAULT_DB_FILE)
     )
@@ -163,6 +189,11 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
         db_retry_wait=db_retry_wait,
         entity_filter=entity_filter,
         exclude_event_types=exclude_event_types,
+        hot_tier_max_rows=hot_tier_max_rows,
+        bulk_insert=bulk_insert,
+        purge_time_budget=purge_time_budget,
+        db_max_readers=db_max_readers,
+        compress_attributes=compress_attributes,
     )
     get_instance.cache_clear()
     instance.async_initialize()
@@ -0,0 +1,311 @@
+"""Bulk writer for the states and events tables."""
+
+from __future__ import annotations
+
+from itertools import groupby
+from operator import attrgetter
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy import insert
+from sqlalchemy.orm.session import Session, SessionTransaction
+
+from homeassistant.core import Event, EventStateChangedData
+
+from .db_schema import (
+    EventData,
+    Events,
+    EventTypes,
+    StateAttributes,
+    States,
+    StatesMeta,
+)
+from .models import ulid_to_bytes_or_none, uuid_hex_to_bytes_or_none
+
+if TYPE_CHECKING:
+    from .table_managers.states import StatesManager
+
+
+class PendingState:
+    """A row for the states table that has not been written yet.
+
+    The states_meta and state_attributes are only set when they
+    are pending as well since their ids are not known until they
+    have been flushed to the database.
+    """
+
+    __slots__ = (
+        "generation",
+        "old_state",
+        "row",
+        "state_attributes",
+        "state_id",
+        "states_meta",
+    )
+
+    def __init__(self, row: dict[str, Any]) -> None:
+        """Initialize the pending state."""
+        self.row = row
+        self.old_state: PendingState | States | None = None
+        self.states_meta: StatesMeta | None = None
+        self.state_attributes: StateAttributes | None = None
+        self.state_id: int | None = None
+        # The generation is the number of pending states that
+        # have to be written before this one so its old_state_id
+        # can be resolved.
+        self.generation = 0
+
+    @property
+    def state(self) -> str | None:
+        """Return the state."""
+        return self.row["state"]  # type: ignore[no-any-return]
+
+    @property
+    def metadata_id(self) -> int | None:
+        """Return the metadata_id."""
+        return self.row["metadata_id"]  # type: ignore[no-any-return]
+
+    @property
+    def attributes_id(self) -> int | None:
+        """Return the attributes_id."""
+        return self.row["attributes_id"]  # type: ignore[no-any-return]
+
+    @property
+    def last_updated_ts(self) -> float | None:
+        """Return the last_updated_ts."""
+        return self.row["last_updated_ts"]  # type: ignore[no-any-return]
+
+    @property
+    def last_changed_ts(self) -> float | None:
+        """Return the last_changed_ts."""
+        return self.row["last_changed_ts"]  # type: ignore[no-any-return]
+
+    @property
+    def last_reported_ts(self) -> float | None:
+        """Return the last_reported_ts."""
+        return self.row["last_reported_ts"]  # type: ignore[no-any-return]
+
+    @last_reported_ts.setter
+    def last_reported_ts(self, last_reported_ts: float | None) -> None:
+        """Set the last_reported_ts."""
+        self.row["last_reported_ts"] = last_reported_ts
+
+    def link_old_state(self, old_state: PendingState | States) -> None:
+        """Link the pending state that was recorded before this one.
+
+        States added to the session are flushed before any pending
+        state is written so they do not need a later generation.
+        """
+        self.old_state = old_state
+        if type(old_state) is PendingState:
+            self.generation = old_state.generation + 1
+
+
+class PendingEvent:
+    """A row for the events table that has not been written yet."""
+
+    __slots__ = ("event_data", "event_type", "row")
+
+    def __init__(self, row: dict[str, Any]) -> None:
+        """Initialize the pending event."""
+        self.row = row
+        self.event_type: EventTypes | None = None
+        self.event_data: EventData | None = None
+
+
+def state_row_from_event(event: Event[EventStateChangedData]) -> dict[str, Any]:
+    """Create a states table row from a state_changed event.
+
+    This is the plain row equivalent of States.from_event.
+    """
+    state = event.data["new_state"]
+    # None state means the state was removed from the state machine
+    if state is None:
+        state_value: str | None = None
+        last_updated_ts = event.time_fired_timestamp
+        last_changed_ts = None
+        last_reported_ts = None
+    else:
+        state_value = state.state
+        last_updated_ts = state.last_updated_timestamp
+        if state.last_updated == state.last_changed:
+            last_changed_ts = None
+        else:
+            last_changed_ts = state.last_changed_timestamp
+        if state.last_updated == state.last_reported:
+            last_reported_ts = None
+        else:
+            last_reported_ts = state.last_reported_timestamp
+    context = event.context
+    return {
+        "state": state_value,
+        "metadata_id": None,
+        "attributes_id": None,
+        "old_state_id": None,
+        "context_id_bin": ulid_to_bytes_or_none(context.id),
+        "context_user_id_bin": uuid_hex_to_bytes_or_none(context.user_id),
+        "context_parent_id_bin": ulid_to_bytes_or_none(context.parent_id),
+        "origin_idx": event.origin.idx,
+        "last_updated_ts": last_updated_ts,
+        "last_changed_ts": last_changed_ts,
+        "last_reported_ts": last_reported_ts,
+    }
+
+
+def event_row_from_event(event: Event) -> dict[str, Any]:
+    """Create an events table row from an event.
+
+    This is the plain row equivalent of Events.from_event.
+    """
+    context = event.context
+    return {
+        "event_type_id": None,
+        "data_id": None,
+        "origin_idx": event.origin.idx,
+        "time_fired_ts": event.time_fired_timestamp,
+        "context_id_bin": ulid_to_bytes_or_none(context.id),
+        "context_user_id_bin": uuid_hex_to_bytes_or_none(context.user_id),
+        "context_parent_id_bin": ulid_to_bytes_or_none(context.parent_id),
+    }
+
+
+class BulkWriter:
+    """Accumulate states and events rows and write them in bulk.
+
+    Instead of adding an ORM object to the session for every event,
+    the rows are kept as plain dicts and written with one multi-row
+    INSERT per table at commit time. The rows of the deduplicated
+    tables (states_meta, state_attributes, event_types, event_data)
+    are still added to the session as ORM objects by their table
+    managers and are flushed first so their ids can be filled in.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the bulk writer."""
+        self._states: list[PendingState] = []
+        self._events: list[PendingEvent] = []
+        self._pending: dict[str, PendingState] = {}
+        # The transaction the rows are written in, the rows have to
+        # be written again if it was rolled back before the commit
+        self._transaction: SessionTransaction | None = None
+        self._events_written = False
+        self.written_states = 0
+        self.written_events = 0
+
+    def pop_pending(self, entity_id: str) -> PendingState | None:
+        """Pop the last pending state for an entity_id.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        return self._pending.pop(entity_id, None)
+
+    def add_state(
+        self, entity_id: str, pending_state: PendingState, entity_removed: bool
+    ) -> None:
+        """Add a pending state.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        self._states.append(pending_state)
+        if not entity_removed:
+            self._pending[entity_id] = pending_state
+
+    def add_event(self, pending_event: PendingEvent) -> None:
+        """Add a pending event.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        self._events.append(pending_event)
+
+    def write(self, session: Session) -> None:
+        """Write the pending rows.
+
+        The session is flushed first to assign ids to the pending
+        rows of the deduplicated tables. The states are written in
+        generations since a state can only be linked to its old state
+        once the old state has been assigned a state_id.
+
+        If the commit failed and the write is retried, the rows already
+        written in the same transaction are not written again. If the
+        transaction was rolled back, all rows are written again.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        session.flush()
+        session.connection()
+        if (transaction := session.get_transaction()) is not self._transaction:
+            self._forget_written()
+            self._transaction = transaction
+        if states := self._states:
+            stmt = insert(States).returning(
+                States.state_id, sort_by_parameter_order=True
+            )
+            states.sort(key=attrgetter("generation"))
+            for _, generation_iter in groupby(states, attrgetter("generation")):
+                generation = list(generation_iter)
+                if generation[0].state_id is not None:
+                    continue
+                rows: list[dict[str, Any]] = []
+                for pending_state in generation:
+                    row = pending_state.row
+                    if old_state := pending_state.old_state:
+                        row["old_state_id"] = old_state.state_id
+                    if states_meta := pending_state.states_meta:
+                        row["metadata_id"] = states_meta.metadata_id
+                    if state_attributes := pending_state.state_attributes:
+                        row["attributes_id"] = state_attributes.attributes_id
+                    rows.append(row)
+                for pending_state, state_id in zip(
+                    generation, session.scalars(stmt, rows), strict=True
+                ):
+                    pending_state.state_id = state_id
+        if (events := self._events) and not self._events_written:
+            rows = []
+            for pending_event in events:
+                row = pending_event.row
+                if event_type := pending_event.event_type:
+                    row["event_type_id"] = event_type.event_type_id
+                if event_data := pending_event.event_data:
+                    row["data_id"] = event_data.data_id
+                rows.append(row)
+            session.execute(insert(Events), rows)
+            self._events_written = True
+
+    def _forget_written(self) -> None:
+        """Forget the state_ids assigned in a transaction that was rolled back."""
+        for pending_state in self._states:
+            pending_state.state_id = None
+        self._events_written = False
+
+    def post_commit_pending(self, states_manager: StatesManager) -> list[PendingState]:
+        """Call after commit to hand the new state_ids to the states manager.
+
+        Returns the states that were written.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        for entity_id, pending_state in self._pending.items():
+            if TYPE_CHECKING:
+                assert pending_state.state_id is not None
+            states_manager.add_committed(entity_id, pending_state.state_id)
+        written = self._states
+        self.written_states += len(written)
+        self.written_events += len(self._events)
+        self.reset()
+        return written
+
+    def reset(self) -> None:
+        """Reset after the database has been reset or changed.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        self._states = []
+        self._events = []
+        self._pending.clear()
+        self._transaction = None
+        self._events_written = False
@@ -54,6 +54,10 @@ ATTR_APPLY_FILTER = "apply_filter"
 
 KEEPALIVE_TIME = 30
 
+PURGE_PROGRESS_STORAGE_KEY = f"{DOMAIN}.purge_progress"
+PURGE_PROGRESS_STORAGE_VERSION = 1
+PURGE_PROGRESS_SAVE_DELAY = 30
+
 CONTEXT_ID_AS_BINARY_SCHEMA_VERSION = 36
 EVENT_TYPE_IDS_SCHEMA_VERSION = 37
 STATES_META_SCHEMA_VERSION = 38
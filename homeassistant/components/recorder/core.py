@@ -16,12 +16,19 @@ from typing import TYPE_CHECKING, Any, cast
 
 from propcache import cached_property
 import psutil_home_assistant as ha_psutil
-from sqlalchemy import create_engine, event as sqlalchemy_event, exc, select, update
+from sqlalchemy import (
+    create_engine,
+    event as sqlalchemy_event,
+    exc,
+    insert,
+    select,
+    update,
+)
 from sqlalchemy.engine import Engine
 from sqlalchemy.engine.interfaces import DBAPIConnection
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import scoped_session, sessionmaker
-from sqlalchemy.orm.session import Session
+from sqlalchemy.orm.session import Session, SessionTransaction
 
 from homeassistant.components import persistent_notification
 from homeassistant.const import (
@@ -44,12 +51,20 @@ from homeassistant.helpers.event import (
     async_track_utc_time_change,
 )
 from homeassistant.helpers.start import async_at_started
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.typing import UNDEFINED, UndefinedType
 import homeassistant.util.dt as dt_util
 from homeassistant.util.enum import try_parse_enum
 from homeassistant.util.event_type import EventType
 
 from . import migration, statistics
+from .bulk_writer import (
+    BulkWriter,
+    PendingEvent,
+    PendingState,
+    event_row_from_event,
+    state_row_from_event,
+)
 from .const import (
     DB_WORKER_PREFIX,
     DOMAIN,
@@ -61,6 +76,9 @@ from .const import (
     MIN_AVAILABLE_MEMORY_FOR_QUEUE_BACKLOG,
     MYSQLDB_PYMYSQL_URL_PREFIX,
     MYSQLDB_URL_PREFIX,
+    PURGE_PROGRESS_SAVE_DELAY,
+    PURGE_PROGRESS_STORAGE_KEY,
+    PURGE_PROGRESS_STORAGE_VERSION,
     SQLITE_MAX_BIND_VARS,
     SQLITE_URL_PREFIX,
     SupportedDialect,
@@ -71,6 +89,7 @@ from .db_schema import (
     EventData,
     Events,
     EventTypes,
+    LogbookEntries,
     StateAttributes,
     States,
     StatesMeta,
@@ -78,8 +97,10 @@ from .db_schema import (
     StatisticsShortTerm,
 )
 from .executor import DBInterruptibleThreadPoolExecutor
+from .history.hot_tier import HistoryHotTier
 from .models import DatabaseEngine, StatisticData, StatisticMetaData, UnsupportedDialect
 from .pool import POOL_SIZE, MutexPool, RecorderPool
+from .purge import PurgeProgress
 from .table_managers.event_data import EventDataManager
 from .table_managers.event_types import EventTypeManager
 from .table_managers.recorder_runs import RecorderRunsManager
@@ -100,6 +121,7 @@ from .tasks import (
     PerodicCleanupTask,
     PurgeTask,
     RecorderTask,
+    ResumePurgeTask,
     StatisticsTask,
     StopTask,
     SynchronizeTask,
@@ -145,6 +167,7 @@ CONNECTIVITY_ERR = "Error in database connectivity during commit"
 
 # Pool size must accommodate Recorder thread + All db executors
 MAX_DB_EXECUTOR_WORKERS = POOL_SIZE - 1
+MAX_DB_MAX_READERS = 32
 
 
 class Recorder(threading.Thread):
@@ -164,6 +187,11 @@ class Recorder(threading.Thread):
         db_retry_wait: int,
         entity_filter: Callable[[str], bool] | None,
         exclude_event_types: set[EventType[Any] | str],
+        hot_tier_max_rows: int = 0,
+        bulk_insert: bool = False,
+        purge_time_budget: int = 0,
+        db_max_readers: int = MAX_DB_EXECUTOR_WORKERS,
+        compress_attributes: bool = False,
     ) -> None:
         """Initialize the recorder."""
         threading.Thread.__init__(self, name="Recorder")
@@ -181,6 +209,10 @@ class Recorder(threading.Thread):
         self.db_url = uri
         self.db_max_retries = db_max_retries
         self.db_retry_wait = db_retry_wait
+        # Reads run in the db executor while all writes are done by
+        # the recorder thread, each of them has its own connection.
+        self.db_max_readers = db_max_readers
+        self.compress_attributes = compress_attributes
         self.database_engine: DatabaseEngine | None = None
         # Database connection is ready, but non-live migration may be in progress
         db_connected: asyncio.Future[bool] = hass.data[DOMAIN].db_connected
@@ -211,6 +243,29 @@ class Recorder(threading.Thread):
         self.states_meta_manager = StatesMetaManager(self)
         self.state_attributes_manager = StateAttributesManager(self)
         self.statistics_meta_manager = StatisticsMetaManager(self)
+        # The history hot tier is opt-in as it trades memory for
+        # answering recent history queries without the database.
+        self.history_hot_tier = (
+            HistoryHotTier(hot_tier_max_rows) if hot_tier_max_rows else None
+        )
+        # When bulk inserts are enabled, states and events are written
+        # with multi-row INSERT statements instead of the unit of work.
+        self.bulk_writer = BulkWriter() if bulk_insert else None
+        # With a purge time budget, the purge stops after the budget
+        # in milliseconds is used up so the queue can be processed
+        # before it continues, and its progress survives a restart.
+        self.purge_time_budget = purge_time_budget / 1000 if purge_time_budget else None
+        self.purge_progress: PurgeProgress | None = None
+        # Rows for the logbook index, written with the next commit, and
+        # the transaction and number of the rows already written in it
+        self._pending_logbook_entries: list[dict[str, Any]] = []
+        self._written_logbook_entries: tuple[SessionTransaction | None, int] = (
+            None,
+            0,
+        )
+        self._purge_progress_store: Store[dict[str, Any]] = Store(
+            hass, PURGE_PROGRESS_STORAGE_VERSION, PURGE_PROGRESS_STORAGE_KEY
+        )
 
         self.event_session: Session | None = None
         self._get_session: Callable[[], Session] | None = None
@@ -279,7 +334,7 @@ class Recorder(threading.Thread):
         self._db_executor = DBInterruptibleThreadPoolExecutor(
             self.recorder_and_worker_thread_ids,
             thread_name_prefix=DB_WORKER_PREFIX,
-            max_workers=MAX_DB_EXECUTOR_WORKERS,
+            max_workers=self.db_max_readers,
             shutdown_hook=self._shutdown_pool,
         )
 
@@ -643,6 +698,11 @@ class Recorder(threading.Thread):
                 name="Recorder commit",
             )
 
+        if self.auto_purge and self.purge_time_budget:
+            self.hass.async_create_background_task(
+                self._async_resume_purge(), "recorder resume purge"
+            )
+
         # Run nightly tasks at 4:12am
         self._nightly_listener = async_track_time_change(
             self.hass, self.async_nightly_tasks, hour=4, minute=12, second=0
@@ -653,6 +713,32 @@ class Recorder(threading.Thread):
             self.hass, self._async_five_minute_tasks, minute=range(0, 60, 5), second=10
         )
 
+    async def _async_resume_purge(self) -> None:
+        """Resume a purge that did not finish before the last shutdown."""
+        if (data := await self._purge_progress_store.async_load()) and (
+            progress := PurgeProgress.from_dict(data)
+        ):
+            _LOGGER.debug("Resuming purge before %s", progress.purge_before.isoformat())
+            self.queue_task(ResumePurgeTask(progress))
+
+    def save_purge_progress(self) -> None:
+        """Save the progress of the running purge or remove it if it finished.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        if progress := self.purge_progress:
+            self.hass.add_job(self._async_save_purge_progress, progress.as_dict())
+        else:
+            self.hass.add_job(self._purge_progress_store.async_remove)
+
+    @callback
+    def _async_save_purge_progress(self, data: dict[str, Any]) -> None:
+        """Save the progress of the running purge."""
+        self._purge_progress_store.async_delay_save(
+            lambda: data, PURGE_PROGRESS_SAVE_DELAY
+        )
+
     async def _async_wait_for_started(self) -> object | None:
         """Wait for the hass started future."""
         return await self._hass_started
@@ -685,6 +771,19 @@ class Recorder(threading.Thread):
             self.is_running = False
             self._shutdown()
 
+    def add_logbook_entries(self, entries: list[dict[str, Any]]) -> None:
+        """Add rows to the logbook index to be written with the next commit.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        if not self.enabled:
+            return
+        self._event_session_has_pending_writes = True
+        self._pending_logbook_entries.extend(entries)
+        if not self.commit_interval:
+            self._commit_event_session_or_retry()
+
     def _add_to_session(self, session: Session, obj: object) -> None:
         """Add an object to the session."""
         self._event_session_has_pending_writes = True
@@ -1010,7 +1109,12 @@ class Recorder(threading.Thread):
         if not self.enabled:
             return
         if event.event_type == EVENT_STATE_CHANGED:
-            self._process_state_changed_event_into_session(event)
+            if self.bulk_writer is not None and self.states_meta_manager.active:
+                self._process_state_changed_event_into_bulk_writer(event)
+            else:
+                self._process_state_changed_event_into_session(event)
+        elif self.bulk_writer is not None and self.event_type_manager.active:
+            self._process_non_state_changed_event_into_bulk_writer(event)
         else:
             self._process_non_state_changed_event_into_session(event)
         # Commit if the commit interval is zero
@@ -1145,6 +1249,146 @@ class Recorder(threading.Thread):
             dbstate.state_attributes = dbstate_attributes
 
         self._add_to_session(session, dbstate)
+        if self.history_hot_tier and states_meta_manager.active:
+            self.history_hot_tier.add_pending(dbstate, shared_attrs)
+
+    def _process_non_state_changed_event_into_bulk_writer(self, event: Event) -> None:
+        """Process any event into the bulk writer except state changed.
+
+        Only the new event_types and event_data rows are added
+        to the session, the event row is written in bulk.
+        """
+        session = self.event_session
+        assert session is not None
+        assert self.bulk_writer is not None
+        pending_event = PendingEvent(event_row_from_event(event))
+        row = pending_event.row
+
+        # Map the event_type to the EventTypes table
+        event_type_manager = self.event_type_manager
+        if pending_event_types := event_type_manager.get_pending(event.event_type):
+            pending_event.event_type = pending_event_types
+        elif event_type_id := event_type_manager.get(event.event_type, session, True):
+            row["event_type_id"] = event_type_id
+        else:
+            event_types = EventTypes(event_type=event.event_type)
+            event_type_manager.add_pending(event_types)
+            self._add_to_session(session, event_types)
+            pending_event.event_type = event_types
+
+        if event.data:
+            event_data_manager = self.event_data_manager
+            if not (
+                shared_data_bytes := event_data_manager.serialize_from_event(event)
+            ):
+                return
+            # Map the event data to the EventData table
+            shared_data = shared_data_bytes.decode("utf-8")
+            # Matching attributes found in the pending commit
+            if pending_event_data := event_data_manager.get_pending(shared_data):
+                pending_event.event_data = pending_event_data
+            # Matching attributes id found in the cache
+            elif (data_id := event_data_manager.get_from_cache(shared_data)) or (
+                (hash_ := EventData.hash_shared_data_bytes(shared_data_bytes))
+                and (data_id := event_data_manager.get(shared_data, hash_, session))
+            ):
+                row["data_id"] = data_id
+            else:
+                # No matching attributes found, save them in the DB
+                dbevent_data = EventData(shared_data=shared_data, hash=hash_)
+                event_data_manager.add_pending(dbevent_data)
+                self._add_to_session(session, dbevent_data)
+                pending_event.event_data = dbevent_data
+
+        self._event_session_has_pending_writes = True
+        self.bulk_writer.add_event(pending_event)
+
+    def _process_state_changed_event_into_bulk_writer(
+        self, event: Event[EventStateChangedData]
+    ) -> None:
+        """Process a state_changed event into the bulk writer.
+
+        Only the new states_meta and state_attributes rows are added
+        to the session, the state row is written in bulk.
+        """
+        bulk_writer = self.bulk_writer
+        assert bulk_writer is not None
+        state_attributes_manager = self.state_attributes_manager
+        states_meta_manager = self.states_meta_manager
+        entity_removed = not event.data.get("new_state")
+        entity_id = event.data["entity_id"]
+
+        pending_state = PendingState(state_row_from_event(event))
+        row = pending_state.row
+        old_state = event.data["old_state"]
+
+        assert self.event_session is not None
+        session = self.event_session
+
+        states_manager = self.states_manager
+        if previous_state := (
+            bulk_writer.pop_pending(entity_id) or states_manager.pop_pending(entity_id)
+        ):
+            pending_state.link_old_state(previous_state)
+            if old_state:
+                previous_state.last_reported_ts = old_state.last_reported_timestamp
+        elif old_state_id := states_manager.pop_committed(entity_id):
+            row["old_state_id"] = old_state_id
+            if old_state:
+                states_manager.update_pending_last_reported(
+                    old_state_id, old_state.last_reported_timestamp
+                )
+
+        if entity_id is None or not (
+            shared_attrs_bytes := state_attributes_manager.serialize_from_event(event)
+        ):
+            return
+
+        # Map the entity_id to the StatesMeta table
+        if pending_states_meta := states_meta_manager.get_pending(entity_id):
+            pending_state.states_meta = pending_states_meta
+        elif metadata_id := states_meta_manager.get(entity_id, session, True):
+            row["metadata_id"] = metadata_id
+        elif entity_removed:
+            # If the entity was removed, we don't need to add it to the
+            # StatesMeta table or record it in the pending commit
+            # if it does not have a metadata_id allocated to it as
+            # it either never existed or was just renamed.
+            return
+        else:
+            states_meta = StatesMeta(entity_id=entity_id)
+            states_meta_manager.add_pending(states_meta)
+            self._add_to_session(session, states_meta)
+            pending_state.states_meta = states_meta
+
+        # Map the event data to the StateAttributes table
+        shared_attrs = shared_attrs_bytes.decode("utf-8")
+        # Matching attributes found in the pending commit
+        if pending_event_data := state_attributes_manager.get_pending(shared_attrs):
+            pending_state.state_attributes = pending_event_data
+        # Matching attributes id found in the cache
+        elif (
+            attributes_id := state_attributes_manager.get_from_cache(shared_attrs)
+        ) or (
+            (hash_ := StateAttributes.hash_shared_attrs_bytes(shared_attrs_bytes))
+            and (
+                attributes_id := state_attributes_manager.get(
+                    shared_attrs, hash_, session
+                )
+            )
+        ):
+            row["attributes_id"] = attributes_id
+        else:
+            # No matching attributes found, save them in the DB
+            dbstate_attributes = StateAttributes(shared_attrs=shared_attrs, hash=hash_)
+            state_attributes_manager.add_pending(dbstate_attributes)
+            self._add_to_session(session, dbstate_attributes)
+            pending_state.state_attributes = dbstate_attributes
+
+        self._event_session_has_pending_writes = True
+        bulk_writer.add_state(entity_id, pending_state, entity_removed)
+        if self.history_hot_tier:
+            self.history_hot_tier.add_pending(pending_state, shared_attrs)
 
     def _handle_database_error(self, err: Exception, *, setup_run: bool) -> bool:
         """Handle a database error that may result in moving away the corrupt db."""
@@ -1192,6 +1436,20 @@ class Recorder(threading.Thread):
         session = self.event_session
         self._commits_without_expire += 1
 
+        if self.bulk_writer is not None:
+            self.bulk_writer.write(session)
+        if logbook_entries := self._pending_logbook_entries:
+            # The rows are kept until the commit succeeds. When the commit
+            # is retried, the rows already written in the same transaction
+            # are not written again.
+            session.connection()
+            transaction = session.get_transaction()
+            written_transaction, written = self._written_logbook_entries
+            if transaction is not written_transaction:
+                written = 0
+            if written < len(logbook_entries):
+                session.execute(insert(LogbookEntries), logbook_entries[written:])
+                self._written_logbook_entries = (transaction, len(logbook_entries))
         if (
             pending_last_reported
             := self.states_manager.get_pending_last_reported_timestamp()
@@ -1210,6 +1468,8 @@ class Recorder(threading.Thread):
         session.commit()
 
         self._event_session_has_pending_writes = False
+        self._pending_logbook_entries = []
+        self._written_logbook_entries = (None, 0)
         # We just committed the state attributes to the database
         # and we now know the attributes_ids.  We can save
         # many selects for matching attributes by loading them
@@ -1219,6 +1479,10 @@ class Recorder(threading.Thread):
         self.event_data_manager.post_commit_pending()
         self.event_type_manager.post_commit_pending()
         self.states_meta_manager.post_commit_pending()
+        if self.bulk_writer is not None:
+            self.bulk_writer.post_commit_pending(self.states_manager)
+        if self.history_hot_tier:
+            self.history_hot_tier.post_commit_pending()
 
         # Expire is an expensive operation (frequently more expensive
         # than the flush and commit itself) so we only
@@ -1247,6 +1511,12 @@ class Recorder(threading.Thread):
         self.event_type_manager.reset()
         self.states_meta_manager.reset()
         self.statistics_meta_manager.reset()
+        if self.history_hot_tier:
+            self.history_hot_tier.reset()
+        if self.bulk_writer is not None:
+            self.bulk_writer.reset()
+        self._pending_logbook_entries = []
+        self._written_logbook_entries = (None, 0)
 
         if not self.event_session:
             return
@@ -1376,6 +1646,7 @@ class Recorder(threading.Thread):
             kwargs["recorder_and_worker_thread_ids"] = (
                 self.recorder_and_worker_thread_ids
             )
+            kwargs["pool_size"] = self.db_max_readers + 1
         elif self.db_url.startswith(
             (
                 MARIADB_URL_PREFIX,
@@ -1397,6 +1668,11 @@ class Recorder(threading.Thread):
         # Disable extended logging for non SQLite databases
         if not self.db_url.startswith(SQLITE_URL_PREFIX):
             kwargs["echo"] = False
+            # The default pool of the server databases has a connection for
+            # the recorder thread and every db executor worker unless the
+            # number of workers has been changed
+            if self.db_max_readers != MAX_DB_EXECUTOR_WORKERS:
+                kwargs["pool_size"] = self.db_max_readers + 1
 
         if self._using_file_sqlite:
             validate_or_move_away_sqlite_database(self.db_url)
@@ -1409,6 +1685,15 @@ class Recorder(threading.Thread):
 
         migration.pre_migrate_schema(self.engine)
         Base.metadata.create_all(self.engine)
+        if (
+            self.bulk_writer is not None
+            and not self.engine.dialect.insert_executemany_returning_sort_by_parameter_order
+        ):
+            _LOGGER.warning(
+                "The database does not support multi-row inserts returning ids, "
+                "bulk inserts are disabled"
+            )
+            self.bulk_writer = None
         self._get_session = scoped_session(sessionmaker(bind=self.engine, future=True))
         _LOGGER.debug("Connected to recorder database")
 
@@ -7,6 +7,7 @@ from datetime import datetime, timedelta
 import logging
 import time
 from typing import Any, Self, cast
+import zlib
 
 import ciso8601
 from fnv_hash_fast import fnv1a_32
@@ -56,12 +57,15 @@ from homeassistant.util.json import (
 
 from .const import ALL_DOMAIN_EXCLUDE_ATTRS, SupportedDialect
 from .models import (
+    COMPRESSED_ATTRS_PREFIX,
     StatisticData,
     StatisticDataTimestamp,
     StatisticMetaData,
     bytes_to_ulid_or_none,
     bytes_to_uuid_hex_or_none,
+    compress_shared_attrs,
     datetime_to_timestamp_or_none,
+    decompress_shared_attrs,
     process_timestamp,
     ulid_to_bytes_or_none,
     uuid_hex_to_bytes_or_none,
@@ -77,7 +81,7 @@ class LegacyBase(DeclarativeBase):
     """Base class for tables, used for schema migration."""
 
 
-SCHEMA_VERSION = 47
+SCHEMA_VERSION = 48
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -94,6 +98,7 @@ TABLE_STATISTICS_META = "statistics_meta"
 TABLE_STATISTICS_RUNS = "statistics_runs"
 TABLE_STATISTICS_SHORT_TERM = "statistics_short_term"
 TABLE_MIGRATION_CHANGES = "migration_changes"
+TABLE_LOGBOOK_ENTRIES = "logbook_entries"
 
 STATISTICS_TABLES = ("statistics", "statistics_short_term")
 
@@ -116,6 +121,7 @@ ALL_TABLES = [
     TABLE_STATISTICS_META,
     TABLE_STATISTICS_RUNS,
     TABLE_STATISTICS_SHORT_TERM,
+    TABLE_LOGBOOK_ENTRIES,
 ]
 
 TABLES_TO_CHECK = [
@@ -130,6 +136,16 @@ METADATA_ID_LAST_UPDATED_INDEX_TS = "ix_states_metadata_id_last_updated_ts"
 EVENTS_CONTEXT_ID_BIN_INDEX = "ix_events_context_id_bin"
 STATES_CONTEXT_ID_BIN_INDEX = "ix_states_context_id_bin"
 LEGACY_STATES_EVENT_ID_INDEX = "ix_states_event_id"
+LOGBOOK_ENTRIES_CONTEXT_ID_BIN_INDEX = "ix_logbook_entries_context_id_bin"
+LOGBOOK_ENTRIES_ENTITY_ID_TIME_FIRED_TS_INDEX = (
+    "ix_logbook_entries_entity_id_time_fired_ts"
+)
+LOGBOOK_ENTRIES_DEVICE_ID_TIME_FIRED_TS_INDEX = (
+    "ix_logbook_entries_device_id_time_fired_ts"
+)
+LOGBOOK_ENTRIES_MULTIPLE_IDS_TIME_FIRED_TS_INDEX = (
+    "ix_logbook_entries_multiple_ids_time_fired_ts"
+)
 LEGACY_STATES_ENTITY_ID_LAST_UPDATED_INDEX = "ix_states_entity_id_last_updated_ts"
 CONTEXT_ID_BIN_MAX_LENGTH = 16
 
@@ -598,6 +614,7 @@ class StateAttributes(Base):
     def shared_attrs_bytes_from_event(
         event: Event[EventStateChangedData],
         dialect: SupportedDialect | None,
+        compress: bool = False,
     ) -> bytes:
         """Create shared_attrs from a state_changed event."""
         # None state means the state was removed from the state machine
@@ -617,9 +634,10 @@ class StateAttributes(Base):
         else:
             exclude_attrs = ALL_DOMAIN_EXCLUDE_ATTRS
         encoder = json_bytes_strip_null if dialect == PSQL_DIALECT else json_bytes
-        bytes_result = encoder(
-            {k: v for k, v in state.attributes.items() if k not in exclude_attrs}
-        )
+        attributes = {
+            k: v for k, v in state.attributes.items() if k not in exclude_attrs
+        }
+        bytes_result = encoder(attributes)
         if len(bytes_result) > MAX_STATE_ATTRS_BYTES:
             _LOGGER.warning(
                 "State attributes for %s exceed maximum size of %s bytes. "
@@ -629,6 +647,8 @@ class StateAttributes(Base):
                 MAX_STATE_ATTRS_BYTES,
             )
             return b"{}"
+        if compress:
+            return compress_shared_attrs(bytes_result, attributes, encoder)
         return bytes_result
 
     @staticmethod
@@ -642,9 +662,13 @@ class StateAttributes(Base):
         if shared_attrs is None:
             return {}
         try:
+            if type(shared_attrs) is str and shared_attrs.startswith(
+                COMPRESSED_ATTRS_PREFIX
+            ):
+                shared_attrs = decompress_shared_attrs(shared_attrs)
             return cast(dict[str, Any], json_loads(shared_attrs))
-        except JSON_DECODE_EXCEPTIONS:
-            # When json_loads fails
+        except (*JSON_DECODE_EXCEPTIONS, ValueError, zlib.error):
+            # When json_loads or decompressing fails
             _LOGGER.exception("Error converting row to state attributes: %s", self)
             return {}
 
@@ -668,6 +692,70 @@ class StatesMeta(Base):
         )
 
 
+class LogbookEntries(Base):
+    """Logbook index maintained by the logbook integration.
+
+    Each row is a recorded state change or event the logbook can show,
+    with the columns of the logbook queries already resolved. The
+    resolved context is the context the logbook describes the row with,
+    which is the context of the row unless the row started it, in which
+    case it is the parent context.
+
+    Events with a list of entity_ids or device_ids are marked with
+    multiple_ids, their entity_id and device_id are NULL.
+    """
+
+    __table_args__ = (
+        Index(
+            LOGBOOK_ENTRIES_ENTITY_ID_TIME_FIRED_TS_INDEX,
+            "entity_id",
+            "time_fired_ts",
+        ),
+        Index(
+            LOGBOOK_ENTRIES_DEVICE_ID_TIME_FIRED_TS_INDEX,
+            "device_id",
+            "time_fired_ts",
+        ),
+        Index(
+            LOGBOOK_ENTRIES_MULTIPLE_IDS_TIME_FIRED_TS_INDEX,
+            "multiple_ids",
+            "time_fired_ts",
+        ),
+        Index(
+            LOGBOOK_ENTRIES_CONTEXT_ID_BIN_INDEX,
+            "context_id_bin",
+            mysql_length=CONTEXT_ID_BIN_MAX_LENGTH,
+            mariadb_length=CONTEXT_ID_BIN_MAX_LENGTH,
+        ),
+        _DEFAULT_TABLE_ARGS,
+    )
+    __tablename__ = TABLE_LOGBOOK_ENTRIES
+    entry_id: Mapped[int] = mapped_column(ID_TYPE, Identity(), primary_key=True)
+    time_fired_ts: Mapped[float | None] = mapped_column(TIMESTAMP_TYPE, index=True)
+    event_type: Mapped[str | None] = mapped_column(String(MAX_LENGTH_EVENT_EVENT_TYPE))
+    event_data: Mapped[str | None] = mapped_column(
+        Text().with_variant(mysql.LONGTEXT, "mysql", "mariadb")
+    )
+    entity_id: Mapped[str | None] = mapped_column(String(MAX_LENGTH_STATE_ENTITY_ID))
+    device_id: Mapped[str | None] = mapped_column(String(MAX_LENGTH_STATE_ENTITY_ID))
+    multiple_ids: Mapped[bool | None] = mapped_column(Boolean)
+    state: Mapped[str | None] = mapped_column(String(MAX_LENGTH_STATE_STATE))
+    icon: Mapped[str | None] = mapped_column(String(MAX_LENGTH_STATE_STATE))
+    context_id_bin: Mapped[bytes | None] = mapped_column(CONTEXT_BINARY_TYPE)
+    context_user_id_bin: Mapped[bytes | None] = mapped_column(CONTEXT_BINARY_TYPE)
+    context_parent_id_bin: Mapped[bytes | None] = mapped_column(CONTEXT_BINARY_TYPE)
+    resolved_context_id_bin: Mapped[bytes | None] = mapped_column(CONTEXT_BINARY_TYPE)
+    context_origin: Mapped[bool | None] = mapped_column(Boolean)
+
+    def __repr__(self) -> str:
+        """Return string representation of instance for debugging."""
+        return (
+            "<recorder.LogbookEntries("
+            f"id={self.entry_id}, event_type='{self.event_type}', "
+            f"entity_id='{self.entity_id}', time_fired_ts={self.time_fired_ts})>"
+        )
+
+
 class StatisticsBase:
     """Statistics base class."""
 
@@ -0,0 +1,307 @@
+"""In-memory columnar hot tier for recent state history."""
+
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import namedtuple
+from collections.abc import Iterable
+from functools import lru_cache
+import sys
+import threading
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from ..bulk_writer import PendingState
+    from ..db_schema import States
+
+# Attribute ids are allocated by the database starting at 1
+# so 0 can be used to mark a row without attributes.
+_NO_ATTRIBUTES_ID = 0
+
+
+@lru_cache(maxsize=4)
+def _row_type(include_last_changed: bool, include_attributes: bool) -> type[tuple]:
+    """Return a row type with the same columns as the history queries."""
+    fields = ["metadata_id", "state", "last_updated_ts"]
+    if include_last_changed:
+        fields.append("last_changed_ts")
+    if include_attributes:
+        fields.append("attributes")
+    return namedtuple("HotTierRow", fields)  # noqa: PYI024
+
+
+class _StateColumns:
+    """Columnar storage of the recent states for a single metadata_id.
+
+    Rows are stored in last_updated_ts order. Every row in the
+    database with a last_updated_ts greater or equal to the first
+    row held in the columns is also held in the columns.
+    """
+
+    __slots__ = ("attributes_ids", "last_changed_ts", "last_updated_ts", "states")
+
+    def __init__(self) -> None:
+        """Initialize the columns."""
+        self.last_updated_ts = array("d")
+        self.last_changed_ts = array("d")
+        self.states: list[str | None] = []
+        self.attributes_ids = array("q")
+
+    def __len__(self) -> int:
+        """Return the number of rows."""
+        return len(self.states)
+
+    def append(
+        self,
+        state: str | None,
+        last_updated_ts: float,
+        last_changed_ts: float | None,
+        attributes_id: int,
+    ) -> None:
+        """Append a row."""
+        self.last_updated_ts.append(last_updated_ts)
+        self.last_changed_ts.append(last_changed_ts or 0.0)
+        self.states.append(state)
+        self.attributes_ids.append(attributes_id)
+
+    def drop_first(self, count: int) -> list[int]:
+        """Drop the first count rows and return the dropped attribute ids.
+
+        Rows sharing the last_updated_ts of the last dropped row are
+        dropped as well so the columns stay complete from the first row.
+        """
+        last_updated_ts = self.last_updated_ts
+        count = bisect_right(last_updated_ts, last_updated_ts[count - 1])
+        dropped = self.attributes_ids[:count].tolist()
+        del last_updated_ts[:count]
+        del self.last_changed_ts[:count]
+        del self.states[:count]
+        del self.attributes_ids[:count]
+        return dropped
+
+
+class HistoryHotTier:
+    """Keep the most recent committed states in memory.
+
+    The Recorder feeds the hot tier with the states it commits, and
+    history queries that fall entirely inside the hot tier are answered
+    without touching the database.
+
+    Writes happen in the recorder thread while reads happen in the
+    database executor so all access to the columns is done under a lock.
+    """
+
+    def __init__(self, max_rows: int) -> None:
+        """Initialize the hot tier."""
+        self.max_rows = max_rows
+        # Evict in chunks to avoid moving the columns on every append
+        # once an entity has reached max_rows.
+        self._evict_chunk = max(1, max_rows // 8)
+        self._lock = threading.Lock()
+        self._columns: dict[int, _StateColumns] = {}
+        self._attributes: dict[int, str] = {}
+        self._attributes_refs: dict[int, int] = {}
+        # The newest last_updated_ts committed for the metadata_ids whose
+        # states were committed out of order, they are left to the
+        # database until a state newer than all their rows is committed.
+        self._out_of_order: dict[int, float] = {}
+        self._pending: list[tuple[States | PendingState, str]] = []
+        self.hits = 0
+        self.misses = 0
+
+    def add_pending(self, dbstate: States | PendingState, shared_attrs: str) -> None:
+        """Add a state that is in the session but not yet committed.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        self._pending.append((dbstate, shared_attrs))
+
+    def post_commit_pending(self) -> None:
+        """Call after commit to move the pending states into the hot tier.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        if not self._pending:
+            return
+        with self._lock:
+            for dbstate, shared_attrs in self._pending:
+                if (metadata_id := dbstate.metadata_id) is None:
+                    continue
+                self._append(metadata_id, dbstate, shared_attrs)
+        self._pending.clear()
+
+    def _append(
+        self, metadata_id: int, dbstate: States | PendingState, shared_attrs: str
+    ) -> None:
+        """Append a committed state to the columns of a metadata_id."""
+        last_updated_ts = dbstate.last_updated_ts
+        if TYPE_CHECKING:
+            assert last_updated_ts is not None
+        if (newest_ts := self._out_of_order.get(metadata_id)) is not None:
+            if last_updated_ts <= newest_ts:
+                return
+            del self._out_of_order[metadata_id]
+        if (columns := self._columns.get(metadata_id)) is None:
+            columns = self._columns[metadata_id] = _StateColumns()
+        elif columns.last_updated_ts and columns.last_updated_ts[-1] > last_updated_ts:
+            # The clock went backwards, the rows after this one would
+            # no longer be held so the database has to answer for the
+            # metadata_id until the columns can be started over.
+            self._out_of_order[metadata_id] = columns.last_updated_ts[-1]
+            self._release_attributes(columns.attributes_ids)
+            del self._columns[metadata_id]
+            return
+        if (state := dbstate.state) is not None:
+            state = sys.intern(state)
+        if attributes_id := dbstate.attributes_id:
+            self._attributes.setdefault(attributes_id, shared_attrs)
+            self._attributes_refs[attributes_id] = (
+                self._attributes_refs.get(attributes_id, 0) + 1
+            )
+        else:
+            attributes_id = _NO_ATTRIBUTES_ID
+        columns.append(state, last_updated_ts, dbstate.last_changed_ts, attributes_id)
+        if len(columns) > self.max_rows:
+            self._release_attributes(columns.drop_first(self._evict_chunk))
+
+    def _release_attributes(self, attributes_ids: Iterable[int]) -> None:
+        """Release the references to attributes that are no longer held."""
+        refs = self._attributes_refs
+        for attributes_id in attributes_ids:
+            if attributes_id == _NO_ATTRIBUTES_ID:
+                continue
+            if (count := refs[attributes_id] - 1) == 0:
+                del refs[attributes_id]
+                del self._attributes[attributes_id]
+            else:
+                refs[attributes_id] = count
+
+    def evict_before(self, purge_before_ts: float) -> None:
+        """Evict states older than purge_before_ts.
+
+        Called when the states are purged from the database.
+        """
+        with self._lock:
+            for metadata_id, columns in list(self._columns.items()):
+                if not (count := bisect_left(columns.last_updated_ts, purge_before_ts)):
+                    continue
+                self._release_attributes(columns.drop_first(count))
+                if not columns:
+                    del self._columns[metadata_id]
+
+    def evict_metadata_ids(self, metadata_ids: Iterable[int]) -> None:
+        """Evict all states for the given metadata_ids.
+
+        Called when the states of specific entities are purged.
+        """
+        with self._lock:
+            for metadata_id in metadata_ids:
+                self._out_of_order.pop(metadata_id, None)
+                if columns := self._columns.pop(metadata_id, None):
+                    self._release_attributes(columns.attributes_ids)
+
+    def reset(self) -> None:
+        """Reset after the database has been reset or changed.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        self._pending.clear()
+        with self._lock:
+            self._columns.clear()
+            self._out_of_order.clear()
+            self._attributes.clear()
+            self._attributes_refs.clear()
+
+    def get_significant_rows(
+        self,
+        start_time_ts: float,
+        end_time_ts: float | None,
+        metadata_ids: list[int],
+        metadata_ids_in_significant_domains: list[int],
+        significant_changes_only: bool,
+        no_attributes: bool,
+        include_start_time_state: bool,
+        run_start_ts: float | None,
+    ) -> list[Any] | None:
+        """Return the rows a significant states query would return.
+
+        The rows are sorted by metadata_id and last_updated_ts and have
+        the same columns as the database query. None is returned if any
+        of the metadata_ids cannot be answered from the hot tier.
+
+        This is the in-memory equivalent of _significant_states_stmt.
+        """
+        include_last_changed = not significant_changes_only
+        row_type = _row_type(include_last_changed, not no_attributes)
+        single_metadata_id = len(metadata_ids) == 1
+        significant_domain_ids = set(metadata_ids_in_significant_domains)
+        rows: list[Any] = []
+        with self._lock:
+            if not all(
+                (columns := self._columns.get(metadata_id))
+                and (
+                    columns.last_updated_ts[0] < start_time_ts
+                    if include_start_time_state
+                    else columns.last_updated_ts[0] <= start_time_ts
+                )
+                for metadata_id in metadata_ids
+            ):
+                self.misses += 1
+                return None
+            self.hits += 1
+            attributes = self._attributes
+            for metadata_id in sorted(metadata_ids):
+                columns = self._columns[metadata_id]
+                last_updated = columns.last_updated_ts
+                last_changed = columns.last_changed_ts
+                states = columns.states
+                attributes_ids = columns.attributes_ids
+                start = bisect_right(last_updated, start_time_ts)
+                end = (
+                    bisect_left(last_updated, end_time_ts, start)
+                    if end_time_ts
+                    else len(last_updated)
+                )
+                # The start time state is the last state before start_time_ts
+                idx = bisect_left(last_updated, start_time_ts) - 1
+                if include_start_time_state and (
+                    single_metadata_id or last_updated[idx] >= run_start_ts  # type: ignore[operator]
+                ):
+                    values: list[Any] = [metadata_id, states[idx], 0]
+                    if include_last_changed:
+                        values.append(0)
+                    if not no_attributes:
+                        values.append(attributes.get(attributes_ids[idx]))
+                    rows.append(row_type(*values))
+                all_changes = (
+                    not significant_changes_only
+                    or metadata_id in significant_domain_ids
+                )
+                for idx in range(start, end):
+                    last_changed_ts = last_changed[idx] or None
+                    if not all_changes and not (
+                        last_changed_ts is None or last_changed_ts == last_updated[idx]
+                    ):
+                        continue
+                    values = [metadata_id, states[idx], last_updated[idx]]
+                    if include_last_changed:
+                        values.append(last_changed_ts)
+                    if not no_attributes:
+                        values.append(attributes.get(attributes_ids[idx]))
+                    rows.append(row_type(*values))
+        return rows
+
+    def stats(self) -> dict[str, int]:
+        """Return statistics about the hot tier."""
+        with self._lock:
+            return {
+                "entities": len(self._columns),
+                "rows": sum(len(columns) for columns in self._columns.values()),
+                "attributes": len(self._attributes),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
@@ -70,6 +70,7 @@ from .db_schema import (
     Events,
     EventTypes,
     LegacyBase,
+    LogbookEntries,
     MigrationChanges,
     SchemaChanges,
     States,
@@ -1835,6 +1836,14 @@ class _SchemaVersion47Migrator(_SchemaVersionMigrator, target_version=47):
         )
 
 
+class _SchemaVersion48Migrator(_SchemaVersionMigrator, target_version=48):
+    def _apply_update(self) -> None:
+        """Version specific update method."""
+        # The logbook index table may already have been created with the
+        # other missing tables when the database was connected
+        cast(Table, LogbookEntries.__table__).create(self.engine, checkfirst=True)
+
+
 def _migrate_statistics_columns_to_timestamp_removing_duplicates(
     hass: HomeAssistant,
     instance: Recorder,
@@ -11,6 +11,11 @@ from .context import (
 from .database import DatabaseEngine, DatabaseOptimizer, UnsupportedDialect
 from .event import extract_event_type_ids
 from .state import LazyState, extract_metadata_ids, row_to_compressed_state
+from .state_attributes import (
+    COMPRESSED_ATTRS_PREFIX,
+    compress_shared_attrs,
+    decompress_shared_attrs,
+)
 from .statistics import (
     CalendarStatisticPeriod,
     FixedStatisticPeriod,
@@ -29,6 +34,7 @@ from .time import (
 )
 
 __all__ = [
+    "COMPRESSED_ATTRS_PREFIX",
     "CalendarStatisticPeriod",
     "DatabaseEngine",
     "DatabaseOptimizer",
@@ -43,7 +49,9 @@ __all__ = [
     "UnsupportedDialect",
     "bytes_to_ulid_or_none",
     "bytes_to_uuid_hex_or_none",
+    "compress_shared_attrs",
     "datetime_to_timestamp_or_none",
+    "decompress_shared_attrs",
     "extract_event_type_ids",
     "extract_metadata_ids",
     "process_timestamp",
@@ -2,14 +2,100 @@
 
 from __future__ import annotations
 
+import base64
+from collections.abc import Callable
 import logging
 from typing import Any
+import zlib
 
 from homeassistant.util.json import json_loads_object
 
 EMPTY_JSON_OBJECT = "{}"
 _LOGGER = logging.getLogger(__name__)
 
+# Compressed attributes are stored as a JSON object which holds the
+# compressed attributes in COMPRESSED_ATTRS_KEY next to the attributes
+# which are matched in SQL by the logbook, so shared_attrs stays valid
+# JSON and can still be queried. The space after the opening brace marks
+# compressed attributes as the JSON encoders of the recorder never write
+# whitespace there, so uncompressed attributes never start with the prefix.
+COMPRESSED_ATTRS_KEY = "@z"
+COMPRESSED_ATTRS_PREFIX = f'{{ "{COMPRESSED_ATTRS_KEY}":"'
+_COMPRESSED_ATTRS_PREFIX_BYTES = COMPRESSED_ATTRS_PREFIX.encode()
+COMPRESSED_ATTRS_LIFTED_KEYS = ("icon", "unit_of_measurement")
+# Small attributes do not compress well enough to be worth it
+COMPRESS_ATTRIBUTES_MIN_BYTES = 512
+
+# The preset dictionary is primed with the keys and values which are
+# found in the attributes of most entities. zlib prefers the end of the
+# dictionary, so the most common strings are last. The dictionary must
+# never be changed since it is needed to decompress the attributes which
+# have already been stored.
+_COMPRESSED_ATTRS_ZDICT = b"".join(
+    (
+        b'"media_content_id":"","media_content_type":"music","media_duration":',
+        b'"media_position":"media_position_updated_at":"media_title":"',
+        b'"media_artist":"","media_album_name":"","source_list":["',
+        b'"forecast":[{"condition":"cloudy","datetime":"","precipitation":',
+        b'"temperature":"templow":"wind_bearing":"wind_speed":"humidity":',
+        b'"hvac_modes":["off","heat","cool","heat_cool","auto"],"fan_modes":["',
+        b'"preset_modes":["none","eco","away","boost","comfort","home"],',
+        b'"min_temp":7,"max_temp":35,"target_temp_step":0.5,"current_temperature":',
+        b'"supported_color_modes":["onoff","brightness","color_temp","hs","xy"],',
+        b'"color_mode":"effect_list":["min_color_temp_kelvin":2000,',
+        b'"max_color_temp_kelvin":6535,"min_mireds":153,"max_mireds":500,',
+        b'"brightness":null,"hs_color":null,"rgb_color":null,"xy_color":null,',
+        b'"latitude":"longitude":"gps_accuracy":"source_type":"gps",',
+        b'"options":["attribution":"Data provided by ","entity_picture":"/api/',
+        b'"state_class":"measurement","state_class":"total_increasing",',
+        b'"device_class":"temperature","device_class":"power","device_class":"energy"',
+        b',"unit_of_measurement":"\xc2\xb0C","unit_of_measurement":"W",',
+        b'"unit_of_measurement":"kWh","unit_of_measurement":"%","icon":"mdi:',
+        b'"supported_features":0,"restored":true,"friendly_name":"',
+    )
+)
+
+
+def compress_shared_attrs(
+    shared_attrs_bytes: bytes,
+    attributes: dict[str, Any],
+    encoder: Callable[[Any], bytes],
+) -> bytes:
+    """Compress json encoded shared attributes.
+
+    The result is deterministic so compressed attributes can be
+    hashed and deduplicated like uncompressed ones. The attributes
+    are returned as they are if compressing them does not save space.
+    """
+    if len(shared_attrs_bytes) < COMPRESS_ATTRIBUTES_MIN_BYTES:
+        return shared_attrs_bytes
+    compressor = zlib.compressobj(level=9, zdict=_COMPRESSED_ATTRS_ZDICT)
+    payload = base64.b85encode(
+        compressor.compress(shared_attrs_bytes) + compressor.flush()
+    )
+    compressed = _COMPRESSED_ATTRS_PREFIX_BYTES + payload + b'"'
+    if lifted := {
+        key: attributes[key]
+        for key in COMPRESSED_ATTRS_LIFTED_KEYS
+        if key in attributes
+    }:
+        compressed += b"," + encoder(lifted)[1:]
+    else:
+        compressed += b"}"
+    if len(compressed) >= len(shared_attrs_bytes):
+        return shared_attrs_bytes
+    return compressed
+
+
+def decompress_shared_attrs(source: str) -> str:
+    """Decompress shared attributes stored by compress_shared_attrs."""
+    # The base85 alphabet does not contain quotes so the
+    # payload ends at the first quote after the prefix
+    start = len(COMPRESSED_ATTRS_PREFIX)
+    payload = base64.b85decode(source[start : source.index('"', start)])
+    decompressor = zlib.decompressobj(zdict=_COMPRESSED_ATTRS_ZDICT)
+    return (decompressor.decompress(payload) + decompressor.flush()).decode()
+
 
 def decode_attributes_from_source(
     source: Any, attr_cache: dict[str, dict[str, Any]]
@@ -20,8 +106,12 @@ def decode_attributes_from_source(
     if (attributes := attr_cache.get(source)) is not None:
         return attributes
     try:
-        attr_cache[source] = attributes = json_loads_object(source)
-    except ValueError:
+        if type(source) is str and source.startswith(COMPRESSED_ATTRS_PREFIX):
+            attributes = json_loads_object(decompress_shared_attrs(source))
+        else:
+            attributes = json_loads_object(source)
+    except (ValueError, zlib.error):
         _LOGGER.exception("Error converting row to state attributes: %s", source)
-        attr_cache[source] = attributes = {}
+        attributes = {}
+    attr_cache[source] = attributes
     return attributes
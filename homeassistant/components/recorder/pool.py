@@ -37,6 +37,10 @@ class RecorderPool(SingletonThreadPool, NullPool):
 
     When called from the creating thread or db executor acts like SingletonThreadPool
     When called from any other thread, acts like NullPool
+
+    The pool_size must be large enough to give the recorder thread and
+    every db executor worker their own connection, so the workers can
+    read in parallel while the recorder thread writes.
     """
 
     def __init__(  # pylint: disable=super-init-not-called
@@ -46,7 +50,7 @@ class RecorderPool(SingletonThreadPool, NullPool):
         **kw: Any,
     ) -> None:
         """Create the pool."""
-        kw["pool_size"] = POOL_SIZE
+        kw.setdefault("pool_size", POOL_SIZE)
         assert (
             recorder_and_worker_thread_ids is not None
         ), "recorder_and_worker_thread_ids is required"
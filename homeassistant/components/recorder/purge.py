@@ -3,14 +3,16 @@
 from __future__ import annotations
 
 from collections.abc import Callable
+from dataclasses import dataclass, field, replace
 from datetime import datetime
-from itertools import zip_longest
+from itertools import takewhile, zip_longest
 import logging
 import time
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 from sqlalchemy.orm.session import Session
 
+from homeassistant.util import dt as dt_util
 from homeassistant.util.collection import chunked_or_all
 
 from .db_schema import Events, States, StatesMeta
@@ -22,23 +24,35 @@ from .queries import (
     data_ids_exist_in_events_with_fast_in_distinct,
     delete_event_data_rows,
     delete_event_rows,
+    delete_event_rows_in_range,
     delete_event_types_rows,
+    delete_logbook_entries_rows,
+    delete_logbook_entries_rows_for_entity_ids,
     delete_recorder_runs_rows,
     delete_states_attributes_rows,
     delete_states_meta_rows,
     delete_states_rows,
+    delete_states_rows_in_range,
     delete_statistics_runs_rows,
     delete_statistics_short_term_rows,
     disconnect_states_rows,
+    disconnect_states_rows_in_range,
     find_entity_ids_to_purge,
     find_event_types_to_purge,
     find_events_to_purge,
+    find_events_to_purge_from_id,
+    find_first_event_id_to_keep,
+    find_first_state_id_to_keep,
     find_latest_statistics_runs_run_id,
     find_legacy_detached_states_and_attributes_to_purge,
     find_legacy_event_state_and_attributes_and_data_ids_to_purge,
     find_legacy_row,
+    find_logbook_entries_to_purge,
+    find_max_event_id,
+    find_max_state_id,
     find_short_term_statistics_to_purge,
     find_states_to_purge,
+    find_states_to_purge_from_id,
     find_statistics_runs_to_purge,
 )
 from .repack import repack_database
@@ -54,6 +68,75 @@ DEFAULT_STATES_BATCHES_PER_PURGE = 20  # We expect ~95% de-dupe rate
 DEFAULT_EVENTS_BATCHES_PER_PURGE = 15  # We expect ~92% de-dupe rate
 
 
+@dataclass(slots=True)
+class PurgeProgress:
+    """Progress of a purge that runs with a time budget.
+
+    The cursors are the lowest state_id and event_id that may still need
+    to be purged. Every row below a cursor has already been purged since
+    the rows are walked in primary key order and the walk stops at the
+    first row that is too new to purge.
+    """
+
+    purge_before: datetime
+    repack: bool
+    apply_filter: bool
+    states_cursor: int = 0
+    events_cursor: int = 0
+    states_walk_done: bool = False
+    events_walk_done: bool = False
+    # The first state_id and event_id that are too new to purge, they
+    # are only used to estimate the number of rows remaining.
+    states_end: int | None = None
+    events_end: int | None = None
+    rows_purged: int = 0
+    started: float = field(default_factory=time.monotonic)
+
+    @property
+    def rows_remaining(self) -> int:
+        """Return an estimate of the number of states and events remaining.
+
+        The estimate is based on the primary keys so it is an upper bound
+        when rows in the range have already been deleted.
+        """
+        remaining = 0
+        if not self.states_walk_done and self.states_end is not None:
+            remaining += max(self.states_end - self.states_cursor, 0)
+        if not self.events_walk_done and self.events_end is not None:
+            remaining += max(self.events_end - self.events_cursor, 0)
+        return remaining
+
+    @property
+    def rate(self) -> float:
+        """Return the number of rows purged per second."""
+        if not (elapsed := time.monotonic() - self.started):
+            return 0.0
+        return self.rows_purged / elapsed
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the progress that is needed to resume the purge."""
+        return {
+            "purge_before": self.purge_before.isoformat(),
+            "repack": self.repack,
+            "apply_filter": self.apply_filter,
+            "states_cursor": self.states_cursor,
+            "events_cursor": self.events_cursor,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> PurgeProgress | None:
+        """Create the progress of a purge to resume from saved data."""
+        if (purge_before := dt_util.parse_datetime(data["purge_before"])) is None:
+            return None
+        return cls(
+            purge_before,
+            data["repack"],
+            data["apply_filter"],
+            states_cursor=data["states_cursor"],
+            events_cursor=data["events_cursor"],
+        )
+
+
 @retryable_database_job("purge")
 def purge_old_data(
     instance: Recorder,
@@ -62,15 +145,25 @@ def purge_old_data(
     apply_filter: bool = False,
     events_batch_size: int = DEFAULT_EVENTS_BATCHES_PER_PURGE,
     states_batch_size: int = DEFAULT_STATES_BATCHES_PER_PURGE,
+    time_budget: float | None = None,
 ) -> bool:
     """Purge events and states older than purge_before.
 
     Cleans up an timeframe of an hour, based on the oldest record.
+
+    If a time_budget in seconds is given, states and events are purged by
+    primary key ranges until the budget is used up instead of a fixed
+    number of batches. The progress is kept in instance.purge_progress so
+    the next call continues where this one stopped.
     """
     _LOGGER.debug(
         "Purging states and events before target %s",
         purge_before.isoformat(sep=" ", timespec="seconds"),
     )
+    deadline = time.monotonic() + time_budget if time_budget else None
+    if instance.history_hot_tier:
+        instance.history_hot_tier.evict_before(purge_before.timestamp())
+    progress: PurgeProgress | None = None
     with session_scope(session=instance.get_session()) as session:
         # Purge a max of max_bind_vars, based on the oldest states or events record
         has_more_to_purge = False
@@ -86,12 +179,25 @@ def purge_old_data(
                 " remaining"
             )
             # Once we are done purging legacy rows, we use the new method
-            has_more_to_purge |= _purge_states_and_attributes_ids(
-                instance, session, states_batch_size, purge_before
-            )
-            has_more_to_purge |= _purge_events_and_data_ids(
-                instance, session, events_batch_size, purge_before
-            )
+            if deadline is None:
+                has_more_to_purge |= _purge_states_and_attributes_ids(
+                    instance, session, states_batch_size, purge_before
+                )
+                has_more_to_purge |= _purge_events_and_data_ids(
+                    instance, session, events_batch_size, purge_before
+                )
+            else:
+                progress = _get_purge_progress(
+                    instance, session, purge_before, repack, apply_filter
+                )
+                has_more_to_purge |= _purge_with_time_budget(
+                    instance,
+                    session,
+                    progress,
+                    states_batch_size,
+                    events_batch_size,
+                    deadline,
+                )
 
         statistics_runs = _select_statistics_runs_to_purge(
             session, purge_before, instance.max_bind_vars
@@ -99,33 +205,47 @@ def purge_old_data(
         short_term_statistics = _select_short_term_statistics_to_purge(
             session, purge_before, instance.max_bind_vars
         )
+        logbook_entries = _select_logbook_entries_to_purge(
+            session, purge_before, instance.max_bind_vars
+        )
         if statistics_runs:
             _purge_statistics_runs(session, statistics_runs)
 
         if short_term_statistics:
             _purge_short_term_statistics(session, short_term_statistics)
 
-        if has_more_to_purge or statistics_runs or short_term_statistics:
+        if logbook_entries:
+            _purge_logbook_entries(session, logbook_entries)
+
+        if (
+            has_more_to_purge
+            or statistics_runs
+            or short_term_statistics
+            or logbook_entries
+        ):
             # Return false, as we might not be done yet.
             _LOGGER.debug("Purging hasn't fully completed yet")
-            return False
-
-        if apply_filter and _purge_filtered_data(instance, session) is False:
+            finished = False
+        elif apply_filter and _purge_filtered_data(instance, session) is False:
             _LOGGER.debug("Cleanup filtered data hasn't fully completed yet")
-            return False
-
-        # This purge cycle is finished, clean up old event types and
-        # recorder runs
-        if instance.event_type_manager.active:
-            _purge_old_event_types(instance, session)
-
-        if instance.states_meta_manager.active:
-            _purge_old_entity_ids(instance, session)
-
-        _purge_old_recorder_runs(instance, session, purge_before)
-    if repack:
+            finished = False
+        else:
+            # This purge cycle is finished, clean up old event types and
+            # recorder runs
+            if instance.event_type_manager.active:
+                _purge_old_event_types(instance, session)
+
+            if instance.states_meta_manager.active:
+                _purge_old_entity_ids(instance, session)
+
+            _purge_old_recorder_runs(instance, session, purge_before)
+            finished = True
+    # The cursors are only moved once the purged rows are committed
+    if progress is not None:
+        instance.purge_progress = progress
+    if finished and repack:
         repack_database(instance)
-    return True
+    return finished
 
 
 def _purging_legacy_format(session: Session) -> bool:
@@ -173,11 +293,187 @@ def _purge_legacy_format(
     )
 
 
+def _get_purge_progress(
+    instance: Recorder,
+    session: Session,
+    purge_before: datetime,
+    repack: bool,
+    apply_filter: bool,
+) -> PurgeProgress:
+    """Return a copy of the progress of the running purge or start a new one.
+
+    The cursors of a previous purge are kept when the purge target moves
+    since every row below them has been purged already.
+
+    The cursors are moved on the copy, which purge_old_data only stores
+    as the progress of the recorder once the session is committed, so a
+    purge resumed after a failed commit starts from the rows which were
+    not deleted.
+    """
+    if (progress := instance.purge_progress) is None:
+        progress = PurgeProgress(purge_before, repack, apply_filter)
+    elif progress.purge_before != purge_before:
+        progress = PurgeProgress(
+            purge_before,
+            repack,
+            apply_filter,
+            states_cursor=progress.states_cursor,
+            events_cursor=progress.events_cursor,
+        )
+    if progress.states_end is None:
+        purge_before_ts = purge_before.timestamp()
+        progress.states_end = (
+            session.execute(find_first_state_id_to_keep(purge_before_ts)).scalar()
+            or (session.execute(find_max_state_id()).scalar() or 0) + 1
+        )
+        progress.events_end = (
+            session.execute(find_first_event_id_to_keep(purge_before_ts)).scalar()
+            or (session.execute(find_max_event_id()).scalar() or 0) + 1
+        )
+    instance.purge_progress = progress
+    return replace(progress)
+
+
+def _purge_with_time_budget(
+    instance: Recorder,
+    session: Session,
+    progress: PurgeProgress,
+    states_batch_size: int,
+    events_batch_size: int,
+    deadline: float,
+) -> bool:
+    """Purge states and events by primary key ranges until the deadline.
+
+    Once the range walk reaches a row that is too new to purge, the
+    remaining old rows are out of primary key order, for example after
+    the clock went backwards, and they are purged by last_updated_ts
+    and time_fired_ts instead.
+
+    Returns true if there are more states or events to purge.
+    """
+    purge_before = progress.purge_before
+    has_more_to_purge = _purge_states_by_range(
+        instance, session, progress, deadline
+    ) or _purge_states_and_attributes_ids(
+        instance, session, states_batch_size, purge_before, deadline
+    )
+    if has_more_to_purge and time.monotonic() >= deadline:
+        return True
+    has_more_to_purge |= _purge_events_by_range(
+        instance, session, progress, deadline
+    ) or _purge_events_and_data_ids(
+        instance, session, events_batch_size, purge_before, deadline
+    )
+    _LOGGER.debug(
+        "Purged %s rows at %.0f rows/s, about %s rows remaining",
+        progress.rows_purged,
+        progress.rate,
+        progress.rows_remaining,
+    )
+    return has_more_to_purge
+
+
+def _purge_states_by_range(
+    instance: Recorder, session: Session, progress: PurgeProgress, deadline: float
+) -> bool:
+    """Purge states and linked attributes ids by state_id ranges.
+
+    Returns true if the walk has not reached a state that is too new to
+    purge yet.
+    """
+    if progress.states_walk_done:
+        return False
+    purge_before_ts = progress.purge_before.timestamp()
+    max_bind_vars = instance.max_bind_vars
+    attributes_ids_batch: set[int] = set()
+    while True:
+        rows = session.execute(
+            find_states_to_purge_from_id(progress.states_cursor, max_bind_vars)
+        ).all()
+        # Every row in the range between the first and last row of the
+        # prefix is purged so the range can be deleted without listing
+        # the state_ids.
+        to_purge = list(
+            takewhile(lambda row: row[2] is not None and row[2] < purge_before_ts, rows)
+        )
+        if to_purge:
+            first_state_id = to_purge[0][0]
+            last_state_id = to_purge[-1][0]
+            session.execute(
+                disconnect_states_rows_in_range(first_state_id, last_state_id)
+            )
+            session.execute(delete_states_rows_in_range(first_state_id, last_state_id))
+            _LOGGER.debug(
+                "Deleted %s states from state_id %s to %s",
+                len(to_purge),
+                first_state_id,
+                last_state_id,
+            )
+            instance.states_manager.evict_purged_state_ids(
+                {state_id for state_id, _, _ in to_purge}
+            )
+            attributes_ids_batch.update(
+                attributes_id for _, attributes_id, _ in to_purge if attributes_id
+            )
+            progress.states_cursor = last_state_id + 1
+            progress.rows_purged += len(to_purge)
+        if len(to_purge) < max_bind_vars:
+            progress.states_walk_done = True
+            break
+        if time.monotonic() >= deadline:
+            break
+    _purge_unused_attributes_ids(instance, session, attributes_ids_batch)
+    return not progress.states_walk_done
+
+
+def _purge_events_by_range(
+    instance: Recorder, session: Session, progress: PurgeProgress, deadline: float
+) -> bool:
+    """Purge events and linked data ids by event_id ranges.
+
+    Returns true if the walk has not reached an event that is too new to
+    purge yet.
+    """
+    if progress.events_walk_done:
+        return False
+    purge_before_ts = progress.purge_before.timestamp()
+    max_bind_vars = instance.max_bind_vars
+    data_ids_batch: set[int] = set()
+    while True:
+        rows = session.execute(
+            find_events_to_purge_from_id(progress.events_cursor, max_bind_vars)
+        ).all()
+        to_purge = list(
+            takewhile(lambda row: row[2] is not None and row[2] < purge_before_ts, rows)
+        )
+        if to_purge:
+            first_event_id = to_purge[0][0]
+            last_event_id = to_purge[-1][0]
+            session.execute(delete_event_rows_in_range(first_event_id, last_event_id))
+            _LOGGER.debug(
+                "Deleted %s events from event_id %s to %s",
+                len(to_purge),
+                first_event_id,
+                last_event_id,
+            )
+            data_ids_batch.update(data_id for _, data_id, _ in to_purge if data_id)
+            progress.events_cursor = last_event_id + 1
+            progress.rows_purged += len(to_purge)
+        if len(to_purge) < max_bind_vars:
+            progress.events_walk_done = True
+            break
+        if time.monotonic() >= deadline:
+            break
+    _purge_unused_data_ids(instance, session, data_ids_batch)
+    return not progress.events_walk_done
+
+
 def _purge_states_and_attributes_ids(
     instance: Recorder,
     session: Session,
     states_batch_size: int,
     purge_before: datetime,
+    deadline: float | None = None,
 ) -> bool:
     """Purge states and linked attributes id in a batch.
 
@@ -201,6 +497,8 @@ def _purge_states_and_attributes_ids(
             break
         _purge_state_ids(instance, session, state_ids)
         attributes_ids_batch = attributes_ids_batch | attributes_ids
+        if deadline is not None and time.monotonic() >= deadline:
+            break
 
     _purge_unused_attributes_ids(instance, session, attributes_ids_batch)
     _LOGGER.debug(
@@ -215,6 +513,7 @@ def _purge_events_and_data_ids(
     session: Session,
     events_batch_size: int,
     purge_before: datetime,
+    deadline: float | None = None,
 ) -> bool:
     """Purge states and linked attributes id in a batch.
 
@@ -236,6 +535,8 @@ def _purge_events_and_data_ids(
             break
         _purge_event_ids(session, event_ids)
         data_ids_batch = data_ids_batch | data_ids
+        if deadline is not None and time.monotonic() >= deadline:
+            break
 
     _purge_unused_data_ids(instance, session, data_ids_batch)
     _LOGGER.debug(
@@ -454,6 +755,17 @@ def _select_short_term_statistics_to_purge(
     return [statistic_id for (statistic_id,) in statistics]
 
 
+def _select_logbook_entries_to_purge(
+    session: Session, purge_before: datetime, max_bind_vars: int
+) -> list[int]:
+    """Return a list of logbook index rows to purge."""
+    logbook_entries = session.execute(
+        find_logbook_entries_to_purge(purge_before.timestamp(), max_bind_vars)
+    ).all()
+    _LOGGER.debug("Selected %s logbook entries to remove", len(logbook_entries))
+    return [entry_id for (entry_id,) in logbook_entries]
+
+
 def _select_legacy_detached_state_and_attributes_and_data_ids_to_purge(
     session: Session, purge_before: datetime, max_bind_vars: int
 ) -> tuple[set[int], set[int]]:
@@ -570,6 +882,12 @@ def _purge_short_term_statistics(
     _LOGGER.debug("Deleted %s short term statistics", deleted_rows)
 
 
+def _purge_logbook_entries(session: Session, logbook_entries: list[int]) -> None:
+    """Delete by entry_id."""
+    deleted_rows = session.execute(delete_logbook_entries_rows(logbook_entries))
+    _LOGGER.debug("Deleted %s logbook entries", deleted_rows)
+
+
 def _purge_event_ids(session: Session, event_ids: set[int]) -> None:
     """Delete by event id."""
     if not event_ids:
@@ -684,6 +1002,8 @@ def _purge_filtered_states(
 
     Return true if all states are purged
     """
+    if instance.history_hot_tier:
+        instance.history_hot_tier.evict_metadata_ids(metadata_ids_to_purge)  # type: ignore[arg-type]
     state_ids: tuple[int, ...]
     attributes_ids: tuple[int, ...]
     event_ids: tuple[int, ...]
@@ -774,13 +1094,14 @@ def purge_entity_data(
     assert database_engine is not None
     purge_before_timestamp = purge_before.timestamp()
     with session_scope(session=instance.get_session()) as session:
-        selected_metadata_ids: list[str] = [
-            metadata_id
-            for (metadata_id, entity_id) in session.query(
-                StatesMeta.metadata_id, StatesMeta.entity_id
-            ).all()
-            if entity_filter and entity_filter(entity_id)
-        ]
+        selected_metadata_ids: list[str] = []
+        selected_entity_ids: list[str] = []
+        for metadata_id, entity_id in session.query(
+            StatesMeta.metadata_id, StatesMeta.entity_id
+        ).all():
+            if entity_filter and entity_filter(entity_id):
+                selected_metadata_ids.append(metadata_id)
+                selected_entity_ids.append(entity_id)
         _LOGGER.debug("Purging entity data for %s", selected_metadata_ids)
         if not selected_metadata_ids:
             return True
@@ -797,6 +1118,14 @@ def purge_entity_data(
             _LOGGER.debug("Purging entity data hasn't fully completed yet")
             return False
 
+        # The logbook index is small compared to the states table
+        # so it is purged in one go once the states are gone
+        for entity_ids_chunk in chunked_or_all(
+            selected_entity_ids, instance.max_bind_vars
+        ):
+            session.execute(
+                delete_logbook_entries_rows_for_entity_ids(entity_ids_chunk)
+            )
         _purge_old_entity_ids(instance, session)
 
     return True
@@ -13,6 +13,7 @@ from .db_schema import (
     EventData,
     Events,
     EventTypes,
+    LogbookEntries,
     MigrationChanges,
     RecorderRuns,
     StateAttributes,
@@ -549,6 +550,31 @@ def delete_states_rows(state_ids: Iterable[int]) -> StatementLambdaElement:
     )
 
 
+def disconnect_states_rows_in_range(
+    first_state_id: int, last_state_id: int
+) -> StatementLambdaElement:
+    """Disconnect states rows linked to a range of state ids."""
+    return lambda_stmt(
+        lambda: update(States)
+        .where(States.old_state_id >= first_state_id)
+        .where(States.old_state_id <= last_state_id)
+        .values(old_state_id=None)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def delete_states_rows_in_range(
+    first_state_id: int, last_state_id: int
+) -> StatementLambdaElement:
+    """Delete a range of states rows."""
+    return lambda_stmt(
+        lambda: delete(States)
+        .where(States.state_id >= first_state_id)
+        .where(States.state_id <= last_state_id)
+        .execution_options(synchronize_session=False)
+    )
+
+
 def delete_event_data_rows(data_ids: Iterable[int]) -> StatementLambdaElement:
     """Delete event_data rows."""
     return lambda_stmt(
@@ -602,6 +628,18 @@ def delete_event_rows(
     )
 
 
+def delete_event_rows_in_range(
+    first_event_id: int, last_event_id: int
+) -> StatementLambdaElement:
+    """Delete a range of event rows."""
+    return lambda_stmt(
+        lambda: delete(Events)
+        .where(Events.event_id >= first_event_id)
+        .where(Events.event_id <= last_event_id)
+        .execution_options(synchronize_session=False)
+    )
+
+
 def delete_recorder_runs_rows(
     purge_before: datetime, current_run_id: int
 ) -> StatementLambdaElement:
@@ -636,6 +674,60 @@ def find_states_to_purge(
     )
 
 
+def find_states_to_purge_from_id(
+    start_state_id: int, max_bind_vars: int
+) -> StatementLambdaElement:
+    """Find the next states in primary key order to purge by range."""
+    return lambda_stmt(
+        lambda: select(States.state_id, States.attributes_id, States.last_updated_ts)
+        .filter(States.state_id >= start_state_id)
+        .order_by(States.state_id)
+        .limit(max_bind_vars)
+    )
+
+
+def find_events_to_purge_from_id(
+    start_event_id: int, max_bind_vars: int
+) -> StatementLambdaElement:
+    """Find the next events in primary key order to purge by range."""
+    return lambda_stmt(
+        lambda: select(Events.event_id, Events.data_id, Events.time_fired_ts)
+        .filter(Events.event_id >= start_event_id)
+        .order_by(Events.event_id)
+        .limit(max_bind_vars)
+    )
+
+
+def find_first_state_id_to_keep(purge_before: float) -> StatementLambdaElement:
+    """Find the first state_id that is too new to purge."""
+    return lambda_stmt(
+        lambda: select(States.state_id)
+        .filter(States.last_updated_ts >= purge_before)
+        .order_by(States.last_updated_ts)
+        .limit(1)
+    )
+
+
+def find_first_event_id_to_keep(purge_before: float) -> StatementLambdaElement:
+    """Find the first event_id that is too new to purge."""
+    return lambda_stmt(
+        lambda: select(Events.event_id)
+        .filter(Events.time_fired_ts >= purge_before)
+        .order_by(Events.time_fired_ts)
+        .limit(1)
+    )
+
+
+def find_max_state_id() -> StatementLambdaElement:
+    """Find the highest state_id."""
+    return lambda_stmt(lambda: select(func.max(States.state_id)))
+
+
+def find_max_event_id() -> StatementLambdaElement:
+    """Find the highest event_id."""
+    return lambda_stmt(lambda: select(func.max(Events.event_id)))
+
+
 def find_short_term_statistics_to_purge(
     purge_before: datetime, max_bind_vars: int
 ) -> StatementLambdaElement:
@@ -648,6 +740,37 @@ def find_short_term_statistics_to_purge(
     )
 
 
+def find_logbook_entries_to_purge(
+    purge_before: float, max_bind_vars: int
+) -> StatementLambdaElement:
+    """Find logbook index rows to purge."""
+    return lambda_stmt(
+        lambda: select(LogbookEntries.entry_id)
+        .filter(LogbookEntries.time_fired_ts < purge_before)
+        .limit(max_bind_vars)
+    )
+
+
+def delete_logbook_entries_rows(entry_ids: Iterable[int]) -> StatementLambdaElement:
+    """Delete logbook index rows."""
+    return lambda_stmt(
+        lambda: delete(LogbookEntries)
+        .where(LogbookEntries.entry_id.in_(entry_ids))
+        .execution_options(synchronize_session=False)
+    )
+
+
+def delete_logbook_entries_rows_for_entity_ids(
+    entity_ids: Iterable[str],
+) -> StatementLambdaElement:
+    """Delete logbook index rows of entity_ids."""
+    return lambda_stmt(
+        lambda: delete(LogbookEntries)
+        .where(LogbookEntries.entity_id.in_(entity_ids))
+        .execution_options(synchronize_session=False)
+    )
+
+
 def find_statistics_runs_to_purge(
     purge_before: datetime, max_bind_vars: int
 ) -> StatementLambdaElement:
@@ -3,12 +3,14 @@
 from __future__ import annotations
 
 from datetime import timedelta
+import logging
 from typing import cast
 
 import voluptuous as vol
 
 from homeassistant.const import ATTR_ENTITY_ID
 from homeassistant.core import HomeAssistant, ServiceCall, callback
+from homeassistant.exceptions import HomeAssistantError
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.entityfilter import generate_filter
 from homeassistant.helpers.service import (
@@ -19,12 +21,25 @@ import homeassistant.util.dt as dt_util
 
 from .const import ATTR_APPLY_FILTER, ATTR_KEEP_DAYS, ATTR_REPACK, DOMAIN
 from .core import Recorder
+from .db_schema import Statistics, StatisticsShortTerm
+from .statistics import validate_statistic_id
+from .statistics_file import (
+    FILE_FORMAT_AUTO,
+    FILE_FORMATS,
+    async_import_statistics_file,
+    export_statistics_file,
+    resolve_file_format,
+)
 from .tasks import PurgeEntitiesTask, PurgeTask
 
+_LOGGER = logging.getLogger(__name__)
+
 SERVICE_PURGE = "purge"
 SERVICE_PURGE_ENTITIES = "purge_entities"
 SERVICE_ENABLE = "enable"
 SERVICE_DISABLE = "disable"
+SERVICE_EXPORT_STATISTICS = "export_statistics"
+SERVICE_IMPORT_STATISTICS = "import_statistics"
 
 SERVICE_PURGE_SCHEMA = vol.Schema(
     {
@@ -63,6 +78,36 @@ SERVICE_PURGE_ENTITIES_SCHEMA = vol.All(
 SERVICE_ENABLE_SCHEMA = vol.Schema({})
 SERVICE_DISABLE_SCHEMA = vol.Schema({})
 
+ATTR_END_TIME = "end_time"
+ATTR_FILENAME = "filename"
+ATTR_FORMAT = "format"
+ATTR_PERIOD = "period"
+ATTR_START_TIME = "start_time"
+ATTR_STATISTIC_IDS = "statistic_ids"
+
+STATISTICS_TABLES_BY_PERIOD: dict[str, type[Statistics | StatisticsShortTerm]] = {
+    "5minute": StatisticsShortTerm,
+    "hour": Statistics,
+}
+
+SERVICE_IMPORT_STATISTICS_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_FILENAME): cv.string,
+        vol.Optional(ATTR_FORMAT, default=FILE_FORMAT_AUTO): vol.In(FILE_FORMATS),
+        vol.Optional(ATTR_PERIOD, default="hour"): vol.In(STATISTICS_TABLES_BY_PERIOD),
+    }
+)
+
+SERVICE_EXPORT_STATISTICS_SCHEMA = SERVICE_IMPORT_STATISTICS_SCHEMA.extend(
+    {
+        vol.Optional(ATTR_STATISTIC_IDS): vol.All(
+            cv.ensure_list, [vol.Any(cv.entity_id, validate_statistic_id)]
+        ),
+        vol.Optional(ATTR_START_TIME): cv.datetime,
+        vol.Optional(ATTR_END_TIME): cv.datetime,
+    }
+)
+
 
 @callback
 def _async_register_purge_service(hass: HomeAssistant, instance: Recorder) -> None:
@@ -135,6 +180,75 @@ def _async_register_disable_service(hass: HomeAssistant, instance: Recorder) ->
     )
 
 
+def _check_allowed_path(hass: HomeAssistant, filename: str) -> None:
+    """Raise if the file is not in an allowed directory."""
+    if not hass.config.is_allowed_path(filename):
+        raise HomeAssistantError(
+            f"Cannot access {filename}, no access to path;"
+            " allowlist_external_dirs may need to be adjusted in configuration.yaml"
+        )
+
+
+@callback
+def _async_register_export_statistics_service(
+    hass: HomeAssistant, instance: Recorder
+) -> None:
+    async def async_handle_export_statistics_service(service: ServiceCall) -> None:
+        """Handle calls to the export statistics service."""
+        filename = service.data[ATTR_FILENAME]
+        _check_allowed_path(hass, filename)
+        file_format = resolve_file_format(filename, service.data[ATTR_FORMAT])
+        statistic_ids = service.data.get(ATTR_STATISTIC_IDS)
+        start_time = service.data.get(ATTR_START_TIME)
+        end_time = service.data.get(ATTR_END_TIME)
+        exported = await instance.async_add_executor_job(
+            export_statistics_file,
+            instance,
+            filename,
+            file_format,
+            STATISTICS_TABLES_BY_PERIOD[service.data[ATTR_PERIOD]],
+            None if statistic_ids is None else set(statistic_ids),
+            start_time and dt_util.as_utc(start_time),
+            end_time and dt_util.as_utc(end_time),
+        )
+        _LOGGER.info("Exported %s statistics rows to %s", exported, filename)
+
+    async_register_admin_service(
+        hass,
+        DOMAIN,
+        SERVICE_EXPORT_STATISTICS,
+        async_handle_export_statistics_service,
+        schema=SERVICE_EXPORT_STATISTICS_SCHEMA,
+    )
+
+
+@callback
+def _async_register_import_statistics_service(
+    hass: HomeAssistant, instance: Recorder
+) -> None:
+    async def async_handle_import_statistics_service(service: ServiceCall) -> None:
+        """Handle calls to the import statistics service."""
+        filename = service.data[ATTR_FILENAME]
+        _check_allowed_path(hass, filename)
+        file_format = resolve_file_format(filename, service.data[ATTR_FORMAT])
+        imported = await async_import_statistics_file(
+            hass,
+            instance,
+            filename,
+            file_format,
+            STATISTICS_TABLES_BY_PERIOD[service.data[ATTR_PERIOD]],
+        )
+        _LOGGER.info("Imported %s statistics rows from %s", imported, filename)
+
+    async_register_admin_service(
+        hass,
+        DOMAIN,
+        SERVICE_IMPORT_STATISTICS,
+        async_handle_import_statistics_service,
+        schema=SERVICE_IMPORT_STATISTICS_SCHEMA,
+    )
+
+
 @callback
 def async_register_services(hass: HomeAssistant, instance: Recorder) -> None:
     """Register recorder services."""
@@ -142,3 +256,5 @@ def async_register_services(hass: HomeAssistant, instance: Recorder) -> None:
     _async_register_purge_entities_service(hass, instance)
     _async_register_enable_service(hass, instance)
     _async_register_disable_service(hass, instance)
+    _async_register_export_statistics_service(hass, instance)
+    _async_register_import_statistics_service(hass, instance)
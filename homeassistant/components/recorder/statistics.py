@@ -11,9 +11,10 @@ from itertools import chain, groupby
 import logging
 from operator import itemgetter
 import re
+import time
 from typing import TYPE_CHECKING, Any, Literal, TypedDict, cast
 
-from sqlalchemy import Select, and_, bindparam, func, lambda_stmt, select, text
+from sqlalchemy import Select, and_, bindparam, func, insert, lambda_stmt, select, text
 from sqlalchemy.engine.row import Row
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm.session import Session
@@ -26,6 +27,7 @@ from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.singleton import singleton
 from homeassistant.helpers.typing import UNDEFINED, UndefinedType
 from homeassistant.util import dt as dt_util
+from homeassistant.util.collection import chunked_or_all
 from homeassistant.util.unit_conversion import (
     BaseUnitConverter,
     BloodGlucoseConcentrationConverter,
@@ -81,6 +83,13 @@ from .util import (
     session_scope,
 )
 
+try:
+    from .statistics_numpy import reduce_statistics_rows
+
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
 if TYPE_CHECKING:
     from . import Recorder
 
@@ -177,6 +186,54 @@ def mean(values: list[float]) -> float | None:
 _LOGGER = logging.getLogger(__name__)
 
 
+@dataclasses.dataclass(slots=True)
+class _HourlyStatisticsAccumulator:
+    """Running summary of the short term statistics of an hour."""
+
+    mean_sum: float = 0.0
+    mean_count: int = 0
+    min: float | None = None
+    max: float | None = None
+    last_reset_ts: float | None = None
+    state: float | None = None
+    sum: float | None = None
+
+    def add(self, stat: StatisticData) -> None:
+        """Fold a short term statistic into the summary."""
+        if (mean := stat.get("mean")) is not None:
+            self.mean_sum += mean
+            self.mean_count += 1
+        if (min_ := stat.get("min")) is not None and (
+            self.min is None or min_ < self.min
+        ):
+            self.min = min_
+        if (max_ := stat.get("max")) is not None and (
+            self.max is None or max_ > self.max
+        ):
+            self.max = max_
+        # The last short term statistic of the hour is the one which is kept
+        self.last_reset_ts = datetime_to_timestamp_or_none(stat.get("last_reset"))
+        self.state = stat.get("state")
+        self.sum = stat.get("sum")
+
+    def as_statistic_data(self, start_ts: float) -> StatisticDataTimestamp:
+        """Return the summary as an hourly statistic."""
+        # The columns are None when none of the short term statistics have
+        # them, which is what the database query returns as well.
+        return cast(
+            StatisticDataTimestamp,
+            {
+                "start_ts": start_ts,
+                "mean": self.mean_sum / self.mean_count if self.mean_count else None,
+                "min": self.min,
+                "max": self.max,
+                "last_reset_ts": self.last_reset_ts,
+                "state": self.state,
+                "sum": self.sum,
+            },
+        )
+
+
 @dataclasses.dataclass(slots=True)
 class ShortTermStatisticsRunCache:
     """Cache for short term statistics runs."""
@@ -184,6 +241,14 @@ class ShortTermStatisticsRunCache:
     # This is a mapping of metadata_id:id of the last short term
     # statistics run for each metadata_id
     _latest_id_by_metadata_id: dict[int, int] = dataclasses.field(default_factory=dict)
+    # Running summaries of the short term statistics compiled during the
+    # current hour, they are only valid if every 5-minute period of the
+    # hour has been folded in since the start of the hour.
+    _hourly_summary: dict[int, _HourlyStatisticsAccumulator] = dataclasses.field(
+        default_factory=dict
+    )
+    _hourly_start_ts: float | None = None
+    _hourly_next_start_ts: float | None = None
 
     def get_latest_ids(self, metadata_ids: set[int]) -> dict[int, int]:
         """Return the latest short term statistics ids for the metadata_ids."""
@@ -203,6 +268,57 @@ class ShortTermStatisticsRunCache:
         """Cache the latest id for the each metadata_id."""
         self._latest_id_by_metadata_id.update(metadata_id_to_id)
 
+    def add_short_term_statistics(
+        self, start: datetime, stats: Iterable[tuple[int, StatisticData]]
+    ) -> None:
+        """Fold the short term statistics compiled for a 5-minute period."""
+        start_ts = start.timestamp()
+        if start.minute == 0:
+            self._hourly_summary.clear()
+            self._hourly_start_ts = start_ts
+        elif start_ts != self._hourly_next_start_ts:
+            # There is a gap, the hour has to be compiled from the database
+            self.invalidate_hourly_statistics()
+            return
+        summary = self._hourly_summary
+        for metadata_id, stat in stats:
+            if (accumulator := summary.get(metadata_id)) is None:
+                accumulator = summary[metadata_id] = _HourlyStatisticsAccumulator()
+            accumulator.add(stat)
+        self._hourly_next_start_ts = (start + StatisticsShortTerm.duration).timestamp()
+
+    def pop_hourly_statistics(
+        self, start: datetime
+    ) -> dict[int, StatisticDataTimestamp] | None:
+        """Return the hourly statistics for the hour starting at start.
+
+        Returns None if not all short term statistics of the hour have
+        been folded in, for example after a restart.
+        """
+        start_ts = start.timestamp()
+        end_ts = (start + Statistics.duration).timestamp()
+        summary = self._hourly_summary
+        valid = (
+            self._hourly_start_ts == start_ts and self._hourly_next_start_ts == end_ts
+        )
+        self.invalidate_hourly_statistics()
+        if not valid:
+            return None
+        return {
+            metadata_id: accumulator.as_statistic_data(start_ts)
+            for metadata_id, accumulator in summary.items()
+        }
+
+    def invalidate_hourly_statistics(self) -> None:
+        """Invalidate the running hourly summaries.
+
+        Called when short term statistics are changed outside of
+        the 5-minute statistics compilation.
+        """
+        self._hourly_summary = {}
+        self._hourly_start_ts = None
+        self._hourly_next_start_ts = None
+
 
 class BaseStatisticsRow(TypedDict, total=False):
     """A processed row of statistic data."""
@@ -393,14 +509,27 @@ def _compile_hourly_statistics_last_sum_stmt(
     )
 
 
-def _compile_hourly_statistics(session: Session, start: datetime) -> None:
+def _compile_hourly_statistics(
+    session: Session, start: datetime, run_cache: ShortTermStatisticsRunCache
+) -> None:
     """Compile hourly statistics.
 
     This will summarize 5-minute statistics for one hour:
     - average, min max is computed by a database query
     - sum is taken from the last 5-minute entry during the hour
+
+    If all 5-minute statistics of the hour were compiled since the
+    start of the hour, the summary kept by the run cache is used
+    instead of querying the database.
     """
     start_time = start.replace(minute=0)
+    if (hourly_stats := run_cache.pop_hourly_statistics(start_time)) is not None:
+        session.add_all(
+            Statistics.from_stats_ts(metadata_id, hourly_stat)
+            for metadata_id, hourly_stat in hourly_stats.items()
+        )
+        return
+
     start_time_ts = start_time.timestamp()
     end_time = start_time + Statistics.duration
     end_time_ts = end_time.timestamp()
@@ -576,6 +705,7 @@ def _compile_statistics(
 
     new_short_term_stats: list[StatisticsBase] = []
     updated_metadata_ids: set[int] = set()
+    inserted_stats: list[tuple[int, StatisticData]] = []
     # Insert collected statistics in the database
     for stats in platform_stats:
         modified_statistic_id, metadata_id = statistics_meta_manager.update_or_add(
@@ -591,6 +721,10 @@ def _compile_statistics(
             stats["stat"],
         ):
             new_short_term_stats.append(new_stat)
+            inserted_stats.append((metadata_id, stats["stat"]))
+
+    run_cache = get_short_term_statistics_run_cache(instance.hass)
+    run_cache.add_short_term_statistics(start, inserted_stats)
 
     if start.minute == 50:
         # Once every hour, update issues
@@ -605,7 +739,7 @@ def _compile_statistics(
 
     if start.minute == 55:
         # A full hour is ready, summarize it
-        _compile_hourly_statistics(session, start)
+        _compile_hourly_statistics(session, start, run_cache)
 
     session.add(StatisticsRuns(start=start))
 
@@ -618,7 +752,6 @@ def _compile_statistics(
         # These are always the newest statistics, so we can update
         # the run cache without having to check the start_ts.
         session.flush()  # populate the ids of the new StatisticsShortTerm rows
-        run_cache = get_short_term_statistics_run_cache(instance.hass)
         # metadata_id is typed to allow None, but we know it's not None here
         # so we can safely cast it to int.
         run_cache.set_latest_ids_for_metadata_ids(
@@ -752,6 +885,7 @@ def clear_statistics(instance: Recorder, statistic_ids: list[str]) -> None:
     """Clear statistics for a list of statistic_ids."""
     with session_scope(session=instance.get_session()) as session:
         instance.statistics_meta_manager.delete(session, statistic_ids)
+    get_short_term_statistics_run_cache(instance.hass).invalidate_hourly_statistics()
 
 
 def update_statistics_metadata(
@@ -1118,6 +1252,21 @@ def _reduce_statistics_per_month(
     )
 
 
+type _ReduceTsFactory = Callable[
+    [],
+    tuple[
+        Callable[[float, float], bool],
+        Callable[[float], tuple[float, float]],
+    ],
+]
+
+_PERIOD_REDUCERS: dict[str, tuple[_ReduceTsFactory, timedelta]] = {
+    "day": (reduce_day_ts_factory, timedelta(days=1)),
+    "week": (reduce_week_ts_factory, timedelta(days=7)),
+    "month": (reduce_month_ts_factory, timedelta(days=31)),
+}
+
+
 def _generate_statistics_during_period_stmt(
     start_time: datetime,
     end_time: datetime | None,
@@ -1783,6 +1932,9 @@ def _statistics_during_period_with_session(
     if not stats:
         return {}
 
+    # With NumPy the statistics are reduced to the period while the
+    # SQL results are converted instead of reducing them afterwards
+    reduce_period = _PERIOD_REDUCERS.get(period) if HAS_NUMPY else None
     result = _sorted_statistics_to_dict(
         hass,
         stats,
@@ -1792,16 +1944,18 @@ def _statistics_during_period_with_session(
         table,
         units,
         types,
+        reduce_period,
     )
 
-    if period == "day":
-        result = _reduce_statistics_per_day(result, types)
+    if reduce_period is None:
+        if period == "day":
+            result = _reduce_statistics_per_day(result, types)
 
-    if period == "week":
-        result = _reduce_statistics_per_week(result, types)
+        if period == "week":
+            result = _reduce_statistics_per_week(result, types)
 
-    if period == "month":
-        result = _reduce_statistics_per_month(result, types)
+        if period == "month":
+            result = _reduce_statistics_per_month(result, types)
 
     if "change" in _types:
         _augment_result_with_change(
@@ -2148,8 +2302,13 @@ def _sorted_statistics_to_dict(
     table: type[StatisticsBase],
     units: dict[str, str] | None,
     types: set[Literal["last_reset", "max", "mean", "min", "state", "sum"]],
+    reduce_period: tuple[_ReduceTsFactory, timedelta] | None = None,
 ) -> dict[str, list[StatisticsRow]]:
-    """Convert SQL results into JSON friendly data structure."""
+    """Convert SQL results into JSON friendly data structure.
+
+    If reduce_period is set, the statistics are reduced to the period
+    which requires NumPy.
+    """
     assert stats, "stats must not be empty"  # Guard against implementation error
     result: dict[str, list[StatisticsRow]] = defaultdict(list)
     metadata = dict(_metadata.values())
@@ -2181,6 +2340,9 @@ def _sorted_statistics_to_dict(
     sum_idx = field_map["sum"] if "sum" in types else None
     sum_only = len(types) == 1 and sum_idx is not None
     row_mapping = tuple((key, field_map[key]) for key in types if key in field_map)
+    if reduce_period is not None:
+        reduce_ts_factory, period_duration = reduce_period
+        same_period, period_start_end = reduce_ts_factory()
     # Append all statistic entries, and optionally do unit conversion
     table_duration_seconds = table.duration.total_seconds()
     for meta_id, db_rows in stats_by_meta_id.items():
@@ -2196,6 +2358,13 @@ def _sorted_statistics_to_dict(
         else:
             convert = None
 
+        if reduce_period is not None and convert is None:
+            # Reduce the SQL results without building a dict for each row
+            result[statistic_id] = reduce_statistics_rows(
+                db_rows, start_ts_idx, row_mapping, period_start_end, types
+            )
+            continue
+
         build_args = (db_rows, table_duration_seconds, start_ts_idx)
         if sum_only:
             # This function is extremely flexible and can handle all types of
@@ -2213,6 +2382,15 @@ def _sorted_statistics_to_dict(
         else:
             _stats = _build_stats(*build_args, row_mapping)
 
+        if reduce_period is not None:
+            _stats = _reduce_statistics(
+                {statistic_id: _stats},
+                same_period,
+                period_start_end,
+                period_duration,
+                types,
+            )[statistic_id]
+
         result[statistic_id] = _stats
 
     return result
@@ -2255,6 +2433,55 @@ def _statistics_exists(
     return result.id if result else None
 
 
+def _bulk_import_statistics(
+    session: Session,
+    table: type[StatisticsBase],
+    metadata_id: int,
+    statistics: Iterable[StatisticData],
+    max_bind_vars: int,
+) -> None:
+    """Insert or update many statistics of a statistic at once.
+
+    The existing rows are looked up with one query per chunk of
+    statistics instead of one query per statistic, and the new rows
+    are inserted with executemany instead of one ORM object each.
+    """
+    # If a start is imported more than once, the last statistic wins
+    stats_by_start_ts = {stat["start"].timestamp(): stat for stat in statistics}
+    stat_id_by_start_ts: dict[float | None, int] = {}
+    for start_ts_chunk in chunked_or_all(stats_by_start_ts, max_bind_vars - 1):
+        stat_id_by_start_ts.update(
+            session.execute(
+                select(table.start_ts, table.id)
+                .where(table.metadata_id == metadata_id)
+                .where(table.start_ts.in_(start_ts_chunk))
+            )
+            .tuples()
+            .all()
+        )
+    created_ts = time.time()
+    new_rows: list[dict[str, Any]] = []
+    for start_ts, stat in stats_by_start_ts.items():
+        if stat_id := stat_id_by_start_ts.get(start_ts):
+            _update_statistics(session, table, stat_id, stat)
+            continue
+        new_rows.append(
+            {
+                "metadata_id": metadata_id,
+                "created_ts": created_ts,
+                "start_ts": start_ts,
+                "mean": stat.get("mean"),
+                "min": stat.get("min"),
+                "max": stat.get("max"),
+                "last_reset_ts": datetime_to_timestamp_or_none(stat.get("last_reset")),
+                "state": stat.get("state"),
+                "sum": stat.get("sum"),
+            }
+        )
+    if new_rows:
+        session.execute(insert(table), new_rows)
+
+
 @callback
 def _async_import_statistics(
     hass: HomeAssistant,
@@ -2330,12 +2557,30 @@ def async_add_external_statistics(
     _async_import_statistics(hass, metadata, statistics)
 
 
+def validate_import_metadata(metadata: StatisticMetaData) -> None:
+    """Validate the metadata of statistics which are imported.
+
+    Statistics of entities must have the recorder as source and
+    external statistics the domain of their statistic_id.
+    """
+    statistic_id = metadata["statistic_id"]
+    if valid_entity_id(statistic_id):
+        source = DOMAIN
+    elif valid_statistic_id(statistic_id):
+        source, _object_id = split_statistic_id(statistic_id)
+    else:
+        raise HomeAssistantError("Invalid statistic_id")
+    if not metadata["source"] or metadata["source"] != source:
+        raise HomeAssistantError("Invalid source")
+
+
 def _import_statistics_with_session(
     instance: Recorder,
     session: Session,
     metadata: StatisticMetaData,
     statistics: Iterable[StatisticData],
     table: type[StatisticsBase],
+    bulk: bool = False,
 ) -> bool:
     """Import statistics to the database."""
     statistics_meta_manager = instance.statistics_meta_manager
@@ -2345,11 +2590,18 @@ def _import_statistics_with_session(
     _, metadata_id = statistics_meta_manager.update_or_add(
         session, metadata, old_metadata_dict
     )
-    for stat in statistics:
-        if stat_id := _statistics_exists(session, table, metadata_id, stat["start"]):
-            _update_statistics(session, table, stat_id, stat)
-        else:
-            _insert_statistics(session, table, metadata_id, stat)
+    if bulk:
+        _bulk_import_statistics(
+            session, table, metadata_id, statistics, instance.max_bind_vars
+        )
+    else:
+        for stat in statistics:
+            if stat_id := _statistics_exists(
+                session, table, metadata_id, stat["start"]
+            ):
+                _update_statistics(session, table, stat_id, stat)
+            else:
+                _insert_statistics(session, table, metadata_id, stat)
 
     if table != StatisticsShortTerm:
         return True
@@ -2357,6 +2609,7 @@ def _import_statistics_with_session(
     # We just inserted new short term statistics, so we need to update the
     # ShortTermStatisticsRunCache with the latest id for the metadata_id
     run_cache = get_short_term_statistics_run_cache(instance.hass)
+    run_cache.invalidate_hourly_statistics()
     cache_latest_short_term_statistic_id_for_metadata_id(
         run_cache, session, metadata_id
     )
@@ -2428,8 +2681,14 @@ def import_statistics(
     metadata: StatisticMetaData,
     statistics: Iterable[StatisticData],
     table: type[StatisticsBase],
+    bulk: bool = False,
+    written: Callable[[], None] | None = None,
 ) -> bool:
-    """Process an import_statistics job."""
+    """Process an import_statistics job.
+
+    written is called from the recorder thread once the statistics
+    have been committed.
+    """
 
     with session_scope(
         session=instance.get_session(),
@@ -2437,9 +2696,13 @@ def import_statistics(
             instance, "statistic"
         ),
     ) as session:
-        return _import_statistics_with_session(
-            instance, session, metadata, statistics, table
+        finished = _import_statistics_with_session(
+            instance, session, metadata, statistics, table, bulk
         )
+        if written is not None:
+            session.commit()
+            written()
+        return finished
 
 
 @retryable_database_job("adjust_statistics")
@@ -2465,6 +2728,9 @@ def adjust_statistics(
         ):
             sum_adjustment = convert(sum_adjustment)
 
+        get_short_term_statistics_run_cache(
+            instance.hass
+        ).invalidate_hourly_statistics()
         _adjust_sum_statistics(
             session,
             StatisticsShortTerm,
@@ -2544,6 +2810,9 @@ def change_statistics_unit(
         )
         for table in tables:
             _change_statistics_unit_for_table(session, table, metadata_id, convert)
+        get_short_term_statistics_run_cache(
+            instance.hass
+        ).invalidate_hourly_statistics()
 
         statistics_meta_manager.update_unit_of_measurement(
             session, statistic_id, new_unit
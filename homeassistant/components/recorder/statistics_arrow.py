@@ -0,0 +1,65 @@
+"""Write and read statistics files with Arrow.
+
+This module is only used if pyarrow is installed, statistics_file.py falls
+back to CSV files otherwise.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Generator, Sequence
+from typing import Any
+
+import pyarrow as pa
+from pyarrow import ipc, parquet
+
+_ARROW_TYPES = {bool: pa.bool_(), float: pa.float64(), str: pa.string()}
+
+
+class ArrowStatisticsWriter:
+    """Write statistics to an Arrow IPC or Parquet file."""
+
+    def __init__(
+        self, path: str, columns: Sequence[tuple[str, type]], parquet_format: bool
+    ) -> None:
+        """Open the file."""
+        self._schema = pa.schema(
+            [(name, _ARROW_TYPES[column_type]) for name, column_type in columns]
+        )
+        self._writer: parquet.ParquetWriter | ipc.RecordBatchFileWriter
+        if parquet_format:
+            self._writer = parquet.ParquetWriter(path, self._schema)
+        else:
+            self._writer = ipc.new_file(path, self._schema)
+
+    def write(self, rows: list[tuple[Any, ...]]) -> None:
+        """Write a batch of rows as a record batch."""
+        self._writer.write_batch(
+            pa.RecordBatch.from_arrays(
+                [
+                    pa.array(column, type=field.type)
+                    for column, field in zip(
+                        zip(*rows, strict=True), self._schema, strict=True
+                    )
+                ],
+                schema=self._schema,
+            )
+        )
+
+    def close(self) -> None:
+        """Close the file."""
+        self._writer.close()
+
+
+def iter_arrow_batches(
+    path: str, parquet_format: bool, batch_size: int
+) -> Generator[list[dict[str, Any]]]:
+    """Read the rows of an Arrow IPC or Parquet file in batches."""
+    if parquet_format:
+        with parquet.ParquetFile(path) as file:
+            for batch in file.iter_batches(batch_size=batch_size):
+                yield batch.to_pylist()
+        return
+    with pa.memory_map(path) as source:
+        reader = ipc.open_file(source)
+        for idx in range(reader.num_record_batches):
+            yield reader.get_batch(idx).to_pylist()
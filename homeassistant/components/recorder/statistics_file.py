@@ -0,0 +1,341 @@
+"""Export and import statistics as files."""
+
+from __future__ import annotations
+
+from collections.abc import Generator, Iterable, Iterator, Sequence
+import csv
+from datetime import datetime
+from functools import partial
+from itertools import groupby
+import logging
+from operator import itemgetter
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Protocol
+
+from sqlalchemy import select
+
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+import homeassistant.util.dt as dt_util
+
+from .db_schema import Statistics, StatisticsShortTerm
+from .models import StatisticData, StatisticMetaData
+from .statistics import validate_import_metadata
+from .tasks import ImportStatisticsTask
+from .util import session_scope
+
+try:
+    from .statistics_arrow import ArrowStatisticsWriter, iter_arrow_batches
+
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+if TYPE_CHECKING:
+    from . import Recorder
+
+_LOGGER = logging.getLogger(__name__)
+
+FILE_FORMAT_ARROW = "arrow"
+FILE_FORMAT_AUTO = "auto"
+FILE_FORMAT_CSV = "csv"
+FILE_FORMAT_PARQUET = "parquet"
+FILE_FORMATS = (
+    FILE_FORMAT_ARROW,
+    FILE_FORMAT_AUTO,
+    FILE_FORMAT_CSV,
+    FILE_FORMAT_PARQUET,
+)
+
+_FILE_FORMAT_BY_SUFFIX = {
+    ".arrow": FILE_FORMAT_ARROW,
+    ".csv": FILE_FORMAT_CSV,
+    ".feather": FILE_FORMAT_ARROW,
+    ".parquet": FILE_FORMAT_PARQUET,
+}
+
+# Rows are streamed from the database and written to the file in batches
+FILE_BATCH_SIZE = 10000
+
+# The metadata of each statistic is repeated in every row, which keeps
+# the file a single table. Arrow and Parquet compress the repeated values.
+_METADATA_COLUMNS: tuple[tuple[str, type], ...] = (
+    ("statistic_id", str),
+    ("source", str),
+    ("name", str),
+    ("unit_of_measurement", str),
+    ("has_mean", bool),
+    ("has_sum", bool),
+)
+_STATISTIC_COLUMNS: tuple[tuple[str, type], ...] = (
+    ("start_ts", float),
+    ("mean", float),
+    ("min", float),
+    ("max", float),
+    ("last_reset_ts", float),
+    ("state", float),
+    ("sum", float),
+)
+FILE_COLUMNS = _METADATA_COLUMNS + _STATISTIC_COLUMNS
+
+
+class _StatisticsWriter(Protocol):
+    """A writer of statistics files."""
+
+    def write(self, rows: list[tuple[Any, ...]]) -> None:
+        """Write a batch of rows."""
+
+    def close(self) -> None:
+        """Close the file."""
+
+
+class _CsvStatisticsWriter:
+    """Write statistics to a CSV file."""
+
+    def __init__(self, path: str, columns: Sequence[tuple[str, type]]) -> None:
+        """Open the file and write the header."""
+        self._file = open(path, "w", newline="", encoding="utf-8")  # noqa: SIM115
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(name for name, _ in columns)
+
+    def write(self, rows: list[tuple[Any, ...]]) -> None:
+        """Write a batch of rows, None is written as an empty value."""
+        self._writer.writerows(rows)
+
+    def close(self) -> None:
+        """Close the file."""
+        self._file.close()
+
+
+def _parse_csv_value(column_type: type, value: str) -> Any:
+    """Parse a value of a CSV file."""
+    if column_type is bool:
+        return value == "True"
+    if not value:
+        return None
+    return float(value) if column_type is float else value
+
+
+def _iter_csv_batches(path: str, batch_size: int) -> Generator[list[dict[str, Any]]]:
+    """Read the rows of a CSV file in batches.
+
+    Rows with values which can not be parsed are skipped.
+    """
+    with open(path, newline="", encoding="utf-8") as file:
+        reader = csv.DictReader(file)
+        if missing := [
+            name for name, _ in FILE_COLUMNS if name not in (reader.fieldnames or ())
+        ]:
+            raise HomeAssistantError(
+                f"Statistics file {path} is missing the columns {', '.join(missing)}"
+            )
+        batch: list[dict[str, Any]] = []
+        for row in reader:
+            try:
+                parsed = {
+                    name: _parse_csv_value(column_type, row[name])
+                    for name, column_type in FILE_COLUMNS
+                }
+            except ValueError as err:
+                _LOGGER.warning(
+                    "Not importing line %s of %s: %s", reader.line_num, path, err
+                )
+                continue
+            batch.append(parsed)
+            if len(batch) == batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+
+def resolve_file_format(path: str, file_format: str) -> str:
+    """Return the format of a statistics file.
+
+    The format is picked from the suffix of the file if it is auto, files
+    with an unknown suffix are Parquet files if pyarrow is installed and
+    CSV files otherwise.
+    """
+    if file_format == FILE_FORMAT_AUTO:
+        file_format = _FILE_FORMAT_BY_SUFFIX.get(
+            Path(path).suffix.lower(),
+            FILE_FORMAT_PARQUET if HAS_PYARROW else FILE_FORMAT_CSV,
+        )
+    if file_format != FILE_FORMAT_CSV and not HAS_PYARROW:
+        raise HomeAssistantError(
+            f"pyarrow must be installed to use {file_format} files"
+        )
+    return file_format
+
+
+def _open_writer(path: str, file_format: str) -> _StatisticsWriter:
+    """Open a statistics file for writing."""
+    if file_format == FILE_FORMAT_CSV:
+        return _CsvStatisticsWriter(path, FILE_COLUMNS)
+    return ArrowStatisticsWriter(path, FILE_COLUMNS, file_format == FILE_FORMAT_PARQUET)
+
+
+def _iter_batches(path: str, file_format: str) -> Generator[list[dict[str, Any]]]:
+    """Read the rows of a statistics file in batches."""
+    if file_format == FILE_FORMAT_CSV:
+        return _iter_csv_batches(path, FILE_BATCH_SIZE)
+    return iter_arrow_batches(path, file_format == FILE_FORMAT_PARQUET, FILE_BATCH_SIZE)
+
+
+def export_statistics_file(
+    instance: Recorder,
+    path: str,
+    file_format: str,
+    table: type[Statistics | StatisticsShortTerm],
+    statistic_ids: set[str] | None,
+    start_time: datetime | None,
+    end_time: datetime | None,
+) -> int:
+    """Export statistics to a file and return the number of exported rows.
+
+    The rows are streamed from the database in batches so the export
+    does not need to hold all statistics in memory.
+    """
+    with session_scope(hass=instance.hass, read_only=True) as session:
+        metadata = instance.statistics_meta_manager.get_many(
+            session, statistic_ids=statistic_ids
+        )
+        metadata_columns = {
+            metadata_id: tuple(meta[name] for name, _ in _METADATA_COLUMNS)  # type: ignore[literal-required]
+            for metadata_id, meta in metadata.values()
+        }
+        stmt = select(
+            table.metadata_id,
+            *(getattr(table, name) for name, _ in _STATISTIC_COLUMNS),
+        )
+        if statistic_ids is not None:
+            stmt = stmt.where(table.metadata_id.in_(metadata_columns))
+        if start_time is not None:
+            stmt = stmt.where(table.start_ts >= start_time.timestamp())
+        if end_time is not None:
+            stmt = stmt.where(table.start_ts < end_time.timestamp())
+        stmt = stmt.order_by(table.metadata_id, table.start_ts)
+        exported = 0
+        writer = _open_writer(path, file_format)
+        try:
+            # yield_per streams the rows with a server side cursor
+            # where the database supports it
+            for partition in session.execute(
+                stmt.execution_options(yield_per=FILE_BATCH_SIZE)
+            ).partitions():
+                rows = [
+                    metadata_columns[row[0]] + tuple(row[1:])
+                    for row in partition
+                    if row[0] in metadata_columns
+                ]
+                if rows:
+                    writer.write(rows)
+                    exported += len(rows)
+        finally:
+            writer.close()
+    return exported
+
+
+def _statistics_from_rows(
+    rows: Iterable[dict[str, Any]],
+    table: type[Statistics | StatisticsShortTerm],
+) -> Iterator[tuple[StatisticMetaData, list[StatisticData]]]:
+    """Group the rows of a statistics file by statistic."""
+    period_seconds = table.duration.total_seconds()
+    for statistic_id, statistic_rows in groupby(rows, itemgetter("statistic_id")):
+        if not isinstance(statistic_id, str):
+            _LOGGER.warning("Not importing statistics without a statistic_id")
+            continue
+        first_row, *other_rows = statistic_rows
+        metadata: StatisticMetaData = {
+            "has_mean": first_row["has_mean"],
+            "has_sum": first_row["has_sum"],
+            "name": first_row["name"],
+            "source": first_row["source"],
+            "statistic_id": statistic_id,
+            "unit_of_measurement": first_row["unit_of_measurement"],
+        }
+        try:
+            validate_import_metadata(metadata)
+        except HomeAssistantError as err:
+            _LOGGER.warning("Not importing statistics of %s: %s", statistic_id, err)
+            continue
+        statistics: list[StatisticData] = []
+        for row in (first_row, *other_rows):
+            if (start_ts := row["start_ts"]) is None:
+                _LOGGER.warning(
+                    "Not importing statistics of %s without a start", statistic_id
+                )
+                continue
+            if start_ts % period_seconds:
+                _LOGGER.warning(
+                    "Not importing statistics of %s starting at %s: "
+                    "not at the start of a period",
+                    statistic_id,
+                    start_ts,
+                )
+                continue
+            statistic: StatisticData = {
+                "start": dt_util.utc_from_timestamp(start_ts),
+                "mean": row["mean"],
+                "min": row["min"],
+                "max": row["max"],
+                "state": row["state"],
+                "sum": row["sum"],
+            }
+            if (last_reset_ts := row["last_reset_ts"]) is not None:
+                statistic["last_reset"] = dt_util.utc_from_timestamp(last_reset_ts)
+            statistics.append(statistic)
+        if statistics:
+            yield metadata, statistics
+
+
+def _next_statistics(
+    batches: Iterator[list[dict[str, Any]]],
+    table: type[Statistics | StatisticsShortTerm],
+) -> list[tuple[StatisticMetaData, list[StatisticData]]] | None:
+    """Read the next batch of a statistics file and group it by statistic.
+
+    None is returned once all batches have been read.
+    """
+    if (batch := next(batches, None)) is None:
+        return None
+    return list(_statistics_from_rows(batch, table))
+
+
+async def async_import_statistics_file(
+    hass: HomeAssistant,
+    instance: Recorder,
+    path: str,
+    file_format: str,
+    table: type[Statistics | StatisticsShortTerm],
+) -> int:
+    """Import statistics from a file and return the number of imported rows.
+
+    The file is read in batches and each batch is imported in bulk by the
+    recorder before the next batch is read, so the import does not need
+    to hold the whole file in memory.
+    """
+    batches = _iter_batches(path, file_format)
+    # The number of rows of each import the recorder has committed
+    written: list[int] = []
+    try:
+        while (
+            batch_statistics := await hass.async_add_executor_job(
+                _next_statistics, batches, table
+            )
+        ) is not None:
+            for metadata, statistics in batch_statistics:
+                instance.queue_task(
+                    ImportStatisticsTask(
+                        metadata,
+                        statistics,
+                        table,
+                        bulk=True,
+                        written=partial(written.append, len(statistics)),
+                    )
+                )
+            await instance.async_block_till_done()
+    finally:
+        await hass.async_add_executor_job(batches.close)
+    return sum(written)
@@ -0,0 +1,104 @@
+"""Reduce statistics to longer periods with NumPy.
+
+This module is only used if NumPy is installed, statistics.py falls back
+to reducing the statistics in pure Python otherwise.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Sequence
+import math
+from typing import TYPE_CHECKING, Any, Literal
+
+import numpy as np
+from sqlalchemy.engine.row import Row
+
+if TYPE_CHECKING:
+    from .statistics import StatisticsRow
+
+
+def _reduce_min_max(
+    reduce: np.ufunc, column: Sequence[float | None], first_idx: np.ndarray
+) -> list[float | None]:
+    """Reduce a column per period, None values are skipped."""
+    return [
+        None if math.isnan(value) else value
+        for value in reduce.reduceat(
+            np.array(column, dtype=np.float64), first_idx
+        ).tolist()
+    ]
+
+
+def reduce_statistics_rows(
+    db_rows: list[Row],
+    start_ts_idx: int,
+    row_mapping: tuple[tuple[str, int], ...],
+    period_start_end: Callable[[float], tuple[float, float]],
+    types: set[Literal["last_reset", "max", "mean", "min", "state", "sum"]],
+) -> list[StatisticsRow]:
+    """Reduce the hourly statistics rows of a statistic to longer periods.
+
+    This is equivalent to building a StatisticsRow for each database row
+    and reducing them with _reduce_statistics, but the rows are turned into
+    columns once and reduced per period instead of row by row. The rows
+    must be sorted by start.
+    """
+    columns = list(zip(*db_rows, strict=True))
+    column_by_key: dict[str, tuple[Any, ...]] = {
+        key: columns[idx] for key, idx in row_mapping
+    }
+    starts = np.array(columns[start_ts_idx], dtype=np.float64)
+    count = len(starts)
+
+    # Find the boundaries of the periods once, the first row of the
+    # next period is the first row starting at or after the end of
+    # the current period.
+    periods: list[tuple[float, float]] = []
+    first_idx_list: list[int] = []
+    idx = 0
+    while idx < count:
+        start_end = period_start_end(columns[start_ts_idx][idx])
+        periods.append(start_end)
+        first_idx_list.append(idx)
+        idx = int(starts.searchsorted(start_end[1]))
+    first_idx = np.array(first_idx_list, dtype=np.intp)
+    last_idx_list = [idx - 1 for idx in first_idx_list[1:]]
+    last_idx_list.append(count - 1)
+
+    reduced: dict[str, list[Any]] = {}
+    if "mean" in types:
+        if (mean_column := column_by_key.get("mean")) is None:
+            reduced["mean"] = [None] * len(periods)
+        else:
+            means = np.array(mean_column, dtype=np.float64)
+            has_mean = ~np.isnan(means)
+            reduced["mean"] = []
+            for first, last in zip(first_idx_list, last_idx_list, strict=True):
+                # The mean is summed with the builtin sum to give exactly
+                # the same result as the pure Python reduction
+                values = means[first : last + 1][has_mean[first : last + 1]].tolist()
+                reduced["mean"].append(sum(values) / len(values) if values else None)
+    for key, reduce in (("min", np.fmin), ("max", np.fmax)):
+        if key not in types:
+            continue
+        if (column := column_by_key.get(key)) is None:
+            reduced[key] = [None] * len(periods)
+        else:
+            reduced[key] = _reduce_min_max(reduce, column, first_idx)
+    for key in ("last_reset", "state", "sum"):
+        if key not in types:
+            continue
+        # The last statistic of the period is the one which is kept
+        if (column := column_by_key.get(key)) is None:
+            reduced[key] = [None] * len(periods)
+        else:
+            reduced[key] = [column[idx] for idx in last_idx_list]
+
+    return [
+        {
+            "start": start,
+            "end": end,
+            **{key: values[period_idx] for key, values in reduced.items()},  # type: ignore[typeddict-item]
+        }
+        for period_idx, (start, end) in enumerate(periods)
+    ]
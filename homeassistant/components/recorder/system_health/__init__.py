@@ -55,6 +55,17 @@ def _async_get_db_engine_info(instance: Recorder) -> dict[str, Any]:
     return db_engine_info
 
 
+@callback
+def _async_get_purge_progress_info(instance: Recorder) -> dict[str, Any]:
+    """Get info about the running purge."""
+    if (progress := instance.purge_progress) is None:
+        return {}
+    return {
+        "purge_rows_remaining": progress.rows_remaining,
+        "purge_rate": f"{progress.rate:.0f} rows/s",
+    }
+
+
 async def system_health_info(hass: HomeAssistant) -> dict[str, Any]:
     """Get info for the info page."""
     instance = get_instance(hass)
@@ -72,4 +83,6 @@ async def system_health_info(hass: HomeAssistant) -> dict[str, Any]:
             "oldest_recorder_run": recorder_runs_manager.first.start,
             "current_recorder_run": recorder_runs_manager.current.start,
         }
-    return db_runs | db_stats | db_engine_info
+    return (
+        db_runs | db_stats | db_engine_info | _async_get_purge_progress_info(instance)
+    )
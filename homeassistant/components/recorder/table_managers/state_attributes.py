@@ -42,7 +42,7 @@ class StateAttributesManager(BaseLRUTableManager[StateAttributes]):
         """Serialize event data."""
         try:
             return StateAttributes.shared_attrs_bytes_from_event(
-                event, self.recorder.dialect_name
+                event, self.recorder.dialect_name, self.recorder.compress_attributes
             )
         except JSON_ENCODE_EXCEPTIONS as ex:
             _LOGGER.warning(
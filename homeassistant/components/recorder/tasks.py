@@ -118,8 +118,15 @@ class PurgeTask(RecorderTask):
     def run(self, instance: Recorder) -> None:
         """Purge the database."""
         if purge.purge_old_data(
-            instance, self.purge_before, self.repack, self.apply_filter
+            instance,
+            self.purge_before,
+            self.repack,
+            self.apply_filter,
+            time_budget=instance.purge_time_budget,
         ):
+            if instance.purge_progress:
+                instance.purge_progress = None
+                instance.save_purge_progress()
             with instance.get_session() as session:
                 instance.recorder_runs_manager.load_from_db(session)
             # We always need to do the db cleanups after a purge
@@ -127,12 +134,43 @@ class PurgeTask(RecorderTask):
             # tasks happen after a vacuum.
             periodic_db_cleanups(instance)
             return
+        if instance.purge_progress:
+            instance.save_purge_progress()
         # Schedule a new purge task if this one didn't finish
         instance.queue_task(
             PurgeTask(self.purge_before, self.repack, self.apply_filter)
         )
 
 
+@dataclass(slots=True)
+class ResumePurgeTask(RecorderTask):
+    """Object to resume a purge that was interrupted by a restart."""
+
+    progress: purge.PurgeProgress
+
+    def run(self, instance: Recorder) -> None:
+        """Resume the purge from the saved cursors."""
+        if instance.purge_progress is None:
+            instance.purge_progress = self.progress
+        progress = instance.purge_progress
+        PurgeTask(progress.purge_before, progress.repack, progress.apply_filter).run(
+            instance
+        )
+
+
+@dataclass(slots=True)
+class LogbookEntriesTask(RecorderTask):
+    """An object to insert into the recorder queue to add logbook index rows."""
+
+    commit_before = False
+
+    entries: list[dict[str, Any]]
+
+    def run(self, instance: Recorder) -> None:
+        """Add the rows to be written with the next commit."""
+        instance.add_logbook_entries(self.entries)
+
+
 @dataclass(slots=True)
 class PurgeEntitiesTask(RecorderTask):
     """Object to store entity information about purge task."""
@@ -194,16 +232,25 @@ class ImportStatisticsTask(RecorderTask):
     metadata: StatisticMetaData
     statistics: Iterable[StatisticData]
     table: type[Statistics | StatisticsShortTerm]
+    bulk: bool = False
+    written: Callable[[], None] | None = None
 
     def run(self, instance: Recorder) -> None:
         """Run statistics task."""
         if statistics.import_statistics(
-            instance, self.metadata, self.statistics, self.table
+            instance,
+            self.metadata,
+            self.statistics,
+            self.table,
+            self.bulk,
+            self.written,
         ):
             return
         # Schedule a new statistics task if this one didn't finish
         instance.queue_task(
-            ImportStatisticsTask(self.metadata, self.statistics, self.table)
+            ImportStatisticsTask(
+                self.metadata, self.statistics, self.table, self.bulk, self.written
+            )
         )
 
 
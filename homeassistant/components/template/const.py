@@ -5,13 +5,16 @@ from homeassistant.const import Platform
 from homeassistant.helpers.typing import ConfigType
 
 CONF_ACTION = "action"
+CONF_ANALYZE_TEMPLATES = "analyze_templates"
 CONF_ATTRIBUTE_TEMPLATES = "attribute_templates"
 CONF_ATTRIBUTES = "attributes"
 CONF_AVAILABILITY = "availability"
 CONF_AVAILABILITY_TEMPLATE = "availability_template"
+CONF_COALESCE_RENDERS = "coalesce_renders"
 CONF_CONDITION = "condition"
 CONF_MAX = "max"
 CONF_MIN = "min"
+CONF_MIN_RENDER_INTERVAL = "min_render_interval"
 CONF_OBJECT_ID = "object_id"
 CONF_PICTURE = "picture"
 CONF_PRESS = "press"
@@ -55,10 +55,13 @@ from homeassistant.helpers.trigger_template_entity import (
 from homeassistant.helpers.typing import ConfigType
 
 from .const import (
+    CONF_ANALYZE_TEMPLATES,
     CONF_ATTRIBUTE_TEMPLATES,
     CONF_ATTRIBUTES,
     CONF_AVAILABILITY,
     CONF_AVAILABILITY_TEMPLATE,
+    CONF_COALESCE_RENDERS,
+    CONF_MIN_RENDER_INTERVAL,
     CONF_PICTURE,
 )
 
@@ -80,6 +83,9 @@ TEMPLATE_ENTITY_COMMON_SCHEMA = vol.Schema(
     {
         vol.Optional(CONF_ATTRIBUTES): vol.Schema({cv.string: cv.template}),
         vol.Optional(CONF_AVAILABILITY): cv.template,
+        vol.Optional(CONF_ANALYZE_TEMPLATES): cv.boolean,
+        vol.Optional(CONF_COALESCE_RENDERS): cv.boolean,
+        vol.Optional(CONF_MIN_RENDER_INTERVAL): cv.positive_time_period,
         vol.Optional(CONF_VARIABLES): cv.SCRIPT_VARIABLES_SCHEMA,
     }
 ).extend(TEMPLATE_ENTITY_BASE_SCHEMA.schema)
@@ -91,6 +97,9 @@ def make_template_entity_common_schema(default_name: str) -> vol.Schema:
         {
             vol.Optional(CONF_ATTRIBUTES): vol.Schema({cv.string: cv.template}),
             vol.Optional(CONF_AVAILABILITY): cv.template,
+            vol.Optional(CONF_ANALYZE_TEMPLATES): cv.boolean,
+            vol.Optional(CONF_COALESCE_RENDERS): cv.boolean,
+            vol.Optional(CONF_MIN_RENDER_INTERVAL): cv.positive_time_period,
         }
     ).extend(make_template_entity_base_schema(default_name).schema)
 
@@ -293,6 +302,9 @@ class TemplateEntity(Entity):  # pylint: disable=hass-enforce-class-module
             self._friendly_name_template = None
             self._run_variables = {}
             self._blueprint_inputs = None
+            self._min_render_interval: float | None = None
+            self._analyze_templates = False
+            self._coalesce_renders = False
         else:
             self._attribute_templates = config.get(CONF_ATTRIBUTES)
             self._availability_template = config.get(CONF_AVAILABILITY)
@@ -301,6 +313,13 @@ class TemplateEntity(Entity):  # pylint: disable=hass-enforce-class-module
             self._friendly_name_template = config.get(CONF_NAME)
             self._run_variables = config.get(CONF_VARIABLES, {})
             self._blueprint_inputs = config.get("raw_blueprint_inputs")
+            self._min_render_interval = (
+                min_render_interval.total_seconds()
+                if (min_render_interval := config.get(CONF_MIN_RENDER_INTERVAL))
+                else None
+            )
+            self._analyze_templates = config.get(CONF_ANALYZE_TEMPLATES, False)
+            self._coalesce_renders = config.get(CONF_COALESCE_RENDERS, False)
 
         class DummyState(State):
             """None-state for template entities not yet added to the state machine."""
@@ -492,7 +511,9 @@ class TemplateEntity(Entity):  # pylint: disable=hass-enforce-class-module
         }
 
         for template, attributes in self._template_attrs.items():
-            template_var_tup = TrackTemplate(template, variables)
+            template_var_tup = TrackTemplate(
+                template, variables, min_render_interval=self._min_render_interval
+            )
             is_availability_template = False
             for attribute in attributes:
                 if attribute._attribute == "_attr_available":  # noqa: SLF001
@@ -511,6 +532,14 @@ class TemplateEntity(Entity):  # pylint: disable=hass-enforce-class-module
             self._handle_results,
             log_fn=log_fn,
             has_super_template=has_availability_template,
+            # Entities can opt in to finding the states of their templates
+            # without a first render, the templates are then rendered by the
+            # refresh below. The preview always renders them to report the
+            # errors of the first render.
+            analyze_templates=log_fn is None and self._analyze_templates,
+            # Entities can opt in to re-rendering their templates once
+            # for a burst of state changes instead of once per change
+            coalesce_renders=log_fn is None and self._coalesce_renders,
         )
         self.async_on_remove(result_info.async_remove)
         self._template_result_info = result_info
@@ -65,8 +65,10 @@ from homeassistant.util.json import format_unserializable_data
 from . import const, decorators, messages
 from .connection import ActiveConnection
 from .messages import construct_result_message
+from .state_broadcast import async_get_state_broadcaster
 
 ALL_SERVICE_DESCRIPTIONS_JSON_CACHE = "websocket_api_all_service_descriptions_json"
+ALL_STATES_JSON_CACHE = "websocket_api_all_states_json"
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -110,29 +112,31 @@ def _forward_events_check_permissions(
     send_message: Callable[[bytes | str | dict[str, Any]], None],
     user: User,
     message_id_as_bytes: bytes,
-    event: Event,
+    events: list[Event],
 ) -> None:
     """Forward state changed events to websocket."""
     # We have to lookup the permissions again because the user might have
     # changed since the subscription was created.
     permissions = user.permissions
-    if (
-        not user.is_admin
-        and not permissions.access_all_entities(POLICY_READ)
-        and not permissions.check_entity(event.data["entity_id"], POLICY_READ)
-    ):
-        return
-    send_message(messages.cached_event_message(message_id_as_bytes, event))
+    check_entity = (
+        None
+        if user.is_admin or permissions.access_all_entities(POLICY_READ)
+        else permissions.check_entity
+    )
+    for event in events:
+        if check_entity is None or check_entity(event.data["entity_id"], POLICY_READ):
+            send_message(messages.cached_event_message(message_id_as_bytes, event))
 
 
 @callback
 def _forward_events_unconditional(
     send_message: Callable[[bytes | str | dict[str, Any]], None],
     message_id_as_bytes: bytes,
-    event: Event,
+    events: list[Event],
 ) -> None:
     """Forward events to websocket."""
-    send_message(messages.cached_event_message(message_id_as_bytes, event))
+    for event in events:
+        send_message(messages.cached_event_message(message_id_as_bytes, event))
 
 
 @callback
@@ -170,7 +174,9 @@ def handle_subscribe_events(
             _forward_events_unconditional, connection.send_message, message_id_as_bytes
         )
 
-    connection.subscriptions[msg["id"]] = hass.bus.async_listen(
+    # Events are forwarded in batches since subscribers to
+    # all events can be flooded with them in an event storm
+    connection.subscriptions[msg["id"]] = hass.bus.async_listen_batch(
         event_type, forward_events
     )
 
@@ -330,6 +336,12 @@ def handle_get_states(
     hass: HomeAssistant, connection: ActiveConnection, msg: dict[str, Any]
 ) -> None:
     """Handle get states command."""
+    user = connection.user
+    if user.is_admin or user.permissions.access_all_entities(POLICY_READ):
+        if (payload := _async_get_all_states_json(hass)) is not None:
+            connection.send_message(construct_result_message(msg["id"], payload))
+            return
+
     states = _async_get_allowed_states(hass, connection)
 
     try:
@@ -356,6 +368,38 @@ def handle_get_states(
     _send_handle_get_states_response(connection, msg["id"], serialized_states)
 
 
+@callback
+def _async_get_all_states_json(hass: HomeAssistant) -> bytes | None:
+    """Return JSON of all states, or None if a state can not be serialized.
+
+    Only the states changed since the last call are serialized again.
+    """
+    generation = hass.states.async_generation()
+    changed: list[str] | None = None
+    if ALL_STATES_JSON_CACHE in hass.data:
+        cached_generation, serialized_states, cached_json_payload = hass.data[
+            ALL_STATES_JSON_CACHE
+        ]
+        # If no state changed, return the cached JSON payload
+        if cached_generation == generation:
+            return cast(bytes, cached_json_payload)
+        changed = hass.states.async_entity_ids_changed_since(cached_generation)
+    if changed is None:
+        # Serialize all states in the order async_all returns them
+        serialized_states = {}
+        changed = hass.states.async_entity_ids()
+    try:
+        for entity_id in changed:
+            if (state := hass.states.get(entity_id)) is not None:
+                serialized_states[entity_id] = state.as_dict_json
+    except (ValueError, TypeError):
+        hass.data.pop(ALL_STATES_JSON_CACHE, None)
+        return None
+    json_payload = b"".join((b"[", b",".join(serialized_states.values()), b"]"))
+    hass.data[ALL_STATES_JSON_CACHE] = (generation, serialized_states, json_payload)
+    return json_payload
+
+
 def _send_handle_get_states_response(
     connection: ActiveConnection, msg_id: int, serialized_states: list[bytes]
 ) -> None:
@@ -367,33 +411,6 @@ def _send_handle_get_states_response(
     )
 
 
-@callback
-def _forward_entity_changes(
-    send_message: Callable[[str | bytes | dict[str, Any]], None],
-    entity_ids: set[str] | None,
-    entity_filter: Callable[[str], bool] | None,
-    user: User,
-    message_id_as_bytes: bytes,
-    event: Event[EventStateChangedData],
-) -> None:
-    """Forward entity state changed events to websocket."""
-    entity_id = event.data["entity_id"]
-    if (entity_ids and entity_id not in entity_ids) or (
-        entity_filter and not entity_filter(entity_id)
-    ):
-        return
-    # We have to lookup the permissions again because the user might have
-    # changed since the subscription was created.
-    permissions = user.permissions
-    if (
-        not user.is_admin
-        and not permissions.access_all_entities(POLICY_READ)
-        and not permissions.check_entity(entity_id, POLICY_READ)
-    ):
-        return
-    send_message(messages.cached_state_diff_message(message_id_as_bytes, event))
-
-
 @callback
 @decorators.websocket_command(
     {
@@ -415,17 +432,9 @@ def handle_subscribe_entities(
     states = _async_get_allowed_states(hass, connection)
     msg_id = msg["id"]
     message_id_as_bytes = str(msg_id).encode()
-    connection.subscriptions[msg_id] = hass.bus.async_listen(
-        EVENT_STATE_CHANGED,
-        partial(
-            _forward_entity_changes,
-            connection.send_message,
-            entity_ids,
-            entity_filter,
-            connection.user,
-            message_id_as_bytes,
-        ),
-    )
+    connection.subscriptions[msg_id] = async_get_state_broadcaster(
+        hass
+    ).async_subscribe(connection, message_id_as_bytes, entity_ids, entity_filter)
     connection.send_result(msg_id)
 
     # JSON serialize here so we can recover if it blows up due to the
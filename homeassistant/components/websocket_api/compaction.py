@@ -0,0 +1,279 @@
+"""Compact the queued messages of a websocket client that falls behind.
+
+A client that reads its messages slower than they are produced is sent
+the same information with fewer messages: the queued state changes of
+each subscribe_entities subscription are merged into a single message at
+the position of its first queued change, with one change for each entity.
+Every change is a diff of the current state, so the client ends up with
+the same states.
+
+All other messages, including the events of subscribe_events
+subscriptions, are kept in order since their listeners may rely on
+every event.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from typing import Any
+
+from homeassistant.const import (
+    COMPRESSED_STATE_ATTRIBUTES,
+    COMPRESSED_STATE_CONTEXT,
+    COMPRESSED_STATE_LAST_CHANGED,
+    COMPRESSED_STATE_LAST_UPDATED,
+)
+from homeassistant.helpers.json import json_bytes
+from homeassistant.util.json import json_loads
+
+from .messages import (
+    ENTITY_EVENT_ADD,
+    ENTITY_EVENT_CHANGE,
+    ENTITY_EVENT_REMOVE,
+    STATE_DIFF_ADDITIONS,
+    STATE_DIFF_REMOVALS,
+)
+
+_ENTITY_EVENT_KEYS = frozenset(
+    (ENTITY_EVENT_ADD, ENTITY_EVENT_CHANGE, ENTITY_EVENT_REMOVE)
+)
+
+# The state changes of subscribe_entities subscriptions are serialized
+# without the id first, see messages.cached_state_diff_message
+_ENTITY_CHANGES_PREFIXES = tuple(
+    b'{"type":"event","event":{"%s":' % kind.encode()
+    for kind in (ENTITY_EVENT_ADD, ENTITY_EVENT_CHANGE, ENTITY_EVENT_REMOVE)
+)
+
+# The kind of an entity change (add, change or remove) and its payload
+type _EntityChange = tuple[str, Any]
+
+
+def _merge_context(old: Any, new: Any, full_state: bool) -> Any:
+    """Merge a context diff into a context or an earlier context diff.
+
+    A context is an id if the context has no parent_id and user_id, and
+    a context diff is an id if only the id changed.
+    """
+    if isinstance(new, str):
+        return {**old, "id": new} if isinstance(old, dict) else new
+    if isinstance(old, dict):
+        return {**old, **new}
+    if full_state:
+        return {"id": old, "parent_id": None, "user_id": None, **new}
+    return {"id": old, **new}
+
+
+def _apply_diff(
+    compressed_state: dict[str, Any], diff: dict[str, Any]
+) -> dict[str, Any]:
+    """Apply a state diff to a compressed state like the client does."""
+    result = dict(compressed_state)
+    for key, value in diff.get(STATE_DIFF_ADDITIONS, {}).items():
+        if key == COMPRESSED_STATE_ATTRIBUTES:
+            result[key] = {**result.get(key, {}), **value}
+        elif key == COMPRESSED_STATE_CONTEXT:
+            result[key] = _merge_context(result.get(key), value, True)
+        elif key == COMPRESSED_STATE_LAST_CHANGED:
+            # The last updated time defaults to the last changed time
+            result[key] = value
+            result.pop(COMPRESSED_STATE_LAST_UPDATED, None)
+        else:
+            result[key] = value
+    if removed := diff.get(STATE_DIFF_REMOVALS, {}).get(COMPRESSED_STATE_ATTRIBUTES):
+        attributes = result[COMPRESSED_STATE_ATTRIBUTES] = dict(
+            result.get(COMPRESSED_STATE_ATTRIBUTES, {})
+        )
+        for key in removed:
+            attributes.pop(key, None)
+    return result
+
+
+def _merge_diffs(old: dict[str, Any], new: dict[str, Any]) -> dict[str, Any] | None:
+    """Merge two consecutive state diffs of an entity.
+
+    None is returned if a single diff can not express both, which is the
+    case if the first diff changed the last changed time and the second
+    one only the last updated time.
+    """
+    old_additions: dict[str, Any] = old.get(STATE_DIFF_ADDITIONS, {})
+    new_additions: dict[str, Any] = new.get(STATE_DIFF_ADDITIONS, {})
+    if COMPRESSED_STATE_LAST_CHANGED in new_additions:
+        old_additions = {
+            key: value
+            for key, value in old_additions.items()
+            if key != COMPRESSED_STATE_LAST_UPDATED
+        }
+    elif (
+        COMPRESSED_STATE_LAST_UPDATED in new_additions
+        and COMPRESSED_STATE_LAST_CHANGED in old_additions
+    ):
+        return None
+    additions = {**old_additions, **new_additions}
+    new_attributes: dict[str, Any] = new_additions.get(COMPRESSED_STATE_ATTRIBUTES, {})
+    if COMPRESSED_STATE_ATTRIBUTES in old_additions and new_attributes:
+        additions[COMPRESSED_STATE_ATTRIBUTES] = {
+            **old_additions[COMPRESSED_STATE_ATTRIBUTES],
+            **new_attributes,
+        }
+    if COMPRESSED_STATE_CONTEXT in old_additions and (
+        COMPRESSED_STATE_CONTEXT in new_additions
+    ):
+        additions[COMPRESSED_STATE_CONTEXT] = _merge_context(
+            old_additions[COMPRESSED_STATE_CONTEXT],
+            new_additions[COMPRESSED_STATE_CONTEXT],
+            False,
+        )
+    diff: dict[str, Any] = {STATE_DIFF_ADDITIONS: additions}
+    # The client applies the additions of a diff before its removals
+    removed = {
+        key
+        for key in old.get(STATE_DIFF_REMOVALS, {}).get(COMPRESSED_STATE_ATTRIBUTES, ())
+        if key not in new_attributes
+    }
+    removed.update(
+        new.get(STATE_DIFF_REMOVALS, {}).get(COMPRESSED_STATE_ATTRIBUTES, ())
+    )
+    if removed:
+        diff[STATE_DIFF_REMOVALS] = {COMPRESSED_STATE_ATTRIBUTES: sorted(removed)}
+    return diff
+
+
+def _merge_entity_changes(
+    old: _EntityChange, new: _EntityChange
+) -> _EntityChange | None:
+    """Merge two consecutive changes of an entity or return None."""
+    if new[0] != ENTITY_EVENT_CHANGE:
+        # Adding an entity replaces its state, removing it drops the state
+        return new
+    if old[0] == ENTITY_EVENT_ADD:
+        return (ENTITY_EVENT_ADD, _apply_diff(old[1], new[1]))
+    if (
+        old[0] == ENTITY_EVENT_CHANGE
+        and (diff := _merge_diffs(old[1], new[1])) is not None
+    ):
+        return (ENTITY_EVENT_CHANGE, diff)
+    return None
+
+
+def _entity_changes(event: dict[str, Any]) -> list[tuple[str, _EntityChange]] | None:
+    """Return the entity changes of a subscribe_entities event.
+
+    None is returned if the event is not a subscribe_entities event or
+    has no changes.
+    """
+    if not event or not event.keys() <= _ENTITY_EVENT_KEYS:
+        return None
+    changes: list[tuple[str, _EntityChange]] = []
+    for kind in (ENTITY_EVENT_ADD, ENTITY_EVENT_CHANGE):
+        if (entities := event.get(kind)) is None:
+            continue
+        if not isinstance(entities, dict):
+            return None
+        for entity_id, payload in entities.items():
+            if not isinstance(payload, dict):
+                return None
+            changes.append((entity_id, (kind, payload)))
+    if (removals := event.get(ENTITY_EVENT_REMOVE)) is not None:
+        if not isinstance(removals, list):
+            return None
+        changes.extend(
+            (entity_id, (ENTITY_EVENT_REMOVE, None)) for entity_id in removals
+        )
+    return changes or None
+
+
+def _entity_changes_messages(
+    message_id: int, entities: dict[str, list[_EntityChange]]
+) -> list[bytes]:
+    """Return the messages of the merged changes of a subscription.
+
+    Each entity has a single change unless its changes could not be merged,
+    the n-th message has the n-th change of the entities. The messages are
+    serialized like the changes they replace, so they can be compacted again.
+    """
+    messages: list[bytes] = []
+    for index in range(max(len(changes) for changes in entities.values())):
+        event: dict[str, Any] = {}
+        for entity_id, changes in entities.items():
+            if index >= len(changes):
+                continue
+            kind, payload = changes[index]
+            if kind == ENTITY_EVENT_REMOVE:
+                event.setdefault(kind, []).append(entity_id)
+            else:
+                event.setdefault(kind, {})[entity_id] = payload
+        messages.append(
+            b"".join(
+                (
+                    json_bytes({"type": "event", "event": event})[:-1],
+                    b',"id":',
+                    str(message_id).encode(),
+                    b"}",
+                )
+            )
+        )
+    return messages
+
+
+def is_compactable_message(message: bytes) -> bool:
+    """Return if a message may be the state changes of a subscription.
+
+    Only the start of the message is checked, so this is cheap enough
+    to be called for every queued message.
+    """
+    return message.startswith(_ENTITY_CHANGES_PREFIXES)
+
+
+def compact_messages(messages: Iterable[bytes]) -> list[bytes]:
+    """Return the messages compacted to fewer messages with the same outcome.
+
+    Only the messages for which is_compactable_message is true are parsed.
+    """
+    compacted: list[bytes | None] = []
+    # The position of the first queued change and the changes of the
+    # entities of each subscribe_entities subscription
+    subscriptions: dict[int, tuple[int, dict[str, list[_EntityChange]]]] = {}
+    for message in messages:
+        if not is_compactable_message(message):
+            compacted.append(message)
+            continue
+        try:
+            parsed = json_loads(message)
+        except ValueError:
+            compacted.append(message)
+            continue
+        if (
+            not isinstance(parsed, dict)
+            or not isinstance(message_id := parsed.get("id"), int)
+            or not isinstance(event := parsed.get("event"), dict)
+        ):
+            compacted.append(message)
+            continue
+        if (changes := _entity_changes(event)) is None:
+            compacted.append(message)
+            continue
+        if (subscription := subscriptions.get(message_id)) is None:
+            subscription = subscriptions[message_id] = (len(compacted), {})
+            compacted.append(None)
+        entities = subscription[1]
+        for entity_id, change in changes:
+            if (
+                not (entity_changes := entities.setdefault(entity_id, []))
+                or (merged := _merge_entity_changes(entity_changes[-1], change)) is None
+            ):
+                entity_changes.append(change)
+            else:
+                entity_changes[-1] = merged
+
+    merged_positions = {
+        position: _entity_changes_messages(message_id, entities)
+        for message_id, (position, entities) in subscriptions.items()
+    }
+    result: list[bytes] = []
+    for position, compacted_message in enumerate(compacted):
+        if compacted_message is not None:
+            result.append(compacted_message)
+        elif (merged_messages := merged_positions.get(position)) is not None:
+            result.extend(merged_messages)
+    return result
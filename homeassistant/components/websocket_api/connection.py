@@ -36,6 +36,11 @@ type MessageHandler = Callable[[HomeAssistant, ActiveConnection, dict[str, Any]]
 type BinaryHandler = Callable[[HomeAssistant, ActiveConnection, bytes], None]
 
 
+def _no_pending_messages() -> int:
+    """Return the number of pending messages of a connection without a queue."""
+    return 0
+
+
 class ActiveConnection:
     """Handle an active websocket client connection."""
 
@@ -51,6 +56,7 @@ class ActiveConnection:
         "supported_features",
         "handlers",
         "binary_handlers",
+        "pending_message_count",
     )
 
     def __init__(
@@ -75,6 +81,8 @@ class ActiveConnection:
             self.hass.data[const.DOMAIN]
         )
         self.binary_handlers: list[BinaryHandler | None] = []
+        # Set by the websocket handler to the size of its message queue
+        self.pending_message_count: Callable[[], int] = _no_pending_messages
         current_connection.set(self)
 
     def __repr__(self) -> str:
@@ -34,6 +34,12 @@ MAX_PENDING_MSG: Final = 4096
 # resolve the ready future.
 PENDING_MSG_MAX_FORCE_READY: Final = 256
 
+# Number of pending messages at which the state changes sent to the
+# subscribe_entities subscriptions of a connection are coalesced until
+# the client has caught up, checked every COALESCE_STATES_RETRY_TIME seconds.
+PENDING_MSG_COALESCE_STATES: Final = 64
+COALESCE_STATES_RETRY_TIME: Final = 0.5
+
 ERR_ID_REUSE: Final = "id_reuse"
 ERR_INVALID_FORMAT: Final = "invalid_format"
 ERR_NOT_ALLOWED: Final = "not_allowed"
@@ -53,6 +59,8 @@ TYPE_RESULT: Final = "result"
 # Event types
 SIGNAL_WEBSOCKET_CONNECTED: Final = "websocket_connected"
 SIGNAL_WEBSOCKET_DISCONNECTED: Final = "websocket_disconnected"
+# Sent when a client falls behind or catches up and when its queue is compacted
+SIGNAL_WEBSOCKET_QUEUE_CHANGED: Final = "websocket_queue_changed"
 
 # Data used to store the current connection list
 DATA_CONNECTIONS: Final = f"{DOMAIN}.connections"
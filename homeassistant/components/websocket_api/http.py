@@ -19,17 +19,21 @@ from homeassistant.core import Event, HomeAssistant, callback
 from homeassistant.helpers.dispatcher import async_dispatcher_send
 from homeassistant.helpers.event import async_call_later
 from homeassistant.util.async_ import create_eager_task
+from homeassistant.util.hass_dict import HassKey
 from homeassistant.util.json import json_loads
 
 from .auth import AUTH_REQUIRED_MESSAGE, AuthPhase
+from .compaction import compact_messages, is_compactable_message
 from .const import (
     DATA_CONNECTIONS,
+    DOMAIN,
     MAX_PENDING_MSG,
     PENDING_MSG_MAX_FORCE_READY,
     PENDING_MSG_PEAK,
     PENDING_MSG_PEAK_TIME,
     SIGNAL_WEBSOCKET_CONNECTED,
     SIGNAL_WEBSOCKET_DISCONNECTED,
+    SIGNAL_WEBSOCKET_QUEUE_CHANGED,
     URL,
 )
 from .error import Disconnect
@@ -44,6 +48,8 @@ if TYPE_CHECKING:
 
 _WS_LOGGER: Final = logging.getLogger(f"{__name__}.connection")
 
+DATA_HANDLERS: HassKey[set[WebSocketHandler]] = HassKey(f"{DOMAIN}.handlers")
+
 
 class WebsocketAPIView(HomeAssistantView):
     """View to serve a websockets endpoint."""
@@ -82,6 +88,8 @@ class WebSocketHandler:
         "_peak_checker_unsub",
         "_connection",
         "_message_queue",
+        "_coalesced_message_count",
+        "_compactable_message_count",
         "_ready_future",
         "_release_ready_queue_size",
     )
@@ -105,6 +113,10 @@ class WebSocketHandler:
         # to use a deque and an asyncio.Future to avoid the overhead of
         # an asyncio.Queue.
         self._message_queue: deque[bytes] = deque()
+        self._coalesced_message_count = 0
+        # The number of messages queued since the queue was last compacted
+        # or empty which compacting the queue may merge
+        self._compactable_message_count = 0
         self._ready_future: asyncio.Future[int] | None = None
         self._release_ready_queue_size: int = 0
 
@@ -126,6 +138,21 @@ class WebSocketHandler:
             return describe_request(request)
         return "finished connection"
 
+    @property
+    def pending_message_count(self) -> int:
+        """Return the number of messages waiting to be sent."""
+        return len(self._message_queue)
+
+    @property
+    def pending_message_bytes(self) -> int:
+        """Return the size of the messages waiting to be sent."""
+        return sum(map(len, self._message_queue))
+
+    @property
+    def coalesced_message_count(self) -> int:
+        """Return the number of messages saved by compacting the queue."""
+        return self._coalesced_message_count
+
     async def _writer(
         self,
         connection: ActiveConnection,
@@ -145,6 +172,7 @@ class WebSocketHandler:
         try:
             while not wsock.closed:
                 if not message_queue:
+                    self._compactable_message_count = 0
                     self._ready_future = loop.create_future()
                     ready_message_count = await self._ready_future
 
@@ -203,9 +231,18 @@ class WebSocketHandler:
             elif isinstance(message, str):
                 message = message.encode("utf-8")
 
+        if is_compactable_message(message):
+            self._compactable_message_count += 1
+
         message_queue = self._message_queue
         message_queue.append(message)
-        if (queue_size_after_add := len(message_queue)) >= MAX_PENDING_MSG:
+        if (
+            (queue_size_after_add := len(message_queue)) >= MAX_PENDING_MSG
+            # The client is only disconnected if compacting the queue did
+            # not make room for the messages of another peak
+            and (queue_size_after_add := self._async_compact_message_queue())
+            >= MAX_PENDING_MSG - PENDING_MSG_PEAK
+        ):
             self._logger.error(
                 (
                     "%s: Client unable to keep up with pending messages. Reached %s pending"
@@ -229,12 +266,45 @@ class WebSocketHandler:
         if queue_size_after_add <= PENDING_MSG_PEAK:
             if peak_checker_active:
                 self._cancel_peak_checker()
+                # The client caught up
+                async_dispatcher_send(self._hass, SIGNAL_WEBSOCKET_QUEUE_CHANGED)
             return
 
         if not peak_checker_active:
             self._peak_checker_unsub = async_call_later(
                 self._hass, PENDING_MSG_PEAK_TIME, self._check_write_peak
             )
+            # The client is falling behind
+            async_dispatcher_send(self._hass, SIGNAL_WEBSOCKET_QUEUE_CHANGED)
+
+    @callback
+    def _async_compact_message_queue(self) -> int:
+        """Compact the queued messages and return the new queue size.
+
+        State changes for the same entity are merged in place so a client
+        that falls behind can catch up instead of being disconnected.
+
+        Compacting parses the queued state changes, so the queue is only
+        compacted again once another peak of them has been queued.
+        """
+        message_queue = self._message_queue
+        queue_size = len(message_queue)
+        if self._compactable_message_count < PENDING_MSG_PEAK:
+            return queue_size
+        self._compactable_message_count = 0
+        compacted = compact_messages(message_queue)
+        if (coalesced := queue_size - len(compacted)) > 0:
+            message_queue.clear()
+            message_queue.extend(compacted)
+            self._coalesced_message_count += coalesced
+            self._logger.debug(
+                "%s: Client is falling behind, compacted %s pending messages to %s",
+                self.description,
+                queue_size,
+                len(compacted),
+            )
+            async_dispatcher_send(self._hass, SIGNAL_WEBSOCKET_QUEUE_CHANGED)
+        return len(message_queue)
 
     @callback
     def _release_ready_future_or_reschedule(self) -> None:
@@ -267,7 +337,12 @@ class WebSocketHandler:
         """Check that we are no longer above the write peak."""
         self._peak_checker_unsub = None
 
-        if len(self._message_queue) < PENDING_MSG_PEAK:
+        if (
+            len(self._message_queue) < PENDING_MSG_PEAK
+            or self._async_compact_message_queue() < PENDING_MSG_PEAK
+        ):
+            # The client caught up
+            async_dispatcher_send(self._hass, SIGNAL_WEBSOCKET_QUEUE_CHANGED)
             return
 
         self._logger.error(
@@ -397,6 +472,7 @@ class WebSocketHandler:
         if self._logger.isEnabledFor(logging.DEBUG):
             self._logger.debug("%s: Received %s", self.description, auth_msg_data)
         connection = await auth.async_handle(auth_msg_data)
+        connection.pending_message_count = self._message_queue.__len__
         # As the webserver is now started before the start
         # event we do not want to block for websocket responses
         #
@@ -405,6 +481,7 @@ class WebSocketHandler:
         self._connection = connection
         self._writer_task = create_eager_task(self._writer(connection, send_bytes_text))
         self._hass.data[DATA_CONNECTIONS] = self._hass.data.get(DATA_CONNECTIONS, 0) + 1
+        self._hass.data.setdefault(DATA_HANDLERS, set()).add(self)
         async_dispatcher_send(self._hass, SIGNAL_WEBSOCKET_CONNECTED)
 
         self._authenticated = True
@@ -524,6 +601,7 @@ class WebSocketHandler:
 
                 if connection is not None:
                     hass.data[DATA_CONNECTIONS] -= 1
+                    hass.data[DATA_HANDLERS].discard(self)
                     self._connection = None
 
                 async_dispatcher_send(hass, SIGNAL_WEBSOCKET_DISCONNECTED)
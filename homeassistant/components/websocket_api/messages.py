@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from collections.abc import Mapping
 from functools import lru_cache
 import logging
 from typing import Any, Final
@@ -15,7 +16,7 @@ from homeassistant.const import (
     COMPRESSED_STATE_LAST_UPDATED,
     COMPRESSED_STATE_STATE,
 )
-from homeassistant.core import CompressedState, Event, EventStateChangedData
+from homeassistant.core import CompressedState, Event, EventStateChangedData, State
 from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers.json import (
     JSON_DUMP,
@@ -199,6 +200,13 @@ def _state_diff_event(
         return {ENTITY_EVENT_REMOVE: [event.data["entity_id"]]}
     if (old_state := event.data["old_state"]) is None:
         return {ENTITY_EVENT_ADD: {new_state.entity_id: new_state.as_compressed_state}}
+    return {
+        ENTITY_EVENT_CHANGE: {new_state.entity_id: _state_diff(old_state, new_state)}
+    }
+
+
+def _state_diff(old_state: State, new_state: State) -> dict[str, dict[str, Any]]:
+    """Return the diff between two states of an entity."""
     additions: dict[str, Any] = {}
     diff: dict[str, dict[str, Any]] = {STATE_DIFF_ADDITIONS: additions}
     new_state_context = new_state.context
@@ -235,7 +243,45 @@ def _state_diff_event(
             # here if there are any values to avoid jumping into the json_encoder_default
             # for every state diff with a removed attribute
             diff[STATE_DIFF_REMOVALS] = {COMPRESSED_STATE_ATTRIBUTES: list(removed)}
-    return {ENTITY_EVENT_CHANGE: {new_state.entity_id: diff}}
+    return diff
+
+
+def coalesced_state_diff_message(
+    message_id_as_bytes: bytes,
+    changes: Mapping[str, tuple[State | None, State | None]],
+) -> bytes | None:
+    """Return an event message with the changes of many entities.
+
+    The changes map each entity_id to its state before its first change
+    and after its last change, so the message has a single diff for each
+    entity no matter how many times it changed. None is returned if the
+    entities were added and removed again.
+    """
+    additions: dict[str, CompressedState] = {}
+    changed: dict[str, dict[str, dict[str, Any]]] = {}
+    removals: list[str] = []
+    for entity_id, (old_state, new_state) in changes.items():
+        if new_state is None:
+            if old_state is not None:
+                removals.append(entity_id)
+        elif old_state is None:
+            additions[entity_id] = new_state.as_compressed_state
+        else:
+            changed[entity_id] = _state_diff(old_state, new_state)
+    event: dict[str, Any] = {}
+    if additions:
+        event[ENTITY_EVENT_ADD] = additions
+    if changed:
+        event[ENTITY_EVENT_CHANGE] = changed
+    if removals:
+        event[ENTITY_EVENT_REMOVE] = removals
+    if not event:
+        return None
+    partial_message = (
+        _message_to_json_bytes_or_none({"type": "event", "event": event})
+        or INVALID_JSON_PARTIAL_MESSAGE
+    )
+    return b"".join((partial_message[:-1], b',"id":', message_id_as_bytes, b"}"))
 
 
 def _message_to_json_bytes_or_none(message: dict[str, Any]) -> bytes | None:
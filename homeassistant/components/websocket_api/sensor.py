@@ -2,7 +2,15 @@
 
 from __future__ import annotations
 
-from homeassistant.components.sensor import SensorEntity
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+)
+from homeassistant.const import UnitOfInformation
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
@@ -10,8 +18,41 @@ from homeassistant.helpers.typing import ConfigType, DiscoveryInfoType
 
 from .const import (
     DATA_CONNECTIONS,
+    DOMAIN,
     SIGNAL_WEBSOCKET_CONNECTED,
     SIGNAL_WEBSOCKET_DISCONNECTED,
+    SIGNAL_WEBSOCKET_QUEUE_CHANGED,
+)
+from .http import DATA_HANDLERS, WebSocketHandler
+
+
+@dataclass(frozen=True, kw_only=True)
+class ConnectionQueueSensorEntityDescription(SensorEntityDescription):
+    """Describes a sensor of the message queues of the connections."""
+
+    value_fn: Callable[[WebSocketHandler], int]
+
+
+QUEUE_SENSORS: tuple[ConnectionQueueSensorEntityDescription, ...] = (
+    ConnectionQueueSensorEntityDescription(
+        key="pending_messages",
+        name="Pending messages",
+        native_unit_of_measurement="messages",
+        value_fn=lambda handler: handler.pending_message_count,
+    ),
+    ConnectionQueueSensorEntityDescription(
+        key="pending_message_bytes",
+        name="Pending message size",
+        device_class=SensorDeviceClass.DATA_SIZE,
+        native_unit_of_measurement=UnitOfInformation.BYTES,
+        value_fn=lambda handler: handler.pending_message_bytes,
+    ),
+    ConnectionQueueSensorEntityDescription(
+        key="coalesced_messages",
+        name="Coalesced messages",
+        native_unit_of_measurement="messages",
+        value_fn=lambda handler: handler.coalesced_message_count,
+    ),
 )
 
 
@@ -24,7 +65,9 @@ async def async_setup_platform(
     """Set up the API streams platform."""
     entity = APICount()
 
-    async_add_entities([entity])
+    async_add_entities(
+        [entity, *(ConnectionQueueSensor(description) for description in QUEUE_SENSORS)]
+    )
 
 
 class APICount(SensorEntity):
@@ -54,3 +97,40 @@ class APICount(SensorEntity):
     def _update_count(self) -> None:
         self._attr_native_value = self.hass.data.get(DATA_CONNECTIONS, 0)
         self.async_write_ha_state()
+
+
+class ConnectionQueueSensor(SensorEntity):
+    """Entity to represent the message queues of the connected clients.
+
+    The state is the total of all connections. It is updated when a client
+    connects, disconnects, falls behind or catches up and when its queue
+    is compacted, not for every queued message.
+    """
+
+    _attr_should_poll = False
+    entity_description: ConnectionQueueSensorEntityDescription
+
+    def __init__(self, description: ConnectionQueueSensorEntityDescription) -> None:
+        """Initialize the sensor."""
+        self.entity_description = description
+        self._attr_unique_id = f"{DOMAIN}_{description.key}"
+        self._attr_native_value = 0
+
+    async def async_added_to_hass(self) -> None:
+        """Handle addition to hass."""
+        for signal in (
+            SIGNAL_WEBSOCKET_CONNECTED,
+            SIGNAL_WEBSOCKET_DISCONNECTED,
+            SIGNAL_WEBSOCKET_QUEUE_CHANGED,
+        ):
+            self.async_on_remove(
+                async_dispatcher_connect(self.hass, signal, self._update_value)
+            )
+
+    @callback
+    def _update_value(self) -> None:
+        value_fn = self.entity_description.value_fn
+        self._attr_native_value = sum(
+            value_fn(handler) for handler in self.hass.data.get(DATA_HANDLERS, ())
+        )
+        self.async_write_ha_state()
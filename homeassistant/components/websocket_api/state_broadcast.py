@@ -0,0 +1,204 @@
+"""Broadcast state changes to the subscribe_entities subscriptions."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from functools import partial
+from typing import TYPE_CHECKING
+
+from homeassistant.auth.permissions.const import POLICY_READ
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import (
+    CALLBACK_TYPE,
+    Event,
+    EventStateChangedData,
+    HomeAssistant,
+    State,
+    callback,
+)
+from homeassistant.util.hass_dict import HassKey
+
+from . import messages
+from .connection import ActiveConnection
+from .const import COALESCE_STATES_RETRY_TIME, DOMAIN, PENDING_MSG_COALESCE_STATES
+
+DATA_STATE_BROADCASTER: HassKey[StateBroadcaster] = HassKey(
+    f"{DOMAIN}.state_broadcaster"
+)
+
+
+class _EntitiesSubscription:
+    """A subscribe_entities subscription of a connection."""
+
+    __slots__ = (
+        "_flush_handle",
+        "_pending",
+        "connection",
+        "entity_filter",
+        "entity_ids",
+        "message_id_as_bytes",
+    )
+
+    def __init__(
+        self,
+        connection: ActiveConnection,
+        message_id_as_bytes: bytes,
+        entity_ids: set[str] | None,
+        entity_filter: Callable[[str], bool] | None,
+    ) -> None:
+        """Initialize the subscription."""
+        self.connection = connection
+        self.message_id_as_bytes = message_id_as_bytes
+        self.entity_ids = entity_ids
+        self.entity_filter = entity_filter
+        # The state of each entity before its first and after its last
+        # change, while the changes are coalesced
+        self._pending: dict[str, tuple[State | None, State | None]] | None = None
+        self._flush_handle: asyncio.TimerHandle | None = None
+
+    @callback
+    def async_forward(self, event: Event[EventStateChangedData]) -> None:
+        """Forward a state change to the client."""
+        entity_id = event.data["entity_id"]
+        # We have to lookup the permissions again because the user might have
+        # changed since the subscription was created.
+        user = self.connection.user
+        permissions = user.permissions
+        if (
+            not user.is_admin
+            and not permissions.access_all_entities(POLICY_READ)
+            and not permissions.check_entity(entity_id, POLICY_READ)
+        ):
+            return
+        if (pending := self._pending) is None:
+            if self.connection.pending_message_count() < PENDING_MSG_COALESCE_STATES:
+                self.connection.send_message(
+                    messages.cached_state_diff_message(self.message_id_as_bytes, event)
+                )
+                return
+            # The client is falling behind, only the latest
+            # state of each entity is sent once it caught up
+            pending = self._pending = {}
+            self._async_schedule_flush()
+        if (change := pending.get(entity_id)) is None:
+            pending[entity_id] = (event.data["old_state"], event.data["new_state"])
+        else:
+            pending[entity_id] = (change[0], event.data["new_state"])
+
+    @callback
+    def _async_schedule_flush(self) -> None:
+        """Schedule sending the coalesced state changes."""
+        self._flush_handle = self.connection.hass.loop.call_later(
+            COALESCE_STATES_RETRY_TIME, self._async_flush
+        )
+
+    @callback
+    def _async_flush(self) -> None:
+        """Send the coalesced state changes if the client caught up."""
+        if self.connection.pending_message_count() >= PENDING_MSG_COALESCE_STATES:
+            self._async_schedule_flush()
+            return
+        self._flush_handle = None
+        pending = self._pending
+        self._pending = None
+        if pending and (
+            message := messages.coalesced_state_diff_message(
+                self.message_id_as_bytes, pending
+            )
+        ):
+            self.connection.send_message(message)
+
+    @callback
+    def async_cancel(self) -> None:
+        """Cancel sending the coalesced state changes."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        self._pending = None
+
+
+class StateBroadcaster:
+    """Forward state changed events to the subscribe_entities subscriptions.
+
+    A single listener serves all subscriptions. Subscriptions for a list
+    of entity_ids are found with a dict lookup, and the message of a state
+    change is serialized once and shared by all subscriptions.
+    """
+
+    __slots__ = ("_entity_subscriptions", "_hass", "_subscriptions", "_unsub")
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the broadcaster."""
+        self._hass = hass
+        self._entity_subscriptions: dict[str, set[_EntitiesSubscription]] = {}
+        self._subscriptions: set[_EntitiesSubscription] = set()
+        self._unsub: CALLBACK_TYPE | None = None
+
+    @callback
+    def async_subscribe(
+        self,
+        connection: ActiveConnection,
+        message_id_as_bytes: bytes,
+        entity_ids: set[str] | None,
+        entity_filter: Callable[[str], bool] | None,
+    ) -> CALLBACK_TYPE:
+        """Subscribe a connection to state changes."""
+        subscription = _EntitiesSubscription(
+            connection, message_id_as_bytes, entity_ids, entity_filter
+        )
+        if entity_ids:
+            for entity_id in entity_ids:
+                self._entity_subscriptions.setdefault(entity_id, set()).add(
+                    subscription
+                )
+        else:
+            self._subscriptions.add(subscription)
+        if self._unsub is None:
+            self._unsub = self._hass.bus.async_listen(
+                EVENT_STATE_CHANGED, self._async_state_changed
+            )
+        return partial(self._async_unsubscribe, subscription)
+
+    @callback
+    def _async_unsubscribe(self, subscription: _EntitiesSubscription) -> None:
+        """Unsubscribe a subscription."""
+        subscription.async_cancel()
+        if entity_ids := subscription.entity_ids:
+            entity_subscriptions = self._entity_subscriptions
+            for entity_id in entity_ids:
+                subscriptions = entity_subscriptions[entity_id]
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del entity_subscriptions[entity_id]
+        else:
+            self._subscriptions.discard(subscription)
+        if not self._subscriptions and not self._entity_subscriptions:
+            if TYPE_CHECKING:
+                assert self._unsub is not None
+            self._unsub()
+            self._unsub = None
+
+    @callback
+    def _async_state_changed(self, event: Event[EventStateChangedData]) -> None:
+        """Forward a state changed event to the subscriptions."""
+        entity_id = event.data["entity_id"]
+        if subscriptions := self._entity_subscriptions.get(entity_id):
+            for subscription in subscriptions:
+                if (
+                    entity_filter := subscription.entity_filter
+                ) is None or entity_filter(entity_id):
+                    subscription.async_forward(event)
+        for subscription in self._subscriptions:
+            if (entity_filter := subscription.entity_filter) is None or entity_filter(
+                entity_id
+            ):
+                subscription.async_forward(event)
+
+
+@callback
+def async_get_state_broadcaster(hass: HomeAssistant) -> StateBroadcaster:
+    """Return the state broadcaster."""
+    if (broadcaster := hass.data.get(DATA_STATE_BROADCASTER)) is None:
+        broadcaster = hass.data[DATA_STATE_BROADCASTER] = StateBroadcaster(hass)
+    return broadcaster
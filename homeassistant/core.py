@@ -7,12 +7,13 @@ of entities and react to changes.
 from __future__ import annotations
 
 import asyncio
-from collections import UserDict, defaultdict
+from collections import UserDict, defaultdict, deque
 from collections.abc import (
     Callable,
     Collection,
     Coroutine,
     Iterable,
+    Iterator,
     KeysView,
     Mapping,
     ValuesView,
@@ -23,6 +24,7 @@ import datetime
 import enum
 import functools
 import inspect
+from itertools import islice
 import logging
 import re
 import threading
@@ -39,6 +41,7 @@ from typing import (
     cast,
     overload,
 )
+import weakref
 
 from propcache import cached_property, under_cached_property
 from typing_extensions import TypeVar
@@ -201,6 +204,10 @@ _DEPRECATED_Config = DeferredDeprecatedAlias(
 # How long to wait until things that run on startup have to finish.
 TIMEOUT_EVENT_START = 15
 
+# How many state changes are kept to look up the entity_ids
+# changed since a generation of the state machine
+MAX_STATE_CHANGES = 10000
+
 
 EVENTS_EXCLUDED_FROM_MATCH_ALL = {
     EVENT_HOMEASSISTANT_CLOSE,
@@ -1455,6 +1462,166 @@ class _OneTimeListener(Generic[_DataT]):
         return f"<_OneTimeListener {self.listener_job.target}>"
 
 
+class _BatchDispatcher:
+    """Run the batch listeners of an event type once per loop iteration.
+
+    The dispatcher is a single listener on the bus no matter how many
+    batch listeners there are, so the cost of firing an event does not
+    grow with the number of batch listeners.
+    """
+
+    __slots__ = ("_events", "_handle", "hass", "listeners", "remove")
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the batch dispatcher."""
+        self.hass = hass
+        self.remove: CALLBACK_TYPE | None = None
+        self.listeners: dict[
+            HassJob[[list[Event[Any]]], Coroutine[Any, Any, None] | None],
+            Callable[[Any], bool] | None,
+        ] = {}
+        self._events: list[Event[Any]] = []
+        self._handle: asyncio.Handle | None = None
+
+    @callback
+    def __call__(self, event: Event[Any]) -> None:
+        """Add the event to the batch."""
+        if self._handle is None:
+            self._handle = self.hass.loop.call_soon(self._async_run)
+        self._events.append(event)
+
+    @callback
+    def _async_run(self) -> None:
+        """Run the listeners with the events of the batch."""
+        events = self._events
+        self._events = []
+        self._handle = None
+        listeners = self.listeners
+        for job, event_filter in list(listeners.items()):
+            # The listener may have been removed by a listener run before it
+            if job not in listeners:
+                continue
+            batch = events
+            if event_filter is not None:
+                batch = []
+                for event in events:
+                    try:
+                        if event_filter(event.data):
+                            batch.append(event)
+                    except Exception:
+                        _LOGGER.exception("Error in event filter")
+                if not batch:
+                    continue
+            try:
+                self.hass.async_run_hass_job(job, batch)
+            except Exception:
+                _LOGGER.exception("Error running job: %s", job)
+
+    @callback
+    def async_cancel(self) -> None:
+        """Drop the events which have not been run yet."""
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        self._events = []
+
+
+type _StateChangedJobType = HassJob[
+    [Event[EventStateChangedData]], Coroutine[Any, Any, None] | None
+]
+# A keyed state changed job and the attributes it is limited to
+type _KeyedStateChangedJobType = tuple[_StateChangedJobType, frozenset[str] | None]
+
+_EMPTY_ATTRIBUTES: Mapping[str, Any] = {}
+
+
+def _async_attributes_changed(
+    event_data: EventStateChangedData, attributes: Iterable[str]
+) -> bool:
+    """Return if any of the attributes changed."""
+    old_attributes = (
+        old_state.attributes
+        if (old_state := event_data["old_state"])
+        else _EMPTY_ATTRIBUTES
+    )
+    new_attributes = (
+        new_state.attributes
+        if (new_state := event_data["new_state"])
+        else _EMPTY_ATTRIBUTES
+    )
+    return any(
+        old_attributes.get(attribute, _SENTINEL)
+        != new_attributes.get(attribute, _SENTINEL)
+        for attribute in attributes
+    )
+
+
+class _StateChangedIndex:
+    """Route state changed events to listeners keyed by entity_id or domain.
+
+    The index is a single listener on the bus, the listeners of an event
+    are found with a dict lookup so routing an event does not grow with
+    the number of listeners. Listeners keyed only by attributes are
+    checked for each event, but only once per attribute.
+    """
+
+    __slots__ = ("attributes", "domains", "entity_ids", "hass", "remove")
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the state changed index."""
+        self.hass = hass
+        self.remove: CALLBACK_TYPE | None = None
+        self.entity_ids: dict[str, list[_KeyedStateChangedJobType]] = {}
+        self.domains: dict[str, list[_KeyedStateChangedJobType]] = {}
+        self.attributes: dict[str, list[_StateChangedJobType]] = {}
+
+    @callback
+    def async_filter(self, event_data: EventStateChangedData) -> bool:
+        """Return if the event may have listeners."""
+        entity_id = event_data["entity_id"]
+        return bool(
+            self.attributes
+            or entity_id in self.entity_ids
+            or (self.domains and entity_id.partition(".")[0] in self.domains)
+        )
+
+    @callback
+    def async_dispatch_soon(self, event: Event[EventStateChangedData]) -> None:
+        """Dispatch the event soon to ensure one event loop runs before dispatch."""
+        self.hass.loop.call_soon(self._async_dispatch, event)
+
+    @callback
+    def _async_dispatch(self, event: Event[EventStateChangedData]) -> None:
+        """Run the listeners of the event."""
+        event_data = event.data
+        entity_id = event_data["entity_id"]
+        keyed_jobs = self.entity_ids.get(entity_id, EMPTY_LIST)
+        if self.domains and (
+            domain_jobs := self.domains.get(entity_id.partition(".")[0])
+        ):
+            # A listener keyed by both the entity_id and its domain runs once
+            keyed_jobs = (
+                list(dict.fromkeys(keyed_jobs + domain_jobs))
+                if keyed_jobs
+                else domain_jobs
+            )
+        jobs = [
+            job
+            for job, attributes in keyed_jobs
+            if attributes is None or _async_attributes_changed(event_data, attributes)
+        ]
+        for attribute, attribute_jobs in list(self.attributes.items()):
+            if _async_attributes_changed(event_data, (attribute,)):
+                jobs.extend(job for job in attribute_jobs if job not in jobs)
+        for job in jobs:
+            try:
+                self.hass.async_run_hass_job(job, event)
+            except Exception:
+                _LOGGER.exception(
+                    "Error while dispatching event for %s to %s", entity_id, job
+                )
+
+
 # Empty list, used by EventBus.async_fire_internal
 EMPTY_LIST: list[Any] = []
 
@@ -1469,15 +1636,24 @@ def _verify_event_type_length_or_raise(event_type: EventType[_DataT] | str) -> N
 class EventBus:
     """Allow the firing of and listening for events."""
 
-    __slots__ = ("_debug", "_hass", "_listeners", "_match_all_listeners")
+    __slots__ = (
+        "_batch_dispatchers",
+        "_debug",
+        "_hass",
+        "_listeners",
+        "_match_all_listeners",
+        "_state_changed_index",
+    )
 
     def __init__(self, hass: HomeAssistant) -> None:
         """Initialize a new event bus."""
         self._listeners: defaultdict[
             EventType[Any] | str, list[_FilterableJobType[Any]]
         ] = defaultdict(list)
+        self._batch_dispatchers: dict[EventType[Any] | str, _BatchDispatcher] = {}
         self._match_all_listeners: list[_FilterableJobType[Any]] = []
         self._listeners[MATCH_ALL] = self._match_all_listeners
+        self._state_changed_index: _StateChangedIndex | None = None
         self._hass = hass
         self._async_logging_changed()
         self.async_listen(EVENT_LOGGING_CHANGED, self._async_logging_changed)
@@ -1651,6 +1827,119 @@ class EventBus:
                 )
         return self._async_listen_filterable_job(event_type, filterable_job)
 
+    @callback
+    def async_listen_batch(
+        self,
+        event_type: EventType[_DataT] | str,
+        listener: Callable[[list[Event[_DataT]]], Coroutine[Any, Any, None] | None],
+        event_filter: Callable[[_DataT], bool] | None = None,
+    ) -> CALLBACK_TYPE:
+        """Listen for events and receive them in batches.
+
+        The events fired during an iteration of the event loop are
+        collected and the listener is run once with the list of them,
+        in the order they were fired, at the start of the next iteration.
+        This is cheaper than running the listener for each event when
+        many events are fired at once. The list may be shared with other
+        listeners and must not be modified.
+
+        To listen to all events specify the constant ``MATCH_ALL``
+        as event_type.
+
+        An optional event_filter, which must be a callable decorated with
+        @callback that returns a boolean value, determines if the
+        event is added to the batch.
+
+        This method must be run in the event loop.
+        """
+        if event_filter is not None and not is_callback_check_partial(event_filter):
+            raise HomeAssistantError(f"Event filter {event_filter} is not a callback")
+        if event_type == EVENT_STATE_REPORTED and not event_filter:
+            raise HomeAssistantError(f"Event filter is required for event {event_type}")
+        job: HassJob[[list[Event[_DataT]]], Coroutine[Any, Any, None] | None] = HassJob(
+            listener, f"listen batch {event_type}"
+        )
+        if (dispatcher := self._batch_dispatchers.get(event_type)) is None:
+            dispatcher = self._batch_dispatchers[event_type] = _BatchDispatcher(
+                self._hass
+            )
+            dispatcher.remove = self._async_listen_filterable_job(
+                event_type,
+                (
+                    HassJob(
+                        dispatcher,
+                        f"listen batch {event_type}",
+                        job_type=HassJobType.Callback,
+                    ),
+                    None,
+                ),
+            )
+        dispatcher.listeners[job] = event_filter
+        return functools.partial(self._async_remove_batch_listener, event_type, job)
+
+    @callback
+    def async_listen_state_changed(
+        self,
+        listener: Callable[
+            [Event[EventStateChangedData]], Coroutine[Any, Any, None] | None
+        ],
+        *,
+        entity_ids: str | Collection[str] | None = None,
+        domains: str | Collection[str] | None = None,
+        attributes: str | Collection[str] | None = None,
+        job_type: HassJobType | None = None,
+    ) -> CALLBACK_TYPE:
+        """Listen for state changed events keyed by entity_id, domain or attribute.
+
+        The listener is run for the state changes of the entity_ids and of
+        the entities in the domains. If attributes are passed, the listener
+        is only run if one of them changed; if only attributes are passed,
+        the listener is run when they changed for any entity. The keys
+        must be lower case.
+
+        Unlike a listener with an event_filter, which is called for every
+        state change, the listeners are found with a dict lookup. Like
+        async_track_state_change_event, the listener is run in the next
+        iteration of the event loop.
+
+        This method must be run in the event loop.
+        """
+        entity_ids = [entity_ids] if isinstance(entity_ids, str) else entity_ids
+        domains = [domains] if isinstance(domains, str) else domains
+        attributes = frozenset(
+            [attributes] if isinstance(attributes, str) else attributes or ()
+        )
+        if not (entity_ids or domains or attributes):
+            raise HomeAssistantError(
+                "An entity_id, domain or attribute is required to listen for"
+                " state changes"
+            )
+        job: _StateChangedJobType = HassJob(
+            listener,
+            f"listen {EVENT_STATE_CHANGED} {entity_ids or domains or attributes}",
+            job_type=job_type,
+        )
+        if (index := self._state_changed_index) is None:
+            index = self._state_changed_index = _StateChangedIndex(self._hass)
+            index.remove = self.async_listen(
+                EVENT_STATE_CHANGED,
+                index.async_dispatch_soon,
+                event_filter=index.async_filter,
+            )
+        keyed: list[tuple[dict[str, list[Any]], str, Any]] = []
+        if entity_ids or domains:
+            keyed_job = (job, attributes or None)
+            keyed.extend((index.entity_ids, key, keyed_job) for key in entity_ids or ())
+            keyed.extend((index.domains, key, keyed_job) for key in domains or ())
+        else:
+            keyed.extend((index.attributes, key, job) for key in attributes)
+        for keys, key, entry in keyed:
+            if (entries := keys.get(key)) is None:
+                keys[key] = [entry]
+            else:
+                entries.append(entry)
+        return functools.partial(self._async_remove_state_changed_listener, keyed)
+
     @callback
     def _async_listen_filterable_job(
         self,
@@ -1751,6 +2040,55 @@ class EventBus:
                 "Unable to remove unknown job listener %s", filterable_job
             )
 
+    @callback
+    def _async_remove_batch_listener(
+        self,
+        event_type: EventType[_DataT] | str,
+        job: HassJob[[list[Event[_DataT]]], Coroutine[Any, Any, None] | None],
+    ) -> None:
+        """Remove a batch listener of a specific event_type.
+
+        This method must be run in the event loop.
+        """
+        dispatcher = self._batch_dispatchers.get(event_type)
+        if dispatcher is None or dispatcher.listeners.pop(job, _SENTINEL) is _SENTINEL:
+            _LOGGER.error("Unable to remove unknown batch listener %s", job)
+            return
+        if dispatcher.listeners:
+            return
+        # The dispatcher is removed with its last listener
+        del self._batch_dispatchers[event_type]
+        dispatcher.async_cancel()
+        if TYPE_CHECKING:
+            assert dispatcher.remove is not None
+        dispatcher.remove()
+
+    @callback
+    def _async_remove_state_changed_listener(
+        self, keyed: list[tuple[dict[str, list[Any]], str, Any]]
+    ) -> None:
+        """Remove a keyed state changed listener.
+
+        This method must be run in the event loop.
+        """
+        try:
+            for keys, key, entry in keyed:
+                entries = keys[key]
+                entries.remove(entry)
+                if not entries:
+                    del keys[key]
+        except (KeyError, ValueError):
+            # The listener was already removed
+            _LOGGER.exception("Unable to remove unknown state changed listener")
+            return
+        index = self._state_changed_index
+        if TYPE_CHECKING:
+            assert index is not None and index.remove is not None
+        if not (index.entity_ids or index.domains or index.attributes):
+            # The index is removed with its last listener
+            self._state_changed_index = None
+            index.remove()
+
 
 class CompressedState(TypedDict):
     """Compressed dict of a state."""
@@ -2031,32 +2369,103 @@ class State:
         )
 
 
+class StatesSnapshot:
+    """Immutable snapshot of the states of the state machine.
+
+    The states of a domain are shared with the state machine, which copies
+    them before changing them while a snapshot is referenced.
+    """
+
+    __slots__ = ("__weakref__", "_domains", "generation")
+
+    def __init__(self, generation: int, domains: dict[str, dict[str, State]]) -> None:
+        """Initialize the snapshot."""
+        self.generation = generation
+        self._domains = domains
+
+    def __len__(self) -> int:
+        """Return the number of states."""
+        return sum(len(domain_states) for domain_states in self._domains.values())
+
+    def get(self, entity_id: str) -> State | None:
+        """Retrieve the state of entity_id or None if not found."""
+        domain_states = self._domains.get(split_entity_id(entity_id)[0])
+        return None if domain_states is None else domain_states.get(entity_id)
+
+    def domains(self) -> KeysView[str]:
+        """Return the domains with states."""
+        return self._domains.keys()
+
+    def entity_ids(self, domain: str) -> KeysView[str] | tuple[()]:
+        """Return the entity_ids of a domain."""
+        if (domain_states := self._domains.get(domain)) is None:
+            return ()
+        return domain_states.keys()
+
+    def states(self, domain: str | None = None) -> Iterator[State]:
+        """Iterate the states of a domain, or all states grouped by domain."""
+        if domain is not None:
+            if (domain_states := self._domains.get(domain)) is not None:
+                yield from domain_states.values()
+            return
+        for domain_states in self._domains.values():
+            yield from domain_states.values()
+
+
 class States(UserDict[str, State]):
     """Container for states, maps entity_id -> State.
 
     Maintains an additional index:
     - domain -> dict[str, State]
+
+    Every change increments the generation, and the entity_ids of the last
+    MAX_STATE_CHANGES changes are kept in order.
     """
 
     def __init__(self) -> None:
         """Initialize the container."""
         super().__init__()
         self._domain_index: defaultdict[str, dict[str, State]] = defaultdict(dict)
+        # Domains whose dict is shared with the referenced snapshots
+        self._shared_domains: set[str] = set()
+        self._snapshot_refs: set[weakref.ref[StatesSnapshot]] = set()
+        self._changes: deque[str] = deque(maxlen=MAX_STATE_CHANGES)
+        self._removed_generation = 0
+        self.generation = 0
 
     def values(self) -> ValuesView[State]:
         """Return the underlying values to avoid __iter__ overhead."""
         return self.data.values()
 
+    def _writable_domain(self, domain: str) -> dict[str, State]:
+        """Return the dict of a domain, copied if a snapshot shares it."""
+        if domain in self._shared_domains:
+            self._shared_domains.remove(domain)
+            domain_states = self._domain_index[domain].copy()
+            self._domain_index[domain] = domain_states
+            return domain_states
+        return self._domain_index[domain]
+
     def __setitem__(self, key: str, entry: State) -> None:
         """Add an item."""
         self.data[key] = entry
-        self._domain_index[entry.domain][entry.entity_id] = entry
+        self._writable_domain(entry.domain)[entry.entity_id] = entry
+        self.generation += 1
+        self._changes.append(key)
 
     def __delitem__(self, key: str) -> None:
         """Remove an item."""
         entry = self[key]
-        del self._domain_index[entry.domain][entry.entity_id]
+        del self._writable_domain(entry.domain)[entry.entity_id]
         super().__delitem__(key)
+        self.generation += 1
+        self._changes.append(key)
+        self._removed_generation = self.generation
+
+    def reported(self, key: str) -> None:
+        """Record that the last_reported time of an item changed."""
+        self.generation += 1
+        self._changes.append(key)
 
     def domain_entity_ids(self, key: str) -> KeysView[str] | tuple[()]:
         """Get all entity_ids for a domain."""
@@ -2072,11 +2481,54 @@ class States(UserDict[str, State]):
             return ()
         return self._domain_index[key].values()
 
+    def snapshot(self) -> StatesSnapshot:
+        """Return a snapshot sharing the dicts of the domains."""
+        domains = {
+            domain: domain_states
+            for domain, domain_states in self._domain_index.items()
+            if domain_states
+        }
+        snapshot = StatesSnapshot(self.generation, domains)
+        # Every dict shared with an older snapshot that is still
+        # referenced is also shared with the new one
+        self._shared_domains = set(domains)
+        self._snapshot_refs.add(weakref.ref(snapshot, self._snapshot_released))
+        return snapshot
+
+    def _snapshot_released(self, ref: weakref.ref[StatesSnapshot]) -> None:
+        """Stop copying the dicts of the domains once no snapshot is referenced."""
+        self._snapshot_refs.discard(ref)
+        if not self._snapshot_refs:
+            self._shared_domains.clear()
+
+    def changed_since(self, generation: int) -> list[str] | None:
+        """Return the entity_ids changed after a generation in order.
+
+        Returns None if an item was removed or the changes were
+        already dropped.
+        """
+        if self._removed_generation > generation:
+            return None
+        if (count := self.generation - generation) <= 0:
+            return []
+        if count > len(self._changes):
+            return None
+        changes = list(islice(reversed(self._changes), count))
+        changes.reverse()
+        return list(dict.fromkeys(changes))
+
 
 class StateMachine:
     """Helper class that tracks the state of different entities."""
 
-    __slots__ = ("_states", "_states_data", "_reservations", "_bus", "_loop")
+    __slots__ = (
+        "_states",
+        "_states_data",
+        "_reservations",
+        "_bus",
+        "_loop",
+        "_snapshot",
+    )
 
     def __init__(self, bus: EventBus, loop: asyncio.events.AbstractEventLoop) -> None:
         """Initialize state machine."""
@@ -2087,6 +2539,7 @@ class StateMachine:
         self._reservations: set[str] = set()
         self._bus = bus
         self._loop = loop
+        self._snapshot: weakref.ref[StatesSnapshot] | None = None
 
     def entity_ids(self, domain_filter: str | None = None) -> list[str]:
         """List of entity ids that are being tracked."""
@@ -2157,6 +2610,44 @@ class StateMachine:
             states.extend(self._states.domain_states(domain))
         return states
 
+    @callback
+    def async_snapshot(self) -> StatesSnapshot:
+        """Return an immutable snapshot of the states without copying them.
+
+        The snapshot is reused until a state changes. While it is referenced
+        the dict of a domain is copied the first time one of its states
+        changes.
+
+        This method must be run in the event loop.
+        """
+        if (
+            self._snapshot is None
+            or (snapshot := self._snapshot()) is None
+            or snapshot.generation != self._states.generation
+        ):
+            snapshot = self._states.snapshot()
+            self._snapshot = weakref.ref(snapshot)
+        return snapshot
+
+    @callback
+    def async_generation(self) -> int:
+        """Return the generation of the states, incremented by every change.
+
+        This method must be run in the event loop.
+        """
+        return self._states.generation
+
+    @callback
+    def async_entity_ids_changed_since(self, generation: int) -> list[str] | None:
+        """Return the entity_ids changed after a generation in order.
+
+        Returns None if a state was removed, or the changes were already
+        dropped, after the generation.
+
+        This method must be run in the event loop.
+        """
+        return self._states.changed_since(generation)
+
     def get(self, entity_id: str) -> State | None:
         """Retrieve state of entity_id or None if not found.
 
@@ -2350,6 +2841,7 @@ class StateMachine:
             old_last_reported = old_state.last_reported  # type: ignore[union-attr]
             old_state.last_reported = now  # type: ignore[union-attr]
             old_state._cache["last_reported_timestamp"] = timestamp  # type: ignore[union-attr] # noqa: SLF001
+            self._states.reported(entity_id)
             # Avoid creating an EventStateReportedData
             self._bus.async_fire_internal(  # type: ignore[misc]
                 EVENT_STATE_REPORTED,
@@ -22,6 +22,7 @@ from .normalized_name_base_registry import (
 )
 from .registry import BaseRegistry, RegistryIndexType
 from .singleton import singleton
+from .snapshot import StoreSnapshot
 from .storage import Store
 from .typing import UNDEFINED, UndefinedType
 
@@ -204,6 +205,9 @@ class AreaRegistry(BaseRegistry[AreasRegistryStoreData]):
             atomic_writes=True,
             minor_version=STORAGE_VERSION_MINOR,
         )
+        self._snapshot = StoreSnapshot(
+            hass, self._store, self._areas_from_data, (AreaEntry, AreaRegistryItems)
+        )
 
     @callback
     def async_get_area(self, area_id: str) -> AreaEntry | None:
@@ -368,8 +372,15 @@ class AreaRegistry(BaseRegistry[AreasRegistryStoreData]):
         """Load the area registry."""
         self._async_setup_cleanup()
 
-        data = await self._store.async_load()
+        if (areas := await self._snapshot.async_load()) is None:
+            areas = self._areas_from_data(await self._store.async_load())
+        self.areas = areas
+        self._area_data = areas.data
 
+    def _areas_from_data(
+        self, data: AreasRegistryStoreData | None
+    ) -> AreaRegistryItems:
+        """Return the entries of the stored data of the area registry."""
         areas = AreaRegistryItems()
 
         if data is not None:
@@ -387,8 +398,7 @@ class AreaRegistry(BaseRegistry[AreasRegistryStoreData]):
                     modified_at=datetime.fromisoformat(area["modified_at"]),
                 )
 
-        self.areas = areas
-        self._area_data = areas.data
+        return areas
 
     @callback
     def _data_to_save(self) -> AreasRegistryStoreData:
@@ -42,6 +42,7 @@ from .frame import report
 from .json import JSON_DUMP, find_paths_unserializable_data, json_bytes, json_fragment
 from .registry import BaseRegistry, BaseRegistryItems, RegistryIndexType
 from .singleton import singleton
+from .snapshot import StoreSnapshot
 from .typing import UNDEFINED, UndefinedType
 
 if TYPE_CHECKING:
@@ -656,6 +657,17 @@ class DeviceRegistry(BaseRegistry[dict[str, list[dict[str, Any]]]]):
             atomic_writes=True,
             minor_version=STORAGE_VERSION_MINOR,
         )
+        self._snapshot = StoreSnapshot(
+            hass,
+            self._store,
+            self._devices_from_data,
+            (
+                DeviceEntry,
+                DeletedDeviceEntry,
+                ActiveDeviceRegistryItems,
+                DeviceRegistryItems,
+            ),
+        )
 
     @callback
     def async_get(self, device_id: str) -> DeviceEntry | None:
@@ -1165,8 +1177,15 @@ class DeviceRegistry(BaseRegistry[dict[str, list[dict[str, Any]]]]):
         """Load the device registry."""
         async_setup_cleanup(self.hass, self)
 
-        data = await self._store.async_load()
+        if (loaded := await self._snapshot.async_load()) is None:
+            loaded = self._devices_from_data(await self._store.async_load())
+        self.devices, self.deleted_devices = loaded
+        self._device_data = self.devices.data
 
+    def _devices_from_data(
+        self, data: dict[str, list[dict[str, Any]]] | None
+    ) -> tuple[ActiveDeviceRegistryItems, DeviceRegistryItems[DeletedDeviceEntry]]:
+        """Return the entries of the stored data of the device registry."""
         devices = ActiveDeviceRegistryItems()
         deleted_devices: DeviceRegistryItems[DeletedDeviceEntry] = DeviceRegistryItems()
 
@@ -1222,9 +1241,7 @@ class DeviceRegistry(BaseRegistry[dict[str, list[dict[str, Any]]]]):
                     orphaned_timestamp=device["orphaned_timestamp"],
                 )
 
-        self.devices = devices
-        self.deleted_devices = deleted_devices
-        self._device_data = devices.data
+        return devices, deleted_devices
 
     @callback
     def _data_to_save(self) -> dict[str, Any]:
@@ -58,6 +58,10 @@ SLOW_SETUP_MAX_WAIT = 60
 SLOW_ADD_ENTITY_MAX_WAIT = 15  # Per Entity
 SLOW_ADD_MIN_TIMEOUT = 500
 
+type BatchServiceHandler = Callable[
+    [list[Entity], dict[str, Any] | ServiceCall], Coroutine[Any, Any, None]
+]
+
 PLATFORM_NOT_READY_RETRIES = 10
 DATA_ENTITY_PLATFORM: HassKey[dict[str, list[EntityPlatform]]] = HassKey(
     "entity_platform"
@@ -157,6 +161,10 @@ class EntityPlatform:
         self.parallel_updates: asyncio.Semaphore | None = None
         self._update_in_sequence: bool = False
 
+        # Handlers of the services of the domain which handle a call for
+        # several entities of the platform at once, indexed by service name
+        self.batch_service_handlers: dict[str, BatchServiceHandler] = {}
+
         # Platform is None for the EntityComponent "catch-all" EntityPlatform
         # which powers entity_component.add_entities
         self.parallel_updates_created = platform is None
@@ -1015,6 +1023,25 @@ class EntityPlatform:
             supports_response=supports_response,
         )
 
+    @callback
+    def async_register_batch_service_handler(
+        self, name: str, handler: BatchServiceHandler
+    ) -> None:
+        """Register a handler of a service of the domain for several entities.
+
+        A call of the service which targets more than one entity of the
+        platform is handled by calling the handler once with these entities,
+        for example with a group command of the devices, instead of calling
+        the service for each entity. Calls which return a response are not
+        handled by the handler.
+
+        The handler is passed the entities and the same data as the service
+        of an entity: the service data without the entity_id, device_id and
+        area_id fields if the service calls a method of the entities,
+        otherwise the service call.
+        """
+        self.batch_service_handlers[name] = handler
+
     async def _async_update_entity_states(self) -> None:
         """Update the states of all the polling entities.
 
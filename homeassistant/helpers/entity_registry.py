@@ -14,6 +14,7 @@ from collections import defaultdict
 from collections.abc import Callable, Container, Hashable, KeysView, Mapping
 from datetime import datetime, timedelta
 from enum import StrEnum
+from functools import partial
 import logging
 import time
 from typing import TYPE_CHECKING, Any, Literal, NotRequired, TypedDict
@@ -61,6 +62,7 @@ from .device_registry import (
 from .json import JSON_DUMP, find_paths_unserializable_data, json_bytes, json_fragment
 from .registry import BaseRegistry, BaseRegistryItems, RegistryIndexType
 from .singleton import singleton
+from .snapshot import SkipSnapshotError, StoreSnapshot
 from .typing import UNDEFINED, UndefinedType
 
 if TYPE_CHECKING:
@@ -714,6 +716,12 @@ class EntityRegistry(BaseRegistry):
             atomic_writes=True,
             minor_version=STORAGE_VERSION_MINOR,
         )
+        self._snapshot = StoreSnapshot(
+            hass,
+            self._store,
+            partial(self._entries_from_data, snapshot=True),
+            (RegistryEntry, DeletedRegistryEntry, EntityRegistryItems),
+        )
         self.hass.bus.async_listen(
             EVENT_DEVICE_REGISTRY_UPDATED,
             self.async_device_modified,
@@ -1258,7 +1266,20 @@ class EntityRegistry(BaseRegistry):
         _async_setup_cleanup(self.hass, self)
         _async_setup_entity_restore(self.hass, self)
 
-        data = await self._store.async_load()
+        if (loaded := await self._snapshot.async_load()) is None:
+            loaded = self._entries_from_data(await self._store.async_load())
+        self.entities, self.deleted_entities = loaded
+        self._entities_data = self.entities.data
+
+    def _entries_from_data(
+        self, data: dict[str, list[dict[str, Any]]] | None, *, snapshot: bool = False
+    ) -> tuple[EntityRegistryItems, dict[tuple[str, str, str], DeletedRegistryEntry]]:
+        """Return the entries of the stored data of the entity registry.
+
+        Invalid entries are logged and skipped. When building a snapshot,
+        which is done in the executor, no snapshot is built instead so the
+        invalid entries are logged again when the registry is loaded.
+        """
         entities = EntityRegistryItems()
         deleted_entities: dict[tuple[str, str, str], DeletedRegistryEntry] = {}
 
@@ -1274,6 +1295,10 @@ class EntityRegistry(BaseRegistry):
                         unique_id=entity["unique_id"],
                     )
                 except (TypeError, ValueError) as err:
+                    if snapshot:
+                        raise SkipSnapshotError(
+                            f"Invalid entity registry entry {entity['entity_id']}"
+                        ) from err
                     report_issue = async_suggest_report_issue(
                         self.hass, integration_domain=entity["platform"]
                     )
@@ -1353,9 +1378,7 @@ class EntityRegistry(BaseRegistry):
                     unique_id=entity["unique_id"],
                 )
 
-        self.deleted_entities = deleted_entities
-        self.entities = entities
-        self._entities_data = entities.data
+        return entities, deleted_entities
 
     @callback
     def _data_to_save(self) -> dict[str, Any]:
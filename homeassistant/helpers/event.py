@@ -4,7 +4,7 @@ from __future__ import annotations
 
 import asyncio
 from collections import defaultdict
-from collections.abc import Callable, Coroutine, Iterable, Mapping, Sequence
+from collections.abc import Callable, Collection, Coroutine, Iterable, Mapping, Sequence
 import copy
 from dataclasses import dataclass
 from datetime import datetime, timedelta
@@ -14,6 +14,8 @@ from random import randint
 import time
 from typing import TYPE_CHECKING, Any, Concatenate, Generic, TypeVar
 
+from lru import LRU
+
 from homeassistant.const import (
     EVENT_CORE_CONFIG_UPDATE,
     EVENT_STATE_CHANGED,
@@ -57,9 +59,6 @@ from .sun import get_astral_event_next
 from .template import RenderInfo, Template, result_as_boolean
 from .typing import TemplateVarsType
 
-_TRACK_STATE_CHANGE_DATA: HassKey[_KeyedEventData[EventStateChangedData]] = HassKey(
-    "track_state_change_data"
-)
 _TRACK_STATE_REPORT_DATA: HassKey[_KeyedEventData[EventStateReportedData]] = HassKey(
     "track_state_report_data"
 )
@@ -75,6 +74,9 @@ _TRACK_ENTITY_REGISTRY_UPDATED_DATA: HassKey[
 _TRACK_DEVICE_REGISTRY_UPDATED_DATA: HassKey[
     _KeyedEventData[EventDeviceRegistryUpdatedData]
 ] = HassKey("track_device_registry_updated_data")
+_TEMPLATE_RENDER_SCHEDULER: HassKey[TemplateRenderScheduler] = HassKey(
+    "template_render_scheduler"
+)
 
 _ALL_LISTENER = "all"
 _DOMAINS_LISTENER = "domains"
@@ -82,6 +84,9 @@ _ENTITIES_LISTENER = "entities"
 
 _LOGGER = logging.getLogger(__name__)
 
+# The number of templates the render stats are kept for
+TEMPLATE_RENDER_STATS_SIZE = 1024
+
 # Used to spread async_track_utc_time_change listeners and DataUpdateCoordinator
 # refresh cycles between RANDOM_MICROSECOND_MIN..RANDOM_MICROSECOND_MAX.
 # The values have been determined experimentally in production testing, background
@@ -146,11 +151,15 @@ class TrackTemplate:
     The template is template to calculate.
     The variables are variables to pass to the template.
     The rate_limit is a rate limit on how often the template is re-rendered.
+    The min_render_interval is a minimum time between re-renders, unlike the
+    rate_limit it also applies to changes of the entities the template
+    references.
     """
 
     template: Template
     variables: TemplateVarsType
     rate_limit: float | None = None
+    min_render_interval: float | None = None
 
 
 @dataclass(slots=True)
@@ -319,8 +328,8 @@ def async_track_state_change_event(
 
     In order to avoid having to iterate a long list
     of EVENT_STATE_CHANGED and fire and create a job
-    for each one, we keep a dict of entity ids that
-    care about the state change events so we can
+    for each one, the event bus keeps a dict of entity ids
+    that care about the state change events so it can
     do a fast dict lookup to route events.
     The passed in entity_ids will be automatically lower cased.
 
@@ -332,16 +341,6 @@ def async_track_state_change_event(
     return _async_track_state_change_event(hass, entity_ids, action, job_type)
 
 
-@callback
-def _async_dispatch_entity_id_event_soon(
-    hass: HomeAssistant,
-    callbacks: dict[str, list[HassJob[[Event[_StateEventDataT]], Any]]],
-    event: Event[_StateEventDataT],
-) -> None:
-    """Dispatch to listeners soon to ensure one event loop runs before dispatch."""
-    hass.loop.call_soon(_async_dispatch_entity_id_event, hass, callbacks, event)
-
-
 @callback
 def _async_dispatch_entity_id_event(
     hass: HomeAssistant,
@@ -372,18 +371,10 @@ def _async_state_filter(
     return event_data["entity_id"] in callbacks
 
 
-_KEYED_TRACK_STATE_CHANGE = _KeyedEventTracker(
-    key=_TRACK_STATE_CHANGE_DATA,
-    event_type=EVENT_STATE_CHANGED,
-    dispatcher_callable=_async_dispatch_entity_id_event_soon,
-    filter_callable=_async_state_filter,
-)
-
-
 @bind_hass
 def _async_track_state_change_event(
     hass: HomeAssistant,
-    entity_ids: str | Iterable[str],
+    entity_ids: str | Collection[str],
     action: Callable[[Event[EventStateChangedData]], Any],
     job_type: HassJobType | None,
 ) -> CALLBACK_TYPE:
@@ -391,8 +382,10 @@ def _async_track_state_change_event(
 
     The passed in entity_ids will not be automatically lower cased.
     """
-    return _async_track_event(
-        _KEYED_TRACK_STATE_CHANGE, hass, entity_ids, action, job_type
+    if not entity_ids:
+        return _remove_empty_listener
+    return hass.bus.async_listen_state_changed(
+        action, entity_ids=entity_ids, job_type=job_type
     )
 
 
@@ -973,6 +966,129 @@ def async_track_template(
 track_template = threaded_listener_factory(async_track_template)
 
 
+@dataclass(slots=True)
+class TemplateRenderStats:
+    """The number of renders and the time spent rendering a template."""
+
+    renders: int = 0
+    render_time: float = 0.0
+
+
+class TemplateRenderScheduler:
+    """Render the templates of the template trackers.
+
+    Trackers which coalesce their renders re-render their templates for
+    the state changes of a loop iteration at the end of the iteration, a
+    template is rendered once for all its state changes. Templates which
+    don't use variables and are shared by several of these trackers are
+    rendered once.
+
+    The number of renders and the time spent rendering are counted for
+    each template of all trackers.
+    """
+
+    __slots__ = ("_flush_task", "_hass", "_pending", "_shared_renders", "stats")
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the scheduler."""
+        self._hass = hass
+        self._pending: dict[
+            TrackTemplateResultInfo, list[Event[EventStateChangedData]]
+        ] = {}
+        self._flush_task: asyncio.Task[None] | None = None
+        self._shared_renders: dict[tuple[str, bool, bool, bool], RenderInfo] | None = (
+            None
+        )
+        self.stats: LRU[str, TemplateRenderStats] = LRU(TEMPLATE_RENDER_STATS_SIZE)
+
+    @callback
+    def async_schedule(
+        self, tracker: TrackTemplateResultInfo, event: Event[EventStateChangedData]
+    ) -> None:
+        """Schedule re-rendering the templates of a tracker for a state change."""
+        # The state changed, renders can't be shared with
+        # templates rendered before the change
+        self._shared_renders = None
+        self._pending.setdefault(tracker, []).append(event)
+        if self._flush_task is None:
+            # A task instead of a handle so the renders are
+            # waited for by async_block_till_done
+            self._flush_task = self._hass.async_create_task_internal(
+                self._async_flush(), "template render scheduler", eager_start=False
+            )
+
+    @callback
+    def async_cancel(self, tracker: TrackTemplateResultInfo) -> None:
+        """Cancel re-rendering the templates of a tracker."""
+        self._pending.pop(tracker, None)
+
+    async def _async_flush(self) -> None:
+        """Re-render the templates of the scheduled state changes."""
+        self._flush_task = None
+        pending = self._pending
+        self._pending = {}
+        self._shared_renders = {}
+        for tracker, events in pending.items():
+            try:
+                tracker.async_refresh_events(events)
+            except Exception:
+                _LOGGER.exception(
+                    "Error while re-rendering the templates of %s", tracker
+                )
+        self._shared_renders = None
+
+    @callback
+    def async_render_to_info(
+        self,
+        template: Template,
+        variables: TemplateVarsType,
+        shared: bool = False,
+        **kwargs: Any,
+    ) -> RenderInfo:
+        """Render a template and count the render.
+
+        If shared is set, the render is shared with the other templates with
+        the same source and render options rendered for the same state changes.
+        """
+        shared_renders = self._shared_renders if shared else None
+        if shared_renders is not None:
+            if template.async_analyze_to_info(variables) is None:
+                # The template uses variables or has to be
+                # rendered to know its states
+                shared_renders = None
+            else:
+                key = (
+                    template.template,
+                    kwargs.get("limited", False),
+                    kwargs.get("strict", False),
+                    kwargs.get("parse_result", True),
+                )
+                if (info := shared_renders.get(key)) is not None:
+                    return info
+        start = time.perf_counter()
+        info = template.async_render_to_info(variables, **kwargs)
+        render_time = time.perf_counter() - start
+        if (stats := self.stats.get(template.template)) is None:
+            stats = self.stats[template.template] = TemplateRenderStats()
+        stats.renders += 1
+        stats.render_time += render_time
+        if shared_renders is not None:
+            shared_renders[key] = info
+        return info
+
+
+@callback
+def async_get_template_render_scheduler(
+    hass: HomeAssistant,
+) -> TemplateRenderScheduler:
+    """Return the template render scheduler."""
+    if (scheduler := hass.data.get(_TEMPLATE_RENDER_SCHEDULER)) is None:
+        scheduler = hass.data[_TEMPLATE_RENDER_SCHEDULER] = TemplateRenderScheduler(
+            hass
+        )
+    return scheduler
+
+
 class TrackTemplateResultInfo:
     """Handle removal / refresh of tracker."""
 
@@ -982,6 +1098,7 @@ class TrackTemplateResultInfo:
         track_templates: Sequence[TrackTemplate],
         action: TrackTemplateResultListener,
         has_super_template: bool = False,
+        coalesce_renders: bool = False,
     ) -> None:
         """Handle removal / refresh of tracker init."""
         self.hass = hass
@@ -989,6 +1106,8 @@ class TrackTemplateResultInfo:
 
         self._track_templates = track_templates
         self._has_super_template = has_super_template
+        self._coalesce_renders = coalesce_renders
+        self._scheduler = async_get_template_render_scheduler(hass)
 
         self._last_result: dict[Template, bool | str | TemplateError] = {}
 
@@ -1021,8 +1140,14 @@ class TrackTemplateResultInfo:
         self,
         strict: bool = False,
         log_fn: Callable[[int, str], None] | None = None,
+        analyze_templates: bool = False,
     ) -> None:
-        """Activation of template tracking."""
+        """Activation of template tracking.
+
+        If analyze_templates is set, the listeners of templates which only
+        reference states by literal entity_ids are set up without rendering
+        the templates, the caller is expected to refresh the templates.
+        """
         block_render = False
         super_template = self._track_templates[0] if self._has_super_template else None
 
@@ -1030,8 +1155,8 @@ class TrackTemplateResultInfo:
         if super_template is not None:
             template = super_template.template
             variables = super_template.variables
-            self._info[template] = info = template.async_render_to_info(
-                variables, strict=strict, log_fn=log_fn
+            self._info[template] = info = self._scheduler.async_render_to_info(
+                template, variables, strict=strict, log_fn=log_fn
             )
 
             # If the super template did not render to True, don't update other templates
@@ -1051,8 +1176,13 @@ class TrackTemplateResultInfo:
                 continue
             template = track_template_.template
             variables = track_template_.variables
-            self._info[template] = info = template.async_render_to_info(
-                variables, strict=strict, log_fn=log_fn
+            if analyze_templates and (
+                analyzed_info := template.async_analyze_to_info(variables)
+            ):
+                self._info[template] = analyzed_info
+                continue
+            self._info[template] = info = self._scheduler.async_render_to_info(
+                template, variables, strict=strict, log_fn=log_fn
             )
 
             if info.exception:
@@ -1124,6 +1254,7 @@ class TrackTemplateResultInfo:
         assert self._track_state_changes
         self._track_state_changes.async_remove()
         self._rate_limit.async_remove()
+        self._scheduler.async_cancel(self)
         for template in list(self._time_listeners):
             self._time_listeners.pop(template)()
 
@@ -1132,6 +1263,35 @@ class TrackTemplateResultInfo:
         """Force recalculate the template."""
         self._refresh(None)
 
+    @callback
+    def async_refresh_events(self, events: list[Event[EventStateChangedData]]) -> None:
+        """Recalculate the templates for the state changes of a loop iteration.
+
+        Each template is rendered once, for the last of the state changes
+        which trigger a re-render of the template with the lowest rate limit.
+        """
+        track_templates = self._track_templates
+        # The index and rate limit of the event each template is rendered for
+        template_events: dict[int, tuple[int, float]] = {}
+        for event_index, event in enumerate(events):
+            for index, track_template_ in enumerate(track_templates):
+                if (info := self._info.get(track_template_.template)) is None:
+                    template_events[index] = (event_index, 0)
+                    continue
+                if not _event_triggers_rerender(event, info):
+                    continue
+                rate_limit = _rate_limit_for_event(event, info, track_template_) or 0
+                if (
+                    template_event := template_events.get(index)
+                ) is None or rate_limit <= template_event[1]:
+                    template_events[index] = (event_index, rate_limit)
+        event_templates: dict[int, list[TrackTemplate]] = {}
+        for index, (event_index, _) in template_events.items():
+            event_templates.setdefault(event_index, []).append(track_templates[index])
+        # The templates are rendered in the order of the events
+        for event_index in sorted(event_templates):
+            self._refresh(events[event_index], event_templates[event_index])
+
     def _render_template_if_ready(
         self,
         track_template_: TrackTemplate,
@@ -1176,8 +1336,8 @@ class TrackTemplateResultInfo:
             )
 
         self._rate_limit.async_triggered(template, now)
-        self._info[template] = info = template.async_render_to_info(
-            track_template_.variables
+        self._info[template] = info = self._scheduler.async_render_to_info(
+            template, track_template_.variables, self._coalesce_renders
         )
 
         try:
@@ -1241,6 +1401,11 @@ class TrackTemplateResultInfo:
         replayed is True if the event is being replayed because the
         rate limit was hit.
         """
+
+        if self._coalesce_renders and event and track_templates is None:
+            self._scheduler.async_schedule(self, event)
+            return
+
         updates: list[TrackTemplateResult] = []
         info_changed = False
         now = event.time_fired_timestamp if not replayed and event else time.time()
@@ -1347,6 +1512,8 @@ def async_track_template_result(
     strict: bool = False,
     log_fn: Callable[[int, str], None] | None = None,
     has_super_template: bool = False,
+    analyze_templates: bool = False,
+    coalesce_renders: bool = False,
 ) -> TrackTemplateResultInfo:
     """Add a listener that fires when the result of a template changes.
 
@@ -1378,14 +1545,29 @@ def async_track_template_result(
     has_super_template
         When set to True, the first template will block rendering of other
         templates if it doesn't render as True.
+    analyze_templates
+        When set to True, the states referenced by a template are found
+        without rendering it where possible. The action does not fire
+        with the initial result of these templates until the template
+        is refreshed.
+    coalesce_renders
+        When set to True, the templates are re-rendered once for all the
+        state changes of a loop iteration at the end of the iteration,
+        instead of for each state change. Only the last state change
+        which triggered the re-render of a template is passed to the
+        action.
 
     Returns
     -------
     Info object used to unregister the listener, and refresh the template.
 
     """
-    tracker = TrackTemplateResultInfo(hass, track_templates, action, has_super_template)
-    tracker.async_setup(strict=strict, log_fn=log_fn)
+    tracker = TrackTemplateResultInfo(
+        hass, track_templates, action, has_super_template, coalesce_renders
+    )
+    tracker.async_setup(
+        strict=strict, log_fn=log_fn, analyze_templates=analyze_templates
+    )
     return tracker
 
 
@@ -1992,15 +2174,19 @@ def _rate_limit_for_event(
     track_template_: TrackTemplate,
 ) -> float | None:
     """Determine the rate limit for an event."""
+    min_render_interval = track_template_.min_render_interval
     # Specifically referenced entities are excluded
     # from the rate limit
     if event.data["entity_id"] in info.entities:
-        return None
+        return min_render_interval
 
+    rate_limit: float | None
     if track_template_.rate_limit is not None:
-        return track_template_.rate_limit
-
-    rate_limit: float | None = info.rate_limit
+        rate_limit = track_template_.rate_limit
+    else:
+        rate_limit = info.rate_limit
+    if min_render_interval is not None:
+        return max(rate_limit or 0, min_render_interval)
     return rate_limit
 
 
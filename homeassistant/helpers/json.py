@@ -201,6 +201,18 @@ def save_json(
     atomic_writes: bool = False,
 ) -> None:
     """Save JSON data to a file."""
+    json_data, mode = prepare_save_json(filename, data, encoder=encoder)
+    method = write_utf8_file_atomic if atomic_writes else write_utf8_file
+    method(filename, json_data, private, mode=mode)
+
+
+def prepare_save_json(
+    filename: str,
+    data: list | dict,
+    *,
+    encoder: type[json.JSONEncoder] | None = None,
+) -> tuple[str | bytes, str]:
+    """Return the contents of a JSON file and the mode to write them with."""
     dump: Callable[[Any], Any]
     try:
         # For backwards compatibility, if they pass in the
@@ -224,8 +236,7 @@ def save_json(
         _LOGGER.error(msg)
         raise SerializationError(msg) from error
 
-    method = write_utf8_file_atomic if atomic_writes else write_utf8_file
-    method(filename, json_data, private, mode=mode)
+    return json_data, mode
 
 
 def find_paths_unserializable_data(
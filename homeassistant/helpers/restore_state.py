@@ -8,7 +8,7 @@ import logging
 from typing import Any, Self, cast
 
 from homeassistant.const import ATTR_RESTORED, EVENT_HOMEASSISTANT_STOP
-from homeassistant.core import HomeAssistant, State, callback, valid_entity_id
+from homeassistant.core import Context, HomeAssistant, State, callback, valid_entity_id
 from homeassistant.exceptions import HomeAssistantError
 import homeassistant.util.dt as dt_util
 from homeassistant.util.hass_dict import HassKey
@@ -20,6 +20,7 @@ from .event import async_track_time_interval
 from .frame import report
 from .json import JSONEncoder
 from .singleton import singleton
+from .snapshot import StoreSnapshot
 from .storage import Store
 
 DATA_RESTORE_STATE: HassKey[RestoreStateData] = HassKey("restore_state")
@@ -137,6 +138,12 @@ class RestoreStateData:
         self.store = Store[list[dict[str, Any]]](
             hass, STORAGE_VERSION, STORAGE_KEY, encoder=JSONEncoder
         )
+        self._snapshot = StoreSnapshot(
+            hass,
+            self.store,
+            self._states_from_data,
+            (StoredState, RestoredExtraData, State, Context),
+        )
         self.last_states: dict[str, StoredState] = {}
         self.entities: dict[str, RestoreEntity] = {}
 
@@ -153,6 +160,10 @@ class RestoreStateData:
 
     async def async_load(self) -> None:
         """Load the instance of this data helper."""
+        if (last_states := await self._snapshot.async_load()) is not None:
+            self.last_states = last_states
+            return
+
         try:
             stored_states = await self.store.async_load()
         except HomeAssistantError as exc:
@@ -163,13 +174,20 @@ class RestoreStateData:
             _LOGGER.debug("Not creating cache - no saved states found")
             self.last_states = {}
         else:
-            self.last_states = {
-                item["state"]["entity_id"]: StoredState.from_dict(item)
-                for item in stored_states
-                if valid_entity_id(item["state"]["entity_id"])
-            }
+            self.last_states = self._states_from_data(stored_states)
             _LOGGER.debug("Created cache with %s", list(self.last_states))
 
+    @staticmethod
+    def _states_from_data(
+        stored_states: list[dict[str, Any]],
+    ) -> dict[str, StoredState]:
+        """Return the stored states of the stored data."""
+        return {
+            item["state"]["entity_id"]: StoredState.from_dict(item)
+            for item in stored_states
+            if valid_entity_id(item["state"]["entity_id"])
+        }
+
     @callback
     def async_get_stored_states(self) -> list[StoredState]:
         """Get the set of states which should be stored.
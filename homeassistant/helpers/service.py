@@ -8,6 +8,7 @@ import dataclasses
 from enum import Enum
 from functools import cache, partial
 import logging
+import time
 from types import ModuleType
 from typing import TYPE_CHECKING, Any, TypedDict, TypeGuard, cast
 
@@ -64,10 +65,12 @@ from . import (
 )
 from .group import expand_entity_ids
 from .selector import TargetSelector
+from .trace import trace_stack_cv, trace_stack_top, trace_update_result
 from .typing import ConfigType, TemplateVarsType, VolDictType, VolSchemaType
 
 if TYPE_CHECKING:
     from .entity import Entity
+    from .entity_platform import BatchServiceHandler, EntityPlatform
 
 CONF_SERVICE_ENTITY_ID = "entity_id"
 
@@ -1001,12 +1004,21 @@ async def entity_service_call(
             )
         return None
 
+    # The time each entity took to handle the call, if the call is traced
+    call_times: dict[str, float] | None = (
+        {} if trace_stack_top(trace_stack_cv) is not None else None
+    )
+
     if len(entities) == 1:
         # Single entity case avoids creating task
         entity = entities[0]
-        single_response = await _handle_entity_call(
-            hass, entity, func, data, call.context
+        single_response = await _timed_call(
+            _handle_entity_call(hass, entity, func, data, call.context),
+            call_times,
+            entities,
         )
+        if call_times is not None:
+            trace_update_result(entity_call_times=call_times)
         if entity.should_poll:
             # Context expires if the turn on commands took a long time.
             # Set context again so it's there when we update
@@ -1014,23 +1026,11 @@ async def entity_service_call(
             await entity.async_update_ha_state(True)
         return {entity.entity_id: single_response} if return_response else None
 
-    # Use asyncio.gather here to ensure the returned results
-    # are in the same order as the entities list
-    results: list[ServiceResponse | BaseException] = await asyncio.gather(
-        *[
-            entity.async_request_call(
-                _handle_entity_call(hass, entity, func, data, call.context)
-            )
-            for entity in entities
-        ],
-        return_exceptions=True,
+    response_data = await _async_handle_entity_calls(
+        hass, entities, func, data, call, call_times
     )
-
-    response_data: EntityServiceResponse = {}
-    for entity, result in zip(entities, results, strict=False):
-        if isinstance(result, BaseException):
-            raise result from None
-        response_data[entity.entity_id] = result
+    if call_times is not None:
+        trace_update_result(entity_call_times=call_times)
 
     tasks: list[asyncio.Task[None]] = []
 
@@ -1052,6 +1052,126 @@ async def entity_service_call(
     return response_data if return_response and response_data else None
 
 
+async def _async_handle_entity_calls(
+    hass: HomeAssistant,
+    entities: list[Entity],
+    func: str | HassJob,
+    data: dict | ServiceCall,
+    call: ServiceCall,
+    call_times: dict[str, float] | None,
+) -> EntityServiceResponse:
+    """Call the service for several entities simultaneously.
+
+    The entities of a platform with a batch handler for the service are
+    handled by a single call of the handler.
+    """
+    batches: dict[EntityPlatform, list[Entity]] = {}
+    entity_calls: list[Entity] = entities
+    if not call.return_response:
+        entity_calls = _group_batch_entity_calls(call, entities, batches)
+
+    # Use asyncio.gather here to ensure the returned results
+    # are in the same order as the entities list
+    results: list[ServiceResponse | BaseException] = await asyncio.gather(
+        *[
+            entity.async_request_call(
+                _timed_call(
+                    _handle_entity_call(hass, entity, func, data, call.context),
+                    call_times,
+                    (entity,),
+                )
+            )
+            for entity in entity_calls
+        ],
+        *[
+            _timed_call(
+                _handle_batch_entity_call(
+                    platform.batch_service_handlers[call.service],
+                    batch_entities,
+                    data,
+                    call.context,
+                ),
+                call_times,
+                batch_entities,
+            )
+            for platform, batch_entities in batches.items()
+        ],
+        return_exceptions=True,
+    )
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result from None
+    return {
+        entity.entity_id: cast(ServiceResponse, result)
+        for entity, result in zip(entity_calls, results, strict=False)
+    }
+
+
+def _group_batch_entity_calls(
+    call: ServiceCall,
+    entities: list[Entity],
+    batches: dict[EntityPlatform, list[Entity]],
+) -> list[Entity]:
+    """Group the entities of platforms which handle the call in a batch.
+
+    The entities of a platform with a batch handler for the service are
+    added to the batches if the call targets more than one of them, the
+    other entities are returned.
+    """
+    platform_entities: dict[EntityPlatform, list[Entity]] = {}
+    for entity in entities:
+        if (
+            (platform := entity.platform) is not None
+            and platform.domain == call.domain
+            and call.service in platform.batch_service_handlers
+        ):
+            platform_entities.setdefault(platform, []).append(entity)
+    batched: set[Entity] = set()
+    for platform, batch_entities in platform_entities.items():
+        if len(batch_entities) > 1:
+            batches[platform] = batch_entities
+            batched.update(batch_entities)
+    return [entity for entity in entities if entity not in batched]
+
+
+async def _handle_batch_entity_call(
+    handler: BatchServiceHandler,
+    entities: list[Entity],
+    data: dict | ServiceCall,
+    context: Context,
+) -> None:
+    """Handle calling a batch handler of a platform."""
+    for entity in entities:
+        entity.async_set_context(context)
+    await handler(entities, data)
+
+
+def _timed_call[_T](
+    coro: Coroutine[Any, Any, _T],
+    call_times: dict[str, float] | None,
+    entities: Iterable[Entity],
+) -> Coroutine[Any, Any, _T]:
+    """Return an entity call, which records its time if the call is traced."""
+    if call_times is None:
+        return coro
+    return _async_timed_call(coro, call_times, entities)
+
+
+async def _async_timed_call[_T](
+    coro: Coroutine[Any, Any, _T],
+    call_times: dict[str, float],
+    entities: Iterable[Entity],
+) -> _T:
+    """Await an entity call and record the time the entities took."""
+    start = time.monotonic()
+    try:
+        return await coro
+    finally:
+        elapsed = time.monotonic() - start
+        for entity in entities:
+            call_times[entity.entity_id] = elapsed
+
+
 async def _handle_entity_call(
     hass: HomeAssistant,
     entity: Entity,
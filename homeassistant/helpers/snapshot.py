@@ -0,0 +1,276 @@
+"""Binary snapshots of data loaded from storage.
+
+Loading the registries and the restore state data takes long when they
+are large, as every item is validated and indexed after the JSON file is
+parsed. A snapshot holds the loaded structures pickled, built from the
+JSON file of the store when Home Assistant closes, and is loaded with a
+single unpickle.
+
+The JSON file stays the source of truth. A snapshot is only used if it was
+built from the exact same JSON file by the same version of Home Assistant
+with the same code of the build function and the snapshotted classes and
+its checksum matches, otherwise the JSON file is loaded.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable, Mapping, Sequence
+from contextlib import suppress
+import copyreg
+from functools import partial
+from hashlib import sha256
+import io
+import logging
+import os
+import pickle
+from types import CodeType
+from typing import Any
+
+import attr
+
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE, __version__
+from homeassistant.core import Event, HomeAssistant
+from homeassistant.util.file import WriteError, write_utf8_file
+from homeassistant.util.json import json_loads
+from homeassistant.util.read_only_dict import ReadOnlyDict
+
+from .json import json_bytes
+from .storage import Store
+
+_LOGGER = logging.getLogger(__name__)
+
+SNAPSHOT_FORMAT = 1
+SNAPSHOT_SUFFIX = ".snapshot"
+
+
+def _reduce_read_only_dict(value: ReadOnlyDict) -> tuple[Any, ...]:
+    """Pickle a read only dict, which can not be filled item by item."""
+    return (ReadOnlyDict, (dict(value),))
+
+
+class SkipSnapshotError(Exception):
+    """Raised by a build function if the data should not be snapshotted.
+
+    For example if invalid items are skipped, which must be reported
+    each time the JSON file is loaded.
+    """
+
+
+def _update_code_digest(digest: Any, code: CodeType) -> None:
+    """Add the bytecode, names and constants of a code object to a digest."""
+    digest.update(code.co_code)
+    digest.update(repr(code.co_names).encode())
+    for const in code.co_consts:
+        if isinstance(const, CodeType):
+            _update_code_digest(digest, const)
+        elif isinstance(const, frozenset):
+            # The order of a frozenset depends on the hash seed
+            digest.update(repr(sorted(map(repr, const))).encode())
+        else:
+            digest.update(repr(const).encode())
+
+
+def _function_code(function: Any) -> CodeType | None:
+    """Return the code of a function, method or partial."""
+    while isinstance(function, partial):
+        function = function.func
+    if isinstance(function, (classmethod, staticmethod)):
+        function = function.__func__
+    elif isinstance(function, property):
+        function = function.fget
+    function = getattr(function, "__func__", function)
+    return getattr(function, "__code__", None)
+
+
+def _code_fingerprint(build: Callable[..., Any], classes: Iterable[type]) -> str:
+    """Return a fingerprint of the build function and the snapshotted classes.
+
+    Source installs keep the version of Home Assistant when the code
+    changes. Unpickling a class whose fields changed would leave the new
+    fields unset, and a changed build function could build the structures
+    differently from the same JSON file.
+    """
+    digest = sha256()
+    if (code := _function_code(build)) is not None:
+        _update_code_digest(digest, code)
+    for cls in classes:
+        fields: set[str] = set()
+        if attr.has(cls):
+            fields.update(attribute.name for attribute in attr.fields(cls))
+        for base in cls.__mro__:
+            slots = base.__dict__.get("__slots__", ())
+            fields.update((slots,) if isinstance(slots, str) else slots)
+            # The methods include __init__, which sets the attributes of
+            # plain classes, and the methods which build the objects. The
+            # code attrs generates from the fields is left out, it embeds
+            # hashes which change with the hash seed
+            for name, value in sorted(base.__dict__.items()):
+                if (
+                    code := _function_code(value)
+                ) is not None and not code.co_filename.startswith("<"):
+                    digest.update(f"{base.__qualname__}.{name}".encode())
+                    _update_code_digest(digest, code)
+        digest.update(
+            f"{cls.__module__}.{cls.__qualname__}:{','.join(sorted(fields))}".encode()
+        )
+    return digest.hexdigest()
+
+
+class _SnapshotPickler(pickle.Pickler):
+    """Pickler for the structures of a snapshot."""
+
+    dispatch_table = {
+        **copyreg.dispatch_table,
+        ReadOnlyDict: _reduce_read_only_dict,
+    }
+
+
+class StoreSnapshot[_StoreT: Mapping[str, Any] | Sequence[Any], _T]:
+    """Load the data of a store from a snapshot.
+
+    The build function turns the data of the store into the structures to
+    snapshot, it must be the same function used when the data is loaded from
+    the store. It is called in the executor and can raise SkipSnapshotError
+    to not snapshot the data. The classes are the classes of the objects in
+    the structures, the snapshot is not used if their code or the code of
+    the build function changed.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        store: Store[_StoreT],
+        build: Callable[[_StoreT], _T],
+        classes: Iterable[type],
+    ) -> None:
+        """Initialize the snapshot and build it when Home Assistant closes."""
+        self.hass = hass
+        self.path = f"{store.path}{SNAPSHOT_SUFFIX}"
+        self._store = store
+        self._build = build
+        self._fingerprint = _code_fingerprint(build, classes)
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_CLOSE, self._async_save)
+
+    def _header(self, json_digest: str, digest: str) -> dict[str, Any]:
+        """Return the header of a snapshot."""
+        return {
+            "format": SNAPSHOT_FORMAT,
+            "ha_version": __version__,
+            "key": self._store.key,
+            "version": self._store.version,
+            "minor_version": self._store.minor_version,
+            "code": self._fingerprint,
+            "json_digest": json_digest,
+            "digest": digest,
+        }
+
+    def _json_digest(self) -> str | None:
+        """Return the digest of the JSON file of the store."""
+        try:
+            with open(self._store.path, "rb") as file:
+                return sha256(file.read()).hexdigest()
+        except FileNotFoundError:
+            return None
+
+    def _read(self) -> tuple[dict[str, Any], bytes] | None:
+        """Return the header and the pickled data of the snapshot."""
+        try:
+            with open(self.path, "rb") as file:
+                header = json_loads(file.readline())
+                payload = file.read()
+        except FileNotFoundError:
+            return None
+        if not isinstance(header, dict):
+            raise TypeError("Invalid snapshot header")
+        return header, payload
+
+    async def async_load(self) -> _T | None:
+        """Return the data of the snapshot or None if it can not be used."""
+        return await self.hass.async_add_executor_job(self._load)
+
+    def _load(self) -> _T | None:
+        """Return the data of the snapshot or None if it can not be used."""
+        try:
+            if (snapshot := self._read()) is None:
+                return None
+            header, payload = snapshot
+            if (json_digest := self._json_digest()) is None or header != self._header(
+                json_digest, sha256(payload).hexdigest()
+            ):
+                _LOGGER.debug("Snapshot %s is outdated", self.path)
+                return None
+            data: _T = pickle.loads(payload)
+        except Exception as err:  # noqa: BLE001
+            _LOGGER.debug("Error loading snapshot %s: %s", self.path, err)
+            return None
+        _LOGGER.debug("Loaded %s from snapshot", self._store.key)
+        return data
+
+    def _read_store(self) -> tuple[str, Any] | None:
+        """Return the digest and the data of the JSON file of the store.
+
+        None is returned if the snapshot is up to date.
+        """
+        try:
+            with open(self._store.path, "rb") as file:
+                contents = file.read()
+        except FileNotFoundError:
+            self._remove()
+            return None
+        json_digest = sha256(contents).hexdigest()
+        try:
+            if (snapshot := self._read()) is not None and snapshot[0] == self._header(
+                json_digest, sha256(snapshot[1]).hexdigest()
+            ):
+                return None
+        except (TypeError, ValueError):
+            pass
+        return json_digest, json_loads(contents)
+
+    def _remove(self) -> None:
+        """Remove the snapshot."""
+        with suppress(FileNotFoundError):
+            os.unlink(self.path)
+
+    def _write(self, json_digest: str, payload: bytes) -> None:
+        """Write the snapshot."""
+        header = json_bytes(self._header(json_digest, sha256(payload).hexdigest()))
+        try:
+            write_utf8_file(self.path, header + b"\n" + payload, True, mode="wb")
+        except WriteError as err:
+            _LOGGER.error("Error writing snapshot %s: %s", self.path, err)
+
+    async def _async_save(self, _event: Event) -> None:
+        """Build the snapshot from the JSON file of the store."""
+        await self.hass.async_add_executor_job(self._save)
+
+    def _save(self) -> None:
+        """Build the snapshot from the JSON file of the store."""
+        store = self._store
+        try:
+            if (stored := self._read_store()) is None:
+                return
+        except (OSError, TypeError, ValueError) as err:
+            _LOGGER.debug("Not building snapshot %s: %s", self.path, err)
+            return
+        json_digest, data = stored
+        if (
+            not isinstance(data, dict)
+            or data.get("version") != store.version
+            or data.get("minor_version", 1) != store.minor_version
+        ):
+            self._remove()
+            return
+        buffer = io.BytesIO()
+        try:
+            _SnapshotPickler(buffer, pickle.HIGHEST_PROTOCOL).dump(
+                self._build(data["data"])
+            )
+        except SkipSnapshotError as err:
+            _LOGGER.debug("Not building snapshot %s: %s", self.path, err)
+            self._remove()
+            return
+        except Exception:
+            _LOGGER.exception("Error building snapshot %s", self.path)
+            return
+        self._write(json_digest, buffer.getvalue())
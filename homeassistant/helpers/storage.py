@@ -3,14 +3,18 @@
 from __future__ import annotations
 
 import asyncio
+from collections import deque
 from collections.abc import Callable, Iterable, Mapping, Sequence
 from contextlib import suppress
 from copy import deepcopy
+from dataclasses import dataclass
+from hashlib import sha256
 import inspect
 from json import JSONDecodeError, JSONEncoder
 import logging
 import os
 from pathlib import Path
+import time
 from typing import Any
 
 from propcache import cached_property
@@ -32,7 +36,7 @@ from homeassistant.exceptions import HomeAssistantError
 from homeassistant.loader import bind_hass
 from homeassistant.util import json as json_util
 import homeassistant.util.dt as dt_util
-from homeassistant.util.file import WriteError
+from homeassistant.util.file import WriteError, write_utf8_file, write_utf8_file_atomic
 from homeassistant.util.hass_dict import HassKey
 
 from . import json as json_helper
@@ -49,6 +53,14 @@ STORAGE_MANAGER: HassKey[_StoreManager] = HassKey("storage_manager")
 
 MANAGER_CLEANUP_DELAY = 60
 
+# The time the writes of all stores are batched for when writing behind
+WRITE_BEHIND_FLUSH_DELAY = 5
+# The maximum number of atomic writes, which fsync, in the fsync window
+WRITE_BEHIND_FSYNC_BUDGET = 6
+WRITE_BEHIND_FSYNC_WINDOW = 60
+# The maximum time an atomic write is deferred over the fsync budget
+WRITE_BEHIND_MAX_DEFERRAL = 60
+
 
 @bind_hass
 async def async_migrator[_T: Mapping[str, Any] | Sequence[Any]](
@@ -103,6 +115,278 @@ def get_internal_store_manager(hass: HomeAssistant) -> _StoreManager:
     return hass.data[STORAGE_MANAGER]
 
 
+@callback
+def async_enable_write_behind(hass: HomeAssistant) -> None:
+    """Batch the writes of all stores and skip writes of unchanged data."""
+    manager = get_internal_store_manager(hass)
+    if manager.write_behind is None:
+        manager.write_behind = _WriteBehind(hass)
+
+
+@callback
+def async_get_write_stats(hass: HomeAssistant) -> StorageWriteStats | None:
+    """Return the write statistics or None if the writes are not batched."""
+    if (write_behind := get_internal_store_manager(hass).write_behind) is None:
+        return None
+    return write_behind.stats
+
+
+@dataclass(slots=True)
+class StorageWriteStats:
+    """Statistics of the batched writes of the stores."""
+
+    save_requests: int = 0
+    writes: int = 0
+    unchanged: int = 0
+    bytes_written: int = 0
+    fsyncs: int = 0
+    deferred_fsyncs: int = 0
+    flushes: int = 0
+    flush_time: float = 0
+    max_flush_time: float = 0
+
+    @property
+    def write_amplification(self) -> float:
+        """Return the number of files written per save request."""
+        return self.writes / self.save_requests if self.save_requests else 0
+
+    @property
+    def average_flush_time(self) -> float:
+        """Return the average time it took to write a batch."""
+        return self.flush_time / self.flushes if self.flushes else 0
+
+
+@dataclass(slots=True)
+class _WriteRequest:
+    """A pending write of a store."""
+
+    key: str
+    path: str
+    data: dict[str, Any]
+    private: bool
+    atomic_writes: bool
+    encoder: type[JSONEncoder] | None
+    # The loop time of the first save request which is not written yet
+    requested: float
+
+
+class _WriteBehind:
+    """Batch the writes of all stores.
+
+    The writes requested within the flush delay are written by a single
+    executor job. A file is not written if its serialized data did not
+    change, and atomic writes, which fsync, are deferred to a later batch
+    once the fsync budget is used up. A write deferred for longer than the
+    maximum deferral is written regardless of the budget. All pending
+    writes are written when Home Assistant is in the final write state.
+
+    Until a write is done its data is returned when the store is loaded.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the write-behind."""
+        self._hass = hass
+        self._pending: dict[str, _WriteRequest] = {}
+        # The writes of the running flush, their data is no longer changed
+        self._flushing: dict[str, _WriteRequest] = {}
+        # The sha256 of the contents of the files, only accessed by the
+        # executor job of a flush as flushes do not run concurrently
+        self._digests: dict[str, bytes | None] = {}
+        self._fsync_times: deque[float] = deque()
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self._flush_lock = asyncio.Lock()
+        self.stats = StorageWriteStats()
+        hass.bus.async_listen_once(
+            EVENT_HOMEASSISTANT_FINAL_WRITE, self._async_final_write
+        )
+
+    @callback
+    def async_write(
+        self,
+        key: str,
+        path: str,
+        data: dict[str, Any],
+        private: bool,
+        atomic_writes: bool,
+        encoder: type[JSONEncoder] | None,
+    ) -> None:
+        """Write the data of a store with the next batch."""
+        requested = self._hass.loop.time()
+        # A pending write of the same file is replaced by the newer data,
+        # which does not restart the deferral of the write
+        if (pending := self._pending.get(path)) is not None:
+            requested = pending.requested
+        self._pending[path] = _WriteRequest(
+            key, path, data, private, atomic_writes, encoder, requested
+        )
+        self.stats.save_requests += 1
+        self._async_schedule_flush()
+
+    @callback
+    def async_get_pending(self, path: str) -> dict[str, Any] | None:
+        """Return the data of the write of a file that is not done yet."""
+        if (request := self._pending.get(path) or self._flushing.get(path)) is None:
+            return None
+        return request.data
+
+    async def async_remove(self, path: str) -> None:
+        """Drop the pending write of a file that is removed."""
+        self._pending.pop(path, None)
+        # Wait for a running flush, which may write the file
+        async with self._flush_lock:
+            self._digests.pop(path, None)
+
+    async def async_flush_all(self) -> None:
+        """Write all pending writes regardless of the fsync budget."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        await self._async_flush(True)
+
+    @callback
+    def _async_schedule_flush(self) -> None:
+        """Schedule a flush of the pending writes."""
+        if self._flush_handle is None:
+            self._flush_handle = self._hass.loop.call_later(
+                WRITE_BEHIND_FLUSH_DELAY, self._async_create_flush_task
+            )
+
+    @callback
+    def _async_create_flush_task(self) -> None:
+        """Flush the pending writes in a task."""
+        self._flush_handle = None
+        self._hass.async_create_task_internal(
+            self._async_flush(False), eager_start=True
+        )
+
+    async def _async_final_write(self, _event: Event) -> None:
+        """Flush all pending writes because Home Assistant is stopping."""
+        await self.async_flush_all()
+
+    @callback
+    def _async_take_requests(self, final: bool) -> list[_WriteRequest]:
+        """Take the pending writes which fit in the fsync budget or are overdue.
+
+        The data of the writes is generated in the event loop, like it
+        is when a store with a pending write is loaded.
+        """
+        now = self._hass.loop.time()
+        fsync_times = self._fsync_times
+        expired = now - WRITE_BEHIND_FSYNC_WINDOW
+        while fsync_times and fsync_times[0] <= expired:
+            fsync_times.popleft()
+        fsyncs_left = WRITE_BEHIND_FSYNC_BUDGET - len(fsync_times)
+        requests: list[_WriteRequest] = []
+        for path, request in list(self._pending.items()):
+            if request.atomic_writes and not final:
+                if (
+                    fsyncs_left <= 0
+                    and now - request.requested < WRITE_BEHIND_MAX_DEFERRAL
+                ):
+                    self.stats.deferred_fsyncs += 1
+                    continue
+                fsyncs_left -= 1
+            del self._pending[path]
+            data = request.data
+            if "data_func" in data:
+                try:
+                    data["data"] = data.pop("data_func")()
+                except Exception as err:  # noqa: BLE001
+                    self._async_log_error(request, err)
+                    continue
+            requests.append(request)
+        return requests
+
+    async def _async_flush(self, final: bool) -> None:
+        """Write the pending writes in a single executor job."""
+        async with self._flush_lock:
+            if requests := self._async_take_requests(final):
+                self._flushing = {request.path: request for request in requests}
+                start = time.monotonic()
+                try:
+                    results = await self._hass.async_add_executor_job(
+                        self._write_requests, requests
+                    )
+                finally:
+                    self._flushing = {}
+                self._async_record_flush(requests, results, time.monotonic() - start)
+            if self._pending and not final:
+                self._async_schedule_flush()
+
+    @callback
+    def _async_record_flush(
+        self,
+        requests: list[_WriteRequest],
+        results: list[int | Exception],
+        flush_time: float,
+    ) -> None:
+        """Update the statistics of a flush and log the failed writes."""
+        stats = self.stats
+        stats.flushes += 1
+        stats.flush_time += flush_time
+        stats.max_flush_time = max(stats.max_flush_time, flush_time)
+        now = self._hass.loop.time()
+        for request, result in zip(requests, results, strict=True):
+            if isinstance(result, Exception):
+                self._async_log_error(request, result)
+            elif not result:
+                stats.unchanged += 1
+            else:
+                stats.writes += 1
+                stats.bytes_written += result
+                if request.atomic_writes:
+                    stats.fsyncs += 1
+                    self._fsync_times.append(now)
+
+    @callback
+    def _async_log_error(self, request: _WriteRequest, err: Exception) -> None:
+        """Log a write that failed."""
+        if isinstance(err, (json_util.SerializationError, WriteError)):
+            _LOGGER.error("Error writing config for %s: %s", request.key, err)
+        else:
+            _LOGGER.error("Error writing config for %s", request.key, exc_info=err)
+
+    def _write_requests(self, requests: list[_WriteRequest]) -> list[int | Exception]:
+        """Write the files and return the number of bytes written or the error."""
+        results: list[int | Exception] = []
+        for request in requests:
+            try:
+                results.append(self._write(request))
+            except Exception as err:  # noqa: BLE001
+                results.append(err)
+        return results
+
+    def _write(self, request: _WriteRequest) -> int:
+        """Write a file unless its contents did not change."""
+        path = request.path
+        contents, mode = json_helper.prepare_save_json(
+            path, request.data, encoder=request.encoder
+        )
+        encoded = contents if isinstance(contents, bytes) else contents.encode()
+        digest = sha256(encoded).digest()
+        if path not in self._digests:
+            self._digests[path] = self._file_digest(path)
+        if self._digests[path] == digest:
+            _LOGGER.debug("Not writing unchanged data to %s", path)
+            return 0
+        _LOGGER.debug("Writing data for %s to %s", request.key, path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        method = write_utf8_file_atomic if request.atomic_writes else write_utf8_file
+        # Forget the contents in case the write fails halfway
+        self._digests.pop(path)
+        method(path, contents, request.private, mode=mode)
+        self._digests[path] = digest
+        return len(encoded)
+
+    def _file_digest(self, path: str) -> bytes | None:
+        """Return the sha256 of the contents of a file."""
+        try:
+            with open(path, "rb") as file:
+                return sha256(file.read()).digest()
+        except FileNotFoundError:
+            return None
+
+
 class _StoreManager:
     """Class to help storing data.
 
@@ -117,6 +401,7 @@ class _StoreManager:
         self._data_preload: dict[str, json_util.JsonValueType] = {}
         self._storage_path: Path = Path(hass.config.config_dir).joinpath(STORAGE_DIR)
         self._cancel_cleanup: asyncio.TimerHandle | None = None
+        self.write_behind: _WriteBehind | None = None
 
     async def async_initialize(self) -> None:
         """Initialize the storage manager."""
@@ -312,8 +597,11 @@ class Store[_T: Mapping[str, Any] | Sequence[Any]]:
     async def _async_load_data(self):
         """Load the data."""
         # Check if we have a pending write
-        if self._data is not None:
-            data = self._data
+        pending = self._data
+        if pending is None and (write_behind := self._manager.write_behind):
+            pending = write_behind.async_get_pending(self.path)
+        if pending is not None:
+            data = pending
 
             # If we didn't generate data yet, do it now.
             if "data_func" in data:
@@ -422,7 +710,13 @@ class Store[_T: Mapping[str, Any] | Sequence[Any]]:
         return stored
 
     async def async_save(self, data: _T) -> None:
-        """Save data."""
+        """Save data.
+
+        When the writes of the stores are batched with write-behind, the
+        data is only queued and is not durable when this returns. It is
+        written within the flush delay, or the maximum deferral for atomic
+        writes over the fsync budget, and at the latest on the final write.
+        """
         self._data = {
             "version": self.version,
             "minor_version": self.minor_version,
@@ -543,6 +837,18 @@ class Store[_T: Mapping[str, Any] | Sequence[Any]]:
                 _LOGGER.error("Error writing config for %s: %s", self.key, err)
 
     async def _async_write_data(self, path: str, data: dict) -> None:
+        if (write_behind := self._manager.write_behind) is not None:
+            write_behind.async_write(
+                self.key,
+                self.path,
+                data,
+                self._private,
+                self._atomic_writes,
+                self._encoder,
+            )
+            if self.hass.state is CoreState.final_write:
+                await write_behind.async_flush_all()
+            return
         await self.hass.async_add_executor_job(self._write_data, self.path, data)
 
     def _write_data(self, path: str, data: dict) -> None:
@@ -570,6 +876,8 @@ class Store[_T: Mapping[str, Any] | Sequence[Any]]:
         self._manager.async_invalidate(self.key)
         self._async_cleanup_delay_listener()
         self._async_cleanup_final_write_listener()
+        if (write_behind := self._manager.write_behind) is not None:
+            await write_behind.async_remove(self.path)
 
         with suppress(FileNotFoundError):
             await self.hass.async_add_executor_job(os.unlink, self.path)
@@ -13,7 +13,9 @@ from copy import deepcopy
 from datetime import date, datetime, time, timedelta
 from functools import cache, lru_cache, partial, wraps
 import json
+from keyword import iskeyword
 import logging
+import marshal
 import math
 from operator import contains
 import pathlib
@@ -23,13 +25,13 @@ import statistics
 from struct import error as StructError, pack, unpack_from
 import sys
 from types import CodeType, TracebackType
-from typing import Any, Concatenate, Literal, NoReturn, Self, cast, overload
+from typing import Any, Concatenate, Literal, NamedTuple, NoReturn, Self, cast, overload
 from urllib.parse import urlencode as urllib_urlencode
-import weakref
 
 from awesomeversion import AwesomeVersion
 import jinja2
-from jinja2 import pass_context, pass_environment, pass_eval_context
+from jinja2 import nodes, pass_context, pass_environment, pass_eval_context
+from jinja2.bccache import bc_magic
 from jinja2.runtime import AsyncLoopContext, LoopContext
 from jinja2.sandbox import ImmutableSandboxedEnvironment
 from jinja2.utils import Namespace
@@ -49,6 +51,7 @@ from homeassistant.const import (
     STATE_UNAVAILABLE,
     STATE_UNKNOWN,
     UnitOfLength,
+    __version__ as ha_version,
 )
 from homeassistant.core import (
     Context,
@@ -85,6 +88,7 @@ from . import (
 )
 from .deprecation import deprecated_function
 from .singleton import singleton
+from .storage import Store
 from .translation import async_translate_state
 from .typing import TemplateVarsType
 
@@ -152,6 +156,24 @@ template_cv: ContextVar[tuple[str, str] | None] = ContextVar(
 CACHED_TEMPLATE_STATES = 512
 EVAL_CACHE_SIZE = 512
 
+# Number of compiled templates kept by the process wide
+# COMPILED_TEMPLATE_CACHE
+COMPILED_TEMPLATE_CACHE_SIZE = 4096
+
+_BYTECODE_STORAGE_KEY = "core.template_bytecode"
+_BYTECODE_STORAGE_VERSION = 1
+_BYTECODE_SAVE_DELAY = 60
+# Code objects can only be loaded by the Python and Jinja version
+# which compiled them, and their analysis by the same analysis version.
+# The version of Home Assistant is included as the filters, globals and
+# fast path code the code objects use can change with an upgrade.
+_ANALYSIS_VERSION = 3
+_BYTECODE_MAGIC = (
+    f"{ha_version}:{jinja2.__version__}:{base64.b64encode(bc_magic).decode()}"
+    f":{_ANALYSIS_VERSION}"
+)
+_BYTECODE_STORE: HassKey[_BytecodeCacheStore] = HassKey("template.bytecode_store")
+
 MAX_CUSTOM_TEMPLATE_SIZE = 5 * 1024 * 1024
 MAX_TEMPLATE_OUTPUT = 256 * 1024  # 256KiB
 
@@ -370,6 +392,388 @@ def _cached_parse_result(render_result: str) -> Any:
     return render_result
 
 
+# Functions, filters and tests which read the state of the
+# entity_id passed as their first argument
+_ENTITY_STATE_FUNCTIONS = frozenset(
+    {"has_value", "is_state", "is_state_attr", "state_attr", "state_translated"}
+)
+# Functions and filters which depend on the time
+_TIME_FUNCTIONS = frozenset(
+    {"now", "relative_time", "time_since", "time_until", "today_at", "utcnow"}
+)
+# Functions and filters which read states that can not be found
+# without rendering the template
+_UNTRACEABLE_STATE_FUNCTIONS = frozenset({"closest", "distance", "expand"})
+# Names defined by Jinja inside loops and macros
+_JINJA_LOCAL_NAMES = frozenset({"caller", "kwargs", "loop", "varargs"})
+# Filters which call the filter or test they are passed by name
+_NAMED_CALL_FILTERS = frozenset({"map", "reject", "rejectattr", "select", "selectattr"})
+
+
+class TemplateDependencies(NamedTuple):
+    """The states a template depends on, found without rendering it."""
+
+    entities: frozenset[str]
+    has_time: bool
+
+
+def _literal_string(node: nodes.Node | None) -> str | None:
+    """Return the value of a string constant."""
+    if isinstance(node, nodes.Const) and isinstance(node.value, str):
+        return node.value
+    return None
+
+
+def _literal_entity_id(node: nodes.Node | None) -> str | None:
+    """Return the entity_id of a string constant, if it is a valid entity_id."""
+    if (value := _literal_string(node)) is not None and valid_entity_id(
+        entity_id := value.lower()
+    ):
+        return entity_id
+    return None
+
+
+def _literal_domain(node: nodes.Node) -> tuple[nodes.Name, str] | None:
+    """Return the states name and domain of states.domain or states['domain']."""
+    if not isinstance(name := getattr(node, "node", None), nodes.Name) or (
+        name.name != "states"
+    ):
+        return None
+    if isinstance(node, nodes.Getattr):
+        return name, node.attr
+    if (
+        isinstance(node, nodes.Getitem)
+        and (domain := _literal_string(node.arg)) is not None
+    ):
+        return name, domain
+    return None
+
+
+def _called_by_name(ast: nodes.Template) -> set[str]:
+    """Return the filters and tests the template calls by name.
+
+    For example map('states') or select('is_state', 'on').
+    """
+    return {
+        called
+        for node in ast.find_all(nodes.Filter)
+        if node.name in _NAMED_CALL_FILTERS
+        for arg in node.args
+        if (called := _literal_string(arg)) is not None
+    }
+
+
+def _analyze_dependencies(
+    ast: nodes.Template, global_names: collections.abc.Container[str]
+) -> TemplateDependencies | None:
+    """Return the states a template depends on.
+
+    The entities are found from literal references like states('x.y'),
+    is_state('x.y', 'on'), state_attr('x.y', 'a') and states.x.y. The
+    entities of all branches are included, even if they are not rendered.
+
+    None is returned if the template uses states in any other way, or uses
+    variables, which could be states, or other templates.
+    """
+    if any(
+        ast.find_all((nodes.Extends, nodes.FromImport, nodes.Import, nodes.Include))
+    ):
+        return None
+    local_names = {
+        node.name for node in ast.find_all(nodes.Name) if node.ctx in ("store", "param")
+    }
+    if not local_names.isdisjoint(_ENTITY_STATE_FUNCTIONS | _TIME_FUNCTIONS) or (
+        "states" in local_names
+    ):
+        return None
+    # The states read by filters and tests called by name depend on
+    # the items they are called with
+    called = _called_by_name(ast)
+    if not called.isdisjoint(
+        _ENTITY_STATE_FUNCTIONS | _UNTRACEABLE_STATE_FUNCTIONS
+    ) or ("states" in called):
+        return None
+    entities: set[str] = set()
+    has_time = not called.isdisjoint(_TIME_FUNCTIONS)
+    # The names of the states function which are part of a literal reference
+    referenced: set[int] = set()
+
+    def _reference(name: nodes.Node, entity_id: str | None) -> None:
+        if entity_id is not None:
+            entities.add(entity_id)
+            referenced.add(id(name))
+
+    for node in ast.find_all(
+        (nodes.Call, nodes.Filter, nodes.Getattr, nodes.Getitem, nodes.Test)
+    ):
+        if isinstance(node, nodes.Call):
+            if isinstance(name := node.node, nodes.Name) and (
+                name.name == "states" or name.name in _ENTITY_STATE_FUNCTIONS
+            ):
+                _reference(
+                    name, _literal_entity_id(node.args[0] if node.args else None)
+                )
+        elif isinstance(node, (nodes.Filter, nodes.Test)):
+            if node.name == "states" or node.name in _ENTITY_STATE_FUNCTIONS:
+                if (entity_id := _literal_entity_id(node.node)) is None:
+                    return None
+                entities.add(entity_id)
+            elif node.name in _UNTRACEABLE_STATE_FUNCTIONS:
+                return None
+            elif node.name in _TIME_FUNCTIONS:
+                has_time = True
+        elif isinstance(node, (nodes.Getattr, nodes.Getitem)):
+            if (states_domain := _literal_domain(node.node)) is not None:
+                # states.domain.object_id or states['domain']['object_id']
+                name, domain = states_domain
+                object_id = (
+                    node.attr
+                    if isinstance(node, nodes.Getattr)
+                    else _literal_string(node.arg)
+                )
+                if object_id is not None and valid_entity_id(
+                    entity_id := f"{domain}.{object_id}".lower()
+                ):
+                    _reference(name, entity_id)
+            elif (
+                isinstance(node, nodes.Getitem)
+                and isinstance(name := node.node, nodes.Name)
+                and name.name == "states"
+            ):
+                # states['domain.object_id']
+                _reference(name, _literal_entity_id(node.arg))
+
+    for name in ast.find_all(nodes.Name):
+        if name.ctx != "load" or id(name) in referenced:
+            continue
+        if name.name in local_names or name.name in _JINJA_LOCAL_NAMES:
+            continue
+        if (
+            name.name == "states"
+            or name.name in _ENTITY_STATE_FUNCTIONS
+            or name.name in _UNTRACEABLE_STATE_FUNCTIONS
+            or name.name not in global_names
+        ):
+            return None
+        if name.name in _TIME_FUNCTIONS:
+            has_time = True
+    return TemplateDependencies(frozenset(entities), has_time)
+
+
+# Functions and filters the fast path calls directly, they ignore
+# the Jinja context they are passed
+_FAST_PATH_FUNCTIONS = frozenset(
+    {
+        "bool",
+        "float",
+        "has_value",
+        "int",
+        "is_state",
+        "is_state_attr",
+        "state_attr",
+        "states",
+    }
+)
+_FAST_PATH_FILTERS = frozenset(
+    {
+        "abs",
+        "bool",
+        "default",
+        "float",
+        "int",
+        "lower",
+        "round",
+        "state_attr",
+        "states",
+        "upper",
+    }
+)
+_FAST_PATH_BINARY_OPERATORS: dict[type[nodes.Expr], str] = {
+    nodes.Add: "+",
+    nodes.And: "and",
+    nodes.Div: "/",
+    nodes.FloorDiv: "//",
+    nodes.Mod: "%",
+    nodes.Mul: "*",
+    nodes.Or: "or",
+    nodes.Pow: "**",
+    nodes.Sub: "-",
+}
+_FAST_PATH_UNARY_OPERATORS: dict[type[nodes.Expr], str] = {
+    nodes.Neg: "-",
+    nodes.Not: "not ",
+    nodes.Pos: "+",
+}
+_FAST_PATH_COMPARE_OPERATORS = {
+    "eq": "==",
+    "gt": ">",
+    "gteq": ">=",
+    "in": "in",
+    "lt": "<",
+    "lteq": "<=",
+    "ne": "!=",
+    "notin": "not in",
+}
+
+
+def _fast_path_expression(node: nodes.Node) -> str | None:
+    """Return the Python source of a Jinja expression.
+
+    The source calls the same functions and filters as the code generated
+    by Jinja, which are looked up as g_<name> and f_<name>. None is returned
+    if the expression is not supported.
+    """
+    if isinstance(node, nodes.Const):
+        if node.value is None or type(node.value) in (bool, float, int, str):
+            return repr(node.value)
+        return None
+    if isinstance(node, nodes.Name):
+        if node.ctx == "load" and node.name in _FAST_PATH_FUNCTIONS:
+            return f"g_{node.name}"
+        return None
+    if isinstance(node, nodes.Getattr):
+        if (obj := _fast_path_expression(node.node)) is None:
+            return None
+        return f"getattr_({obj}, {node.attr!r})"
+    if isinstance(node, nodes.Getitem):
+        if (obj := _fast_path_expression(node.node)) is None or (
+            arg := _fast_path_expression(node.arg)
+        ) is None:
+            return None
+        return f"getitem_({obj}, {arg})"
+    if isinstance(node, nodes.Call):
+        if (
+            node.dyn_args is not None
+            or node.dyn_kwargs is not None
+            or not isinstance(node.node, nodes.Name)
+            or (func := _fast_path_expression(node.node)) is None
+        ):
+            return None
+        return _fast_path_call(func, node.args, node.kwargs)
+    if isinstance(node, nodes.Filter):
+        if (
+            node.dyn_args is not None
+            or node.dyn_kwargs is not None
+            or node.node is None
+            or node.name not in _FAST_PATH_FILTERS
+        ):
+            return None
+        return _fast_path_call(f"f_{node.name}", [node.node, *node.args], node.kwargs)
+    if isinstance(node, nodes.BinExpr):
+        if (
+            (operator := _FAST_PATH_BINARY_OPERATORS.get(type(node))) is None
+            or (left := _fast_path_expression(node.left)) is None
+            or (right := _fast_path_expression(node.right)) is None
+        ):
+            return None
+        return f"({left} {operator} {right})"
+    if isinstance(node, nodes.UnaryExpr):
+        if (operator := _FAST_PATH_UNARY_OPERATORS.get(type(node))) is None or (
+            operand := _fast_path_expression(node.node)
+        ) is None:
+            return None
+        return f"({operator}{operand})"
+    if isinstance(node, nodes.Compare):
+        if (expression := _fast_path_expression(node.expr)) is None:
+            return None
+        parts = [expression]
+        for compare in node.ops:
+            if (operator := _FAST_PATH_COMPARE_OPERATORS.get(compare.op)) is None or (
+                expression := _fast_path_expression(compare.expr)
+            ) is None:
+                return None
+            parts.append(f"{operator} {expression}")
+        return f"({' '.join(parts)})"
+    if isinstance(node, nodes.CondExpr) and node.expr2 is not None:
+        if (
+            (test := _fast_path_expression(node.test)) is None
+            or (expr1 := _fast_path_expression(node.expr1)) is None
+            or (expr2 := _fast_path_expression(node.expr2)) is None
+        ):
+            return None
+        return f"({expr1} if {test} else {expr2})"
+    return None
+
+
+def _fast_path_call(
+    func: str,
+    args: Iterable[nodes.Expr],
+    keywords: Iterable[nodes.Keyword | nodes.Pair],
+) -> str | None:
+    """Return the Python source of a call of a function or filter."""
+    params: list[str] = []
+    for arg in args:
+        if (param := _fast_path_expression(arg)) is None:
+            return None
+        params.append(param)
+    for keyword in keywords:
+        # Jinja allows Python keywords as argument names, like class=
+        if (
+            iskeyword(keyword.key)
+            or (param := _fast_path_expression(keyword.value)) is None
+        ):
+            return None
+        params.append(f"{keyword.key}={param}")
+    return f"{func}({', '.join(params)})"
+
+
+def _compile_fast_path(ast: nodes.Template) -> CodeType | None:
+    """Compile a template of a single simple expression to Python code.
+
+    The code defines a render function which returns the same output as
+    the Jinja template, it is bound to an environment by _bind_fast_path.
+    """
+    if (
+        len(ast.body) != 1
+        or not isinstance(output := ast.body[0], nodes.Output)
+        or len(output.nodes) != 1
+        or (expression := _fast_path_expression(output.nodes[0])) is None
+    ):
+        return None
+    return compile(
+        f"def render():\n    return str({expression})\n", "<template>", "exec"
+    )
+
+
+def _bind_fast_path(
+    code: CodeType, env: TemplateEnvironment
+) -> tuple[Callable[[], str], frozenset[str]] | None:
+    """Bind the fast path of a template to the functions of an environment.
+
+    Returns the render function and the names of the functions it uses,
+    or None if the environment has functions the fast path can't call.
+    """
+    namespace: dict[str, Any] = {
+        "__builtins__": {},
+        "getattr_": env.getattr,
+        "getitem_": env.getitem,
+        "str": str,
+    }
+    render_code = next(const for const in code.co_consts if isinstance(const, CodeType))
+    names: set[str] = set()
+    for name in render_code.co_names:
+        if name in namespace:
+            continue
+        kind, _, template_name = name.partition("_")
+        func: Any
+        if kind == "g":
+            func = env.globals.get(template_name)
+            names.add(template_name)
+        else:
+            func = env.filters.get(template_name)
+        if func is None:
+            return None
+        if (pass_arg := getattr(func, "jinja_pass_arg", None)) is not None:
+            if pass_arg.name != "context":
+                return None
+            # Functions which depend on hass are passed the context
+            # by Jinja, but don't use it
+            func = partial(func, None)
+        namespace[name] = func
+    exec(code, namespace)  # noqa: S102
+    return namespace["render"], frozenset(names)
+
+
 class RenderInfo:
     """Holds information about a template render."""
 
@@ -500,6 +904,10 @@ class Template:
         "is_static",
         "_compiled_code",
         "_compiled",
+        "_dependencies",
+        "_fast_path_code",
+        "_fast_render",
+        "_fast_render_names",
         "_exc_info",
         "_limited",
         "_strict",
@@ -532,6 +940,10 @@ class Template:
         self.template: str = template.strip()
         self._compiled_code: CodeType | None = None
         self._compiled: jinja2.Template | None = None
+        self._dependencies: TemplateDependencies | None = None
+        self._fast_path_code: CodeType | None = None
+        self._fast_render: Callable[[], str] | None = None
+        self._fast_render_names: frozenset[str] = frozenset()
         self.hass = hass
         self.is_static = not is_template_string(template)
         self._exc_info: sys._OptExcInfo | None = None
@@ -567,14 +979,14 @@ class Template:
         if self.is_static or self._compiled_code is not None:
             return
 
-        if compiled := self._env.template_cache.get(self.template):
-            self._compiled_code = compiled
-            return
-
         with _template_context_manager as cm:
             cm.set_template(self.template, "compiling")
             try:
-                self._compiled_code = self._env.compile(self.template)
+                (
+                    self._compiled_code,
+                    self._dependencies,
+                    self._fast_path_code,
+                ) = self._env.compile_template(self.template)
             except jinja2.TemplateError as err:
                 raise TemplateError(err) from err
 
@@ -630,7 +1042,14 @@ class Template:
             kwargs.update(variables)
 
         try:
-            render_result = _render_with_context(self.template, compiled, **kwargs)
+            if (fast_render := self._fast_render) is not None and (
+                not kwargs or self._fast_render_names.isdisjoint(kwargs)
+            ):
+                render_result = _render_fast_path_with_context(
+                    self.template, fast_render
+                )
+            else:
+                render_result = _render_with_context(self.template, compiled, **kwargs)
         except Exception as err:
             raise TemplateError(err) from err
 
@@ -715,6 +1134,32 @@ class Template:
 
         return False
 
+    @callback
+    def async_analyze_to_info(
+        self, variables: TemplateVarsType = None
+    ) -> RenderInfo | None:
+        """Find the states the template depends on without rendering it.
+
+        The render info has no result. None is returned if the states can
+        only be found by rendering the template, or if the variables shadow
+        the functions of the template.
+        """
+        if self.is_static:
+            return None
+        try:
+            self.ensure_valid()
+        except TemplateError:
+            return None
+        if (dependencies := self._dependencies) is None or (
+            variables and not self._env.globals.keys().isdisjoint(variables)
+        ):
+            return None
+        render_info = RenderInfo(self)
+        render_info.entities = set(dependencies.entities)
+        render_info.has_time = dependencies.has_time
+        render_info._freeze()  # noqa: SLF001
+        return render_info
+
     @callback
     def async_render_to_info(
         self,
@@ -851,6 +1296,10 @@ class Template:
         self._compiled = jinja2.Template.from_code(
             env, self._compiled_code, env.globals, None
         )
+        if self._fast_path_code is not None and (
+            fast_path := _bind_fast_path(self._fast_path_code, env)
+        ):
+            self._fast_render, self._fast_render_names = fast_path
 
         return self._compiled
 
@@ -1211,11 +1660,14 @@ def _state_generator(
     # We do not want to expose this method in the public API though to
     # ensure it does not get misused.
     #
+    # The states of a domain are iterated from a snapshot, which does not
+    # copy them like async_all does.
+    #
     container: Iterable[State]
     if domain is None:
         container = states._states.values()  # noqa: SLF001
     else:
-        container = states.async_all(domain)
+        container = states.async_snapshot().states(domain)
     for state in container:
         yield _template_state_no_collect(hass, state)
 
@@ -2735,6 +3187,13 @@ def _render_with_context(
         return template.render(**kwargs)
 
 
+def _render_fast_path_with_context(template_str: str, render: Callable[[], str]) -> str:
+    """Render the fast path of a template like _render_with_context."""
+    with _template_context_manager as cm:
+        cm.set_template(template_str, "rendering")
+        return render()
+
+
 def make_logging_undefined(
     strict: bool | None, log_fn: Callable[[int, str], None] | None
 ) -> type[jinja2.Undefined]:
@@ -2808,6 +3267,173 @@ def _load_custom_templates(hass: HomeAssistant) -> dict[str, str]:
     return result
 
 
+# The source of a template and whether it was compiled for a limited,
+# a strict and an environment with hass. Filters and tests are checked
+# when compiling and environments without hass have fewer of them.
+type _CompiledTemplateKey = tuple[str, bool, bool, bool]
+
+
+def _marshal_code(code: CodeType) -> str:
+    """Return a code object as a string."""
+    return base64.b64encode(marshal.dumps(code)).decode()
+
+
+def _unmarshal_code(data: str) -> CodeType:
+    """Return a code object from a string."""
+    return cast(CodeType, marshal.loads(base64.b64decode(data)))
+
+
+class CompiledTemplate(NamedTuple):
+    """A compiled template and the states it depends on."""
+
+    code: CodeType
+    dependencies: TemplateDependencies | None
+    fast_path: CodeType | None
+
+
+class CompiledTemplateCache:
+    """Process wide LRU cache of compiled templates.
+
+    Template sensors, automations and blueprints often share the same
+    template strings, they are compiled once and share the code object.
+    """
+
+    __slots__ = ("_lru", "evictions", "hits", "misses")
+
+    def __init__(self, size: int) -> None:
+        """Initialize the cache."""
+        self._lru: LRU[_CompiledTemplateKey, CompiledTemplate] = LRU(
+            size, callback=self._evicted
+        )
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _evicted(self, key: _CompiledTemplateKey, compiled: CompiledTemplate) -> None:
+        """Count an evicted template."""
+        self.evictions += 1
+
+    def get(self, key: _CompiledTemplateKey) -> CompiledTemplate | None:
+        """Return a compiled template."""
+        if (compiled := self._lru.get(key)) is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return compiled
+
+    def set(self, key: _CompiledTemplateKey, compiled: CompiledTemplate) -> None:
+        """Add a compiled template."""
+        self._lru[key] = compiled
+
+    def clear(self) -> None:
+        """Remove all compiled templates and reset the statistics."""
+        self._lru.clear()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """Return the statistics of the cache."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self._lru),
+            "max_size": self._lru.get_size(),
+        }
+
+    def as_bytecode(self) -> list[tuple[Any, ...]]:
+        """Return the compiled templates as marshalled code objects."""
+        return [
+            (
+                *key,
+                _marshal_code(code),
+                None if dependencies is None else sorted(dependencies.entities),
+                dependencies is not None and dependencies.has_time,
+                None if fast_path is None else _marshal_code(fast_path),
+            )
+            for key, (code, dependencies, fast_path) in reversed(self._lru.items())
+        ]
+
+    def load_bytecode(self, bytecode: Iterable[list[Any]]) -> None:
+        """Add compiled templates from marshalled code objects."""
+        for (
+            source,
+            limited,
+            strict,
+            with_hass,
+            code,
+            entities,
+            has_time,
+            fast_path,
+        ) in bytecode:
+            key = (source, limited, strict, with_hass)
+            if key not in self._lru:
+                self._lru[key] = CompiledTemplate(
+                    _unmarshal_code(code),
+                    None
+                    if entities is None
+                    else TemplateDependencies(frozenset(entities), has_time),
+                    None if fast_path is None else _unmarshal_code(fast_path),
+                )
+
+
+COMPILED_TEMPLATE_CACHE = CompiledTemplateCache(COMPILED_TEMPLATE_CACHE_SIZE)
+
+
+async def async_load_bytecode_cache(hass: HomeAssistant) -> None:
+    """Load the templates compiled by the previous run.
+
+    Templates compiled while running are saved again, the saved templates
+    are discarded when Python or Jinja are updated.
+    """
+    store = Store[dict[str, Any]](
+        hass, _BYTECODE_STORAGE_VERSION, _BYTECODE_STORAGE_KEY, private=True
+    )
+    if (data := await store.async_load()) is not None and data.get(
+        "magic"
+    ) == _BYTECODE_MAGIC:
+        try:
+            COMPILED_TEMPLATE_CACHE.load_bytecode(data["templates"])
+        except (ValueError, TypeError, EOFError) as err:
+            _LOGGER.warning("Discarding invalid compiled templates: %s", err)
+    hass.data[_BYTECODE_STORE] = _BytecodeCacheStore(store)
+
+
+class _BytecodeCacheStore:
+    """Save the compiled templates after new templates were compiled.
+
+    The delayed save is scheduled once until it runs, scheduling it again
+    for every compiled template would keep postponing it while many
+    templates are compiled at startup.
+    """
+
+    __slots__ = ("_store", "save_scheduled")
+
+    def __init__(self, store: Store[dict[str, Any]]) -> None:
+        """Initialize the store."""
+        self._store = store
+        self.save_scheduled = False
+
+    @callback
+    def async_schedule_save(self) -> None:
+        """Schedule saving the compiled templates."""
+        if self.save_scheduled:
+            return
+        self.save_scheduled = True
+        self._store.async_delay_save(self._data_to_save, _BYTECODE_SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the compiled templates to save."""
+        self.save_scheduled = False
+        return {
+            "magic": _BYTECODE_MAGIC,
+            "templates": COMPILED_TEMPLATE_CACHE.as_bytecode(),
+        }
+
+
 @singleton(_HASS_LOADER)
 def _get_hass_loader(hass: HomeAssistant) -> HassLoader:
     return HassLoader({})
@@ -2854,9 +3480,8 @@ class TemplateEnvironment(ImmutableSandboxedEnvironment):
         """Initialise template environment."""
         super().__init__(undefined=make_logging_undefined(strict, log_fn))
         self.hass = hass
-        self.template_cache: weakref.WeakValueDictionary[
-            str | jinja2.nodes.Template, CodeType | None
-        ] = weakref.WeakValueDictionary()
+        self._limited = bool(limited)
+        self._strict = bool(strict)
         self.add_extension("jinja2.ext.loopcontrols")
         self.filters["round"] = forgiving_round
         self.filters["multiply"] = multiply
@@ -3209,8 +3834,33 @@ class TemplateEnvironment(ImmutableSandboxedEnvironment):
                 defer_init,
             )
 
-        compiled = super().compile(source)
-        self.template_cache[source] = compiled
+        if not isinstance(source, str):
+            return super().compile(source)
+
+        return self.compile_template(source).code
+
+    def compile_template(self, source: str) -> CompiledTemplate:
+        """Compile a template and find the states it depends on."""
+        key = (source, self._limited, self._strict, self.hass is not None)
+        if (compiled := COMPILED_TEMPLATE_CACHE.get(key)) is not None:
+            return compiled
+        try:
+            ast = self._parse(source, None, None)
+        except jinja2.TemplateSyntaxError:
+            self.handle_exception(source=source)
+        compiled = CompiledTemplate(
+            super().compile(ast),
+            _analyze_dependencies(ast, self.globals),
+            _compile_fast_path(ast),
+        )
+        COMPILED_TEMPLATE_CACHE.set(key, compiled)
+        if (
+            self.hass is not None
+            and (store := self.hass.data.get(_BYTECODE_STORE))
+            and not store.save_scheduled
+        ):
+            # Templates may be compiled in the executor
+            self.hass.loop.call_soon_threadsafe(store.async_schedule_save)
         return compiled
 
 
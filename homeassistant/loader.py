@@ -29,8 +29,8 @@ from propcache import cached_property
 import voluptuous as vol
 
 from . import generated
-from .const import Platform
-from .core import HomeAssistant, callback
+from .const import EVENT_HOMEASSISTANT_STARTED, Platform, __version__
+from .core import Event, HomeAssistant, callback
 from .generated.application_credentials import APPLICATION_CREDENTIALS
 from .generated.bluetooth import BLUETOOTH
 from .generated.config_flows import FLOWS
@@ -49,6 +49,7 @@ if TYPE_CHECKING:
     # because they would cause a circular import otherwise.
     from .config_entries import ConfigEntry
     from .helpers import device_registry as dr
+    from .helpers.storage import Store
     from .helpers.typing import ConfigType
 
 _LOGGER = logging.getLogger(__name__)
@@ -132,7 +133,15 @@ DATA_CUSTOM_COMPONENTS: HassKey[
     dict[str, Integration] | asyncio.Future[dict[str, Integration]]
 ] = HassKey("custom_components")
 DATA_PRELOAD_PLATFORMS: HassKey[list[str]] = HassKey("preload_platforms")
+DATA_PROCESSED_PLATFORMS: HassKey[set[str]] = HassKey("processed_platforms")
+DATA_DEFERRED_PRELOADS: HassKey[dict[str, Integration]] = HassKey("deferred_preloads")
+DATA_IMPORT_TIMES: HassKey[dict[str, float]] = HassKey("import_times")
+DATA_MANIFEST_CACHE: HassKey[ManifestCache] = HassKey("manifest_cache")
 PACKAGE_CUSTOM_COMPONENTS = "custom_components"
+
+MANIFEST_CACHE_STORAGE_KEY = "core.integration_manifests"
+MANIFEST_CACHE_STORAGE_VERSION = 1
+MANIFEST_CACHE_SAVE_DELAY = 60
 PACKAGE_BUILTIN = "homeassistant.components"
 CUSTOM_WARNING = (
     "We found a custom integration %s which has not "
@@ -270,6 +279,167 @@ def async_setup(hass: HomeAssistant) -> None:
     hass.data[DATA_INTEGRATIONS] = {}
     hass.data[DATA_MISSING_PLATFORMS] = {}
     hass.data[DATA_PRELOAD_PLATFORMS] = BASE_PRELOAD_PLATFORMS.copy()
+    hass.data[DATA_PROCESSED_PLATFORMS] = set()
+    hass.data[DATA_IMPORT_TIMES] = {}
+
+
+@callback
+def async_enable_lazy_platforms(hass: HomeAssistant, warm_up: bool) -> None:
+    """Import the preload platforms of integrations on first use.
+
+    By default the preload platforms are imported with the integration. Only
+    the platforms which no integration platform processes are deferred, like
+    config_flow or the platforms of integrations which are not set up, since
+    the processing of a platform imports it when its integration is loaded.
+
+    If warm_up is set, the platforms which were not used yet are imported in
+    the background once Home Assistant has started.
+    """
+    hass.data[DATA_DEFERRED_PRELOADS] = {}
+    if warm_up:
+        hass.bus.async_listen_once(
+            EVENT_HOMEASSISTANT_STARTED,
+            ft.partial(_async_start_platforms_warm_up, hass),
+        )
+
+
+@callback
+def _async_start_platforms_warm_up(hass: HomeAssistant, _event: Event) -> None:
+    """Start importing the deferred preload platforms."""
+    hass.async_create_background_task(
+        async_warm_up_platforms(hass), "warm up integration platforms"
+    )
+
+
+async def async_warm_up_platforms(hass: HomeAssistant) -> None:
+    """Import the deferred preload platforms of the loaded integrations.
+
+    The platforms are imported one at a time to not compete with the
+    imports of platforms which are used.
+    """
+    deferred_preloads = hass.data[DATA_DEFERRED_PRELOADS]
+    preload_platforms = hass.data[DATA_PRELOAD_PLATFORMS]
+    while deferred_preloads:
+        _, integration = deferred_preloads.popitem()
+        for platform_name in integration.platforms_exists(preload_platforms):
+            with suppress(ImportError):
+                await integration.async_get_platform(platform_name)
+
+
+@callback
+def async_get_import_timings(hass: HomeAssistant) -> dict[str, float]:
+    """Return the time spent importing the modules of each integration."""
+    timings: dict[str, float] = {}
+    # The times are added from the import executor
+    for name, seconds in list(hass.data[DATA_IMPORT_TIMES].items()):
+        domain = name.partition(".")[0]
+        timings[domain] = timings.get(domain, 0) + seconds
+    return timings
+
+
+class ManifestCache:
+    """Cache the manifests and files of integrations between restarts.
+
+    An entry is used as long as the modification time and size of the
+    manifest and the modification time of the integration directory are
+    unchanged. The entries are looked up and added in the executor.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entries: dict[str, list[Any]],
+        store: Store[dict[str, Any]] | None = None,
+    ) -> None:
+        """Initialize the cache."""
+        self._hass = hass
+        self._entries = entries
+        self._store = store
+        self.hits = 0
+        self.misses = 0
+        # The time spent loading the manifests which were not cached
+        self.load_time = 0.0
+        # The time loading the cached manifests took the last time
+        # they were loaded, minus the time spent checking the entries
+        self.saved_time = 0.0
+
+    def get(
+        self, manifest_path: pathlib.Path
+    ) -> tuple[Manifest, set[str] | None] | None:
+        """Return the cached manifest and files of an integration."""
+        if (entry := self._entries.get(str(manifest_path))) is None:
+            return None
+        start = time.perf_counter()
+        manifest_mtime, manifest_size, dir_mtime, load_time, manifest, files = entry
+        try:
+            manifest_stat = os.stat(manifest_path)
+            dir_stat = os.stat(manifest_path.parent)
+        except OSError:
+            return None
+        if (
+            manifest_stat.st_mtime_ns != manifest_mtime
+            or manifest_stat.st_size != manifest_size
+            or dir_stat.st_mtime_ns != dir_mtime
+        ):
+            return None
+        self.hits += 1
+        self.saved_time += load_time - (time.perf_counter() - start)
+        return cast(Manifest, manifest), None if files is None else set(files)
+
+    def set(
+        self,
+        manifest_path: pathlib.Path,
+        manifest: Manifest,
+        files: set[str] | None,
+        load_time: float,
+    ) -> None:
+        """Cache the manifest and files of an integration."""
+        self.misses += 1
+        self.load_time += load_time
+        try:
+            manifest_stat = os.stat(manifest_path)
+            dir_stat = os.stat(manifest_path.parent)
+        except OSError:
+            return
+        self._entries[str(manifest_path)] = [
+            manifest_stat.st_mtime_ns,
+            manifest_stat.st_size,
+            dir_stat.st_mtime_ns,
+            load_time,
+            manifest,
+            None if files is None else sorted(files),
+        ]
+        if self._store is not None:
+            self._hass.loop.call_soon_threadsafe(self._async_schedule_save)
+
+    @callback
+    def _async_schedule_save(self) -> None:
+        """Schedule saving the cache."""
+        if TYPE_CHECKING:
+            assert self._store is not None
+        self._store.async_delay_save(self._data_to_save, MANIFEST_CACHE_SAVE_DELAY)
+
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the data to store."""
+        return {"version": __version__, "manifests": dict(self._entries)}
+
+
+async def async_load_manifest_cache(hass: HomeAssistant) -> None:
+    """Load the cache of the manifests of the previous run.
+
+    The cached manifests are discarded when the version of
+    Home Assistant changes.
+    """
+    # pylint: disable-next=import-outside-toplevel
+    from .helpers.storage import Store
+
+    store: Store[dict[str, Any]] = Store(
+        hass, MANIFEST_CACHE_STORAGE_VERSION, MANIFEST_CACHE_STORAGE_KEY, private=True
+    )
+    entries: dict[str, list[Any]] = {}
+    if (data := await store.async_load()) and data.get("version") == __version__:
+        entries = data["manifests"]
+    hass.data[DATA_MANIFEST_CACHE] = ManifestCache(hass, entries, store)
 
 
 def manifest_from_legacy_module(domain: str, module: ModuleType) -> Manifest:
@@ -638,7 +808,12 @@ async def async_get_mqtt(hass: HomeAssistant) -> dict[str, list[str]]:
 
 @callback
 def async_register_preload_platform(hass: HomeAssistant, platform_name: str) -> None:
-    """Register a platform to be preloaded."""
+    """Register a platform to be preloaded.
+
+    The platform is processed when an integration is loaded, so it is
+    preloaded even if the preload platforms are imported on first use.
+    """
+    hass.data[DATA_PROCESSED_PLATFORMS].add(platform_name)
     preload_platforms = hass.data[DATA_PRELOAD_PLATFORMS]
     if platform_name not in preload_platforms:
         preload_platforms.append(platform_name)
@@ -652,30 +827,49 @@ class Integration:
         cls, hass: HomeAssistant, root_module: ModuleType, domain: str
     ) -> Integration | None:
         """Resolve an integration from a root module."""
+        manifest_cache = hass.data.get(DATA_MANIFEST_CACHE)
         for base in root_module.__path__:
             manifest_path = pathlib.Path(base) / domain / "manifest.json"
+            file_path = manifest_path.parent
 
-            if not manifest_path.is_file():
-                continue
+            if manifest_cache is not None and (
+                cached := manifest_cache.get(manifest_path)
+            ):
+                manifest, top_level_files = cached
+            else:
+                if not manifest_path.is_file():
+                    continue
 
-            try:
-                manifest = cast(Manifest, json_loads(manifest_path.read_text()))
-            except JSON_DECODE_EXCEPTIONS as err:
-                _LOGGER.error(
-                    "Error parsing manifest.json file at %s: %s", manifest_path, err
+                start = time.perf_counter()
+                try:
+                    manifest = cast(Manifest, json_loads(manifest_path.read_text()))
+                except JSON_DECODE_EXCEPTIONS as err:
+                    _LOGGER.error(
+                        "Error parsing manifest.json file at %s: %s", manifest_path, err
+                    )
+                    continue
+
+                # Avoid the listdir for virtual integrations
+                # as they cannot have any platforms
+                top_level_files = (
+                    None
+                    if manifest.get("integration_type") == "virtual"
+                    else set(os.listdir(file_path))
                 )
-                continue
+                if manifest_cache is not None:
+                    manifest_cache.set(
+                        manifest_path,
+                        manifest,
+                        top_level_files,
+                        time.perf_counter() - start,
+                    )
 
-            file_path = manifest_path.parent
-            # Avoid the listdir for virtual integrations
-            # as they cannot have any platforms
-            is_virtual = manifest.get("integration_type") == "virtual"
             integration = cls(
                 hass,
                 f"{root_module.__name__}.{domain}",
                 file_path,
                 manifest,
-                None if is_virtual else set(os.listdir(file_path)),
+                top_level_files,
             )
 
             if not integration.import_executor:
@@ -765,6 +959,9 @@ class Integration:
             self._all_dependencies = set()
 
         self._platforms_to_preload = hass.data[DATA_PRELOAD_PLATFORMS]
+        self._processed_platforms = hass.data[DATA_PROCESSED_PLATFORMS]
+        self._deferred_preloads = hass.data.get(DATA_DEFERRED_PRELOADS)
+        self._import_times = hass.data[DATA_IMPORT_TIMES]
         self._component_future: asyncio.Future[ComponentProtocol] | None = None
         self._import_futures: dict[str, asyncio.Future[ModuleType]] = {}
         self._cache = hass.data[DATA_COMPONENTS]
@@ -993,7 +1190,11 @@ class Integration:
         # So we do it before validating config to catch these errors.
         load_executor = self.import_executor and (
             self.pkg_path not in sys.modules
-            or (self.config_flow and f"{self.pkg_path}.config_flow" not in sys.modules)
+            or (
+                self.config_flow
+                and self._deferred_preloads is None
+                and f"{self.pkg_path}.config_flow" not in sys.modules
+            )
         )
         if not load_executor:
             comp = self._get_component()
@@ -1066,6 +1267,7 @@ class Integration:
         """Return the component."""
         cache = self._cache
         domain = self.domain
+        start = time.perf_counter()
         try:
             cache[domain] = cast(
                 ComponentProtocol, importlib.import_module(self.pkg_path)
@@ -1080,9 +1282,23 @@ class Integration:
                 "Unexpected exception importing component %s", self.pkg_path
             )
             raise ImportError(f"Exception importing {self.pkg_path}") from err
+        self._import_times[domain] = time.perf_counter() - start
 
         if preload_platforms:
-            for platform_name in self.platforms_exists(self._platforms_to_preload):
+            platform_names = self.platforms_exists(self._platforms_to_preload)
+            if (deferred_preloads := self._deferred_preloads) is not None:
+                # The processed platforms are imported once the integration
+                # is loaded anyway, the others are imported on first use
+                processed_platforms = self._processed_platforms
+                processed = [
+                    platform_name
+                    for platform_name in platform_names
+                    if platform_name in processed_platforms
+                ]
+                if len(processed) < len(platform_names):
+                    deferred_preloads[domain] = self
+                platform_names = processed
+            for platform_name in platform_names:
                 with suppress(ImportError):
                     self.get_platform(platform_name)
 
@@ -1264,6 +1480,7 @@ class Integration:
         """
         full_name = f"{self.domain}.{platform_name}"
         cache = self.hass.data[DATA_COMPONENTS]
+        start = time.perf_counter()
         try:
             cache[full_name] = self._import_platform(platform_name)
         except ModuleNotFoundError:
@@ -1288,6 +1505,7 @@ class Integration:
             raise ImportError(
                 f"Exception importing {self.pkg_path}.{platform_name}"
             ) from err
+        self._import_times[full_name] = time.perf_counter() - start
 
         return cast(ModuleType, cache[full_name])
 
@@ -52,6 +52,10 @@ class RuntimeConfig:
 
     debug: bool = False
     open_ui: bool = False
+    profile_startup: bool = False
+    lazy_platforms: bool = False
+    warm_up_platforms: bool = False
+    storage_write_behind: bool = False
 
     safe_mode: bool = False
 
@@ -7,7 +7,9 @@ import asyncio
 from collections.abc import Callable
 from contextlib import suppress
 import logging
+import os
 from timeit import default_timer as timer
+from typing import Any
 
 from homeassistant import core
 from homeassistant.const import EVENT_STATE_CHANGED
@@ -116,6 +118,160 @@ async def fire_events_with_filter(hass):
     return timer() - start
 
 
+async def _fire_events_to_listeners(hass, listener_count, batch):
+    """Fire events to listener_count listeners and return the runtime."""
+    count = 0
+    event_name = "benchmark_event"
+    # Keep the number of listener runs about the same for each count
+    events_to_fire = 10**6 // max(listener_count, 10) * 10
+
+    @core.callback
+    def listener(_):
+        """Handle event."""
+        nonlocal count
+        count += 1
+
+    @core.callback
+    def batch_listener(events):
+        """Handle a batch of events."""
+        nonlocal count
+        count += len(events)
+
+    unsubs = [
+        hass.bus.async_listen_batch(event_name, batch_listener)
+        if batch
+        else hass.bus.async_listen(event_name, listener)
+        for _ in range(listener_count)
+    ]
+
+    start = timer()
+
+    for _ in range(events_to_fire):
+        hass.bus.async_fire(event_name)
+
+    await hass.async_block_till_done()
+
+    runtime = timer() - start
+
+    assert count == events_to_fire * listener_count
+
+    for unsub in unsubs:
+        unsub()
+
+    return runtime
+
+
+@benchmark
+async def fire_events_to_0_listeners(hass):
+    """Fire a million events with 0 listeners."""
+    return await _fire_events_to_listeners(hass, 0, False)
+
+
+@benchmark
+async def fire_events_to_10_listeners(hass):
+    """Fire a million events to 10 listeners."""
+    return await _fire_events_to_listeners(hass, 10, False)
+
+
+@benchmark
+async def fire_events_to_1000_listeners(hass):
+    """Fire 10,000 events to 1000 listeners."""
+    return await _fire_events_to_listeners(hass, 1000, False)
+
+
+@benchmark
+async def fire_events_to_0_batch_listeners(hass):
+    """Fire a million events with 0 batch listeners."""
+    return await _fire_events_to_listeners(hass, 0, True)
+
+
+@benchmark
+async def fire_events_to_10_batch_listeners(hass):
+    """Fire a million events to 10 batch listeners."""
+    return await _fire_events_to_listeners(hass, 10, True)
+
+
+@benchmark
+async def fire_events_to_1000_batch_listeners(hass):
+    """Fire 10,000 events to 1000 batch listeners."""
+    return await _fire_events_to_listeners(hass, 1000, True)
+
+
+async def _fire_state_changed_to_listeners(hass, listener_count, keyed):
+    """Fire state changed events to entity listeners and return the runtime."""
+    count = 0
+    events_to_fire = 10**4
+
+    @core.callback
+    def listener(_):
+        """Handle event."""
+        nonlocal count
+        count += 1
+
+    unsubs = []
+    for idx in range(listener_count):
+        entity_id = f"light.kitchen{idx}"
+        if keyed:
+            unsubs.append(
+                hass.bus.async_listen_state_changed(listener, entity_ids=entity_id)
+            )
+        else:
+            unsubs.append(
+                hass.bus.async_listen(
+                    EVENT_STATE_CHANGED,
+                    listener,
+                    event_filter=core.callback(
+                        lambda data, entity_id=entity_id: data["entity_id"] == entity_id
+                    ),
+                )
+            )
+    event_data = {
+        "entity_id": "light.kitchen0",
+        "old_state": core.State("light.kitchen0", "off"),
+        "new_state": core.State("light.kitchen0", "on"),
+    }
+
+    start = timer()
+
+    for _ in range(events_to_fire):
+        hass.bus.async_fire(EVENT_STATE_CHANGED, event_data)
+
+    await hass.async_block_till_done()
+
+    runtime = timer() - start
+
+    assert count == events_to_fire
+
+    for unsub in unsubs:
+        unsub()
+
+    return runtime
+
+
+@benchmark
+async def state_changed_10_filtered_listeners(hass):
+    """Fire 10,000 state changed events to 10 filtered listeners."""
+    return await _fire_state_changed_to_listeners(hass, 10, False)
+
+
+@benchmark
+async def state_changed_1000_filtered_listeners(hass):
+    """Fire 10,000 state changed events to 1000 filtered listeners."""
+    return await _fire_state_changed_to_listeners(hass, 1000, False)
+
+
+@benchmark
+async def state_changed_10_keyed_listeners(hass):
+    """Fire 10,000 state changed events to 10 keyed listeners."""
+    return await _fire_state_changed_to_listeners(hass, 10, True)
+
+
+@benchmark
+async def state_changed_1000_keyed_listeners(hass):
+    """Fire 10,000 state changed events to 1000 keyed listeners."""
+    return await _fire_state_changed_to_listeners(hass, 1000, True)
+
+
 @benchmark
 async def state_changed_helper(hass):
     """Run a million events through state changed helper with 1000 entities."""
@@ -308,3 +464,208 @@ async def json_serialize_states(hass):
     start = timer()
     JSON_DUMP(states)
     return timer() - start
+
+
+async def _write_recorder_rows(hass, bulk):
+    """Write 10,000 state_changed and 2,000 other events, return the runtime.
+
+    The states share 10 rows of attributes and the other events share 20
+    rows of event data. They are looked up like the recorder does, so the
+    new shared rows are written with the states and events that use them
+    and later rows reuse their ids.
+
+    The database url to benchmark is read from RECORDER_BENCHMARK_DB_URL,
+    for example a local MariaDB or PostgreSQL stand-in, so each dialect
+    is benchmarked by its own run. An in-memory SQLite database is used
+    by default. The recorder tables are created for the run and dropped
+    after it, so the database must not have recorder tables already.
+    """
+    # pylint: disable-next=import-outside-toplevel
+    from sqlalchemy import create_engine, inspect
+
+    # pylint: disable-next=import-outside-toplevel
+    from sqlalchemy.orm import Session
+
+    # pylint: disable-next=import-outside-toplevel
+    from homeassistant.components.recorder.bulk_writer import (
+        BulkWriter,
+        PendingEvent,
+        PendingState,
+        event_row_from_event,
+        state_row_from_event,
+    )
+
+    # pylint: disable-next=import-outside-toplevel
+    from homeassistant.components.recorder.db_schema import (
+        Base,
+        EventData,
+        Events,
+        EventTypes,
+        StateAttributes,
+        States,
+        StatesMeta,
+    )
+
+    # pylint: disable-next=import-outside-toplevel
+    from homeassistant.components.recorder.util import session_scope
+
+    db_url = os.environ.get("RECORDER_BENCHMARK_DB_URL", "sqlite://")
+    entity_count = 500
+    event_count = 100
+    # One commit per round, like a commit interval with every sensor reporting
+    rounds = 20
+    state_events = [
+        [
+            core.Event(
+                EVENT_STATE_CHANGED,
+                {
+                    "entity_id": f"sensor.power_{idx}",
+                    "old_state": None,
+                    "new_state": core.State(
+                        f"sensor.power_{idx}",
+                        str(round_idx),
+                        {"unit_of_measurement": "W", "group": idx % 10},
+                    ),
+                },
+            )
+            for idx in range(entity_count)
+        ]
+        for round_idx in range(rounds)
+    ]
+    other_events = [
+        [
+            core.Event("benchmark_event", {"entity_id": f"switch.switch_{idx % 20}"})
+            for idx in range(event_count)
+        ]
+        for _ in range(rounds)
+    ]
+
+    def _write() -> float:
+        engine = create_engine(db_url)
+        if existing := set(inspect(engine).get_table_names()).intersection(
+            Base.metadata.tables
+        ):
+            engine.dispose()
+            raise RuntimeError(
+                "The benchmark database already has the recorder tables "
+                f"{', '.join(sorted(existing))}, use an empty database"
+            )
+        Base.metadata.create_all(engine)
+        dialect_name = engine.dialect.name
+        with session_scope(session=Session(bind=engine)) as session:
+            states_meta = [
+                StatesMeta(entity_id=f"sensor.power_{idx}")
+                for idx in range(entity_count)
+            ]
+            event_types = EventTypes(event_type="benchmark_event")
+            session.add_all([*states_meta, event_types])
+            session.flush()
+            metadata_ids = [meta.metadata_id for meta in states_meta]
+            event_type_id = event_types.event_type_id
+        bulk_writer = BulkWriter()
+        old_states: list[Any] = [None] * entity_count
+        # The shared rows by their json, the ids of the rows added in
+        # the current round are not known until they are flushed
+        state_attributes: dict[bytes, StateAttributes] = {}
+        event_data: dict[bytes, EventData] = {}
+        start = timer()
+        with session_scope(
+            session=Session(bind=engine, expire_on_commit=False)
+        ) as session:
+            for round_states, round_events in zip(
+                state_events, other_events, strict=True
+            ):
+                for idx, event in enumerate(round_states):
+                    shared_attrs_bytes = StateAttributes.shared_attrs_bytes_from_event(
+                        event, dialect_name
+                    )
+                    if (attributes := state_attributes.get(shared_attrs_bytes)) is None:
+                        attributes = StateAttributes(
+                            shared_attrs=shared_attrs_bytes.decode("utf-8"),
+                            hash=StateAttributes.hash_shared_attrs_bytes(
+                                shared_attrs_bytes
+                            ),
+                        )
+                        session.add(attributes)
+                        state_attributes[shared_attrs_bytes] = attributes
+                    if bulk:
+                        row = state_row_from_event(event)
+                        row["metadata_id"] = metadata_ids[idx]
+                        pending_state = PendingState(row)
+                        if attributes.attributes_id is None:
+                            pending_state.state_attributes = attributes
+                        else:
+                            row["attributes_id"] = attributes.attributes_id
+                        if old_state := old_states[idx]:
+                            pending_state.link_old_state(old_state)
+                        bulk_writer.add_state(
+                            event.data["entity_id"], pending_state, False
+                        )
+                        old_states[idx] = pending_state
+                    else:
+                        dbstate = States.from_event(event)
+                        dbstate.entity_id = None
+                        dbstate.metadata_id = metadata_ids[idx]
+                        if attributes.attributes_id is None:
+                            dbstate.state_attributes = attributes
+                        else:
+                            dbstate.attributes_id = attributes.attributes_id
+                        if old_state := old_states[idx]:
+                            dbstate.old_state = old_state
+                        session.add(dbstate)
+                        old_states[idx] = dbstate
+                for event in round_events:
+                    shared_data_bytes = EventData.shared_data_bytes_from_event(
+                        event, dialect_name
+                    )
+                    if (data := event_data.get(shared_data_bytes)) is None:
+                        data = EventData(
+                            shared_data=shared_data_bytes.decode("utf-8"),
+                            hash=EventData.hash_shared_data_bytes(shared_data_bytes),
+                        )
+                        session.add(data)
+                        event_data[shared_data_bytes] = data
+                    if bulk:
+                        pending_event = PendingEvent(event_row_from_event(event))
+                        pending_event.row["event_type_id"] = event_type_id
+                        if data.data_id is None:
+                            pending_event.event_data = data
+                        else:
+                            pending_event.row["data_id"] = data.data_id
+                        bulk_writer.add_event(pending_event)
+                    else:
+                        dbevent = Events.from_event(event)
+                        dbevent.event_type_id = event_type_id
+                        if data.data_id is None:
+                            dbevent.event_data_rel = data
+                        else:
+                            dbevent.data_id = data.data_id
+                        session.add(dbevent)
+                if bulk:
+                    bulk_writer.write(session)
+                session.commit()
+                if bulk:
+                    bulk_writer.reset()
+                # States that have been committed do not need a later generation
+                old_states = [
+                    States(state_id=old_state.state_id) if bulk else old_state
+                    for old_state in old_states
+                ]
+        runtime = timer() - start
+        Base.metadata.drop_all(engine)
+        engine.dispose()
+        return runtime
+
+    return await hass.async_add_executor_job(_write)
+
+
+@benchmark
+async def recorder_orm_insert(hass):
+    """Write states and events through the ORM."""
+    return await _write_recorder_rows(hass, False)
+
+
+@benchmark
+async def recorder_bulk_insert(hass):
+    """Write states and events with bulk inserts."""
+    return await _write_recorder_rows(hass, True)
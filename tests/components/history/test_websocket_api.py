@@ -454,6 +454,126 @@ async def test_history_during_period_bad_end_time(
     assert response["error"]["code"] == "invalid_end_time"
 
 
+@pytest.mark.parametrize("downsample", ["lttb", "min_max"])
+async def test_history_during_period_downsample(
+    hass: HomeAssistant,
+    recorder_mock: Recorder,
+    hass_ws_client: WebSocketGenerator,
+    downsample: str,
+) -> None:
+    """Test history_during_period with max_points downsamples numeric entities."""
+    now = dt_util.utcnow()
+
+    await async_setup_component(hass, "history", {})
+    await async_setup_component(hass, "sensor", {})
+    await async_recorder_block_till_done(hass)
+    with freeze_time(now) as freezer:
+        for idx in range(100):
+            freezer.tick(timedelta(seconds=1))
+            value = 1000 if idx == 42 else idx % 10
+            hass.states.async_set("sensor.power", str(value), {"unit": "W"})
+            hass.states.async_set("sensor.mode", "eco" if idx < 50 else "boost")
+            # Short numeric runs separated by gaps
+            hass.states.async_set(
+                "sensor.gappy", "unavailable" if idx % 10 == 9 else str(idx)
+            )
+            if idx % 25 == 0:
+                hass.states.async_set("sensor.few", str(idx))
+        hass.states.async_set("sensor.power", "unavailable")
+        await async_wait_recording_done(hass)
+
+    client = await hass_ws_client()
+    await client.send_json(
+        {
+            "id": 1,
+            "type": "history/history_during_period",
+            "start_time": now.isoformat(),
+            "entity_ids": [
+                "sensor.power",
+                "sensor.mode",
+                "sensor.few",
+                "sensor.gappy",
+            ],
+            "significant_changes_only": False,
+            "minimal_response": True,
+            "max_points": 20,
+            "downsample": downsample,
+        }
+    )
+    response = await client.receive_json()
+    assert response["success"]
+    result = response["result"]
+
+    power = result["sensor.power"]
+    assert len(power) <= 20
+    # The first state carries the attributes and is always kept
+    assert power[0] == {"s": "0", "a": {"unit": "W"}, "lu": ANY}
+    # The spike and the last numeric state are kept
+    assert "1000" in [state["s"] for state in power]
+    assert power[-2]["s"] == "9"
+    assert power[-1]["s"] == "unavailable"
+    assert [state["lu"] for state in power] == sorted(state["lu"] for state in power)
+    # Non numeric entities keep the states where the state changed
+    assert [state["s"] for state in result["sensor.mode"]] == ["eco", "boost"]
+    # Entities with fewer states than max_points are not downsampled
+    assert [state["s"] for state in result["sensor.few"]] == ["0", "25", "50", "75"]
+    # The numeric runs between the gaps share what the gaps leave of max_points
+    gappy = [state["s"] for state in result["sensor.gappy"]]
+    assert len(gappy) == 20
+    assert gappy[0] == "0"
+    assert gappy.count("unavailable") == 10
+
+    await client.send_json(
+        {
+            "id": 2,
+            "type": "history/history_during_period",
+            "start_time": now.isoformat(),
+            "entity_ids": ["sensor.power"],
+            "max_points": 2,
+        }
+    )
+    response = await client.receive_json()
+    assert not response["success"]
+    assert response["error"]["code"] == "invalid_format"
+
+
+async def test_history_stream_historical_only_downsample(
+    hass: HomeAssistant, recorder_mock: Recorder, hass_ws_client: WebSocketGenerator
+) -> None:
+    """Test history stream with max_points downsamples the historical states."""
+    now = dt_util.utcnow() - timedelta(minutes=10)
+    await async_setup_component(hass, "history", {})
+    await async_setup_component(hass, "sensor", {})
+    await async_recorder_block_till_done(hass)
+    with freeze_time(now) as freezer:
+        for idx in range(100):
+            freezer.tick(timedelta(seconds=1))
+            hass.states.async_set("sensor.power", str(idx))
+        await async_wait_recording_done(hass)
+        end_time = dt_util.utcnow() + timedelta(seconds=1)
+
+    client = await hass_ws_client()
+    await client.send_json(
+        {
+            "id": 1,
+            "type": "history/stream",
+            "entity_ids": ["sensor.power"],
+            "start_time": now.isoformat(),
+            "end_time": end_time.isoformat(),
+            "minimal_response": True,
+            "max_points": 10,
+        }
+    )
+    response = await client.receive_json()
+    assert response["success"]
+
+    response = await client.receive_json()
+    power = response["event"]["states"]["sensor.power"]
+    assert len(power) == 10
+    assert power[0]["s"] == "0"
+    assert power[-1]["s"] == "99"
+
+
 async def test_history_stream_historical_only(
     hass: HomeAssistant, recorder_mock: Recorder, hass_ws_client: WebSocketGenerator
 ) -> None:
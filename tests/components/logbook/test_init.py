@@ -4,10 +4,12 @@ import asyncio
 from collections.abc import Callable
 from datetime import datetime, timedelta
 from http import HTTPStatus
-from unittest.mock import Mock
+from typing import Any
+from unittest.mock import Mock, patch
 
 from freezegun import freeze_time
 import pytest
+from sqlalchemy.exc import OperationalError
 import voluptuous as vol
 
 from homeassistant.components import logbook, recorder
@@ -19,6 +21,9 @@ from homeassistant.components.logbook.models import EventAsRow, LazyEventPartial
 from homeassistant.components.logbook.processor import EventProcessor
 from homeassistant.components.logbook.queries.common import PSEUDO_EVENT_STATE_CHANGED
 from homeassistant.components.recorder import Recorder
+from homeassistant.components.recorder.db_schema import LogbookEntries
+from homeassistant.components.recorder.services import SERVICE_DISABLE
+from homeassistant.components.recorder.util import session_scope
 from homeassistant.components.script import EVENT_SCRIPT_STARTED
 from homeassistant.components.sensor import SensorStateClass
 from homeassistant.const import (
@@ -2358,6 +2363,436 @@ async def test_context_filter(
     assert response.status == HTTPStatus.BAD_REQUEST
 
 
+@pytest.mark.usefixtures("recorder_mock")
+async def test_logbook_index(hass: HomeAssistant) -> None:
+    """Test the logbook index gives the same entries as the logbook queries."""
+    await asyncio.gather(
+        *[
+            async_setup_component(hass, comp, {})
+            for comp in ("homeassistant", "automation", "script")
+        ]
+    )
+    context = ha.Context(
+        id="01GTDGKBCH00GW0X476W5TVAAA",
+        user_id="b400facee45711eaa9308bfd3d19e474",
+    )
+    child_context = ha.Context(
+        id="01GTDGKBCH00GW0X476W5TVDDD",
+        parent_id="01GTDGKBCH00GW0X476W5TVAAA",
+        user_id="b400facee45711eaa9308bfd3d19e474",
+    )
+    # Happens before the logbook is set up and is added from the recorder
+    hass.bus.async_fire(
+        EVENT_AUTOMATION_TRIGGERED,
+        {ATTR_NAME: "Mock automation", ATTR_ENTITY_ID: "automation.alarm"},
+        context=context,
+    )
+    hass.states.async_set(
+        "automation.alarm",
+        STATE_ON,
+        {ATTR_FRIENDLY_NAME: "Alarm Automation"},
+        context=child_context,
+    )
+    hass.states.async_set("alarm_control_panel.area_001", STATE_OFF)
+    await async_wait_recording_done(hass)
+
+    assert await async_setup_component(
+        hass, logbook.DOMAIN, {logbook.DOMAIN: {"index": True}}
+    )
+    await hass.async_block_till_done(wait_background_tasks=True)
+    indexer = hass.data[logbook.DOMAIN].indexer
+    assert indexer.ready
+
+    hass.bus.async_fire(
+        EVENT_SCRIPT_STARTED,
+        {ATTR_NAME: "Mock script", ATTR_ENTITY_ID: "script.mock_script"},
+        context=child_context,
+    )
+    hass.states.async_set(
+        "alarm_control_panel.area_001", STATE_ON, context=child_context
+    )
+    light_context = ha.Context(
+        id="01GTDGKBCH00GW0X476W5TVBFC",
+        parent_id="01GTDGKBCH00GW0X476W5TVDDD",
+        user_id="9400facee45711eaa9308bfd3d19e474",
+    )
+    hass.states.async_set("light.switch", STATE_ON)
+    hass.bus.async_fire(
+        EVENT_CALL_SERVICE,
+        {ATTR_DOMAIN: "light", ATTR_SERVICE: "turn_off"},
+        context=light_context,
+    )
+    hass.states.async_set("light.switch", STATE_OFF, context=light_context)
+    hass.states.async_set(
+        "sensor.power", "1", {ATTR_UNIT_OF_MEASUREMENT: "W"}, context=light_context
+    )
+    hass.states.async_set(
+        "sensor.power", "2", {ATTR_UNIT_OF_MEASUREMENT: "W"}, context=light_context
+    )
+    logbook.async_log_entry(
+        hass,
+        "mock_name",
+        "mock_message",
+        "alarm_control_panel",
+        "alarm_control_panel.area_003",
+        child_context,
+    )
+    await async_wait_recording_done(hass)
+
+    start = dt_util.utc_from_timestamp(indexer.start)
+    end = dt_util.utcnow() + timedelta(hours=1)
+    assert not indexer.covers(start - timedelta(seconds=1))
+
+    def _get_events(
+        entity_ids: list[str] | None, use_index: bool
+    ) -> list[dict[str, str]]:
+        event_types = logbook.helpers.async_determine_event_types(
+            hass, entity_ids, None
+        )
+        event_processor = EventProcessor(hass, event_types, entity_ids)
+        if not use_index:
+            event_processor.indexer = None
+        return event_processor.get_events(start, end)
+
+    events = await hass.async_add_executor_job(_get_events, None, True)
+    assert events == await hass.async_add_executor_job(_get_events, None, False)
+    assert [event.get("entity_id") for event in events] == [
+        "automation.alarm",
+        "script.mock_script",
+        "alarm_control_panel.area_001",
+        "light.switch",
+        "alarm_control_panel.area_003",
+    ]
+    # The rows of entities are described the same way as when all rows are
+    # requested, the logbook queries also link to rows the logbook does not show
+    entity_ids = ["alarm_control_panel.area_001", "light.switch"]
+    assert await hass.async_add_executor_job(_get_events, entity_ids, True) == [
+        event for event in events if event.get("entity_id") in entity_ids
+    ]
+    assert events[2]["context_entity_id"] == "script.mock_script"
+    assert events[3]["context_event_type"] == "call_service"
+    assert events[3]["context_service"] == "turn_off"
+
+
+@pytest.mark.usefixtures("recorder_mock")
+async def test_logbook_index_long_lived_context(hass: HomeAssistant) -> None:
+    """Test the index keeps contexts which keep having rows."""
+    await async_setup_component(hass, "homeassistant", {})
+    for index in range(2):
+        hass.states.async_set(f"light.other_{index}", STATE_OFF)
+    hass.states.async_set("light.switch", STATE_OFF)
+    await async_wait_recording_done(hass)
+
+    with patch(
+        "homeassistant.components.logbook.index.INDEX_CONTEXT_ORIGIN_CACHE_SIZE", 2
+    ):
+        assert await async_setup_component(
+            hass, logbook.DOMAIN, {logbook.DOMAIN: {"index": True}}
+        )
+        await hass.async_block_till_done(wait_background_tasks=True)
+        indexer = hass.data[logbook.DOMAIN].indexer
+        assert indexer.ready
+
+        light_context = ha.Context(id="01GTDGKBCH00GW0X476W5TVBFC")
+        hass.bus.async_fire(
+            EVENT_CALL_SERVICE,
+            {ATTR_DOMAIN: "light", ATTR_SERVICE: "toggle"},
+            context=light_context,
+        )
+        # Rows of other contexts are added between the rows of the light
+        # context, more contexts than the index remembers
+        hass.states.async_set("light.other_0", STATE_ON)
+        hass.states.async_set("light.switch", STATE_ON, context=light_context)
+        start = dt_util.utcnow()
+        hass.states.async_set("light.other_1", STATE_ON)
+        hass.states.async_set("light.switch", STATE_OFF, context=light_context)
+        await async_wait_recording_done(hass)
+
+    end = dt_util.utcnow() + timedelta(hours=1)
+    assert indexer.covers(start)
+
+    def _get_events(use_index: bool) -> list[dict[str, str]]:
+        entity_ids = ["light.switch"]
+        event_types = logbook.helpers.async_determine_event_types(
+            hass, entity_ids, None
+        )
+        event_processor = EventProcessor(hass, event_types, entity_ids)
+        if not use_index:
+            event_processor.indexer = None
+        return event_processor.get_events(start, end)
+
+    # The last row of the switch is only described by the row which started
+    # its context if the index still knows the context was started before
+    events = await hass.async_add_executor_job(_get_events, True)
+    assert events == await hass.async_add_executor_job(_get_events, False)
+    assert len(events) == 1
+    assert events[0]["state"] == STATE_OFF
+    assert events[0]["context_event_type"] == EVENT_CALL_SERVICE
+    assert events[0]["context_service"] == "toggle"
+
+
+@pytest.mark.parametrize(
+    "recorder_config",
+    [{CONF_EXCLUDE: {CONF_ENTITIES: ["light.excluded"]}}],
+)
+@pytest.mark.usefixtures("recorder_mock")
+async def test_logbook_index_recorder_filter(hass: HomeAssistant) -> None:
+    """Test the index skips the entities the recorder does not record."""
+    await async_setup_component(hass, "homeassistant", {})
+    hass.states.async_set("light.excluded", STATE_OFF)
+    hass.states.async_set("light.included", STATE_OFF)
+    await async_wait_recording_done(hass)
+
+    assert await async_setup_component(
+        hass, logbook.DOMAIN, {logbook.DOMAIN: {"index": True}}
+    )
+    await hass.async_block_till_done(wait_background_tasks=True)
+    indexer = hass.data[logbook.DOMAIN].indexer
+    assert indexer.ready
+
+    start = dt_util.utcnow()
+    hass.states.async_set("light.excluded", STATE_ON)
+    hass.states.async_set("light.included", STATE_ON)
+    hass.bus.async_fire(
+        EVENT_CALL_SERVICE,
+        {
+            ATTR_DOMAIN: "light",
+            ATTR_SERVICE: "turn_on",
+            ATTR_ENTITY_ID: "light.excluded",
+        },
+    )
+    await async_wait_recording_done(hass)
+    end = dt_util.utcnow() + timedelta(hours=1)
+    assert indexer.covers(start)
+
+    def _get_events(use_index: bool) -> list[dict[str, str]]:
+        event_types = logbook.helpers.async_determine_event_types(hass, None, None)
+        event_processor = EventProcessor(hass, event_types)
+        if not use_index:
+            event_processor.indexer = None
+        return event_processor.get_events(start, end)
+
+    events = await hass.async_add_executor_job(_get_events, True)
+    assert events == await hass.async_add_executor_job(_get_events, False)
+    assert [event["entity_id"] for event in events] == ["light.included"]
+
+    def _count_excluded_rows() -> int:
+        with session_scope(hass=hass, read_only=True) as session:
+            return (
+                session.query(LogbookEntries)
+                .filter(LogbookEntries.entity_id == "light.excluded")
+                .count()
+            )
+
+    assert await hass.async_add_executor_job(_count_excluded_rows) == 0
+
+
+@pytest.mark.usefixtures("recorder_mock")
+async def test_logbook_index_logbook_filter(hass: HomeAssistant) -> None:
+    """Test the index applies the logbook filters like the logbook queries."""
+    await async_setup_component(hass, "homeassistant", {})
+    hass.states.async_set("light.excluded", STATE_OFF)
+    hass.states.async_set("light.included", STATE_OFF)
+    await async_wait_recording_done(hass)
+
+    assert await async_setup_component(
+        hass,
+        logbook.DOMAIN,
+        {
+            logbook.DOMAIN: {
+                "index": True,
+                CONF_EXCLUDE: {CONF_ENTITIES: ["light.excluded"]},
+            }
+        },
+    )
+    await hass.async_block_till_done(wait_background_tasks=True)
+    indexer = hass.data[logbook.DOMAIN].indexer
+    assert indexer.ready
+
+    start = dt_util.utcnow()
+    light_context = ha.Context(id="01GTDGKBCH00GW0X476W5TVBFC")
+    hass.bus.async_fire(
+        EVENT_CALL_SERVICE,
+        {ATTR_DOMAIN: "light", ATTR_SERVICE: "turn_on"},
+        context=light_context,
+    )
+    hass.states.async_set("light.excluded", STATE_ON, context=light_context)
+    hass.states.async_set("light.included", STATE_ON, context=light_context)
+    logbook.async_log_entry(
+        hass, "mock_name", "mock_message", "light", "light.excluded"
+    )
+    await async_wait_recording_done(hass)
+    end = dt_util.utcnow() + timedelta(hours=1)
+    assert indexer.covers(start)
+
+    def _get_events(
+        entity_ids: list[str] | None, use_index: bool
+    ) -> list[dict[str, str]]:
+        event_types = logbook.helpers.async_determine_event_types(
+            hass, entity_ids, None
+        )
+        event_processor = EventProcessor(hass, event_types, entity_ids)
+        if not use_index:
+            event_processor.indexer = None
+        return event_processor.get_events(start, end)
+
+    events = await hass.async_add_executor_job(_get_events, None, True)
+    assert events == await hass.async_add_executor_job(_get_events, None, False)
+    assert [event["entity_id"] for event in events] == ["light.included"]
+    assert events[0]["context_service"] == "turn_on"
+
+    # The filters are not applied when entities are requested
+    entity_ids = ["light.excluded"]
+    events = await hass.async_add_executor_job(_get_events, entity_ids, True)
+    assert events == await hass.async_add_executor_job(_get_events, entity_ids, False)
+    assert [event["entity_id"] for event in events] == [
+        "light.excluded",
+        "light.excluded",
+    ]
+
+
+@pytest.mark.usefixtures("recorder_mock")
+async def test_logbook_index_multiple_entity_ids(hass: HomeAssistant) -> None:
+    """Test events with a list of entity_ids are found like the logbook queries."""
+    await async_setup_component(hass, "homeassistant", {})
+    hass.states.async_set("light.kitchen", STATE_OFF)
+    await async_wait_recording_done(hass)
+    assert await async_setup_component(
+        hass, logbook.DOMAIN, {logbook.DOMAIN: {"index": True}}
+    )
+    await hass.async_block_till_done(wait_background_tasks=True)
+    indexer = hass.data[logbook.DOMAIN].indexer
+    assert indexer.ready
+
+    start = dt_util.utcnow()
+    hass.states.async_set("light.kitchen", STATE_ON)
+    hass.bus.async_fire(
+        EVENT_LOGBOOK_ENTRY,
+        {
+            ATTR_NAME: "mock_name",
+            logbook.ATTR_MESSAGE: "mock_message",
+            ATTR_DOMAIN: "light",
+            ATTR_ENTITY_ID: ["light.kitchen", "light.hallway"],
+        },
+    )
+    await async_wait_recording_done(hass)
+    end = dt_util.utcnow() + timedelta(hours=1)
+    assert indexer.covers(start)
+
+    with session_scope(hass=hass, read_only=True) as session:
+        assert [
+            (row.entity_id, row.multiple_ids)
+            for row in session.query(LogbookEntries)
+            .filter(LogbookEntries.time_fired_ts > start.timestamp())
+            .order_by(LogbookEntries.time_fired_ts)
+        ] == [("light.kitchen", False), (None, True)]
+
+    def _get_events(
+        entity_ids: list[str] | None, use_index: bool
+    ) -> list[dict[str, str]]:
+        event_types = logbook.helpers.async_determine_event_types(
+            hass, entity_ids, None
+        )
+        event_processor = EventProcessor(hass, event_types, entity_ids)
+        if not use_index:
+            event_processor.indexer = None
+        return event_processor.get_events(start, end)
+
+    for entity_ids in (None, ["light.kitchen"], ["light.hallway"]):
+        events = await hass.async_add_executor_job(_get_events, entity_ids, True)
+        assert events == await hass.async_add_executor_job(
+            _get_events, entity_ids, False
+        )
+
+
+@pytest.mark.usefixtures("recorder_mock")
+async def test_logbook_index_recorder_disabled(hass: HomeAssistant) -> None:
+    """Test the index rows are not written while the recorder is disabled."""
+    await async_setup_component(hass, "homeassistant", {})
+    hass.states.async_set("light.switch", STATE_OFF)
+    await async_wait_recording_done(hass)
+    assert await async_setup_component(
+        hass, logbook.DOMAIN, {logbook.DOMAIN: {"index": True}}
+    )
+    await hass.async_block_till_done(wait_background_tasks=True)
+    assert hass.data[logbook.DOMAIN].indexer.ready
+
+    await hass.services.async_call(recorder.DOMAIN, SERVICE_DISABLE, {}, blocking=True)
+    hass.states.async_set("light.switch", STATE_ON)
+    await async_wait_recording_done(hass)
+
+    def _count_rows() -> int:
+        with session_scope(hass=hass, read_only=True) as session:
+            return (
+                session.query(LogbookEntries)
+                .filter(LogbookEntries.entity_id == "light.switch")
+                .filter(LogbookEntries.state == STATE_ON)
+                .count()
+            )
+
+    assert await hass.async_add_executor_job(_count_rows) == 0
+
+
+@pytest.mark.parametrize("rollback", [False, True])
+@pytest.mark.usefixtures("recorder_mock")
+async def test_logbook_index_commit_retried(
+    hass: HomeAssistant, rollback: bool
+) -> None:
+    """Test the index rows are written once when the first commit fails."""
+    await async_setup_component(hass, "homeassistant", {})
+    hass.states.async_set("light.switch", STATE_OFF)
+    await async_wait_recording_done(hass)
+    assert await async_setup_component(
+        hass, logbook.DOMAIN, {logbook.DOMAIN: {"index": True}}
+    )
+    await hass.async_block_till_done(wait_background_tasks=True)
+    assert hass.data[logbook.DOMAIN].indexer.ready
+
+    session = recorder.get_instance(hass).event_session
+    assert session is not None
+    execute = session.execute
+    commit = session.commit
+    index_rows_written = failed = False
+
+    def _execute(statement: Any, *args: Any, **kwargs: Any) -> Any:
+        nonlocal index_rows_written
+        table = getattr(statement, "table", None)
+        if getattr(table, "name", None) == LogbookEntries.__tablename__:
+            index_rows_written = True
+        return execute(statement, *args, **kwargs)
+
+    def _fail_first_commit() -> None:
+        nonlocal failed
+        if failed or not index_rows_written:
+            commit()
+            return
+        failed = True
+        if rollback:
+            session.rollback()
+        raise OperationalError("commit", {}, Exception("forced to fail"))
+
+    with (
+        patch("time.sleep"),
+        patch.object(session, "execute", side_effect=_execute),
+        patch.object(session, "commit", side_effect=_fail_first_commit),
+    ):
+        hass.states.async_set("light.switch", STATE_ON)
+        await async_wait_recording_done(hass)
+
+    assert failed
+
+    def _count_rows() -> int:
+        with session_scope(hass=hass, read_only=True) as session:
+            return (
+                session.query(LogbookEntries)
+                .filter(LogbookEntries.entity_id == "light.switch")
+                .filter(LogbookEntries.state == STATE_ON)
+                .count()
+            )
+
+    assert await hass.async_add_executor_job(_count_rows) == 1
+
+
 async def _async_fetch_logbook(client, params=None):
     if params is None:
         params = {}
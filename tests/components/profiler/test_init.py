@@ -21,6 +21,8 @@ from homeassistant.components.profiler import (
     SERVICE_DUMP_LOG_OBJECTS,
     SERVICE_LOG_CURRENT_TASKS,
     SERVICE_LOG_EVENT_LOOP_SCHEDULED,
+    SERVICE_LOG_STORAGE_WRITES,
+    SERVICE_LOG_TEMPLATE_RENDERS,
     SERVICE_LOG_THREAD_FRAMES,
     SERVICE_LRU_STATS,
     SERVICE_MEMORY,
@@ -35,6 +37,9 @@ from homeassistant.components.profiler.const import DOMAIN
 from homeassistant.const import CONF_SCAN_INTERVAL, CONF_TYPE
 from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import storage
+from homeassistant.helpers.event import async_get_template_render_scheduler
+from homeassistant.helpers.template import Template
 import homeassistant.util.dt as dt_util
 
 from tests.common import MockConfigEntry, async_fire_time_changed
@@ -335,6 +340,69 @@ async def test_lru_stats(hass: HomeAssistant, caplog: pytest.LogCaptureFixture)
     assert "sqlalchemy_test" in caplog.text
 
 
+async def test_log_template_renders(
+    hass: HomeAssistant, caplog: pytest.LogCaptureFixture
+) -> None:
+    """Test logging the templates which took the most time to render."""
+
+    entry = MockConfigEntry(domain=DOMAIN)
+    entry.add_to_hass(hass)
+
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    scheduler = async_get_template_render_scheduler(hass)
+    for source in ("{{ 1 + 1 }}", "{{ 2 + 2 }}", "{{ 3 + 3 }}"):
+        scheduler.async_render_to_info(Template(source, hass), None)
+    scheduler.stats["{{ 2 + 2 }}"].render_time = 10.0
+
+    assert hass.services.has_service(DOMAIN, SERVICE_LOG_TEMPLATE_RENDERS)
+    await hass.services.async_call(
+        DOMAIN, SERVICE_LOG_TEMPLATE_RENDERS, {"max_templates": 1}, blocking=True
+    )
+
+    assert "Template rendered 1 times in 10.000000 seconds: {{ 2 + 2 }}" in (
+        caplog.text
+    )
+    assert "{{ 1 + 1 }}" not in caplog.text
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+
+
+async def test_log_storage_writes(
+    hass: HomeAssistant, caplog: pytest.LogCaptureFixture
+) -> None:
+    """Test logging the statistics of the batched writes of storage files."""
+
+    entry = MockConfigEntry(domain=DOMAIN)
+    entry.add_to_hass(hass)
+
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert hass.services.has_service(DOMAIN, SERVICE_LOG_STORAGE_WRITES)
+    with pytest.raises(HomeAssistantError, match="Storage writes are not batched"):
+        await hass.services.async_call(
+            DOMAIN, SERVICE_LOG_STORAGE_WRITES, {}, blocking=True
+        )
+
+    storage.async_enable_write_behind(hass)
+    stats = storage.async_get_write_stats(hass)
+    assert stats is not None
+    stats.save_requests = 4
+    stats.writes = 2
+    await hass.services.async_call(
+        DOMAIN, SERVICE_LOG_STORAGE_WRITES, {}, blocking=True
+    )
+
+    assert "4 save requests, 2 files written" in caplog.text
+    assert "write amplification 0.50" in caplog.text
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+
+
 async def test_log_object_sources(
     hass: HomeAssistant, caplog: pytest.LogCaptureFixture
 ) -> None:
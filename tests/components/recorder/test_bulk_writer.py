@@ -0,0 +1,238 @@
+"""The tests for the recorder bulk writer."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+from unittest.mock import patch
+
+from freezegun.api import FrozenDateTimeFactory
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from homeassistant.components.recorder import Recorder
+from homeassistant.components.recorder.bulk_writer import BulkWriter
+from homeassistant.components.recorder.db_schema import (
+    EventData,
+    Events,
+    EventTypes,
+    StateAttributes,
+    States,
+    StatesMeta,
+)
+from homeassistant.components.recorder.util import session_scope
+from homeassistant.core import HomeAssistant
+
+from .common import async_recorder_block_till_done, async_wait_recording_done
+
+from tests.typing import RecorderInstanceGenerator
+
+
+@pytest.fixture
+async def mock_recorder_before_hass(
+    async_test_recorder: RecorderInstanceGenerator,
+) -> None:
+    """Set up recorder."""
+
+
+@pytest.fixture(autouse=True)
+def setup_recorder(recorder_mock: Recorder) -> None:
+    """Set up recorder."""
+
+
+@pytest.mark.parametrize(
+    "recorder_config",
+    [
+        {"bulk_insert": True, "commit_interval": 0},
+        {"bulk_insert": True, "commit_interval": 1},
+        {"bulk_insert": False, "commit_interval": 0},
+        {"bulk_insert": False, "commit_interval": 1},
+    ],
+)
+@pytest.mark.parametrize("persistent_database", [True])
+async def test_bulk_insert_states(
+    hass: HomeAssistant,
+    recorder_mock: Recorder,
+    recorder_config: dict[str, bool | int],
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test states are written the same way with and without bulk inserts.
+
+    On-disk database because a commit interval does not play nice with the MutexPool.
+    """
+    assert (recorder_mock.bulk_writer is not None) is recorder_config["bulk_insert"]
+    for idx in range(3):
+        freezer.tick(timedelta(seconds=1))
+        hass.states.async_set("sensor.power", str(idx), {"unit": "W"})
+        hass.states.async_set("sensor.energy", str(idx), {"unit": "kWh"})
+        freezer.tick(timedelta(seconds=1))
+        # Report the same state again to update last_reported
+        hass.states.async_set("sensor.power", str(idx), {"unit": "W"})
+    # Wait for the recorder to process the states before asking for a commit
+    await async_recorder_block_till_done(hass)
+    await async_wait_recording_done(hass)
+
+    freezer.tick(timedelta(seconds=1))
+    hass.states.async_set("sensor.power", "3", {"unit": "W", "changed": True})
+    hass.states.async_remove("sensor.energy")
+    # Wait for the recorder to process the states before asking for a commit
+    await async_recorder_block_till_done(hass)
+    await async_wait_recording_done(hass)
+
+    def _fetch_rows() -> list[tuple]:
+        with session_scope(hass=hass, read_only=True) as session:
+            assert session.query(StateAttributes).count() == 4
+            return [
+                (
+                    states_meta.entity_id,
+                    db_state.state,
+                    db_state.state_id,
+                    db_state.old_state_id,
+                    db_state.last_updated_ts,
+                    db_state.last_reported_ts,
+                    state_attributes.shared_attrs if state_attributes else None,
+                )
+                for db_state, states_meta, state_attributes in session.query(
+                    States, StatesMeta, StateAttributes
+                )
+                .outerjoin(StatesMeta, States.metadata_id == StatesMeta.metadata_id)
+                .outerjoin(
+                    StateAttributes,
+                    States.attributes_id == StateAttributes.attributes_id,
+                )
+                .order_by(States.last_updated_ts, States.state_id)
+            ]
+
+    rows = await recorder_mock.async_add_executor_job(_fetch_rows)
+    power = [row for row in rows if row[0] == "sensor.power"]
+    energy = [row for row in rows if row[0] == "sensor.energy"]
+    assert [row[1] for row in power] == ["0", "1", "2", "3"]
+    assert [row[1] for row in energy] == ["0", "1", "2", None]
+    for entity_rows in (power, energy):
+        assert entity_rows[0][3] is None
+        for previous, row in zip(entity_rows, entity_rows[1:], strict=False):
+            # Each state is linked to the state recorded before it
+            assert row[3] == previous[2]
+    # The reported states updated last_reported of the state before them
+    assert [row[5] for row in power[:3]] == [row[4] + 1 for row in power[:3]]
+    assert power[3][6] == '{"unit":"W","changed":true}'
+    assert energy[3][6] == "{}"
+
+
+@pytest.mark.parametrize(
+    "recorder_config", [{"bulk_insert": True, "commit_interval": 1}]
+)
+async def test_bulk_insert_events(hass: HomeAssistant, recorder_mock: Recorder) -> None:
+    """Test events are written with bulk inserts."""
+    bulk_writer = recorder_mock.bulk_writer
+    assert isinstance(bulk_writer, BulkWriter)
+    for idx in range(5):
+        hass.bus.async_fire("bulk_event", {"idx": idx % 2})
+    hass.bus.async_fire("other_event")
+    await async_wait_recording_done(hass)
+
+    with session_scope(hass=hass, read_only=True) as session:
+        rows = [
+            (event_types.event_type, event_data.shared_data if event_data else None)
+            for _, event_types, event_data in session.query(
+                Events, EventTypes, EventData
+            )
+            .outerjoin(EventTypes, Events.event_type_id == EventTypes.event_type_id)
+            .outerjoin(EventData, Events.data_id == EventData.data_id)
+            .filter(EventTypes.event_type.in_(["bulk_event", "other_event"]))
+            .order_by(Events.time_fired_ts, Events.event_id)
+        ]
+        assert (
+            session.query(EventData)
+            .filter(EventData.shared_data.in_(['{"idx":0}', '{"idx":1}']))
+            .count()
+            == 2
+        )
+
+    assert rows == [
+        ("bulk_event", '{"idx":0}'),
+        ("bulk_event", '{"idx":1}'),
+        ("bulk_event", '{"idx":0}'),
+        ("bulk_event", '{"idx":1}'),
+        ("bulk_event", '{"idx":0}'),
+        ("other_event", None),
+    ]
+    assert bulk_writer.written_events >= 6
+
+
+@pytest.mark.parametrize(
+    "recorder_config", [{"bulk_insert": True, "commit_interval": 1}]
+)
+@pytest.mark.parametrize("persistent_database", [True])
+@pytest.mark.parametrize("rollback", [False, True])
+async def test_bulk_insert_commit_retried(
+    hass: HomeAssistant,
+    recorder_mock: Recorder,
+    freezer: FrozenDateTimeFactory,
+    rollback: bool,
+) -> None:
+    """Test rows are written once when the first commit fails.
+
+    The failed transaction is either still open or rolled back
+    when the commit is retried.
+    """
+    hass.states.async_set("sensor.power", "0", {"unit": "W"})
+    hass.bus.async_fire("bulk_event")
+    await async_recorder_block_till_done(hass)
+    await async_wait_recording_done(hass)
+
+    session = recorder_mock.event_session
+    assert session is not None
+    commit = session.commit
+    failed = False
+
+    def _fail_first_commit() -> None:
+        nonlocal failed
+        if failed:
+            commit()
+            return
+        failed = True
+        if rollback:
+            session.rollback()
+        raise OperationalError("commit", {}, Exception("forced to fail"))
+
+    with (
+        patch("time.sleep"),
+        patch.object(session, "commit", side_effect=_fail_first_commit),
+    ):
+        for idx in range(1, 3):
+            freezer.tick(timedelta(seconds=1))
+            hass.states.async_set("sensor.power", str(idx), {"unit": "W"})
+        hass.bus.async_fire("bulk_event")
+        await async_recorder_block_till_done(hass)
+        await async_wait_recording_done(hass)
+
+    assert failed
+
+    def _fetch_rows() -> tuple[list[tuple], int]:
+        with session_scope(hass=hass, read_only=True) as session:
+            states = [
+                (db_state.state, db_state.state_id, db_state.old_state_id)
+                for db_state in session.query(States)
+                .join(StatesMeta, States.metadata_id == StatesMeta.metadata_id)
+                .filter(StatesMeta.entity_id == "sensor.power")
+                .order_by(States.last_updated_ts, States.state_id)
+            ]
+            events = (
+                session.query(Events)
+                .join(EventTypes, Events.event_type_id == EventTypes.event_type_id)
+                .filter(EventTypes.event_type == "bulk_event")
+                .count()
+            )
+            return states, events
+
+    states, events = await recorder_mock.async_add_executor_job(_fetch_rows)
+    assert [state for state, _, _ in states] == ["0", "1", "2"]
+    assert states[0][2] is None
+    for previous, row in zip(states, states[1:], strict=False):
+        assert row[2] == previous[1]
+    assert events == 2
+
+
+async def test_bulk_insert_disabled_by_default(recorder_mock: Recorder) -> None:
+    """Test bulk inserts are opt-in."""
+    assert recorder_mock.bulk_writer is None
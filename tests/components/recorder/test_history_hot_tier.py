@@ -0,0 +1,211 @@
+"""The tests for the recorder history hot tier."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import Any
+from unittest.mock import patch
+
+from freezegun import freeze_time
+import pytest
+
+from homeassistant.components.recorder import Recorder, history
+from homeassistant.components.recorder.history.hot_tier import HistoryHotTier
+from homeassistant.core import HomeAssistant, State
+import homeassistant.util.dt as dt_util
+
+from .common import async_wait_recording_done
+
+from tests.typing import RecorderInstanceGenerator
+
+
+@pytest.fixture
+async def mock_recorder_before_hass(
+    async_test_recorder: RecorderInstanceGenerator,
+) -> None:
+    """Set up recorder."""
+
+
+@pytest.fixture(autouse=True)
+def setup_recorder(recorder_mock: Recorder) -> None:
+    """Set up recorder."""
+
+
+def _as_comparable(
+    result: dict[str, list[State | dict[str, Any]]],
+) -> dict[str, list[dict[str, Any]]]:
+    """Convert a history result to something that can be compared."""
+    return {
+        entity_id: [
+            state.as_dict() if isinstance(state, State) else state for state in states
+        ]
+        for entity_id, states in result.items()
+    }
+
+
+def _record_states(hass: HomeAssistant) -> tuple[datetime, datetime]:
+    """Record states for a sensor, a media player and a thermostat."""
+    zero = dt_util.utcnow()
+    with freeze_time(zero) as freezer:
+        for idx in range(10):
+            freezer.move_to(zero + timedelta(seconds=idx + 1))
+            hass.states.async_set("sensor.power", str(idx * 10), {"unit": "W"})
+            hass.states.async_set(
+                "media_player.test",
+                "playing" if idx % 3 else "idle",
+                {"media_title": f"title {idx}"},
+            )
+            hass.states.async_set(
+                "thermostat.test", "heat", {"current_temperature": 20 + idx}
+            )
+    return zero, zero + timedelta(seconds=12)
+
+
+@pytest.mark.parametrize("recorder_config", [{"hot_tier_max_rows": 100}])
+@pytest.mark.parametrize("include_start_time_state", [True, False])
+@pytest.mark.parametrize("significant_changes_only", [True, False])
+@pytest.mark.parametrize("minimal_response", [True, False])
+@pytest.mark.parametrize("no_attributes", [True, False])
+@pytest.mark.parametrize("compressed_state_format", [True, False])
+@pytest.mark.parametrize(
+    "entity_ids",
+    [
+        ["sensor.power"],
+        ["media_player.test", "sensor.power", "thermostat.test"],
+    ],
+)
+async def test_hot_tier_matches_database(
+    hass: HomeAssistant,
+    recorder_mock: Recorder,
+    include_start_time_state: bool,
+    significant_changes_only: bool,
+    minimal_response: bool,
+    no_attributes: bool,
+    compressed_state_format: bool,
+    entity_ids: list[str],
+) -> None:
+    """Test the hot tier returns the same history as the database."""
+    zero, end = _record_states(hass)
+    await async_wait_recording_done(hass)
+    hot_tier = recorder_mock.history_hot_tier
+    assert isinstance(hot_tier, HistoryHotTier)
+    start = zero + timedelta(seconds=4.5)
+
+    def _get_states() -> dict[str, list[State | dict[str, Any]]]:
+        return history.get_significant_states(
+            hass,
+            start,
+            end,
+            entity_ids,
+            include_start_time_state=include_start_time_state,
+            significant_changes_only=significant_changes_only,
+            minimal_response=minimal_response,
+            no_attributes=no_attributes,
+            compressed_state_format=compressed_state_format,
+        )
+
+    from_hot_tier = await recorder_mock.async_add_executor_job(_get_states)
+    assert hot_tier.stats()["hits"] == 1
+    with patch.object(recorder_mock, "history_hot_tier", None):
+        from_database = await recorder_mock.async_add_executor_job(_get_states)
+
+    assert from_database
+    assert _as_comparable(from_hot_tier) == _as_comparable(from_database)
+
+
+@pytest.mark.parametrize("recorder_config", [{"hot_tier_max_rows": 4}])
+async def test_hot_tier_falls_back_to_database(
+    hass: HomeAssistant, recorder_mock: Recorder
+) -> None:
+    """Test queries starting before the hot tier fall back to the database."""
+    zero, end = _record_states(hass)
+    await async_wait_recording_done(hass)
+    hot_tier = recorder_mock.history_hot_tier
+    assert isinstance(hot_tier, HistoryHotTier)
+    stats = hot_tier.stats()
+    assert stats["entities"] == 3
+    assert stats["rows"] <= 3 * 4
+
+    hist = await recorder_mock.async_add_executor_job(
+        history.get_significant_states, hass, zero, end, ["sensor.power"]
+    )
+    assert [state.state for state in hist["sensor.power"]] == [
+        str(idx * 10) for idx in range(10)
+    ]
+    assert hot_tier.stats()["misses"] == 1
+
+    hist = await recorder_mock.async_add_executor_job(
+        history.get_significant_states,
+        hass,
+        zero + timedelta(seconds=9.5),
+        end,
+        ["sensor.power"],
+    )
+    assert [state.state for state in hist["sensor.power"]] == ["80", "90"]
+    assert hot_tier.stats()["hits"] == 1
+
+
+@pytest.mark.parametrize("recorder_config", [{"hot_tier_max_rows": 100}])
+async def test_hot_tier_clock_backwards(
+    hass: HomeAssistant, recorder_mock: Recorder
+) -> None:
+    """Test the database answers for an entity after its clock went backwards."""
+    hot_tier = recorder_mock.history_hot_tier
+    assert isinstance(hot_tier, HistoryHotTier)
+    zero = dt_util.utcnow()
+    end = zero + timedelta(seconds=10)
+    with freeze_time(zero) as freezer:
+        for seconds in (1, 2, 3, 2.5, 2.8):
+            freezer.move_to(zero + timedelta(seconds=seconds))
+            hass.states.async_set("sensor.power", str(seconds), {"unit": "W"})
+            await async_wait_recording_done(hass)
+    assert hot_tier.stats()["entities"] == 0
+
+    hist = await recorder_mock.async_add_executor_job(
+        history.get_significant_states,
+        hass,
+        zero + timedelta(seconds=2.7),
+        end,
+        ["sensor.power"],
+    )
+    assert [state.state for state in hist["sensor.power"]] == ["2.5", "2.8", "3"]
+    assert hot_tier.stats()["misses"] == 1
+
+    # The columns start over with the first state newer than all rows
+    with freeze_time(zero + timedelta(seconds=4)):
+        hass.states.async_set("sensor.power", "4", {"unit": "W"})
+        await async_wait_recording_done(hass)
+    assert hot_tier.stats()["entities"] == 1
+    hist = await recorder_mock.async_add_executor_job(
+        history.get_significant_states,
+        hass,
+        zero + timedelta(seconds=3.5),
+        end,
+        ["sensor.power"],
+    )
+    assert [state.state for state in hist["sensor.power"]] == ["3", "4"]
+    assert hot_tier.stats()["misses"] == 2
+
+
+async def test_hot_tier_disabled_by_default(recorder_mock: Recorder) -> None:
+    """Test the hot tier is opt-in."""
+    assert recorder_mock.history_hot_tier is None
+
+
+@pytest.mark.parametrize("recorder_config", [{"hot_tier_max_rows": 100}])
+async def test_hot_tier_purge(hass: HomeAssistant, recorder_mock: Recorder) -> None:
+    """Test purging the database evicts the purged states from the hot tier."""
+    zero, _ = _record_states(hass)
+    await async_wait_recording_done(hass)
+    hot_tier = recorder_mock.history_hot_tier
+    assert isinstance(hot_tier, HistoryHotTier)
+    assert hot_tier.stats()["rows"] == 30
+
+    hot_tier.evict_before((zero + timedelta(seconds=5.5)).timestamp())
+    assert hot_tier.stats()["rows"] == 15
+
+    states_meta_manager = recorder_mock.states_meta_manager
+    metadata_id = states_meta_manager.get("sensor.power", None, True)
+    hot_tier.evict_metadata_ids([metadata_id])
+    assert hot_tier.stats()["entities"] == 2
+    assert hot_tier.stats()["rows"] == 10
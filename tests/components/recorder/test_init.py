@@ -30,6 +30,7 @@ from homeassistant.components.recorder import (
     Recorder,
     db_schema,
     get_instance,
+    history,
     migration,
     statistics,
 )
@@ -2746,3 +2747,54 @@ async def test_empty_entity_id(
     hass.bus.async_fire("hello", {"entity_id": ""})
     await async_wait_recording_done(hass)
     assert "Invalid entity ID" not in caplog.text
+
+
+@pytest.mark.skip_on_db_engine(["mysql", "postgresql"])
+@pytest.mark.usefixtures("skip_by_db_engine")
+@pytest.mark.parametrize("persistent_database", [True])
+@pytest.mark.parametrize("recorder_config", [{"db_max_readers": 2}])
+async def test_db_max_readers(recorder_mock: Recorder) -> None:
+    """Test the number of db executor workers and pooled connections is configurable.
+
+    On-disk database because the pool of in-memory databases is a MutexPool.
+    """
+    assert recorder_mock.db_max_readers == 2
+    assert recorder_mock._db_executor._max_workers == 2
+    # One connection for each worker and one for the recorder thread
+    assert recorder_mock.engine.pool.size == 3
+
+
+@pytest.mark.parametrize("recorder_config", [{"compress_attributes": True}])
+async def test_compress_attributes(
+    hass: HomeAssistant, recorder_mock: Recorder
+) -> None:
+    """Test large state attributes are stored compressed when enabled."""
+    attributes = {
+        "friendly_name": "Home",
+        "icon": "mdi:weather-cloudy",
+        "forecast": [
+            {"condition": "cloudy", "temperature": 20 + day, "templow": 10}
+            for day in range(10)
+        ],
+    }
+    hass.states.async_set("weather.home", "cloudy", attributes)
+    hass.states.async_set("weather.home", "sunny", attributes)
+    hass.states.async_set("sensor.small", "1", {"unit_of_measurement": "W"})
+    await async_wait_recording_done(hass)
+
+    with session_scope(hass=hass, read_only=True) as session:
+        shared_attrs = [row.shared_attrs for row in session.query(StateAttributes)]
+    # The compressed attributes are deduplicated like uncompressed ones
+    assert len(shared_attrs) == 2
+    assert '{"unit_of_measurement":"W"}' in shared_attrs
+    assert any(attrs.startswith('{ "@z":"') for attrs in shared_attrs)
+
+    hist = await recorder_mock.async_add_executor_job(
+        history.get_significant_states,
+        hass,
+        dt_util.utcnow() - timedelta(hours=1),
+        None,
+        ["weather.home"],
+    )
+    assert [state.state for state in hist["weather.home"]] == ["cloudy", "sunny"]
+    assert all(state.attributes == attributes for state in hist["weather.home"])
@@ -702,6 +702,39 @@ def test_forgiving_add_column(recorder_db_url: str) -> None:
     engine.dispose()
 
 
+def test_migrate_logbook_entries_table(recorder_db_url: str) -> None:
+    """Test the logbook_entries table is created when migrating to schema 48."""
+    engine = create_engine(recorder_db_url, poolclass=StaticPool)
+    db_schema.Base.metadata.create_all(
+        engine,
+        tables=[
+            table
+            for table in db_schema.Base.metadata.sorted_tables
+            if table.name != db_schema.TABLE_LOGBOOK_ENTRIES
+        ],
+    )
+    assert not inspect(engine).has_table(db_schema.TABLE_LOGBOOK_ENTRIES)
+    migrator = migration._SchemaVersionMigrator.get_migrator(48)(
+        Mock(), Mock(), engine, sessionmaker(bind=engine), 47
+    )
+
+    migrator.apply_update()
+    assert inspect(engine).has_table(db_schema.TABLE_LOGBOOK_ENTRIES)
+    assert {
+        index["name"]
+        for index in inspect(engine).get_indexes(db_schema.TABLE_LOGBOOK_ENTRIES)
+    } >= {
+        db_schema.LOGBOOK_ENTRIES_CONTEXT_ID_BIN_INDEX,
+        db_schema.LOGBOOK_ENTRIES_DEVICE_ID_TIME_FIRED_TS_INDEX,
+        db_schema.LOGBOOK_ENTRIES_ENTITY_ID_TIME_FIRED_TS_INDEX,
+        db_schema.LOGBOOK_ENTRIES_MULTIPLE_IDS_TIME_FIRED_TS_INDEX,
+    }
+
+    # The table may already exist
+    migrator.apply_update()
+    engine.dispose()
+
+
 def test_forgiving_add_index(recorder_db_url: str) -> None:
     """Test that add index will continue if index exists."""
     engine = create_engine(recorder_db_url, poolclass=StaticPool)
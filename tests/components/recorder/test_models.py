@@ -1,6 +1,7 @@
 """The tests for the Recorder component."""
 
 from datetime import datetime, timedelta
+from typing import Any
 from unittest.mock import PropertyMock
 
 import pytest
@@ -13,6 +14,7 @@ from homeassistant.components.recorder.db_schema import (
     States,
 )
 from homeassistant.components.recorder.models import (
+    COMPRESSED_ATTRS_PREFIX,
     LazyState,
     process_timestamp,
     process_timestamp_to_utc_isoformat,
@@ -106,6 +108,82 @@ def test_from_event_to_db_state_attributes_with_null() -> None:
     assert decoded["this_attr"] == "withnull"
 
 
+def test_from_event_to_db_state_attributes_compressed() -> None:
+    """Test large state attributes are compressed and small ones are not."""
+    attrs = {
+        "icon": "mdi:weather-cloudy",
+        "forecast": [
+            {"condition": "cloudy", "temperature": 20 + day, "templow": 10}
+            for day in range(10)
+        ],
+    }
+    state = ha.State("weather.home", "cloudy", attrs)
+    event = ha.Event(
+        EVENT_STATE_CHANGED,
+        {"entity_id": "weather.home", "old_state": None, "new_state": state},
+        context=state.context,
+    )
+    dialect = SupportedDialect.MYSQL
+    uncompressed = StateAttributes.shared_attrs_bytes_from_event(event, dialect)
+    compressed = StateAttributes.shared_attrs_bytes_from_event(event, dialect, True)
+    assert len(compressed) < len(uncompressed)
+    assert compressed.startswith(COMPRESSED_ATTRS_PREFIX.encode())
+    # The attributes matched by the logbook in SQL are kept as they are
+    assert json_loads(compressed)["icon"] == "mdi:weather-cloudy"
+    db_attrs = StateAttributes(shared_attrs=compressed.decode())
+    assert db_attrs.to_native() == attrs
+    row = PropertyMock(entity_id="weather.home", attributes=compressed.decode())
+    assert LazyState(row, {}, None, row.entity_id, "", 1, False).attributes == attrs
+
+    state = ha.State("sensor.temperature", "18", {"this_attr": True})
+    event = ha.Event(
+        EVENT_STATE_CHANGED,
+        {"entity_id": "sensor.temperature", "old_state": None, "new_state": state},
+        context=state.context,
+    )
+    assert (
+        StateAttributes.shared_attrs_bytes_from_event(event, dialect, True)
+        == b'{"this_attr":true}'
+    )
+
+
+@pytest.mark.parametrize(
+    "attrs",
+    [{"@z": "hello", "a": 1}, {"@z": "a b"}, {"@z": ""}],
+)
+def test_attributes_like_compressed_attributes(attrs: dict[str, Any]) -> None:
+    """Test attributes with the key of compressed attributes are not decompressed."""
+    state = ha.State("sensor.temperature", "18", attrs)
+    event = ha.Event(
+        EVENT_STATE_CHANGED,
+        {"entity_id": "sensor.temperature", "old_state": None, "new_state": state},
+        context=state.context,
+    )
+    for compress in (False, True):
+        shared_attrs = StateAttributes.shared_attrs_bytes_from_event(
+            event, SupportedDialect.MYSQL, compress
+        ).decode()
+        assert not shared_attrs.startswith(COMPRESSED_ATTRS_PREFIX)
+        assert StateAttributes(shared_attrs=shared_attrs).to_native() == attrs
+        row = PropertyMock(entity_id="sensor.temperature", attributes=shared_attrs)
+        lazy_state = LazyState(row, {}, None, row.entity_id, "", 1, False)
+        assert lazy_state.attributes == attrs
+
+
+@pytest.mark.parametrize(
+    "shared_attrs",
+    [f'{COMPRESSED_ATTRS_PREFIX}a b"}}', f'{COMPRESSED_ATTRS_PREFIX}abcde"}}'],
+)
+def test_invalid_compressed_attributes(
+    shared_attrs: str, caplog: pytest.LogCaptureFixture
+) -> None:
+    """Test invalid compressed attributes are logged and decoded as empty."""
+    assert StateAttributes(shared_attrs=shared_attrs).to_native() == {}
+    row = PropertyMock(entity_id="sensor.temperature", attributes=shared_attrs)
+    assert LazyState(row, {}, None, row.entity_id, "", 1, False).attributes == {}
+    assert "Error converting row to state attributes" in caplog.text
+
+
 def test_repr() -> None:
     """Test converting event to db state repr."""
     attrs = {"this_attr": True}
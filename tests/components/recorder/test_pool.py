@@ -78,3 +78,15 @@ def test_recorder_pool(caplog: pytest.LogCaptureFixture) -> None:
     new_thread.join()
     assert "accesses the database without the database executor" not in caplog.text
     assert connections[6] != connections[7]
+
+
+def test_recorder_pool_size() -> None:
+    """Test RecorderPool keeps the pool size when it is recreated."""
+    engine = create_engine(
+        "sqlite://",
+        poolclass=RecorderPool,
+        pool_size=9,
+        recorder_and_worker_thread_ids=set(),
+    )
+    assert engine.pool.size == 9
+    assert engine.pool.recreate().size == 9
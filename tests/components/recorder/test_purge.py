@@ -4,6 +4,7 @@ from collections.abc import Generator
 from datetime import datetime, timedelta
 import json
 import sqlite3
+from typing import Any
 from unittest.mock import patch
 
 from freezegun import freeze_time
@@ -13,10 +14,15 @@ from sqlalchemy.orm.session import Session
 from voluptuous.error import MultipleInvalid
 
 from homeassistant.components.recorder import DOMAIN as RECORDER_DOMAIN, Recorder
-from homeassistant.components.recorder.const import SupportedDialect
+from homeassistant.components.recorder.const import (
+    PURGE_PROGRESS_STORAGE_KEY,
+    PURGE_PROGRESS_STORAGE_VERSION,
+    SupportedDialect,
+)
 from homeassistant.components.recorder.db_schema import (
     Events,
     EventTypes,
+    LogbookEntries,
     RecorderRuns,
     StateAttributes,
     States,
@@ -206,6 +212,147 @@ async def test_purge_old_states(hass: HomeAssistant, recorder_mock: Recorder) ->
         assert state_attributes.count() == 3
 
 
+async def test_purge_old_states_with_time_budget(
+    hass: HomeAssistant, recorder_mock: Recorder
+) -> None:
+    """Test purging old states by state_id ranges with a time budget."""
+    await _add_test_states(hass)
+
+    with session_scope(hass=hass) as session:
+        state_ids = [state.state_id for state in session.query(States)]
+        assert len(state_ids) == 6
+
+    purge_before = dt_util.utcnow() - timedelta(days=4)
+
+    with (
+        patch.object(recorder_mock, "max_bind_vars", 1),
+        patch.object(recorder_mock.database_engine, "max_bind_vars", 1),
+    ):
+        # The budget is used up after the first range so only one
+        # state is purged per call
+        finished = purge_old_data(
+            recorder_mock, purge_before, repack=False, time_budget=1e-9
+        )
+        assert not finished
+        progress = recorder_mock.purge_progress
+        assert progress is not None
+        assert progress.states_cursor == state_ids[0] + 1
+        assert progress.states_end == state_ids[4]
+        assert progress.rows_purged == 1
+        assert progress.rows_remaining >= 3
+
+        with session_scope(hass=hass) as session:
+            assert session.query(States).count() == 5
+
+        calls = 1
+        while not purge_old_data(
+            recorder_mock, purge_before, repack=False, time_budget=1e-9
+        ):
+            calls += 1
+            assert calls < 20
+
+    progress = recorder_mock.purge_progress
+    assert progress.states_walk_done
+    assert progress.states_cursor == state_ids[3] + 1
+    assert progress.rows_remaining == 0
+
+    with session_scope(hass=hass) as session:
+        states = session.query(States).order_by(States.state_id).all()
+        assert [state.state for state in states] == ["dontpurgeme_4", "dontpurgeme_5"]
+        # The link to the purged state has been removed
+        assert states[0].old_state_id is None
+        assert states[1].old_state_id == states[0].state_id
+        assert session.query(StateAttributes).count() == 1
+
+    # A new purge target keeps the cursors since every row below
+    # them has been purged already
+    purge_old_data(recorder_mock, dt_util.utcnow(), repack=False, time_budget=10)
+    assert recorder_mock.purge_progress.states_cursor == state_ids[5] + 1
+    with session_scope(hass=hass) as session:
+        assert session.query(States).count() == 0
+
+
+async def test_purge_with_time_budget_commit_fails(
+    hass: HomeAssistant, recorder_mock: Recorder
+) -> None:
+    """Test the cursors are only moved once the purged rows are committed."""
+    await _add_test_states(hass)
+
+    purge_before = dt_util.utcnow() - timedelta(days=4)
+    session = recorder_mock.get_session()
+    with (
+        patch.object(recorder_mock, "get_session", return_value=session),
+        patch.object(
+            session,
+            "commit",
+            side_effect=OperationalError("commit", {}, Exception("forced to fail")),
+        ),
+    ):
+        purge_old_data(recorder_mock, purge_before, repack=False, time_budget=10)
+
+    # Later commits of the recorder do not move the cursors either
+    hass.states.async_set("test.recorder3", "on")
+    await async_wait_recording_done(hass)
+
+    progress = recorder_mock.purge_progress
+    assert progress is not None
+    assert progress.states_cursor == 0
+    assert not progress.states_walk_done
+    assert progress.rows_purged == 0
+    with session_scope(hass=hass) as session:
+        assert session.query(States).count() == 7
+
+    purge_old_data(recorder_mock, purge_before, repack=False, time_budget=10)
+    assert recorder_mock.purge_progress.states_walk_done
+    with session_scope(hass=hass) as session:
+        assert session.query(States).count() == 3
+
+
+async def test_purge_old_events_with_time_budget(
+    hass: HomeAssistant, recorder_mock: Recorder
+) -> None:
+    """Test purging old events that are not in event_id order with a time budget."""
+    await _add_test_events(hass, 3)
+
+    purge_before = dt_util.utcnow() - timedelta(days=4)
+    finished = purge_old_data(recorder_mock, purge_before, repack=False, time_budget=10)
+    assert finished
+
+    with session_scope(hass=hass) as session:
+        events = session.query(Events).filter(
+            Events.event_type_id.in_(select_event_type_ids(TEST_EVENT_TYPES))
+        )
+        assert events.count() == 6
+
+
+@pytest.mark.parametrize("recorder_config", [{"purge_time_budget": 1000}])
+async def test_purge_resumes_after_restart(
+    hass: HomeAssistant, recorder_mock: Recorder, hass_storage: dict[str, Any]
+) -> None:
+    """Test a purge that did not finish before a restart is resumed."""
+    await _add_test_states(hass)
+
+    purge_before = dt_util.utcnow() - timedelta(days=4)
+    hass_storage[PURGE_PROGRESS_STORAGE_KEY] = {
+        "version": PURGE_PROGRESS_STORAGE_VERSION,
+        "minor_version": 1,
+        "key": PURGE_PROGRESS_STORAGE_KEY,
+        "data": {
+            "purge_before": purge_before.isoformat(),
+            "repack": False,
+            "apply_filter": False,
+            "states_cursor": 0,
+            "events_cursor": 0,
+        },
+    }
+    await recorder_mock._async_resume_purge()
+    await async_wait_purge_done(hass)
+
+    with session_scope(hass=hass) as session:
+        assert session.query(States).count() == 2
+    assert recorder_mock.purge_progress is None
+
+
 @pytest.mark.skip_on_db_engine(["mysql", "postgresql"])
 @pytest.mark.usefixtures("recorder_mock", "skip_by_db_engine")
 async def test_purge_old_states_encouters_database_corruption(
@@ -404,6 +551,31 @@ async def test_purge_old_statistics_runs(
         assert statistics_runs.count() == 1
 
 
+async def test_purge_old_logbook_entries(
+    hass: HomeAssistant, recorder_mock: Recorder
+) -> None:
+    """Test deleting old rows of the logbook index."""
+    now = dt_util.utcnow()
+    with session_scope(hass=hass) as session:
+        session.add_all(
+            LogbookEntries(
+                time_fired_ts=(now - timedelta(days=days)).timestamp(),
+                entity_id="light.kitchen",
+                state="on",
+                context_origin=True,
+            )
+            for days in (0, 5, 15, 20)
+        )
+
+    finished = purge_old_data(recorder_mock, now - timedelta(days=10), repack=False)
+    assert not finished
+    finished = purge_old_data(recorder_mock, now - timedelta(days=10), repack=False)
+    assert finished
+
+    with session_scope(hass=hass) as session:
+        assert session.query(LogbookEntries).count() == 2
+
+
 @pytest.mark.parametrize("use_sqlite", [True, False], indirect=True)
 @pytest.mark.usefixtures("recorder_mock")
 async def test_purge_method(
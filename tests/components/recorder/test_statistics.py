@@ -1,6 +1,7 @@
 """The tests for sensor recorder platform."""
 
-from datetime import timedelta
+from datetime import datetime, timedelta
+import random
 from typing import Any
 from unittest.mock import ANY, Mock, patch
 
@@ -394,6 +395,116 @@ async def test_compile_periodic_statistics_exception(
     }
 
 
+@pytest.mark.parametrize(
+    ("invalidate", "expected_queries"),
+    [(False, 0), (True, 1)],
+)
+async def test_compile_hourly_statistics_incremental(
+    hass: HomeAssistant,
+    setup_recorder: None,
+    invalidate: bool,
+    expected_queries: int,
+) -> None:
+    """Test hourly statistics are summarized from the 5-minute statistics.
+
+    The hour is only compiled from the database if the summary kept by the
+    run cache is not complete.
+    """
+
+    def _mock_compile_statistics(
+        hass: HomeAssistant, session: Any, start: datetime, end: datetime
+    ) -> PlatformCompiledStatistics:
+        idx = start.minute // 5
+        return PlatformCompiledStatistics(
+            [
+                {
+                    "meta": {
+                        "has_mean": True,
+                        "has_sum": False,
+                        "name": None,
+                        "source": "recorder",
+                        "statistic_id": "sensor.mean",
+                        "unit_of_measurement": "W",
+                    },
+                    "stat": {
+                        "start": start,
+                        "mean": idx,
+                        "min": idx - 1,
+                        "max": idx + 1,
+                    },
+                },
+                {
+                    "meta": {
+                        "has_mean": False,
+                        "has_sum": True,
+                        "name": None,
+                        "source": "recorder",
+                        "statistic_id": "sensor.sum",
+                        "unit_of_measurement": "kWh",
+                    },
+                    "stat": {
+                        "start": start,
+                        "last_reset": None,
+                        "state": idx * 2,
+                        "sum": idx * 10,
+                    },
+                },
+            ],
+            get_metadata_with_session(
+                recorder.get_instance(hass),
+                session,
+                statistic_ids={"sensor.mean", "sensor.sum"},
+            ),
+        )
+
+    await _setup_mock_domain(
+        hass, Mock(compile_statistics=Mock(wraps=_mock_compile_statistics))
+    )
+    await async_recorder_block_till_done(hass)
+
+    zero = get_start_time(dt_util.utcnow()).replace(minute=0) + timedelta(hours=1)
+    with patch(
+        "homeassistant.components.recorder.statistics._compile_hourly_statistics_summary_mean_stmt",
+        wraps=statistics._compile_hourly_statistics_summary_mean_stmt,
+    ) as summary_mean_stmt_mock:
+        for idx in range(12):
+            do_adhoc_statistics(hass, start=zero + timedelta(minutes=5 * idx))
+            await async_wait_recording_done(hass)
+            if invalidate and idx == 5:
+                get_short_term_statistics_run_cache(hass).invalidate_hourly_statistics()
+    assert summary_mean_stmt_mock.call_count == expected_queries
+
+    stats = statistics_during_period(hass, zero, period="hour")
+    start_ts = zero.timestamp()
+    end_ts = (zero + timedelta(hours=1)).timestamp()
+    assert stats == {
+        "sensor.mean": [
+            {
+                "start": start_ts,
+                "end": end_ts,
+                "mean": pytest.approx(5.5),
+                "min": -1.0,
+                "max": 12.0,
+                "last_reset": None,
+                "state": None,
+                "sum": None,
+            }
+        ],
+        "sensor.sum": [
+            {
+                "start": start_ts,
+                "end": end_ts,
+                "mean": None,
+                "min": None,
+                "max": None,
+                "last_reset": None,
+                "state": 22.0,
+                "sum": 110.0,
+            }
+        ],
+    }
+
+
 async def test_rename_entity(
     hass: HomeAssistant, entity_registry: er.EntityRegistry, setup_recorder: None
 ) -> None:
@@ -1844,6 +1955,65 @@ async def test_monthly_statistics_sum(
     assert stats == {}
 
 
+@pytest.mark.usefixtures("setup_recorder")
+async def test_reduce_statistics_numpy(hass: HomeAssistant) -> None:
+    """Test reducing statistics with NumPy gives the same result as without."""
+    assert statistics.HAS_NUMPY
+    await hass.config.async_set_time_zone("Europe/Amsterdam")
+    rand = random.Random(0)
+    zero = dt_util.parse_datetime("2022-02-27 00:00:00+00:00")
+    for statistic_id, unit, has_mean, has_sum in (
+        ("sensor.mean", "W", True, False),
+        ("sensor.gaps", "W", True, False),
+        ("sensor.sum", "kWh", False, True),
+    ):
+        external_statistics = []
+        for hour in range(24 * 40):
+            if statistic_id == "sensor.gaps" and rand.random() < 0.5:
+                continue
+            mean = rand.uniform(-100, 100)
+            stat: dict[str, Any] = {"start": zero + timedelta(hours=hour)}
+            if has_mean and rand.random() > 0.1:
+                stat |= {
+                    "mean": mean,
+                    "min": mean - rand.random(),
+                    "max": mean + rand.random(),
+                }
+            if has_sum:
+                stat |= {"state": rand.uniform(0, 10), "sum": hour * 1.1}
+            external_statistics.append(stat)
+        async_import_statistics(
+            hass,
+            {
+                "has_mean": has_mean,
+                "has_sum": has_sum,
+                "name": None,
+                "source": "recorder",
+                "statistic_id": statistic_id,
+                "unit_of_measurement": unit,
+            },
+            external_statistics,
+        )
+    await async_wait_recording_done(hass)
+
+    for period in ("day", "week", "month"):
+        for units in (None, {"energy": "Wh"}):
+            with patch.object(
+                statistics,
+                "reduce_statistics_rows",
+                wraps=statistics.reduce_statistics_rows,
+            ) as reduce_statistics_rows_mock:
+                stats = statistics_during_period(hass, zero, period=period, units=units)
+            # Statistics which are converted are reduced without NumPy
+            assert reduce_statistics_rows_mock.call_count == (3 if units is None else 2)
+            with patch.object(statistics, "HAS_NUMPY", False):
+                expected = statistics_during_period(
+                    hass, zero, period=period, units=units
+                )
+            assert stats
+            assert stats == expected
+
+
 def test_cache_key_for_generate_statistics_during_period_stmt() -> None:
     """Test cache key for _generate_statistics_during_period_stmt."""
     stmt = _generate_statistics_during_period_stmt(
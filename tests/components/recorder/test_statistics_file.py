@@ -0,0 +1,357 @@
+"""The tests for exporting and importing statistics files."""
+
+from collections.abc import Generator
+from datetime import timedelta
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from homeassistant.components.recorder import Recorder, statistics_file
+from homeassistant.components.recorder.const import DOMAIN
+from homeassistant.components.recorder.db_schema import Statistics, StatisticsMeta
+from homeassistant.components.recorder.statistics import (
+    async_add_external_statistics,
+    async_import_statistics,
+)
+from homeassistant.components.recorder.statistics_file import (
+    HAS_PYARROW,
+    async_import_statistics_file,
+    resolve_file_format,
+)
+from homeassistant.components.recorder.util import session_scope
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+import homeassistant.util.dt as dt_util
+
+from .common import async_wait_recording_done, statistics_during_period
+
+from tests.typing import RecorderInstanceGenerator
+
+
+@pytest.fixture
+async def mock_recorder_before_hass(
+    async_test_recorder: RecorderInstanceGenerator,
+) -> None:
+    """Set up recorder."""
+
+
+@pytest.fixture(autouse=True)
+def setup_recorder(
+    recorder_mock: Recorder, hass: HomeAssistant, tmp_path: Path
+) -> None:
+    """Set up recorder and allow the files of the tests to be accessed."""
+    hass.config.allowlist_external_dirs = {str(tmp_path)}
+
+
+async def _async_add_statistics(hass: HomeAssistant) -> None:
+    """Add an external and an internal statistic."""
+    start = dt_util.utcnow().replace(minute=0, second=0, microsecond=0)
+    async_add_external_statistics(
+        hass,
+        {
+            "has_mean": False,
+            "has_sum": True,
+            "name": "Total imported energy",
+            "source": "test",
+            "statistic_id": "test:total_energy_import",
+            "unit_of_measurement": "kWh",
+        },
+        [
+            {
+                "start": start - timedelta(hours=hours),
+                "last_reset": start - timedelta(days=1),
+                "state": float(hours),
+                "sum": float(10 - hours),
+            }
+            for hours in range(1, 4)
+        ],
+    )
+    async_import_statistics(
+        hass,
+        {
+            "has_mean": True,
+            "has_sum": False,
+            "name": None,
+            "source": DOMAIN,
+            "statistic_id": "sensor.temperature",
+            "unit_of_measurement": "°C",
+        },
+        [
+            {
+                "start": start - timedelta(hours=hours),
+                "mean": 20.5 + hours,
+                "min": 19.25,
+                "max": 25.0,
+            }
+            for hours in range(1, 3)
+        ],
+    )
+    await async_wait_recording_done(hass)
+
+
+def _delete_statistics(hass: HomeAssistant) -> None:
+    """Delete all statistics and their metadata."""
+    with session_scope(hass=hass) as session:
+        session.query(Statistics).delete()
+        session.query(StatisticsMeta).delete()
+
+
+@pytest.mark.parametrize("file_format", ["csv", "arrow", "parquet"])
+async def test_export_import_statistics(
+    hass: HomeAssistant, recorder_mock: Recorder, tmp_path: Path, file_format: str
+) -> None:
+    """Test statistics can be exported to a file and imported again."""
+    if file_format != "csv":
+        pytest.importorskip("pyarrow")
+    await _async_add_statistics(hass)
+    start = dt_util.utcnow() - timedelta(days=1)
+    statistic_ids = {"test:total_energy_import", "sensor.temperature"}
+    stats = statistics_during_period(
+        hass, start, period="hour", statistic_ids=statistic_ids
+    )
+    assert len(stats["test:total_energy_import"]) == 3
+    assert len(stats["sensor.temperature"]) == 2
+
+    filename = str(tmp_path / f"statistics.{file_format}")
+    await hass.services.async_call(
+        DOMAIN, "export_statistics", {"filename": filename}, blocking=True
+    )
+    await recorder_mock.async_add_executor_job(_delete_statistics, hass)
+    assert statistics_during_period(hass, start, period="hour") == {}
+
+    await hass.services.async_call(
+        DOMAIN, "import_statistics", {"filename": filename}, blocking=True
+    )
+    await async_wait_recording_done(hass)
+    assert (
+        statistics_during_period(
+            hass, start, period="hour", statistic_ids=statistic_ids
+        )
+        == stats
+    )
+
+
+async def test_export_statistics_filtered(
+    hass: HomeAssistant, recorder_mock: Recorder, tmp_path: Path
+) -> None:
+    """Test exporting some statistics in a time range."""
+    await _async_add_statistics(hass)
+    start = dt_util.utcnow().replace(minute=0, second=0, microsecond=0)
+    filename = tmp_path / "statistics.csv"
+    await hass.services.async_call(
+        DOMAIN,
+        "export_statistics",
+        {
+            "filename": str(filename),
+            "statistic_ids": ["test:total_energy_import"],
+            "start_time": start - timedelta(hours=2),
+        },
+        blocking=True,
+    )
+    lines = filename.read_text().splitlines()
+    assert lines[0] == (
+        "statistic_id,source,name,unit_of_measurement,has_mean,has_sum,"
+        "start_ts,mean,min,max,last_reset_ts,state,sum"
+    )
+    last_reset_ts = (start - timedelta(days=1)).timestamp()
+    assert lines[1:] == [
+        "test:total_energy_import,test,Total imported energy,kWh,False,True,"
+        f"{(start - timedelta(hours=2)).timestamp()},,,,{last_reset_ts},2.0,8.0",
+        "test:total_energy_import,test,Total imported energy,kWh,False,True,"
+        f"{(start - timedelta(hours=1)).timestamp()},,,,{last_reset_ts},1.0,9.0",
+    ]
+
+
+async def test_import_statistics_updates_existing(
+    hass: HomeAssistant,
+    recorder_mock: Recorder,
+    tmp_path: Path,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Test importing a file updates existing statistics and skips invalid ones."""
+    await _async_add_statistics(hass)
+    start = dt_util.utcnow().replace(minute=0, second=0, microsecond=0)
+    hour_ts = (start - timedelta(hours=1)).timestamp()
+    filename = tmp_path / "statistics.csv"
+    filename.write_text(
+        "statistic_id,source,name,unit_of_measurement,has_mean,has_sum,"
+        "start_ts,mean,min,max,last_reset_ts,state,sum\n"
+        f"test:total_energy_import,test,Energy,kWh,False,True,{hour_ts},,,,,5.0,50.0\n"
+        f"test:total_energy_import,test,Energy,kWh,False,True,{hour_ts + 60},,,,,6.0,60.0\n"
+        f"test:other,other,Other,kWh,False,True,{hour_ts},,,,,1.0,1.0\n"
+    )
+    await hass.services.async_call(
+        DOMAIN, "import_statistics", {"filename": str(filename)}, blocking=True
+    )
+    await async_wait_recording_done(hass)
+
+    stats = statistics_during_period(
+        hass,
+        start - timedelta(days=1),
+        period="hour",
+        statistic_ids={"test:total_energy_import", "test:other"},
+        types={"state", "sum"},
+    )
+    assert [
+        (row["state"], row["sum"]) for row in stats["test:total_energy_import"]
+    ] == [
+        (3.0, 7.0),
+        (2.0, 8.0),
+        (5.0, 50.0),
+    ]
+    assert "test:other" not in stats
+    assert "Not importing statistics of test:other: Invalid source" in caplog.text
+    assert "not at the start of a period" in caplog.text
+
+
+async def test_import_statistics_invalid_rows(
+    hass: HomeAssistant,
+    recorder_mock: Recorder,
+    tmp_path: Path,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Test rows with invalid values are skipped with a warning."""
+    start = dt_util.utcnow().replace(minute=0, second=0, microsecond=0)
+    hour_ts = (start - timedelta(hours=1)).timestamp()
+    filename = tmp_path / "statistics.csv"
+    filename.write_text(
+        "statistic_id,source,name,unit_of_measurement,has_mean,has_sum,"
+        "start_ts,mean,min,max,last_reset_ts,state,sum\n"
+        f"test:energy,test,Energy,kWh,False,True,{hour_ts},,,,,5.0,50.0\n"
+        "test:energy,test,Energy,kWh,False,True,,,,,,6.0,60.0\n"
+        f"test:energy,test,Energy,kWh,False,True,{hour_ts},,,,,many,60.0\n"
+        f",test,Energy,kWh,False,True,{hour_ts},,,,,1.0,1.0\n"
+    )
+    await hass.services.async_call(
+        DOMAIN, "import_statistics", {"filename": str(filename)}, blocking=True
+    )
+    await async_wait_recording_done(hass)
+
+    stats = statistics_during_period(
+        hass,
+        start - timedelta(days=1),
+        period="hour",
+        statistic_ids={"test:energy"},
+        types={"state", "sum"},
+    )
+    assert [(row["state"], row["sum"]) for row in stats["test:energy"]] == [(5.0, 50.0)]
+    assert "Not importing statistics of test:energy without a start" in caplog.text
+    assert f"Not importing line 4 of {filename}" in caplog.text
+    assert "Not importing statistics without a statistic_id" in caplog.text
+
+
+async def test_import_statistics_counts_written_rows(
+    hass: HomeAssistant, recorder_mock: Recorder, tmp_path: Path
+) -> None:
+    """Test only the rows which were committed are counted as imported."""
+    start = dt_util.utcnow().replace(minute=0, second=0, microsecond=0)
+    hour_ts = (start - timedelta(hours=1)).timestamp()
+    filename = tmp_path / "statistics.csv"
+    filename.write_text(
+        "statistic_id,source,name,unit_of_measurement,has_mean,has_sum,"
+        "start_ts,mean,min,max,last_reset_ts,state,sum\n"
+        f"test:energy,test,Energy,kWh,False,True,{hour_ts - 3600},,,,,5.0,50.0\n"
+        f"test:energy,test,Energy,kWh,False,True,{hour_ts},,,,,6.0,60.0\n"
+        f"test:other,test,Other,kWh,False,True,{hour_ts},,,,,1.0,1.0\n"
+    )
+    bulk_import = statistics_file.ImportStatisticsTask.run
+
+    def _run(task: statistics_file.ImportStatisticsTask, instance: Recorder) -> None:
+        if task.metadata["statistic_id"] == "test:other":
+            with patch(
+                "homeassistant.components.recorder.statistics._bulk_import_statistics",
+                side_effect=OperationalError("insert", {}, Exception()),
+            ):
+                bulk_import(task, instance)
+            return
+        bulk_import(task, instance)
+
+    with patch.object(statistics_file.ImportStatisticsTask, "run", _run):
+        imported = await async_import_statistics_file(
+            hass, recorder_mock, str(filename), "csv", Statistics
+        )
+    assert imported == 2
+
+    stats = statistics_during_period(
+        hass,
+        start - timedelta(days=1),
+        period="hour",
+        statistic_ids={"test:energy", "test:other"},
+        types={"sum"},
+    )
+    assert [row["sum"] for row in stats["test:energy"]] == [50.0, 60.0]
+    assert "test:other" not in stats
+
+
+async def test_import_statistics_closes_file_on_error(
+    hass: HomeAssistant, recorder_mock: Recorder, tmp_path: Path
+) -> None:
+    """Test the file is closed when an import fails partway."""
+    hour_ts = (
+        dt_util.utcnow().replace(minute=0, second=0, microsecond=0) - timedelta(hours=1)
+    ).timestamp()
+    filename = tmp_path / "statistics.csv"
+    filename.write_text(
+        "statistic_id,source,name,unit_of_measurement,has_mean,has_sum,"
+        "start_ts,mean,min,max,last_reset_ts,state,sum\n"
+        f"test:energy,test,Energy,kWh,False,True,{hour_ts},,,,,5.0,50.0\n"
+        f"test:other,test,Other,kWh,False,True,{hour_ts},,,,,1.0,1.0\n"
+    )
+    iter_batches = statistics_file._iter_batches
+    batches: list[Generator[list[dict[str, Any]]]] = []
+
+    def _iter_batches(path: str, file_format: str) -> Generator[list[dict[str, Any]]]:
+        batches.append(iter_batches(path, file_format))
+        return batches[0]
+
+    with (
+        patch.object(statistics_file, "FILE_BATCH_SIZE", 1),
+        patch.object(statistics_file, "_iter_batches", _iter_batches),
+        patch.object(
+            statistics_file,
+            "_statistics_from_rows",
+            side_effect=[iter(()), ValueError("broken")],
+        ),
+        pytest.raises(ValueError, match="broken"),
+    ):
+        await async_import_statistics_file(
+            hass, recorder_mock, str(filename), "csv", Statistics
+        )
+    assert batches[0].gi_frame is None
+
+
+async def test_import_statistics_missing_columns(
+    hass: HomeAssistant, tmp_path: Path
+) -> None:
+    """Test importing a file without all columns fails."""
+    filename = tmp_path / "statistics.csv"
+    filename.write_text("statistic_id,source,start_ts\ntest:energy,test,0\n")
+    with pytest.raises(HomeAssistantError, match="missing the columns name"):
+        await hass.services.async_call(
+            DOMAIN, "import_statistics", {"filename": str(filename)}, blocking=True
+        )
+
+
+async def test_statistics_file_not_allowed(hass: HomeAssistant) -> None:
+    """Test files outside of the allowed directories can not be accessed."""
+    for service in ("export_statistics", "import_statistics"):
+        with pytest.raises(HomeAssistantError, match="no access to path"):
+            await hass.services.async_call(
+                DOMAIN, service, {"filename": "/etc/statistics.csv"}, blocking=True
+            )
+
+
+def test_resolve_file_format() -> None:
+    """Test the format of a file is picked from its suffix."""
+    assert resolve_file_format("statistics.csv", "auto") == "csv"
+    assert resolve_file_format("statistics.txt", "csv") == "csv"
+    if HAS_PYARROW:
+        assert resolve_file_format("statistics.feather", "auto") == "arrow"
+        assert resolve_file_format("statistics", "auto") == "parquet"
+        return
+    assert resolve_file_format("statistics", "auto") == "csv"
+    with pytest.raises(HomeAssistantError, match="pyarrow must be installed"):
+        resolve_file_format("statistics.parquet", "auto")
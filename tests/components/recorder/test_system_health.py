@@ -6,8 +6,10 @@ import pytest
 
 from homeassistant.components.recorder import Recorder, get_instance
 from homeassistant.components.recorder.const import SupportedDialect
+from homeassistant.components.recorder.purge import PurgeProgress
 from homeassistant.core import HomeAssistant
 from homeassistant.setup import async_setup_component
+from homeassistant.util import dt as dt_util
 
 from .common import async_wait_recording_done
 
@@ -67,6 +69,22 @@ async def test_recorder_system_health_alternate_dbms(
     }
 
 
+@pytest.mark.skip_on_db_engine(["mysql", "postgresql"])
+@pytest.mark.usefixtures("skip_by_db_engine")
+async def test_recorder_system_health_purge_progress(
+    recorder_mock: Recorder, hass: HomeAssistant
+) -> None:
+    """Test recorder system health while a purge is running."""
+    assert await async_setup_component(hass, "system_health", {})
+    await async_wait_recording_done(hass)
+    progress = PurgeProgress(dt_util.utcnow(), False, False, states_end=101)
+    progress.states_cursor = 21
+    recorder_mock.purge_progress = progress
+    info = await get_system_health_info(hass, "recorder")
+    assert info["purge_rows_remaining"] == 80
+    assert info["purge_rate"].endswith(" rows/s")
+
+
 @pytest.mark.parametrize(
     "db_engine", [SupportedDialect.MYSQL, SupportedDialect.POSTGRESQL]
 )
@@ -2,8 +2,10 @@
 
 from asyncio import Event
 from datetime import datetime, timedelta
+from typing import Any
 from unittest.mock import ANY, patch
 
+from freezegun.api import FrozenDateTimeFactory
 import pytest
 from syrupy.assertion import SnapshotAssertion
 
@@ -25,6 +27,7 @@ from homeassistant.core import Context, CoreState, HomeAssistant, State, callbac
 from homeassistant.helpers import device_registry as dr, entity_registry as er
 from homeassistant.helpers.entity_component import async_update_entity
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import async_get_template_render_scheduler
 from homeassistant.helpers.template import Template
 from homeassistant.helpers.typing import ConfigType, DiscoveryInfoType
 from homeassistant.setup import ATTR_COMPONENT, async_setup_component
@@ -710,6 +713,112 @@ async def test_sun_renders_once_per_sensor(hass: HomeAssistant) -> None:
     }
 
 
+@pytest.mark.parametrize(("count", "domain"), [(1, "template")])
+@pytest.mark.parametrize(
+    "config",
+    [
+        {
+            "template": {
+                "sensor": {
+                    "name": "test_template_sensor",
+                    "state": "{{ states('sensor.test_state') }}",
+                    "min_render_interval": {"seconds": 10},
+                },
+            },
+        },
+    ],
+)
+@pytest.mark.usefixtures("start_ha")
+async def test_min_render_interval(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """Test the renders of a template sensor are limited by its minimum interval."""
+    assert hass.states.get(TEST_NAME).state == STATE_UNKNOWN
+
+    # The template was just rendered when the sensor was added
+    hass.states.async_set("sensor.test_state", "1")
+    hass.states.async_set("sensor.test_state", "2")
+    await hass.async_block_till_done()
+    assert hass.states.get(TEST_NAME).state == STATE_UNKNOWN
+
+    freezer.tick(timedelta(seconds=10))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    assert hass.states.get(TEST_NAME).state == "2"
+
+
+@pytest.mark.parametrize(
+    ("extra_config", "renders"), [({}, 3), ({"coalesce_renders": True}, 1)]
+)
+async def test_coalesce_renders(
+    hass: HomeAssistant, extra_config: dict[str, Any], renders: int
+) -> None:
+    """Test a burst of state changes renders the template once when coalesced."""
+    assert await async_setup_component(
+        hass,
+        "template",
+        {
+            "template": {
+                "sensor": {
+                    "name": "test_template_sensor",
+                    "state": "{{ states('sensor.test_state') }}",
+                    **extra_config,
+                },
+            },
+        },
+    )
+    await hass.async_block_till_done()
+    stats = async_get_template_render_scheduler(hass).stats
+    initial_renders = stats["{{ states('sensor.test_state') }}"].renders
+
+    hass.states.async_set("sensor.test_state", "1")
+    hass.states.async_set("sensor.test_state", "2")
+    hass.states.async_set("sensor.test_state", "3")
+    await hass.async_block_till_done()
+
+    assert hass.states.get(TEST_NAME).state == "3"
+    assert (
+        stats["{{ states('sensor.test_state') }}"].renders == initial_renders + renders
+    )
+
+
+@pytest.mark.parametrize(
+    ("extra_config", "analyzed"),
+    [
+        ({}, False),
+        ({"min_render_interval": {"seconds": 10}}, False),
+        ({"analyze_templates": True}, True),
+    ],
+)
+async def test_analyze_templates_opt_in(
+    hass: HomeAssistant, extra_config: dict[str, Any], analyzed: bool
+) -> None:
+    """Test templates are only analyzed without rendering when opted in."""
+    with patch.object(
+        Template,
+        "async_analyze_to_info",
+        autospec=True,
+        side_effect=Template.async_analyze_to_info,
+    ) as analyze_mock:
+        assert await async_setup_component(
+            hass,
+            "template",
+            {
+                "template": {
+                    "sensor": {
+                        "name": "test_template_sensor",
+                        "state": "{{ states('sensor.test_state') }}",
+                        **extra_config,
+                    },
+                },
+            },
+        )
+        await hass.async_block_till_done()
+
+    assert analyze_mock.called is analyzed
+    assert hass.states.get(TEST_NAME).state == STATE_UNKNOWN
+
+
 @pytest.mark.parametrize(("count", "domain"), [(1, "template")])
 @pytest.mark.parametrize(
     "config",
@@ -4,7 +4,7 @@ import asyncio
 from copy import deepcopy
 import logging
 from typing import Any
-from unittest.mock import ANY, AsyncMock, Mock, patch
+from unittest.mock import ANY, AsyncMock, Mock, PropertyMock, patch
 
 import pytest
 import voluptuous as vol
@@ -692,6 +692,50 @@ async def test_get_states(
     assert msg["result"] == states
 
 
+async def test_get_states_changed_since_last_call(
+    hass: HomeAssistant, websocket_client: MockHAClientWebSocket
+) -> None:
+    """Test get_states only serializes the states changed since the last call."""
+    hass.states.async_set("greeting.hello", "world")
+    hass.states.async_set("greeting.bye", "universe")
+
+    async def _get_states(msg_id: int) -> list[dict[str, Any]]:
+        await websocket_client.send_json({"id": msg_id, "type": "get_states"})
+        msg = await websocket_client.receive_json()
+        assert msg["id"] == msg_id
+        assert msg["success"]
+        return msg["result"]
+
+    assert await _get_states(5) == [
+        state.as_dict() for state in hass.states.async_all()
+    ]
+
+    hass.states.async_set("greeting.hello", "moon")
+    hass.states.async_set("farewell.bye", "universe")
+    changed_json = [
+        hass.states.get("greeting.hello").as_dict_json,
+        hass.states.get("farewell.bye").as_dict_json,
+    ]
+    with patch.object(
+        State, "as_dict_json", new_callable=PropertyMock, side_effect=changed_json
+    ) as mock_as_dict_json:
+        result = await _get_states(6)
+    assert mock_as_dict_json.call_count == 2
+    assert result == [state.as_dict() for state in hass.states.async_all()]
+    assert [state["entity_id"] for state in result] == [
+        "greeting.hello",
+        "greeting.bye",
+        "farewell.bye",
+    ]
+
+    hass.states.async_remove("greeting.hello")
+    hass.states.async_set("greeting.hello", "sun")
+    assert await _get_states(7) == [
+        state.as_dict() for state in hass.states.async_all()
+    ]
+    assert hass.states.get("greeting.hello").state == "sun"
+
+
 async def test_get_services(
     hass: HomeAssistant, websocket_client: MockHAClientWebSocket
 ) -> None:
@@ -0,0 +1,202 @@
+"""Test compacting the queued messages of a websocket client."""
+
+from typing import Any
+
+from homeassistant.components.websocket_api.compaction import (
+    compact_messages,
+    is_compactable_message,
+)
+from homeassistant.helpers.json import json_bytes
+from homeassistant.util.json import json_loads
+
+from .test_commands import _apply_entities_changes
+
+
+def _entities_message(message_id: int, event: dict[str, Any]) -> bytes:
+    """Return a subscribe_entities message serialized like the server does."""
+    return b"".join(
+        (
+            json_bytes({"type": "event", "event": event})[:-1],
+            b',"id":',
+            str(message_id).encode(),
+            b"}",
+        )
+    )
+
+
+def _apply_entities_messages(
+    states: dict[str, dict[str, Any]], messages: list[bytes]
+) -> None:
+    """Apply subscribe_entities messages like the client does."""
+    for message in messages:
+        event = json_loads(message)["event"]
+        for entity_id, compressed_state in event.get("a", {}).items():
+            states[entity_id] = {
+                "state": compressed_state["s"],
+                "attributes": dict(compressed_state["a"]),
+                "context": (
+                    {"id": context, "parent_id": None, "user_id": None}
+                    if isinstance(context := compressed_state["c"], str)
+                    else dict(context)
+                ),
+                "last_changed": compressed_state["lc"],
+                "last_updated": compressed_state.get("lu", compressed_state["lc"]),
+            }
+        for entity_id, diff in event.get("c", {}).items():
+            _apply_entities_changes(states[entity_id], diff)
+        for entity_id in event.get("r", []):
+            states.pop(entity_id, None)
+
+
+def test_compact_entity_changes() -> None:
+    """Test the changes of a subscription are merged to a change per entity."""
+    messages = [
+        _entities_message(
+            1,
+            {
+                "a": {
+                    "light.kitchen": {
+                        "s": "off",
+                        "a": {"color": "red"},
+                        "c": "01",
+                        "lc": 1,
+                    },
+                    "light.removed": {"s": "off", "a": {}, "c": "02", "lc": 1},
+                }
+            },
+        ),
+        b'{"id":2,"type":"result","success":true,"result":null}',
+        _entities_message(
+            1, {"c": {"light.kitchen": {"+": {"s": "on", "c": "03", "lc": 2}}}}
+        ),
+        _entities_message(
+            1,
+            {
+                "c": {
+                    "light.kitchen": {
+                        "+": {"a": {"level": 5}, "c": {"user_id": "abc"}, "lu": 3},
+                        "-": {"a": ["color"]},
+                    }
+                }
+            },
+        ),
+        _entities_message(
+            1, {"a": {"light.added": {"s": "on", "a": {}, "c": "04", "lc": 4}}}
+        ),
+        _entities_message(1, {"r": ["light.removed"]}),
+    ]
+    expected: dict[str, dict[str, Any]] = {}
+    _apply_entities_messages(expected, messages[:1] + messages[2:])
+
+    compacted = compact_messages(messages)
+
+    assert len(compacted) == 2
+    assert compacted[1] == messages[1]
+    event = json_loads(compacted[0])["event"]
+    assert event.keys() == {"a", "r"}
+    assert event["a"].keys() == {"light.kitchen", "light.added"}
+    assert event["r"] == ["light.removed"]
+    states: dict[str, dict[str, Any]] = {}
+    _apply_entities_messages(states, compacted[:1])
+    assert states == expected
+
+
+def test_compact_entity_diffs() -> None:
+    """Test state diffs of an entity are merged into a single diff."""
+    initial = {
+        "light.kitchen": {
+            "s": "off",
+            "a": {"color": "red", "level": 1},
+            "c": {"id": "01", "parent_id": None, "user_id": "abc"},
+            "lc": 1,
+        }
+    }
+    messages = [
+        _entities_message(
+            1,
+            {
+                "c": {
+                    "light.kitchen": {
+                        "+": {"s": "on", "a": {"color": "blue"}, "c": "02", "lc": 2},
+                        "-": {"a": ["level"]},
+                    }
+                }
+            },
+        ),
+        _entities_message(
+            1,
+            {
+                "c": {
+                    "light.kitchen": {
+                        "+": {"a": {"level": 2}, "c": {"parent_id": "03"}, "lc": 3},
+                        "-": {"a": ["color"]},
+                    }
+                }
+            },
+        ),
+    ]
+    expected: dict[str, dict[str, Any]] = {}
+    _apply_entities_messages(
+        expected, [_entities_message(1, {"a": initial}), *messages]
+    )
+
+    compacted = compact_messages(messages)
+
+    assert len(compacted) == 1
+    assert json_loads(compacted[0])["event"].keys() == {"c"}
+    states: dict[str, dict[str, Any]] = {}
+    _apply_entities_messages(states, [_entities_message(1, {"a": initial}), *compacted])
+    assert states == expected
+
+
+def test_compact_keeps_changes_that_can_not_be_merged() -> None:
+    """Test a change of the last updated time after a last changed time is kept."""
+    messages = [
+        _entities_message(1, {"c": {"light.kitchen": {"+": {"s": "on", "lc": 2}}}}),
+        _entities_message(1, {"c": {"light.kitchen": {"+": {"lu": 3}}}}),
+        _entities_message(2, {"c": {"light.kitchen": {"+": {"s": "on", "lc": 2}}}}),
+    ]
+
+    assert compact_messages(messages) == messages
+
+
+def test_compact_keeps_state_changed_events() -> None:
+    """Test the state_changed events of subscribe_events are all kept."""
+
+    def state_changed(entity_id: str, old: str, new: str) -> bytes:
+        return json_bytes(
+            {
+                "type": "event",
+                "event": {
+                    "event_type": "state_changed",
+                    "data": {
+                        "entity_id": entity_id,
+                        "old_state": {"state": old},
+                        "new_state": {"state": new},
+                    },
+                },
+                "id": 1,
+            }
+        )
+
+    messages = [
+        state_changed("light.kitchen", "unavailable", "on"),
+        state_changed("light.kitchen", "on", "off"),
+        state_changed("light.kitchen", "off", "dim"),
+    ]
+
+    assert not any(is_compactable_message(message) for message in messages)
+    assert compact_messages(messages) == messages
+
+
+def test_compact_keeps_other_messages() -> None:
+    """Test messages that can not be compacted are kept in order."""
+    messages = [
+        b'{"id":1,"type":"result","success":true,"result":null}',
+        b'{"id":2,"type":"event","event":{"a":{}}}',
+        b'{"id":3,"type":"event","event":{"events":[]}}',
+        b'{"id":3,"type":"event","event":{"events":[]}}',
+        b'{"id":4,"type":"event","event"',
+    ]
+
+    assert compact_messages(messages) == messages
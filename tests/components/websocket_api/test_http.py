@@ -345,6 +345,97 @@ async def test_pending_msg_peak_but_does_not_overflow(
     assert "Client unable to keep up with pending messages" not in caplog.text
 
 
+async def test_pending_msg_overflow_compacts_queue(
+    hass: HomeAssistant,
+    hass_ws_client: WebSocketGenerator,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Test state changes are merged instead of disconnecting the client."""
+    orig_handler = http.WebSocketHandler
+    setup_instance: http.WebSocketHandler | None = None
+
+    def instantiate_handler(*args):
+        nonlocal setup_instance
+        setup_instance = orig_handler(*args)
+        return setup_instance
+
+    with patch(
+        "homeassistant.components.websocket_api.http.WebSocketHandler",
+        instantiate_handler,
+    ):
+        websocket_client = await hass_ws_client()
+
+    instance: http.WebSocketHandler = cast(http.WebSocketHandler, setup_instance)
+
+    with (
+        patch("homeassistant.components.websocket_api.http.MAX_PENDING_MSG", 20),
+        patch("homeassistant.components.websocket_api.http.PENDING_MSG_PEAK", 5),
+    ):
+        for idx in range(20):
+            instance._send_message(
+                b'{"type":"event","event":{"c":{"light.kitchen":'
+                b'{"+":{"s":"%d"}}}},"id":1}' % idx
+            )
+
+    assert instance.pending_message_count == 1
+    assert instance.pending_message_bytes > 0
+    assert instance.coalesced_message_count == 19
+    msg = await websocket_client.receive_json()
+    assert msg == {
+        "id": 1,
+        "type": "event",
+        "event": {"c": {"light.kitchen": {"+": {"s": "19"}}}},
+    }
+    assert "Client unable to keep up with pending messages" not in caplog.text
+
+
+async def test_pending_msg_overflow_compacts_only_state_changes(
+    hass: HomeAssistant,
+    hass_ws_client: WebSocketGenerator,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Test the queue is not parsed unless a peak of state changes was queued."""
+    orig_handler = http.WebSocketHandler
+    setup_instance: http.WebSocketHandler | None = None
+
+    def instantiate_handler(*args):
+        nonlocal setup_instance
+        setup_instance = orig_handler(*args)
+        return setup_instance
+
+    with patch(
+        "homeassistant.components.websocket_api.http.WebSocketHandler",
+        instantiate_handler,
+    ):
+        await hass_ws_client()
+
+    instance: http.WebSocketHandler = cast(http.WebSocketHandler, setup_instance)
+
+    with (
+        patch("homeassistant.components.websocket_api.http.MAX_PENDING_MSG", 20),
+        patch("homeassistant.components.websocket_api.http.PENDING_MSG_PEAK", 5),
+        patch(
+            "homeassistant.components.websocket_api.http.compact_messages"
+        ) as compact_messages_mock,
+    ):
+        for idx in range(16):
+            instance._send_message(
+                {
+                    "type": "event",
+                    "event": {"event_type": "state_changed", "data": {"idx": idx}},
+                    "id": 1,
+                }
+            )
+        for idx in range(4):
+            instance._send_message(
+                b'{"type":"event","event":{"c":{"light.kitchen":'
+                b'{"+":{"s":"%d"}}}},"id":2}' % idx
+            )
+
+    assert not compact_messages_mock.called
+    assert "Client unable to keep up with pending messages" in caplog.text
+
+
 async def test_non_json_message(
     hass: HomeAssistant, websocket_client, caplog: pytest.LogCaptureFixture
 ) -> None:
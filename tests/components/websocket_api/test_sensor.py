@@ -1,14 +1,21 @@
 """Test cases for the API stream sensor."""
 
+from datetime import timedelta
+
 from homeassistant.auth.providers.homeassistant import HassAuthProvider
 from homeassistant.components.websocket_api.auth import TYPE_AUTH_REQUIRED
-from homeassistant.components.websocket_api.http import URL
+from homeassistant.components.websocket_api.const import SIGNAL_WEBSOCKET_QUEUE_CHANGED
+from homeassistant.components.websocket_api.http import DATA_HANDLERS, URL
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.dispatcher import async_dispatcher_send
 from homeassistant.setup import async_setup_component
+import homeassistant.util.dt as dt_util
 
 from .test_auth import test_auth_active_with_token
 
-from tests.typing import ClientSessionGenerator
+from tests.common import async_fire_time_changed
+from tests.typing import ClientSessionGenerator, WebSocketGenerator
 
 
 async def test_websocket_api(
@@ -45,3 +52,47 @@ async def test_websocket_api(
 
     state = hass.states.get("sensor.connected_clients")
     assert state.state == "0"
+
+
+async def test_connection_queue_sensors(
+    hass: HomeAssistant,
+    hass_ws_client: WebSocketGenerator,
+    entity_registry: er.EntityRegistry,
+) -> None:
+    """Test the sensors of the message queues of the connections."""
+    await async_setup_component(
+        hass, "sensor", {"sensor": {"platform": "websocket_api"}}
+    )
+    await hass.async_block_till_done()
+
+    state = hass.states.get("sensor.pending_messages")
+    assert state.state == "0"
+    assert "connections" not in state.attributes
+    assert (
+        entity_registry.async_get("sensor.pending_messages").unique_id
+        == "websocket_api_pending_messages"
+    )
+
+    websocket_client = await hass_ws_client()
+    (handler,) = hass.data[DATA_HANDLERS]
+    handler._message_queue.extend((b"{}", b"[1]"))
+    handler._coalesced_message_count = 5
+
+    # The sensors are not polled
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=60))
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.pending_messages").state == "0"
+
+    async_dispatcher_send(hass, SIGNAL_WEBSOCKET_QUEUE_CHANGED)
+    await hass.async_block_till_done()
+
+    assert hass.states.get("sensor.pending_messages").state == "2"
+    assert hass.states.get("sensor.pending_message_size").state == "5"
+    state = hass.states.get("sensor.coalesced_messages")
+    assert state.state == "5"
+    assert "connections" not in state.attributes
+
+    await websocket_client.close()
+    await hass.async_block_till_done()
+    assert not hass.data[DATA_HANDLERS]
+    assert hass.states.get("sensor.coalesced_messages").state == "0"
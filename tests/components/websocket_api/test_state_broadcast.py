@@ -0,0 +1,118 @@
+"""Test broadcasting state changes to websocket subscriptions."""
+
+from datetime import timedelta
+import logging
+from typing import Any
+from unittest.mock import Mock
+
+from homeassistant.components import websocket_api
+from homeassistant.components.websocket_api.const import (
+    COALESCE_STATES_RETRY_TIME,
+    PENDING_MSG_COALESCE_STATES,
+)
+from homeassistant.components.websocket_api.state_broadcast import (
+    async_get_state_broadcaster,
+)
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+import homeassistant.util.dt as dt_util
+from homeassistant.util.json import json_loads
+
+from tests.common import MockUser, async_fire_time_changed
+
+
+async def test_coalesce_state_changes_for_slow_client(
+    hass: HomeAssistant, hass_admin_user: MockUser
+) -> None:
+    """Test state changes are coalesced while a client falls behind."""
+    assert await async_setup_component(hass, websocket_api.DOMAIN, {})
+    hass.states.async_set("light.kitchen", "off", {"color": "red"})
+    hass.states.async_set("light.removed", "off")
+    sent: list[Any] = []
+    pending_message_count = 0
+    connection = websocket_api.ActiveConnection(
+        logging.getLogger(__name__), hass, sent.append, hass_admin_user, Mock()
+    )
+    connection.pending_message_count = lambda: pending_message_count
+    unsub = async_get_state_broadcaster(hass).async_subscribe(
+        connection, b"7", None, None
+    )
+
+    hass.states.async_set("light.kitchen", "on", {"color": "red"})
+    assert len(sent) == 1
+    assert json_loads(sent[0])["event"]["c"]["light.kitchen"]["+"]["s"] == "on"
+
+    pending_message_count = PENDING_MSG_COALESCE_STATES
+    hass.states.async_set("light.kitchen", "off", {"color": "red"})
+    hass.states.async_set("light.kitchen", "off", {"color": "blue"})
+    hass.states.async_set("light.added", "on")
+    hass.states.async_remove("light.removed")
+    hass.states.async_set("light.added_and_removed", "on")
+    hass.states.async_remove("light.added_and_removed")
+    assert len(sent) == 1
+
+    # The client has not caught up yet
+    now = dt_util.utcnow()
+    async_fire_time_changed(hass, now + timedelta(seconds=COALESCE_STATES_RETRY_TIME))
+    assert len(sent) == 1
+
+    pending_message_count = 0
+    async_fire_time_changed(
+        hass, now + timedelta(seconds=COALESCE_STATES_RETRY_TIME * 2)
+    )
+    assert len(sent) == 2
+    message = json_loads(sent[1])
+    assert message["id"] == 7
+    assert message["type"] == "event"
+    event = message["event"]
+    assert event.keys() == {"a", "c", "r"}
+    assert event["a"].keys() == {"light.added"}
+    assert event["c"]["light.kitchen"]["+"]["s"] == "off"
+    assert event["c"]["light.kitchen"]["+"]["a"] == {"color": "blue"}
+    assert event["r"] == ["light.removed"]
+
+    hass.states.async_set("light.kitchen", "on", {"color": "blue"})
+    assert len(sent) == 3
+
+    unsub()
+    assert EVENT_STATE_CHANGED not in hass.bus.async_listeners()
+
+
+async def test_subscriptions_share_listener(
+    hass: HomeAssistant, hass_admin_user: MockUser
+) -> None:
+    """Test subscriptions share a listener and the messages of state changes."""
+    assert await async_setup_component(hass, websocket_api.DOMAIN, {})
+    sent: list[Any] = []
+    connection = websocket_api.ActiveConnection(
+        logging.getLogger(__name__), hass, sent.append, hass_admin_user, Mock()
+    )
+    broadcaster = async_get_state_broadcaster(hass)
+    unsubs = [
+        broadcaster.async_subscribe(connection, b"1", None, None),
+        broadcaster.async_subscribe(connection, b"2", {"light.kitchen"}, None),
+        broadcaster.async_subscribe(
+            connection, b"3", None, lambda entity_id: entity_id.startswith("switch.")
+        ),
+    ]
+    assert hass.bus.async_listeners()[EVENT_STATE_CHANGED] == 1
+
+    hass.states.async_set("light.kitchen", "on")
+    hass.states.async_set("light.other", "on")
+    hass.states.async_set("switch.other", "on")
+
+    assert sorted(
+        (json_loads(message)["id"], *json_loads(message)["event"]["a"])
+        for message in sent
+    ) == [
+        (1, "light.kitchen"),
+        (1, "light.other"),
+        (1, "switch.other"),
+        (2, "light.kitchen"),
+        (3, "switch.other"),
+    ]
+
+    for unsub in unsubs:
+        unsub()
+    assert EVENT_STATE_CHANGED not in hass.bus.async_listeners()
@@ -29,6 +29,7 @@ from homeassistant.helpers import (
     entity_platform,
     entity_registry as er,
     issue_registry as ir,
+    service,
 )
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity import Entity, async_generate_entity_id
@@ -37,6 +38,12 @@ from homeassistant.helpers.entity_component import (
     EntityComponent,
 )
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.trace import (
+    TraceElement,
+    trace_stack_cv,
+    trace_stack_pop,
+    trace_stack_push,
+)
 from homeassistant.helpers.typing import ConfigType, DiscoveryInfoType
 import homeassistant.util.dt as dt_util
 
@@ -1580,6 +1587,139 @@ async def test_platforms_sharing_services(hass: HomeAssistant) -> None:
     assert entity2 in entities
 
 
+async def test_batch_service_handler(hass: HomeAssistant) -> None:
+    """Test a call for several entities of a platform is handled in a batch."""
+    entity_platform1 = MockEntityPlatform(
+        hass, domain="mock_integration", platform_name="mock_platform", platform=None
+    )
+    entity1 = MockEntity(entity_id="mock_integration.entity_1")
+    entity2 = MockEntity(entity_id="mock_integration.entity_2")
+    await entity_platform1.async_add_entities([entity1, entity2])
+
+    entity_platform2 = MockEntityPlatform(
+        hass, domain="mock_integration", platform_name="other_platform", platform=None
+    )
+    entity3 = MockEntity(entity_id="mock_integration.entity_3")
+    await entity_platform2.async_add_entities([entity3])
+
+    entities = []
+    entity_data = []
+    batches = []
+    batch_data = []
+
+    @callback
+    def handle_service(entity, data):
+        entities.append(entity)
+        entity_data.append(data)
+
+    async def handle_batch(batch_entities: list[Entity], call: ServiceCall) -> None:
+        assert call.data["some"] == "data"
+        batches.append(batch_entities)
+        batch_data.append(call)
+
+    entity_platform1.async_register_batch_service_handler("hello", handle_batch)
+    service.async_register_entity_service(
+        hass,
+        "mock_integration",
+        "hello",
+        entities=entity_platform1.domain_entities,
+        func=handle_service,
+        job_type=None,
+        schema={vol.Optional("some"): str},
+    )
+
+    element = TraceElement({}, "action/0")
+    trace_stack_push(trace_stack_cv, element)
+    await hass.services.async_call(
+        "mock_integration",
+        "hello",
+        {"some": "data"},
+        target={"entity_id": "all"},
+        blocking=True,
+    )
+    trace_stack_pop(trace_stack_cv)
+
+    assert len(batches) == 1
+    assert set(batches[0]) == {entity1, entity2}
+    assert entities == [entity3]
+    # The batch handler is passed the same service call as the entities
+    assert batch_data == entity_data
+    assert isinstance(batch_data[0], ServiceCall)
+    assert element.as_dict()["result"]["entity_call_times"].keys() == {
+        "mock_integration.entity_1",
+        "mock_integration.entity_2",
+        "mock_integration.entity_3",
+    }
+
+    # A batch is only used for several entities of the platform
+    batches.clear()
+    entities.clear()
+    await hass.services.async_call(
+        "mock_integration",
+        "hello",
+        target={
+            "entity_id": ["mock_integration.entity_1", "mock_integration.entity_3"]
+        },
+        blocking=True,
+    )
+
+    assert batches == []
+    assert set(entities) == {entity1, entity3}
+
+
+async def test_batch_service_handler_entity_method(hass: HomeAssistant) -> None:
+    """Test a batch handler is passed the data of the entity methods."""
+
+    class MockHelloEntity(MockEntity):
+        """Mock entity with a service method."""
+
+        async def async_hello(self, **kwargs: Any) -> None:
+            """Handle the service."""
+            entity_data.append(kwargs)
+
+    entity_platform1 = MockEntityPlatform(
+        hass, domain="mock_integration", platform_name="mock_platform", platform=None
+    )
+    entity1 = MockHelloEntity(entity_id="mock_integration.entity_1")
+    entity2 = MockHelloEntity(entity_id="mock_integration.entity_2")
+    await entity_platform1.async_add_entities([entity1, entity2])
+
+    entity_platform2 = MockEntityPlatform(
+        hass, domain="mock_integration", platform_name="other_platform", platform=None
+    )
+    entity3 = MockHelloEntity(entity_id="mock_integration.entity_3")
+    await entity_platform2.async_add_entities([entity3])
+
+    entity_data: list[dict[str, Any]] = []
+    batch_data: list[dict[str, Any]] = []
+
+    async def handle_batch(batch_entities: list[Entity], data: dict[str, Any]) -> None:
+        batch_data.append(data)
+
+    entity_platform1.async_register_batch_service_handler("hello", handle_batch)
+    service.async_register_entity_service(
+        hass,
+        "mock_integration",
+        "hello",
+        entities=entity_platform1.domain_entities,
+        func="async_hello",
+        job_type=None,
+        schema={vol.Optional("some"): str},
+    )
+
+    await hass.services.async_call(
+        "mock_integration",
+        "hello",
+        {"some": "data"},
+        target={"entity_id": "all", "area_id": "kitchen"},
+        blocking=True,
+    )
+
+    # The entity service fields are removed from the data of the batch
+    assert entity_data == [{"some": "data"}]
+    assert batch_data == [{"some": "data"}]
+
+
 async def test_register_entity_service_response_data(hass: HomeAssistant) -> None:
     """Test an entity service that does supports response data."""
 
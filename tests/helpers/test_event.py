@@ -30,6 +30,7 @@ from homeassistant.helpers.event import (
     TrackTemplate,
     TrackTemplateResult,
     async_call_later,
+    async_get_template_render_scheduler,
     async_track_device_registry_updated_event,
     async_track_entity_registry_updated_event,
     async_track_point_in_time,
@@ -3119,6 +3120,208 @@ async def test_track_template_result_refresh_cancel(hass: HomeAssistant) -> None
     assert refresh_runs == ["duck"]
 
 
+async def test_async_track_template_result_analyze_templates(
+    hass: HomeAssistant,
+) -> None:
+    """Test the listeners of templates are set up without rendering them."""
+    template_1 = Template("{{ states('switch.test') }}", hass)
+    template_2 = Template("{{ states.binary_sensor | count }}", hass)
+
+    refresh_runs = []
+
+    @ha.callback
+    def refresh_listener(
+        event: Event[EventStateChangedData] | None,
+        updates: list[TrackTemplateResult],
+    ) -> None:
+        refresh_runs.append(updates)
+
+    info = async_track_template_result(
+        hass,
+        [TrackTemplate(template_1, None), TrackTemplate(template_2, None)],
+        refresh_listener,
+        analyze_templates=True,
+    )
+
+    assert template_1._renders == 0
+    assert template_2._renders > 0
+    assert info.listeners == {
+        "all": False,
+        "domains": {"binary_sensor"},
+        "entities": {"switch.test"},
+        "time": False,
+    }
+
+    info.async_refresh()
+    assert refresh_runs == [
+        [
+            TrackTemplateResult(template_1, None, "unknown"),
+            TrackTemplateResult(template_2, None, 0),
+        ]
+    ]
+
+    refresh_runs = []
+    hass.states.async_set("switch.test", "on")
+    await hass.async_block_till_done()
+
+    assert refresh_runs == [[TrackTemplateResult(template_1, "unknown", "on")]]
+
+
+async def test_async_track_template_result_coalesce_renders(
+    hass: HomeAssistant,
+) -> None:
+    """Test the renders of state changes in a loop iteration are coalesced."""
+    template_1 = Template("{{ states('switch.test') }}", hass)
+    template_2 = Template("{{ states('switch.test') }}", hass)
+    template_3 = Template("{{ states('sensor.test') }}", hass)
+
+    refresh_runs = []
+
+    @ha.callback
+    def refresh_listener(
+        event: Event[EventStateChangedData] | None,
+        updates: list[TrackTemplateResult],
+    ) -> None:
+        refresh_runs.append((event and event.data["entity_id"], updates))
+
+    info_1 = async_track_template_result(
+        hass,
+        [TrackTemplate(template_1, None), TrackTemplate(template_3, None)],
+        refresh_listener,
+        coalesce_renders=True,
+    )
+    info_2 = async_track_template_result(
+        hass, [TrackTemplate(template_2, None)], refresh_listener, coalesce_renders=True
+    )
+    stats = async_get_template_render_scheduler(hass).stats
+    assert stats["{{ states('switch.test') }}"].renders == 2
+
+    hass.states.async_set("switch.test", "on")
+    hass.states.async_set("sensor.test", "1")
+    hass.states.async_set("switch.test", "off")
+    hass.states.async_set("switch.test", "on")
+    assert refresh_runs == []
+    await hass.async_block_till_done()
+
+    assert refresh_runs == [
+        ("sensor.test", [TrackTemplateResult(template_3, None, 1)]),
+        ("switch.test", [TrackTemplateResult(template_1, None, "on")]),
+        ("switch.test", [TrackTemplateResult(template_2, None, "on")]),
+    ]
+    # The template is rendered once for both trackers
+    assert stats["{{ states('switch.test') }}"].renders == 3
+    assert stats["{{ states('switch.test') }}"].render_time > 0
+
+    refresh_runs.clear()
+    hass.states.async_set("switch.test", "off")
+    info_2.async_remove()
+    await hass.async_block_till_done()
+
+    assert refresh_runs == [
+        ("switch.test", [TrackTemplateResult(template_1, "on", "off")])
+    ]
+
+    info_1.async_remove()
+
+
+async def test_async_track_template_result_without_coalesce_renders(
+    hass: HomeAssistant,
+) -> None:
+    """Test templates are rendered for each state change unless coalesced."""
+    template = Template("{{ states('switch.test') }}", hass)
+
+    refresh_runs = []
+
+    @ha.callback
+    def refresh_listener(
+        event: Event[EventStateChangedData] | None,
+        updates: list[TrackTemplateResult],
+    ) -> None:
+        refresh_runs.append([update.result for update in updates])
+
+    info = async_track_template_result(
+        hass, [TrackTemplate(template, None)], refresh_listener
+    )
+    stats = async_get_template_render_scheduler(hass).stats
+    renders = stats["{{ states('switch.test') }}"].renders
+
+    hass.states.async_set("switch.test", "on")
+    hass.states.async_set("switch.test", "off")
+    hass.states.async_set("switch.test", "on")
+    await hass.async_block_till_done()
+
+    # The template is rendered once for each state change, the last
+    # two renders see the same state as the first one
+    assert stats["{{ states('switch.test') }}"].renders == renders + 3
+    assert refresh_runs == [["on"]]
+
+    info.async_remove()
+
+
+async def test_template_render_scheduler_shared_renders(
+    hass: HomeAssistant,
+) -> None:
+    """Test renders are only shared with the same source and options."""
+    hass.states.async_set("sensor.test", "1")
+    scheduler = async_get_template_render_scheduler(hass)
+    scheduler._shared_renders = {}
+    template_1 = Template("{{ states('sensor.test') }}", hass)
+    template_2 = Template("{{ states('sensor.test') }}", hass)
+
+    info = scheduler.async_render_to_info(template_1, None, True)
+    assert info.result() == 1
+    assert scheduler.async_render_to_info(template_2, None, True) is info
+    info = scheduler.async_render_to_info(template_2, None, True, parse_result=False)
+    assert info.result() == "1"
+
+    template_3 = Template("{{ states('sensor.test') ~ suffix }}", hass)
+    template_4 = Template("{{ states('sensor.test') ~ suffix }}", hass)
+    info = scheduler.async_render_to_info(template_3, {"suffix": "a"}, True)
+    assert info.result() == "1a"
+    info = scheduler.async_render_to_info(template_4, {"suffix": "b"}, True)
+    assert info.result() == "1b"
+    scheduler._shared_renders = None
+
+
+async def test_async_track_template_result_min_render_interval(
+    hass: HomeAssistant,
+) -> None:
+    """Test the renders of a template are limited by its minimum interval."""
+    template = Template("{{ states('switch.test') }}", hass)
+
+    refresh_runs = []
+
+    @ha.callback
+    def refresh_listener(
+        event: Event[EventStateChangedData] | None,
+        updates: list[TrackTemplateResult],
+    ) -> None:
+        refresh_runs.append(updates.pop().result)
+
+    info = async_track_template_result(
+        hass,
+        [TrackTemplate(template, None, min_render_interval=0.1)],
+        refresh_listener,
+    )
+    hass.states.async_set("switch.test", "on")
+    await hass.async_block_till_done()
+    assert refresh_runs == ["on"]
+
+    hass.states.async_set("switch.test", "off")
+    await hass.async_block_till_done()
+    assert refresh_runs == ["on"]
+
+    next_time = dt_util.utcnow() + timedelta(seconds=0.125)
+    with patch(
+        "homeassistant.helpers.ratelimit.time.time", return_value=next_time.timestamp()
+    ):
+        async_fire_time_changed(hass, next_time)
+        await hass.async_block_till_done()
+    assert refresh_runs == ["on", "off"]
+
+    info.async_remove()
+
+
 async def test_async_track_template_result_multiple_templates(
     hass: HomeAssistant,
 ) -> None:
@@ -0,0 +1,341 @@
+"""Tests for the snapshots of data loaded from storage."""
+
+from datetime import datetime
+import io
+import json
+from pathlib import Path
+import pickle
+import threading
+from typing import Any
+
+import pytest
+
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import HomeAssistant, State
+from homeassistant.helpers import (
+    area_registry as ar,
+    device_registry as dr,
+    entity_registry as er,
+    restore_state,
+)
+from homeassistant.helpers.json import json_bytes
+from homeassistant.helpers.snapshot import (
+    SkipSnapshotError,
+    StoreSnapshot,
+    _SnapshotPickler,
+)
+from homeassistant.helpers.storage import Store
+from homeassistant.util.json import json_loads
+
+from tests.common import MockConfigEntry
+
+MOCK_KEY = "test.snapshot"
+MOCK_DATA = {"items": [{"id": "abc", "name": "Item"}]}
+
+
+class _Item:
+    """An item of a snapshot."""
+
+    def __init__(self, name: str) -> None:
+        """Initialize the item."""
+        self.name = name
+
+
+class _ChangedItem:
+    """The item of a snapshot with a new field."""
+
+    def __init__(self, name: str) -> None:
+        """Initialize the item."""
+        self.name = name
+        self.icon = None
+
+
+def _build(data: dict[str, list[dict[str, Any]]]) -> dict[str, str]:
+    """Return the names of the items by id."""
+    return {item["id"]: item["name"] for item in data["items"]}
+
+
+def _build_upper(data: dict[str, list[dict[str, Any]]]) -> dict[str, str]:
+    """Return the upper case names of the items by id."""
+    return {item["id"]: item["name"].upper() for item in data["items"]}
+
+
+def _write_store(path: str, data: dict[str, Any], version: int = 1) -> None:
+    """Write the JSON file of a store."""
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    Path(path).write_text(
+        json.dumps(
+            {"version": version, "minor_version": 1, "key": MOCK_KEY, "data": data}
+        )
+    )
+
+
+def _pickle_roundtrip(data: Any) -> Any:
+    """Return the data after pickling it like a snapshot."""
+    buffer = io.BytesIO()
+    _SnapshotPickler(buffer, pickle.HIGHEST_PROTOCOL).dump(data)
+    return pickle.loads(buffer.getvalue())
+
+
+@pytest.fixture
+def store(hass: HomeAssistant, tmp_path: Path) -> Store[dict[str, Any]]:
+    """Return a store in a temporary config directory."""
+    hass.config.config_dir = str(tmp_path)
+    return Store(hass, 1, MOCK_KEY)
+
+
+async def _async_close(hass: HomeAssistant) -> None:
+    """Fire the close event and wait for the snapshots to be written."""
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_CLOSE)
+    await hass.async_block_till_done()
+
+
+async def test_snapshot_is_built_when_closing(
+    hass: HomeAssistant, store: Store[dict[str, Any]]
+) -> None:
+    """Test a snapshot is built from the JSON file and used when it is unchanged."""
+    snapshot = StoreSnapshot(hass, store, _build, ())
+    assert await snapshot.async_load() is None
+
+    _write_store(store.path, MOCK_DATA)
+    await _async_close(hass)
+    assert Path(snapshot.path).is_file()
+
+    assert await StoreSnapshot(hass, store, _build, ()).async_load() == {"abc": "Item"}
+
+    # The JSON file is the source of truth
+    _write_store(store.path, {"items": []})
+    assert await StoreSnapshot(hass, store, _build, ()).async_load() is None
+
+    # The snapshot is rebuilt
+    StoreSnapshot(hass, store, _build, ())
+    await _async_close(hass)
+    assert await StoreSnapshot(hass, store, _build, ()).async_load() == {}
+
+    # The snapshot is removed with the JSON file
+    Path(store.path).unlink()
+    StoreSnapshot(hass, store, _build, ())
+    await _async_close(hass)
+    assert not Path(snapshot.path).exists()
+
+
+async def test_snapshot_is_not_used_if_invalid(
+    hass: HomeAssistant, store: Store[dict[str, Any]]
+) -> None:
+    """Test a snapshot is not used if its checksum or version does not match."""
+    _write_store(store.path, MOCK_DATA)
+    snapshot = StoreSnapshot(hass, store, _build, ())
+    await _async_close(hass)
+    contents = Path(snapshot.path).read_bytes()
+
+    Path(snapshot.path).write_bytes(contents[:-1] + b"\x00")
+    assert await snapshot.async_load() is None
+
+    Path(snapshot.path).write_bytes(b"not a snapshot")
+    assert await snapshot.async_load() is None
+
+    Path(snapshot.path).write_bytes(contents)
+    assert await snapshot.async_load() == {"abc": "Item"}
+    assert (
+        await StoreSnapshot(hass, Store(hass, 2, MOCK_KEY), _build, ()).async_load()
+        is None
+    )
+
+
+async def test_snapshot_is_not_built_for_other_version(
+    hass: HomeAssistant, store: Store[dict[str, Any]]
+) -> None:
+    """Test no snapshot is built if the JSON file needs to be migrated."""
+    _write_store(store.path, MOCK_DATA, version=0)
+    snapshot = StoreSnapshot(hass, store, _build, ())
+    await _async_close(hass)
+
+    assert not Path(snapshot.path).exists()
+
+
+async def test_snapshot_is_not_used_if_classes_changed(
+    hass: HomeAssistant, store: Store[dict[str, Any]]
+) -> None:
+    """Test a snapshot is not used and rebuilt if the snapshotted classes changed."""
+    _write_store(store.path, MOCK_DATA)
+    StoreSnapshot(hass, store, _build, (_Item,))
+    await _async_close(hass)
+    assert await StoreSnapshot(hass, store, _build, (_Item,)).async_load() == {
+        "abc": "Item"
+    }
+
+    # The fields of the class change
+    code = _Item.__init__.__code__
+    _Item.__init__.__code__ = _ChangedItem.__init__.__code__
+    try:
+        assert await StoreSnapshot(hass, store, _build, (_Item,)).async_load() is None
+
+        # The snapshot is rebuilt although the JSON file did not change
+        StoreSnapshot(hass, store, _build, (_Item,))
+        await _async_close(hass)
+        assert await StoreSnapshot(hass, store, _build, (_Item,)).async_load() == {
+            "abc": "Item"
+        }
+    finally:
+        _Item.__init__.__code__ = code
+
+
+async def test_snapshot_is_not_used_if_build_changed(
+    hass: HomeAssistant, store: Store[dict[str, Any]]
+) -> None:
+    """Test a snapshot is not used if the code of the build function changed."""
+    _write_store(store.path, MOCK_DATA)
+    StoreSnapshot(hass, store, _build, ())
+    await _async_close(hass)
+
+    code = _build.__code__
+    _build.__code__ = _build_upper.__code__
+    try:
+        assert await StoreSnapshot(hass, store, _build, ()).async_load() is None
+
+        StoreSnapshot(hass, store, _build, ())
+        await _async_close(hass)
+        assert await StoreSnapshot(hass, store, _build, ()).async_load() == {
+            "abc": "ITEM"
+        }
+    finally:
+        _build.__code__ = code
+
+
+async def test_snapshot_is_skipped(
+    hass: HomeAssistant, store: Store[dict[str, Any]]
+) -> None:
+    """Test no snapshot is built if the build function skips it."""
+    _write_store(store.path, MOCK_DATA)
+    snapshot = StoreSnapshot(hass, store, _build, ())
+    await _async_close(hass)
+    assert Path(snapshot.path).is_file()
+
+    def build(data: dict[str, list[dict[str, Any]]]) -> dict[str, str]:
+        raise SkipSnapshotError("Invalid item")
+
+    _write_store(store.path, {"items": []})
+    StoreSnapshot(hass, store, build, ())
+    await _async_close(hass)
+    assert not Path(snapshot.path).exists()
+
+
+async def test_snapshot_is_built_in_executor(
+    hass: HomeAssistant, store: Store[dict[str, Any]]
+) -> None:
+    """Test the snapshot is built outside of the event loop."""
+    loop_thread_ids: list[int] = []
+
+    def build(data: dict[str, list[dict[str, Any]]]) -> dict[str, str]:
+        loop_thread_ids.append(threading.get_ident())
+        return _build(data)
+
+    _write_store(store.path, MOCK_DATA)
+    StoreSnapshot(hass, store, build, ())
+    await _async_close(hass)
+
+    assert loop_thread_ids
+    assert loop_thread_ids[0] != threading.get_ident()
+
+
+async def test_snapshot_of_registries(
+    hass: HomeAssistant,
+    area_registry: ar.AreaRegistry,
+    device_registry: dr.DeviceRegistry,
+    entity_registry: er.EntityRegistry,
+) -> None:
+    """Test the entries of the registries can be snapshotted."""
+    created_at = datetime(2024, 1, 1).isoformat()
+    entities = entity_registry._entries_from_data(
+        {
+            "entities": [
+                {
+                    "aliases": ["alias"],
+                    "area_id": "kitchen",
+                    "categories": {},
+                    "capabilities": {"max": 100},
+                    "config_entry_id": "entry",
+                    "created_at": created_at,
+                    "device_class": None,
+                    "device_id": "device",
+                    "disabled_by": "user",
+                    "entity_category": "config",
+                    "entity_id": "light.kitchen",
+                    "hidden_by": None,
+                    "icon": None,
+                    "id": "id",
+                    "has_entity_name": True,
+                    "labels": ["label"],
+                    "modified_at": created_at,
+                    "name": None,
+                    "options": {"light": {"option": True}},
+                    "original_device_class": None,
+                    "original_icon": None,
+                    "original_name": "Kitchen",
+                    "platform": "hue",
+                    "supported_features": 0,
+                    "translation_key": None,
+                    "unique_id": "1234",
+                    "previous_unique_id": None,
+                    "unit_of_measurement": None,
+                }
+            ],
+            "deleted_entities": [],
+        }
+    )
+    loaded_entities, _ = _pickle_roundtrip(entities)
+    assert loaded_entities == entities[0]
+    assert loaded_entities["light.kitchen"].options == {"light": {"option": True}}
+    assert loaded_entities.get_entry("id") == entities[0]["light.kitchen"]
+    assert loaded_entities.get_entries_for_device_id("device", True) == [
+        entities[0]["light.kitchen"]
+    ]
+
+    config_entry = MockConfigEntry()
+    config_entry.add_to_hass(hass)
+    device_entry = device_registry.async_get_or_create(
+        config_entry_id=config_entry.entry_id,
+        identifiers={("hue", "1234")},
+        connections={(dr.CONNECTION_NETWORK_MAC, "12:34:56:ab:cd:ef")},
+    )
+    devices, _ = _pickle_roundtrip((device_registry.devices, None))
+    assert devices.get_entry({("hue", "1234")}, None) == device_entry
+
+    area_entry = area_registry.async_create("Kitchen")
+    areas = _pickle_roundtrip(area_registry.areas)
+    assert areas.get_by_name("Kitchen") == area_entry
+
+
+async def test_snapshot_of_invalid_registry_entries(
+    entity_registry: er.EntityRegistry, caplog: pytest.LogCaptureFixture
+) -> None:
+    """Test no snapshot is built of an entity registry with invalid entries."""
+    data = {
+        "entities": [{"entity_id": "invalid", "platform": "hue", "unique_id": "1"}],
+        "deleted_entities": [],
+    }
+    with pytest.raises(SkipSnapshotError):
+        entity_registry._entries_from_data(data, snapshot=True)
+    assert "could not be loaded" not in caplog.text
+
+    entities, _ = entity_registry._entries_from_data(data)
+    assert not entities
+    assert "Entity registry entry 'invalid' from integration hue" in caplog.text
+
+
+async def test_snapshot_of_restore_state(hass: HomeAssistant) -> None:
+    """Test the stored states can be snapshotted."""
+    stored_state = restore_state.StoredState(
+        State("sensor.temperature", "21", {"unit_of_measurement": "°C"}),
+        restore_state.RestoredExtraData({"native_value": 21}),
+        datetime(2024, 1, 1),
+    )
+    last_states = restore_state.RestoreStateData._states_from_data(
+        [json_loads(json_bytes(stored_state.as_dict()))]
+    )
+
+    loaded = _pickle_roundtrip(last_states)["sensor.temperature"]
+
+    assert loaded.state.as_dict() == last_states["sensor.temperature"].state.as_dict()
+    assert loaded.extra_data.as_dict() == {"native_value": 21}
+    assert loaded.last_seen == last_states["sensor.temperature"].last_seen
@@ -4,6 +4,7 @@ import asyncio
 from datetime import timedelta
 import json
 import os
+from pathlib import Path
 from typing import Any, NamedTuple
 from unittest.mock import Mock, patch
 
@@ -1180,3 +1181,214 @@ async def test_storage_concurrent_load(hass: HomeAssistant) -> None:
         )
         for load in loads:
             assert load == "data"
+
+
+async def _async_flush_write_behind(hass: HomeAssistant, flushes: int = 1) -> None:
+    """Fire the timers of the delayed writes and of the flushes."""
+    for _ in range(flushes):
+        async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=1))
+        await hass.async_block_till_done()
+        async_fire_time_changed(
+            hass,
+            dt_util.utcnow() + timedelta(seconds=storage.WRITE_BEHIND_FLUSH_DELAY + 1),
+        )
+        await hass.async_block_till_done()
+
+
+async def test_write_behind_batches_writes(tmp_path: Path) -> None:
+    """Test the writes of all stores are batched and unchanged data is skipped."""
+    async with async_test_home_assistant(config_dir=str(tmp_path)) as hass:
+        storage.async_enable_write_behind(hass)
+        store = storage.Store(hass, MOCK_VERSION, MOCK_KEY)
+        store2 = storage.Store(hass, MOCK_VERSION, "storage-test-2", atomic_writes=True)
+        store.async_delay_save(lambda: MOCK_DATA)
+        store2.async_delay_save(lambda: MOCK_DATA2)
+
+        async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=1))
+        await hass.async_block_till_done()
+        stats = storage.async_get_write_stats(hass)
+        assert stats is not None
+        assert stats.save_requests == 2
+        assert stats.flushes == 0
+        assert not os.path.exists(store.path)
+
+        with patch.object(
+            hass, "async_add_executor_job", wraps=hass.async_add_executor_job
+        ) as mock_executor_job:
+            await _async_flush_write_behind(hass)
+        assert mock_executor_job.call_count == 1
+
+        assert json.loads(Path(store.path).read_text())["data"] == MOCK_DATA
+        assert json.loads(Path(store2.path).read_text())["data"] == MOCK_DATA2
+        assert stats.writes == 2
+        assert stats.fsyncs == 1
+        assert stats.flushes == 1
+        assert stats.max_flush_time == stats.average_flush_time
+
+        mtime = os.stat(store.path).st_mtime_ns
+        store.async_delay_save(lambda: MOCK_DATA)
+        await _async_flush_write_behind(hass)
+        assert os.stat(store.path).st_mtime_ns == mtime
+        assert stats.save_requests == 3
+        assert stats.writes == 2
+        assert stats.unchanged == 1
+        assert stats.write_amplification == pytest.approx(2 / 3)
+
+        # A removed file is written again
+        await store.async_remove()
+        store.async_delay_save(lambda: MOCK_DATA)
+        await _async_flush_write_behind(hass)
+        assert json.loads(Path(store.path).read_text())["data"] == MOCK_DATA
+        assert stats.writes == 3
+
+        await hass.async_stop(force=True)
+
+
+async def test_write_behind_fsync_budget(tmp_path: Path) -> None:
+    """Test atomic writes over the fsync budget are deferred until the final write."""
+    async with async_test_home_assistant(config_dir=str(tmp_path)) as hass:
+        storage.async_enable_write_behind(hass)
+        stores = [
+            storage.Store(
+                hass, MOCK_VERSION, f"storage-test-{index}", atomic_writes=True
+            )
+            for index in range(3)
+        ]
+        for store in stores:
+            store.async_delay_save(lambda: MOCK_DATA)
+
+        with patch.object(storage, "WRITE_BEHIND_FSYNC_BUDGET", 2):
+            await _async_flush_write_behind(hass, 2)
+            deferred = [store for store in stores if not os.path.exists(store.path)]
+            assert len(deferred) == 1
+
+            hass.set_state(CoreState.final_write)
+            hass.bus.async_fire(EVENT_HOMEASSISTANT_FINAL_WRITE)
+            await hass.async_block_till_done()
+
+        assert json.loads(Path(deferred[0].path).read_text())["data"] == MOCK_DATA
+        stats = storage.async_get_write_stats(hass)
+        assert stats is not None
+        assert stats.fsyncs == 3
+        assert stats.deferred_fsyncs == 2
+        assert stats.flushes == 2
+
+        # Writes are flushed right away in the final write state
+        stores[0].async_delay_save(lambda: MOCK_DATA2, 1)
+        hass.bus.async_fire(EVENT_HOMEASSISTANT_FINAL_WRITE)
+        await hass.async_block_till_done()
+        assert json.loads(Path(stores[0].path).read_text())["data"] == MOCK_DATA2
+        assert stats.save_requests == 4
+        assert stats.flushes == 3
+
+        await hass.async_stop(force=True)
+
+
+async def test_write_behind_max_deferral(tmp_path: Path) -> None:
+    """Test atomic writes deferred for too long are written over the fsync budget."""
+    async with async_test_home_assistant(config_dir=str(tmp_path)) as hass:
+        storage.async_enable_write_behind(hass)
+        stores = [
+            storage.Store(
+                hass, MOCK_VERSION, f"storage-test-{index}", atomic_writes=True
+            )
+            for index in range(2)
+        ]
+        for store in stores:
+            store.async_delay_save(lambda: MOCK_DATA)
+
+        with (
+            patch.object(storage, "WRITE_BEHIND_FSYNC_BUDGET", 1),
+            patch.object(storage, "WRITE_BEHIND_MAX_DEFERRAL", 0.1),
+        ):
+            await _async_flush_write_behind(hass)
+            deferred = [store for store in stores if not os.path.exists(store.path)]
+            assert len(deferred) == 1
+
+            # Newer data does not restart the deferral
+            deferred[0].async_delay_save(lambda: MOCK_DATA2)
+            await asyncio.sleep(0.1)
+            await _async_flush_write_behind(hass)
+
+        assert json.loads(Path(deferred[0].path).read_text())["data"] == MOCK_DATA2
+        stats = storage.async_get_write_stats(hass)
+        assert stats is not None
+        assert stats.fsyncs == 2
+        assert stats.deferred_fsyncs == 1
+
+        await hass.async_stop(force=True)
+
+
+async def test_write_behind_load_pending_write(tmp_path: Path) -> None:
+    """Test a store with a pending write loads the data of the write."""
+    async with async_test_home_assistant(config_dir=str(tmp_path)) as hass:
+        storage.async_enable_write_behind(hass)
+        store = storage.Store(hass, MOCK_VERSION, MOCK_KEY)
+        await store.async_save(MOCK_DATA)
+        assert not os.path.exists(store.path)
+
+        assert await store.async_load() == MOCK_DATA
+        # A store with the same key, like after reloading an integration
+        assert (
+            await storage.Store(hass, MOCK_VERSION, MOCK_KEY).async_load() == MOCK_DATA
+        )
+
+        # Saving again does not wait for the pending write
+        await store.async_save(MOCK_DATA2)
+        assert await store.async_load() == MOCK_DATA2
+
+        # The data of a running flush is loaded
+        flushing = asyncio.Event()
+        flush_done = asyncio.Event()
+        original_executor_job = hass.async_add_executor_job
+
+        async def _slow_executor_job(target, *args):
+            flushing.set()
+            await flush_done.wait()
+            return await original_executor_job(target, *args)
+
+        with patch.object(hass, "async_add_executor_job", _slow_executor_job):
+            async_fire_time_changed(
+                hass,
+                dt_util.utcnow()
+                + timedelta(seconds=storage.WRITE_BEHIND_FLUSH_DELAY + 1),
+            )
+            await flushing.wait()
+            assert (
+                await storage.Store(hass, MOCK_VERSION, MOCK_KEY).async_load()
+                == MOCK_DATA2
+            )
+            flush_done.set()
+            await hass.async_block_till_done()
+
+        assert json.loads(Path(store.path).read_text())["data"] == MOCK_DATA2
+        stats = storage.async_get_write_stats(hass)
+        assert stats is not None
+        assert stats.save_requests == 2
+        assert stats.writes == 1
+
+        await hass.async_stop(force=True)
+
+
+async def test_write_behind_write_error(
+    tmp_path: Path, caplog: pytest.LogCaptureFixture
+) -> None:
+    """Test errors of batched writes are logged by the store."""
+    async with async_test_home_assistant(config_dir=str(tmp_path)) as hass:
+        storage.async_enable_write_behind(hass)
+        store = storage.Store(hass, MOCK_VERSION, MOCK_KEY)
+        store.async_delay_save(lambda: {"bad": object()})
+        await _async_flush_write_behind(hass)
+
+        assert f"Error writing config for {MOCK_KEY}" in caplog.text
+        assert not os.path.exists(store.path)
+        stats = storage.async_get_write_stats(hass)
+        assert stats is not None
+        assert stats.writes == 0
+
+        await hass.async_stop(force=True)
+
+
+async def test_write_stats_without_write_behind(hass: HomeAssistant) -> None:
+    """Test there are no write statistics if the writes are not batched."""
+    assert storage.async_get_write_stats(hass) is None
@@ -31,6 +31,7 @@ from homeassistant.const import (
     UnitOfSpeed,
     UnitOfTemperature,
     UnitOfVolume,
+    __version__,
 )
 from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import TemplateError
@@ -5147,8 +5148,9 @@ def test_iif(hass: HomeAssistant) -> None:
     assert tpl.async_render() == "no"
 
 
-async def test_cache_garbage_collection() -> None:
-    """Test caching a template."""
+async def test_compiled_template_cache() -> None:
+    """Test templates with the same source share the compiled code."""
+    template.COMPILED_TEMPLATE_CACHE.clear()
     template_string = (
         "{% set dict = {'foo': 'x&y', 'bar': 42} %} {{ dict | urlencode }}"
     )
@@ -5156,18 +5158,281 @@ async def test_cache_garbage_collection() -> None:
         (template_string),
     )
     tpl.ensure_valid()
-    assert template._NO_HASS_ENV.template_cache.get(template_string)
+    assert template.COMPILED_TEMPLATE_CACHE.stats == {
+        "hits": 0,
+        "misses": 1,
+        "evictions": 0,
+        "size": 1,
+        "max_size": template.COMPILED_TEMPLATE_CACHE_SIZE,
+    }
 
     tpl2 = template.Template(
         (template_string),
     )
     tpl2.ensure_valid()
-    assert template._NO_HASS_ENV.template_cache.get(template_string)
+    assert tpl2._compiled_code is tpl._compiled_code
+    assert template.COMPILED_TEMPLATE_CACHE.stats["hits"] == 1
 
+    # The compiled code outlives the templates
     del tpl
-    assert template._NO_HASS_ENV.template_cache.get(template_string)
     del tpl2
-    assert not template._NO_HASS_ENV.template_cache.get(template_string)
+    assert template.COMPILED_TEMPLATE_CACHE.get((template_string, False, False, False))
+
+    cache = template.CompiledTemplateCache(1)
+    cache.set(
+        ("{{ 1 }}", False, False, True),
+        template.CompiledTemplate(compile("1", "<test>", "eval"), None, None),
+    )
+    cache.set(
+        ("{{ 2 }}", False, False, True),
+        template.CompiledTemplate(compile("2", "<test>", "eval"), None, None),
+    )
+    assert cache.get(("{{ 1 }}", False, False, True)) is None
+    assert cache.stats["evictions"] == 1
+    assert cache.stats["size"] == 1
+
+
+async def test_compiled_template_bytecode_cache(
+    hass: HomeAssistant, hass_storage: dict[str, Any]
+) -> None:
+    """Test compiled templates are saved and loaded again."""
+    template.COMPILED_TEMPLATE_CACHE.clear()
+    await template.async_load_bytecode_cache(hass)
+    tpl = template.Template("{{ 40 + states('sensor.count') | int(0) }}", hass)
+    assert tpl.async_render() == 40
+    await hass.async_block_till_done()
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=61))
+    await hass.async_block_till_done()
+    data = hass_storage["core.template_bytecode"]["data"]
+    assert [entry[:4] for entry in data["templates"]] == [
+        ["{{ 40 + states('sensor.count') | int(0) }}", False, False, True]
+    ]
+
+    template.COMPILED_TEMPLATE_CACHE.clear()
+    await template.async_load_bytecode_cache(hass)
+    assert template.COMPILED_TEMPLATE_CACHE.stats["size"] == 1
+    tpl = template.Template("{{ 40 + states('sensor.count') | int(0) }}", hass)
+    assert tpl.async_render() == 40
+    assert tpl._fast_render is not None
+    info = tpl.async_analyze_to_info()
+    assert info is not None
+    assert info.entities == {"sensor.count"}
+    assert template.COMPILED_TEMPLATE_CACHE.stats["misses"] == 0
+
+    # Compiling more templates does not postpone the save
+    template.COMPILED_TEMPLATE_CACHE.clear()
+    now = dt_util.utcnow()
+    assert template.Template("{{ 1 + 1 }}", hass).async_render() == 2
+    await hass.async_block_till_done()
+    async_fire_time_changed(hass, now + timedelta(seconds=40))
+    await hass.async_block_till_done()
+    assert template.Template("{{ 2 + 2 }}", hass).async_render() == 4
+    await hass.async_block_till_done()
+    async_fire_time_changed(hass, now + timedelta(seconds=61))
+    await hass.async_block_till_done()
+    data = hass_storage["core.template_bytecode"]["data"]
+    assert [entry[0] for entry in data["templates"]] == [
+        "{{ 1 + 1 }}",
+        "{{ 2 + 2 }}",
+    ]
+
+    # Code compiled by another Home Assistant, Python or Jinja version
+    # is discarded
+    template.COMPILED_TEMPLATE_CACHE.clear()
+    data["magic"] = data["magic"].replace(f"{__version__}:", "2000.1.0:")
+    await template.async_load_bytecode_cache(hass)
+    assert template.COMPILED_TEMPLATE_CACHE.stats["size"] == 0
+
+
+@pytest.mark.parametrize(
+    ("template_string", "entities", "has_time"),
+    [
+        ("{{ 1 + 1 }}", set(), False),
+        ("{{ states('Sensor.Temperature') }}", {"sensor.temperature"}, False),
+        ("{{ 'sensor.temperature' | states }}", {"sensor.temperature"}, False),
+        ("{{ states['sensor.temperature'].state }}", {"sensor.temperature"}, False),
+        ("{{ states.sensor.temperature.state }}", {"sensor.temperature"}, False),
+        ("{{ states.sensor['temperature'].state }}", {"sensor.temperature"}, False),
+        ("{{ states['sensor']['temperature'].state }}", {"sensor.temperature"}, False),
+        ("{{ states['sensor'].temperature.state }}", {"sensor.temperature"}, False),
+        (
+            "{% if is_state('light.kitchen', 'on') %}"
+            "{{ state_attr('light.kitchen', 'brightness') }}"
+            "{% else %}{{ has_value('light.other') }}{% endif %}",
+            {"light.kitchen", "light.other"},
+            False,
+        ),
+        (
+            "{% set limit = 5 %}{% for i in range(limit) %}"
+            "{{ loop.index }}{% endfor %}",
+            set(),
+            False,
+        ),
+        ("{{ now().hour > 5 and is_state('sun.sun', 'up') }}", {"sun.sun"}, True),
+        ("{{ '2024-01-01' | as_datetime | relative_time }}", set(), True),
+        (
+            "{{ ['2024-01-01'] | map('as_datetime') | map('relative_time') | list }}",
+            set(),
+            True,
+        ),
+        ("{{ ['a', 'b'] | select('in', 'abc') | map('upper') | list }}", set(), False),
+    ],
+)
+async def test_analyze_to_info(
+    hass: HomeAssistant, template_string: str, entities: set[str], has_time: bool
+) -> None:
+    """Test the states a template depends on are found without rendering it."""
+    tpl = template.Template(template_string, hass)
+    info = tpl.async_analyze_to_info()
+    assert info is not None
+    assert info.entities == entities
+    assert info.has_time is has_time
+    assert not info.all_states
+    assert not info.domains
+    assert not info.domains_lifecycle
+    assert tpl._renders == 0
+
+
+@pytest.mark.parametrize(
+    "template_string",
+    [
+        "static",
+        "{{ states | count }}",
+        "{{ states.sensor | count }}",
+        "{{ states['sensor'] | count }}",
+        "{{ ['light.a', 'light.b'] | select('is_state', 'on') | list }}",
+        "{{ ['light.a', 'light.b'] | reject('is_state', 'on') | list }}",
+        "{{ ['light.a', 'light.b'] | map('states') | list }}",
+        "{{ ['light.a', 'light.b'] | map('state_attr', 'x') | list }}",
+        "{{ ['group.a'] | map('expand') | list }}",
+        "{{ [{'entity_id': 'light.a'}] | selectattr('entity_id', 'is_state', 'on') }}",
+        "{{ [{'entity_id': 'light.a'}] | rejectattr('entity_id', 'has_value') }}",
+        "{{ states['sensor'][name] }}",
+        "{{ states['sensor.temperature.state'] }}",
+        "{{ states('sensor') }}",
+        "{{ 'sensor' | states }}",
+        "{{ is_state('invalid', 'on') }}",
+        "{{ states[entity_id] }}",
+        "{{ states(entity_id) }}",
+        "{{ entity_id | states }}",
+        "{{ states.sensor[name] }}",
+        "{{ expand('group.all') | count }}",
+        "{{ 'group.all' | expand | count }}",
+        "{{ closest('zone.home') }}",
+        "{% set states = 1 %}{{ states }}",
+        "{% import 'macros.jinja' as macros %}{{ macros.state() }}",
+        "{{ invalid ",
+    ],
+)
+async def test_analyze_to_info_needs_render(
+    hass: HomeAssistant, template_string: str
+) -> None:
+    """Test templates which have to be rendered to find their states."""
+    tpl = template.Template(template_string, hass)
+    assert tpl.async_analyze_to_info() is None
+
+
+async def test_analyze_to_info_variables(hass: HomeAssistant) -> None:
+    """Test variables which shadow the functions of a template are detected."""
+    tpl = template.Template("{{ states('sensor.temperature') }}", hass)
+    info = tpl.async_analyze_to_info({"this": "that"})
+    assert info is not None
+    assert info.entities == {"sensor.temperature"}
+    assert tpl.async_analyze_to_info({"states": "that"}) is None
+
+
+@pytest.mark.parametrize(
+    "template_string",
+    [
+        "{{ states('sensor.temperature') | float(0) * 2 }}",
+        "{{ states('sensor.temperature') | float > 20 and is_state('light.a', 'on') }}",
+        "{{ state_attr('light.a', 'brightness') }}",
+        "{{ (states.light.a.attributes.brightness / 2.55) | round(1) }}",
+        "{{ states['light.a'].state | upper }}",
+        "{{ states.light.missing }}",
+        "{{ 'on' if is_state('light.a', 'on') else 'off' }}",
+        "{{ float(states('sensor.temperature'), 0) ** 2 - 1 }}",
+        "{{ state_attr('light.a', 'missing') | default(5) }}",
+        "{{ not has_value('light.a') }}",
+        "{{ 10 // 3 % 2 }}",
+    ],
+)
+async def test_fast_path(hass: HomeAssistant, template_string: str) -> None:
+    """Test simple templates render the same without Jinja."""
+    hass.states.async_set("sensor.temperature", "21.456")
+    hass.states.async_set("light.a", "on", {"brightness": 100})
+    tpl = template.Template(template_string, hass)
+    info = tpl.async_render_to_info()
+    assert tpl._fast_render is not None
+
+    jinja_tpl = template.Template(template_string, hass)
+    jinja_tpl.ensure_valid()
+    jinja_tpl._ensure_compiled()
+    jinja_tpl._fast_render = None
+    jinja_info = jinja_tpl.async_render_to_info()
+
+    assert info.result() == jinja_info.result()
+    assert info.entities == jinja_info.entities
+    assert tpl.async_render(parse_result=False) == jinja_tpl.async_render(
+        parse_result=False
+    )
+
+
+async def test_fast_path_errors(hass: HomeAssistant) -> None:
+    """Test errors of simple templates are the same without Jinja."""
+    tpl = template.Template("{{ states('sensor.missing') | float }}", hass)
+    tpl.ensure_valid()
+    tpl._ensure_compiled()
+    assert tpl._fast_render is not None
+    with pytest.raises(
+        TemplateError,
+        match=(
+            "float got invalid input 'unknown' when rendering template "
+            "'{{ states\\('sensor.missing'\\) \\| float }}'"
+        ),
+    ):
+        tpl.async_render()
+
+    tpl = template.Template("{{ states.light.a.attributes.missing * 2 }}", hass)
+    hass.states.async_set("light.a", "on")
+    with pytest.raises(TemplateError, match="UndefinedError"):
+        tpl.async_render()
+
+
+@pytest.mark.parametrize(
+    "template_string",
+    [
+        "{{ states | count }}",
+        "{{ states('light.a') ~ 'x' }}",
+        "{{ expand('group.all') }}",
+        "{{ this.state }}",
+        "{{ states('light.a') | regex_replace('o', 'a') }}",
+        "{{ [1, 2] }}",
+        "{{ states('light.a') }} and {{ states('light.b') }}",
+        "{% if is_state('light.a', 'on') %}on{% endif %}",
+        "{{ states('light.a') if is_state('light.a', 'on') }}",
+        "{{ states('light.a', lambda=True) }}",
+        "{{ states('light.a') | default(class=1) }}",
+    ],
+)
+async def test_fast_path_not_supported(
+    hass: HomeAssistant, template_string: str
+) -> None:
+    """Test templates which are rendered by Jinja."""
+    tpl = template.Template(template_string, hass)
+    tpl.ensure_valid()
+    tpl._ensure_compiled()
+    assert tpl._fast_render is None
+
+
+async def test_fast_path_variables(hass: HomeAssistant) -> None:
+    """Test variables which shadow the functions of a template are rendered by Jinja."""
+    hass.states.async_set("light.a", "on")
+    tpl = template.Template("{{ is_state('light.a', 'on') }}", hass)
+    assert tpl.async_render({"this": "that"}) is True
+    assert tpl._fast_render is not None
+    with patch.object(tpl, "_fast_render", side_effect=AssertionError):
+        assert tpl.async_render({"is_state": lambda *args: "shadowed"}) == "shadowed"
 
 
 def test_is_template_string() -> None:
@@ -3,6 +3,7 @@
 import asyncio
 from collections.abc import Generator, Iterable
 import contextlib
+from datetime import timedelta
 import glob
 import logging
 import os
@@ -26,11 +27,13 @@ from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.translation import async_translations_loaded
 from homeassistant.helpers.typing import ConfigType
 from homeassistant.loader import Integration
+import homeassistant.util.dt as dt_util
 
 from .common import (
     MockConfigEntry,
     MockModule,
     MockPlatform,
+    async_fire_time_changed,
     get_test_config_dir,
     mock_config_flow,
     mock_integration,
@@ -130,6 +133,22 @@ async def test_empty_setup(hass: HomeAssistant) -> None:
         assert domain in hass.config.components, domain
 
 
+@pytest.mark.parametrize("load_registries", [False])
+async def test_profile_startup(
+    hass: HomeAssistant, caplog: pytest.LogCaptureFixture
+) -> None:
+    """Test a report of the startup is logged when profiling the startup."""
+    hass.data[bootstrap.DATA_PROFILE_STARTUP] = None
+    with caplog.at_level(logging.INFO):
+        await bootstrap.async_from_config_dict({}, hass)
+
+    assert loader.DATA_MANIFEST_CACHE in hass.data
+    assert "Startup profile: " in caplog.text
+    assert "integration manifests loaded from cache" in caplog.text
+    assert "slowest integration setups: " in caplog.text
+    assert "imports over the budget of" in caplog.text
+
+
 @pytest.mark.parametrize("load_registries", [False])
 async def test_config_does_not_turn_off_debug(hass: HomeAssistant) -> None:
     """Test that config does not turn off debug if its turned on by runtime config."""
@@ -1524,3 +1543,150 @@ def test_should_rollover_is_always_false() -> None:
         ).shouldRollover(Mock())
         is False
     )
+
+
+@pytest.mark.parametrize("load_registries", [False])
+async def test_setup_stage_2_independent_of_stage_1(
+    hass: HomeAssistant, hass_storage: dict[str, Any]
+) -> None:
+    """Test stage 2 integrations which do not wait for stage 1 are set up early."""
+    assert "cloud" in bootstrap.STAGE_1_INTEGRATIONS
+    hass.set_state(CoreState.not_running)
+    order = []
+    independent_setup = asyncio.Event()
+
+    async def async_setup_cloud(hass: HomeAssistant, config: ConfigType) -> bool:
+        await independent_setup.wait()
+        order.append("cloud")
+        return True
+
+    async def async_setup_independent(hass: HomeAssistant, config: ConfigType) -> bool:
+        order.append("independent")
+        independent_setup.set()
+        return True
+
+    async def async_setup_after_cloud(hass: HomeAssistant, config: ConfigType) -> bool:
+        order.append("after_cloud")
+        return True
+
+    mock_integration(hass, MockModule(domain="cloud", async_setup=async_setup_cloud))
+    mock_integration(
+        hass, MockModule(domain="independent", async_setup=async_setup_independent)
+    )
+    mock_integration(
+        hass,
+        MockModule(
+            domain="after_cloud",
+            async_setup=async_setup_after_cloud,
+            partial_manifest={"after_dependencies": ["cloud"]},
+        ),
+    )
+
+    await bootstrap._async_set_up_integrations(
+        hass, {"cloud": {}, "independent": {}, "after_cloud": {}}
+    )
+
+    assert order == ["independent", "cloud", "after_cloud"]
+
+    # The setup times are saved to prioritize the setups on the next start
+    async_fire_time_changed(
+        hass, dt_util.utcnow() + timedelta(seconds=bootstrap.SETUP_TIMINGS_SAVE_DELAY)
+    )
+    await hass.async_block_till_done()
+    assert hass_storage[bootstrap.SETUP_TIMINGS_STORAGE_KEY]["data"].keys() >= {
+        "cloud",
+        "independent",
+        "after_cloud",
+    }
+
+
+async def test_independent_stage_2_domains(hass: HomeAssistant) -> None:
+    """Test finding the stage 2 domains which do not wait for stage 1."""
+    integrations = {
+        integration.domain: integration
+        for integration in (
+            mock_integration(
+                hass,
+                MockModule(
+                    domain="stage_1",
+                    requirements=["shared[extra]==1.0"],
+                    partial_manifest={"after_dependencies": ["waited_for"]},
+                ),
+            ),
+            mock_integration(hass, MockModule(domain="independent")),
+            mock_integration(
+                hass, MockModule(domain="chained", dependencies=["independent"])
+            ),
+            mock_integration(hass, MockModule(domain="waited_for")),
+            mock_integration(
+                hass, MockModule(domain="shares_requirement", requirements=["Shared>2"])
+            ),
+            mock_integration(
+                hass, MockModule(domain="needs_stage_1", dependencies=["stage_1"])
+            ),
+            mock_integration(
+                hass,
+                MockModule(
+                    domain="needs_late",
+                    partial_manifest={"after_dependencies": ["needs_stage_1"]},
+                ),
+            ),
+        )
+    }
+
+    assert bootstrap._independent_stage_2_domains(
+        {"stage_1"}, set(integrations) - {"stage_1"}, integrations
+    ) == {"independent", "chained"}
+
+
+async def test_setup_priorities(hass: HomeAssistant) -> None:
+    """Test the setups waited for by the longest chains of setups come first."""
+    integrations = {
+        integration.domain: integration
+        for integration in (
+            mock_integration(hass, MockModule(domain="root")),
+            mock_integration(hass, MockModule(domain="child", dependencies=["root"])),
+            mock_integration(
+                hass, MockModule(domain="grandchild", dependencies=["child"])
+            ),
+            mock_integration(
+                hass,
+                MockModule(
+                    domain="cyclic",
+                    partial_manifest={"after_dependencies": ["cyclic_too"]},
+                ),
+            ),
+            mock_integration(
+                hass,
+                MockModule(
+                    domain="cyclic_too",
+                    partial_manifest={"after_dependencies": ["cyclic"]},
+                ),
+            ),
+            mock_integration(
+                hass, MockModule(domain="cyclic_child", dependencies=["cyclic_too"])
+            ),
+            mock_integration(hass, MockModule(domain="fast")),
+        )
+    }
+    timings = {
+        "root": 1.0,
+        "child": 2.0,
+        "grandchild": 3.0,
+        "cyclic": 4.0,
+        "cyclic_too": 5.0,
+        "cyclic_child": 6.0,
+    }
+    expected = {
+        "root": 1.0 + 2.0 + 3.0,
+        "child": 2.0 + 3.0,
+        "grandchild": 3.0,
+        "cyclic": 4.0 + 5.0 + 6.0,
+        "cyclic_too": 4.0 + 5.0 + 6.0,
+        "cyclic_child": 6.0,
+        "fast": 0,
+    }
+
+    # The priorities of a cycle do not depend on the order it is visited in
+    for domains in (list(integrations), list(reversed(integrations))):
+        assert bootstrap._setup_priorities(timings, domains, integrations) == expected
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import array
 import asyncio
+from collections.abc import Callable
 from datetime import datetime, timedelta
 import functools
 import gc
@@ -1166,6 +1167,177 @@ async def test_eventbus_filtered_listener(hass: HomeAssistant) -> None:
     unsub()
 
 
+async def test_eventbus_listen_batch(hass: HomeAssistant) -> None:
+    """Test events fired in the same loop iteration are received as one batch."""
+    batches: list[list[ha.Event]] = []
+
+    @ha.callback
+    def listener(events: list[ha.Event]) -> None:
+        """Mock listener."""
+        batches.append(events)
+
+    @ha.callback
+    def mock_filter(event_data: dict[str, Any]) -> bool:
+        """Mock filter."""
+        return not event_data["filtered"]
+
+    unsub = hass.bus.async_listen_batch("test", listener, event_filter=mock_filter)
+
+    for idx in range(3):
+        hass.bus.async_fire("test", {"filtered": False, "idx": idx})
+    hass.bus.async_fire("test", {"filtered": True})
+    hass.bus.async_fire("other", {"filtered": False})
+    # The batch is not run while the events are fired
+    assert batches == []
+    await hass.async_block_till_done()
+
+    assert [[event.data["idx"] for event in batch] for batch in batches] == [[0, 1, 2]]
+
+    hass.bus.async_fire("test", {"filtered": False, "idx": 3})
+    await hass.async_block_till_done()
+
+    assert [[event.data["idx"] for event in batch] for batch in batches] == [
+        [0, 1, 2],
+        [3],
+    ]
+
+    # Events which were not run yet are dropped when unsubscribing
+    hass.bus.async_fire("test", {"filtered": False, "idx": 4})
+    unsub()
+    await hass.async_block_till_done()
+
+    assert len(batches) == 2
+    assert hass.bus.async_listeners().get("test") is None
+
+
+async def test_eventbus_listen_batch_coroutine(hass: HomeAssistant) -> None:
+    """Test a coroutine function can listen for batches of events."""
+    batches: list[list[ha.Event]] = []
+
+    async def listener(events: list[ha.Event]) -> None:
+        """Mock listener."""
+        batches.append(events)
+
+    hass.bus.async_listen_batch(MATCH_ALL, listener)
+    hass.bus.async_fire("test")
+    hass.bus.async_fire("test2")
+    await hass.async_block_till_done()
+
+    assert [[event.event_type for event in batch] for batch in batches] == [
+        ["test", "test2"]
+    ]
+
+
+async def test_eventbus_listen_batch_shared(hass: HomeAssistant) -> None:
+    """Test batch listeners of an event type share a single bus listener."""
+    batches1: list[list[ha.Event]] = []
+    batches2: list[list[ha.Event]] = []
+
+    @ha.callback
+    def listener1(events: list[ha.Event]) -> None:
+        batches1.append(events)
+
+    @ha.callback
+    def listener2(events: list[ha.Event]) -> None:
+        batches2.append(events)
+
+    unsub1 = hass.bus.async_listen_batch("test", listener1)
+    hass.bus.async_listen_batch("test", listener2)
+    assert hass.bus.async_listeners()["test"] == 1
+
+    hass.bus.async_fire("test")
+    unsub1()
+    await hass.async_block_till_done()
+
+    assert batches1 == []
+    assert len(batches2) == 1
+    assert hass.bus.async_listeners()["test"] == 1
+
+
+async def test_eventbus_listen_state_changed(hass: HomeAssistant) -> None:
+    """Test listening for state changes keyed by entity_id, domain or attribute."""
+    calls: dict[str, list[str]] = {
+        "entity": [],
+        "domain": [],
+        "both": [],
+        "entity_attribute": [],
+        "attribute": [],
+    }
+
+    def _listener(key: str) -> Callable[[ha.Event[ha.EventStateChangedData]], None]:
+        @ha.callback
+        def listener(event: ha.Event[ha.EventStateChangedData]) -> None:
+            calls[key].append(event.data["entity_id"])
+
+        return listener
+
+    hass.bus.async_listen_state_changed(_listener("entity"), entity_ids="light.kitchen")
+    hass.bus.async_listen_state_changed(_listener("domain"), domains=["switch"])
+    hass.bus.async_listen_state_changed(
+        _listener("both"), entity_ids=["switch.fan"], domains="switch"
+    )
+    hass.bus.async_listen_state_changed(
+        _listener("entity_attribute"),
+        entity_ids="light.kitchen",
+        attributes="brightness",
+    )
+    unsub = hass.bus.async_listen_state_changed(
+        _listener("attribute"), attributes={"temperature"}
+    )
+    assert hass.bus.async_listeners()[EVENT_STATE_CHANGED] == 1
+
+    hass.states.async_set("light.kitchen", "on")
+    hass.states.async_set("light.kitchen", "on", {"brightness": 100})
+    hass.states.async_set("light.kitchen", "on", {"brightness": 100, "temperature": 1})
+    hass.states.async_set("switch.fan", "on")
+    hass.states.async_set("sensor.outside", "10", {"temperature": 10})
+    hass.states.async_set("sensor.outside", "11", {"temperature": 10})
+    hass.states.async_set("light.other", "on")
+    await hass.async_block_till_done()
+
+    assert calls == {
+        "entity": ["light.kitchen", "light.kitchen", "light.kitchen"],
+        "domain": ["switch.fan"],
+        "both": ["switch.fan"],
+        "entity_attribute": ["light.kitchen"],
+        "attribute": ["light.kitchen", "sensor.outside"],
+    }
+
+    unsub()
+    hass.states.async_set("sensor.outside", "11", {"temperature": 11})
+    await hass.async_block_till_done()
+    assert calls["attribute"] == ["light.kitchen", "sensor.outside"]
+
+    with pytest.raises(HomeAssistantError, match="entity_id, domain or attribute"):
+        hass.bus.async_listen_state_changed(_listener("entity"))
+
+
+async def test_eventbus_listen_state_changed_remove(
+    hass: HomeAssistant, caplog: pytest.LogCaptureFixture
+) -> None:
+    """Test the keyed state changed listener is removed with its last listener."""
+    calls: list[str] = []
+
+    @ha.callback
+    def listener(event: ha.Event[ha.EventStateChangedData]) -> None:
+        calls.append(event.data["entity_id"])
+
+    unsub1 = hass.bus.async_listen_state_changed(listener, entity_ids="light.kitchen")
+    unsub2 = hass.bus.async_listen_state_changed(listener, domains="light")
+    hass.states.async_set("light.kitchen", "on")
+    # Listeners removed before the event is dispatched are not run
+    unsub1()
+    unsub2()
+    await hass.async_block_till_done()
+
+    assert calls == []
+    assert EVENT_STATE_CHANGED not in hass.bus.async_listeners()
+
+    # Removing a listener twice does not raise
+    unsub1()
+    assert "Unable to remove unknown state changed listener" in caplog.text
+
+
 async def test_eventbus_run_immediately_callback(hass: HomeAssistant) -> None:
     """Test we can call events immediately with a callback."""
     calls = []
@@ -1489,6 +1661,79 @@ async def test_statemachine_remove(hass: HomeAssistant) -> None:
     assert len(events) == 1
 
 
+async def test_statemachine_snapshot(hass: HomeAssistant) -> None:
+    """Test snapshots of the state machine do not change with it."""
+    hass.states.async_set("light.bowl", "on")
+    hass.states.async_set("switch.ac", "off")
+    bowl = hass.states.get("light.bowl")
+    ac = hass.states.get("switch.ac")
+
+    snapshot = hass.states.async_snapshot()
+    assert hass.states.async_snapshot() is snapshot
+    assert len(snapshot) == 2
+    assert set(snapshot.domains()) == {"light", "switch"}
+    assert list(snapshot.entity_ids("light")) == ["light.bowl"]
+    assert list(snapshot.entity_ids("other")) == []
+    assert list(snapshot.states("switch")) == [ac]
+    assert list(snapshot.states("other")) == []
+    assert list(snapshot.states()) == [bowl, ac]
+
+    hass.states.async_set("light.bowl", "off")
+    hass.states.async_set("light.kitchen", "on")
+    hass.states.async_remove("switch.ac")
+    assert snapshot.get("light.bowl") is bowl
+    assert snapshot.get("light.kitchen") is None
+    assert snapshot.get("switch.ac") is ac
+    assert list(snapshot.states()) == [bowl, ac]
+
+    new_snapshot = hass.states.async_snapshot()
+    assert new_snapshot is not snapshot
+    assert new_snapshot.generation > snapshot.generation
+    assert set(new_snapshot.domains()) == {"light"}
+    assert list(new_snapshot.states("light")) == hass.states.async_all("light")
+
+    # Once no snapshot is referenced the states of a domain are changed
+    # without copying them
+    states = hass.states._states
+    light_states = states._domain_index["light"]
+    del snapshot, new_snapshot
+    hass.states.async_set("light.bowl", "on")
+    assert states._domain_index["light"] is light_states
+
+
+async def test_statemachine_entity_ids_changed_since(hass: HomeAssistant) -> None:
+    """Test the entity_ids changed since a generation."""
+    generation = hass.states.async_generation()
+    assert hass.states.async_entity_ids_changed_since(generation) == []
+
+    hass.states.async_set("light.bowl", "on")
+    hass.states.async_set("switch.ac", "off")
+    hass.states.async_set("light.bowl", "off")
+    # Reporting the same state changes last_reported
+    hass.states.async_set("light.kitchen", "on")
+    hass.states.async_set("light.kitchen", "on")
+    assert hass.states.async_entity_ids_changed_since(generation) == [
+        "light.bowl",
+        "switch.ac",
+        "light.kitchen",
+    ]
+
+    generation = hass.states.async_generation()
+    hass.states.async_set("switch.ac", "on")
+    assert hass.states.async_entity_ids_changed_since(generation) == ["switch.ac"]
+
+    # A removal can not be applied to the entity_ids of the generation
+    hass.states.async_remove("light.kitchen")
+    assert hass.states.async_entity_ids_changed_since(generation) is None
+    generation = hass.states.async_generation()
+    assert hass.states.async_entity_ids_changed_since(generation) == []
+
+    for _ in range(ha.MAX_STATE_CHANGES + 1):
+        hass.states.async_set("light.bowl", "on", force_update=True)
+    assert hass.states.async_entity_ids_changed_since(generation) is None
+    assert hass.states.async_entity_ids_changed_since(generation + 1) == ["light.bowl"]
+
+
 async def test_state_machine_case_insensitivity(hass: HomeAssistant) -> None:
     """Test setting and getting states entity_id insensitivity."""
     events = async_capture_events(hass, EVENT_STATE_CHANGED)
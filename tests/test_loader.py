@@ -5,21 +5,37 @@ import os
 import pathlib
 import sys
 import threading
+from types import ModuleType
 from typing import Any
 from unittest.mock import MagicMock, patch
 
 from awesomeversion import AwesomeVersion
+from freezegun.api import FrozenDateTimeFactory
 import pytest
 
 from homeassistant import loader
 from homeassistant.components import http, hue
 from homeassistant.components.hue import light as hue_light
+from homeassistant.const import (
+    EVENT_COMPONENT_LOADED,
+    EVENT_HOMEASSISTANT_STARTED,
+    __version__,
+)
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers import frame
+from homeassistant.helpers.integration_platform import (
+    async_process_integration_platforms,
+)
 from homeassistant.helpers.json import json_dumps
+from homeassistant.setup import ATTR_COMPONENT
 from homeassistant.util.json import json_loads
 
-from .common import MockModule, async_get_persistent_notifications, mock_integration
+from .common import (
+    MockModule,
+    async_fire_time_changed,
+    async_get_persistent_notifications,
+    mock_integration,
+)
 
 
 async def test_circular_component_dependencies(hass: HomeAssistant) -> None:
@@ -1377,6 +1393,72 @@ async def test_async_get_component_preloads_config_and_config_flow(
     }
 
 
+async def test_async_get_component_lazy_platforms(hass: HomeAssistant) -> None:
+    """Verify the preload platforms are imported after start with lazy platforms."""
+    loader.async_enable_lazy_platforms(hass, True)
+    executor_import_integration = _get_test_integration(
+        hass, "executor_import", True, import_executor=True
+    )
+
+    with (
+        patch("homeassistant.loader.importlib.import_module") as mock_import,
+        patch.object(
+            executor_import_integration,
+            "platforms_exists",
+            return_value=["config_flow", "diagnostics"],
+        ),
+    ):
+        await executor_import_integration.async_get_component()
+
+        assert mock_import.call_count == 1
+        assert hass.data[loader.DATA_DEFERRED_PRELOADS] == {
+            "executor_import": executor_import_integration
+        }
+
+        hass.bus.async_fire(EVENT_HOMEASSISTANT_STARTED)
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+    assert [call[0][0] for call in mock_import.call_args_list] == [
+        "homeassistant.components.executor_import",
+        "homeassistant.components.executor_import.config_flow",
+        "homeassistant.components.executor_import.diagnostics",
+    ]
+    assert hass.data[loader.DATA_DEFERRED_PRELOADS] == {}
+    assert loader.async_get_import_timings(hass).keys() == {"executor_import"}
+
+
+async def test_async_get_component_lazy_platforms_processed(
+    hass: HomeAssistant,
+) -> None:
+    """Verify processed platforms are still imported with lazy platforms."""
+    loader.async_enable_lazy_platforms(hass, False)
+    processed: list[tuple[str, ModuleType]] = []
+
+    @callback
+    def _process_platform(
+        hass: HomeAssistant, domain: str, platform: ModuleType
+    ) -> None:
+        processed.append((domain, platform))
+
+    await async_process_integration_platforms(hass, "diagnostics", _process_platform)
+    integration = await loader.async_get_integration(hass, "hue")
+    with patch.dict(sys.modules):
+        # The component is imported in the executor with its preload
+        # platforms only if it was not imported yet
+        for name in list(sys.modules):
+            if name.startswith(integration.pkg_path):
+                del sys.modules[name]
+        await integration.async_get_component()
+
+    assert integration.get_platform_cached("diagnostics") is not None
+    assert integration.get_platform_cached("config_flow") is None
+    assert hass.data[loader.DATA_DEFERRED_PRELOADS] == {"hue": integration}
+
+    hass.bus.async_fire(EVENT_COMPONENT_LOADED, {ATTR_COMPONENT: "hue"})
+    await hass.async_block_till_done()
+    assert processed == [("hue", integration.get_platform_cached("diagnostics"))]
+
+
 @pytest.mark.usefixtures("enable_custom_integrations")
 async def test_async_get_component_loads_loop_if_already_in_sys_modules(
     hass: HomeAssistant, caplog: pytest.LogCaptureFixture
@@ -2035,3 +2117,74 @@ async def test_manifest_json_fragment_round_trip(hass: HomeAssistant) -> None:
         json_loads(json_dumps(integration.manifest_json_fragment))
         == integration.manifest
     )
+
+
+async def test_manifest_cache(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    tmp_path: pathlib.Path,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test manifests are loaded from the cache while their files are unchanged."""
+    hass_storage[loader.MANIFEST_CACHE_STORAGE_KEY] = {
+        "version": loader.MANIFEST_CACHE_STORAGE_VERSION,
+        "minor_version": 1,
+        "key": loader.MANIFEST_CACHE_STORAGE_KEY,
+        "data": {
+            "version": "0.1.0",
+            "manifests": {
+                str(tmp_path / "test_cache" / "manifest.json"): [
+                    0,
+                    0,
+                    0,
+                    0.0,
+                    {"domain": "outdated"},
+                    [],
+                ]
+            },
+        },
+    }
+    integration_path = tmp_path / "test_cache"
+    integration_path.mkdir()
+    manifest_path = integration_path / "manifest.json"
+    manifest_path.write_text(
+        json_dumps({"domain": "test_cache", "name": "Test", "version": "1.0.0"})
+    )
+    root_module = MagicMock(__path__=[str(tmp_path)])
+    root_module.__name__ = "custom_components"
+
+    await loader.async_load_manifest_cache(hass)
+    cache = hass.data[loader.DATA_MANIFEST_CACHE]
+
+    def _resolve() -> loader.Integration | None:
+        return loader.Integration.resolve_from_root(hass, root_module, "test_cache")
+
+    integration = await hass.async_add_executor_job(_resolve)
+    assert integration is not None
+    assert integration.name == "Test"
+    assert (cache.hits, cache.misses) == (0, 1)
+
+    with patch("homeassistant.loader.json_loads") as mock_json_loads:
+        integration = await hass.async_add_executor_job(_resolve)
+    assert not mock_json_loads.called
+    assert integration is not None
+    assert integration.name == "Test"
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    # A changed manifest and a new file of the integration are loaded
+    manifest_path.write_text(
+        json_dumps({"domain": "test_cache", "name": "Changed", "version": "1.0.0"})
+    )
+    (integration_path / "light.py").write_text("")
+    integration = await hass.async_add_executor_job(_resolve)
+    assert integration is not None
+    assert integration.name == "Changed"
+    assert integration.platforms_exists(("light",)) == ["light"]
+    assert (cache.hits, cache.misses) == (1, 2)
+
+    freezer.tick(loader.MANIFEST_CACHE_SAVE_DELAY)
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    data = hass_storage[loader.MANIFEST_CACHE_STORAGE_KEY]["data"]
+    assert data["version"] == __version__
+    assert data["manifests"][str(manifest_path)][4]["name"] == "Changed"